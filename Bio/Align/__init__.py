@@ -15,7 +15,9 @@ class, used in the Bio.AlignIO module.
 from __future__ import print_function
 
 import sys  # Only needed to check if we are using Python 2 or 3
-from Bio.Seq import Seq
+
+from Bio._py3k import basestring
+from Bio.Seq import Seq, BytesSeq
 from Bio.SeqRecord import SeqRecord, _RestrictedDict
 from Bio import Alphabet
 
@@ -1330,19 +1332,208 @@ class PairwiseAligner(_aligners.PairwiseAligner):
     -EVL-
     <BLANKLINE>
 
+    For long and similar sequences, the dynamic programming can be limited
+    to a band around a diagonal of the score matrix.  Only the diagonals
+    j - i from band_offset - band_width to band_offset + band_width are
+    considered, where i and j are positions in the target and query
+    sequence.  This makes the time needed by the score method proportional
+    to the sequence length rather than to the product of the sequence
+    lengths, but only finds the alignments lying entirely inside the band.
+    The align method also limits the dynamic programming to the band, but
+    still allocates and clears the full matrix of traces used to generate
+    the alignments (one byte per pair of positions, or two for the Gotoh
+    algorithm), so its time and memory remain proportional to the product
+    of the sequence lengths, if much smaller than without a band.  Setting
+    band_width to None (the default) uses the full score matrix:
+
+    >>> aligner = Align.PairwiseAligner()
+    >>> aligner.mismatch = -1
+    >>> aligner.gap_score = -1
+    >>> aligner.band_width = 2
+    >>> alignments = aligner.align("GAACTGCATT", "GACTGGATT")
+    >>> for alignment in sorted(alignments):
+    ...     print("Score = %.1f:" % alignment.score)
+    ...     print(alignment)
+    ...
+    Score = 6.0:
+    GAACTGCATT
+    |-||||X|||
+    G-ACTGGATT
+    <BLANKLINE>
+    Score = 6.0:
+    GAACTGCATT
+    ||-|||X|||
+    GA-CTGGATT
+    <BLANKLINE>
+
+    In global mode, the band must contain both the start and the end of the
+    alignment, otherwise a ValueError is raised.  In local mode, setting
+    xdrop stops the dynamic programming once the best score in a row of the
+    score matrix has dropped more than xdrop below the best score found so
+    far, which saves time if the sequences are similar in their first part
+    only.  Alignments found after such a drop are missed.  Banded alignment
+    and X-drop termination are not available for the Waterman-Smith-Beyer
+    algorithm (used for general gap score functions).
+
     """
 
     def align(self, seqA, seqB):
-        seqA = str(seqA)
-        seqB = str(seqB)
-        score, paths = _aligners.PairwiseAligner.align(self, seqA, seqB)
+        seqA = _prepare_sequence(seqA)
+        seqB = _prepare_sequence(seqB)
+        score, paths = _aligners.PairwiseAligner.align(
+            self, _sequence_data(seqA), _sequence_data(seqB))
         alignments = PairwiseAlignments(seqA, seqB, score, paths)
         return alignments
 
     def score(self, seqA, seqB):
-        seqA = str(seqA)
-        seqB = str(seqB)
-        return _aligners.PairwiseAligner.score(self, seqA, seqB)
+        seqA = _prepare_sequence(seqA)
+        seqB = _prepare_sequence(seqB)
+        return _aligners.PairwiseAligner.score(
+            self, _sequence_data(seqA), _sequence_data(seqB))
+
+    def score_many(self, seqA, seqB, threads=0):
+        """Return a NumPy array of the alignment scores of many sequences.
+
+        Arguments:
+         - seqA, seqB - the target and query sequences. Either can be a
+           list or tuple of sequences, which are then aligned pairwise, or
+           a single sequence, which is aligned to each sequence in the
+           other list (as for one read against many targets).
+         - threads - the number of worker threads (default 0, calculating
+           all scores in the calling thread).
+
+        The result is the same as calling the score method on each pair,
+        but the sequences are handed to the C code in one go, and except
+        for the Waterman-Smith-Beyer algorithm (which calls the gap score
+        functions) the GIL is released while the scores are calculated,
+        so that using threads makes use of several CPU cores:
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> aligner.score_many("ACCGT", ["ACG", "ACCGT", "TT"]).tolist()
+        [3.0, 5.0, 1.0]
+        >>> aligner.score_many(["ACCGT", "GAT"], ["ACG", "AT"]).tolist()
+        [3.0, 2.0]
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Install NumPy if you want to use score_many.")
+        seqsA, seqsB, n = _sequence_batches(seqA, seqB)
+        seqsA = [_sequence_data(seq) for seq in seqsA]
+        seqsB = [_sequence_data(seq) for seq in seqsB]
+        scores = numpy.empty(n)
+
+        def score_chunk(start, end):
+            _aligners.PairwiseAligner.score_many(
+                self, seqsA if len(seqsA) == 1 else seqsA[start:end],
+                seqsB if len(seqsB) == 1 else seqsB[start:end],
+                scores[start:end])
+
+        if threads < 0:
+            raise ValueError("Use threads with a minimum of 0")
+        if not threads:
+            score_chunk(0, n)
+            return scores
+        # A few chunks per thread, to balance sequences of different lengths
+        size = max(1, -(-n // (4 * threads)))
+        _thread_map(lambda start: score_chunk(start, start + size),
+                    range(0, n, size), threads)
+        return scores
+
+    def align_many(self, seqA, seqB, threads=0):
+        """Return a list with the alignments of many sequences.
+
+        The arguments are as for the score_many method, with a list or tuple
+        of sequences aligned pairwise, or a single sequence aligned to each
+        sequence in the other list. Each element of the returned list is
+        the result of the align method for that pair:
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> for alignments in aligner.align_many("ACCGT", ["ACG", "AGT"]):
+        ...     print("%i alignments, score %.1f"
+        ...           % (len(alignments), alignments.score))
+        2 alignments, score 3.0
+        1 alignments, score 3.0
+
+        With threads, the dynamic programming for the different pairs runs
+        in parallel, as the GIL is released while the score and trace
+        matrices are filled in (except for the Waterman-Smith-Beyer
+        algorithm). The alignments themselves are generated when you
+        iterate over them, as for the align method.
+        """
+        seqsA, seqsB, n = _sequence_batches(seqA, seqB)
+
+        def align_pair(i):
+            return self.align(seqsA[0 if len(seqsA) == 1 else i],
+                              seqsB[0 if len(seqsB) == 1 else i])
+
+        if threads < 0:
+            raise ValueError("Use threads with a minimum of 0")
+        if not threads:
+            return [align_pair(i) for i in range(n)]
+        return _thread_map(align_pair, range(n), threads)
+
+
+def _prepare_sequence(sequence):
+    """Return the sequence as a string or a BytesSeq object (PRIVATE).
+
+    Bytes-like objects (e.g. bytes, bytearray or memoryview) are wrapped
+    in a BytesSeq without copying, any other sequence becomes a string.
+    """
+    if isinstance(sequence, BytesSeq):
+        return sequence
+    if isinstance(sequence, basestring):
+        return str(sequence)
+    if isinstance(sequence, (bytes, bytearray, memoryview)):
+        return BytesSeq(sequence)
+    return str(sequence)
+
+
+def _sequence_batches(seqA, seqB):
+    """Return the prepared sequences of score_many or align_many (PRIVATE).
+
+    Returns two lists of sequences, and the number of pairs to align. A list
+    or tuple is a batch of sequences, anything else a single sequence to be
+    aligned to each sequence in the other batch.
+    """
+    seqsA = seqA if isinstance(seqA, (list, tuple)) else [seqA]
+    seqsB = seqB if isinstance(seqB, (list, tuple)) else [seqB]
+    if len(seqsA) == 1:
+        n = len(seqsB)
+    elif len(seqsB) == 1 or len(seqsA) == len(seqsB):
+        n = len(seqsA)
+    else:
+        raise ValueError("Got %i target and %i query sequences"
+                         % (len(seqsA), len(seqsB)))
+    seqsA = [_prepare_sequence(seq) for seq in seqsA]
+    seqsB = [_prepare_sequence(seq) for seq in seqsB]
+    return seqsA, seqsB, n
+
+
+def _thread_map(function, items, threads):
+    """Return the function results for each item, using threads (PRIVATE)."""
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(threads)
+    try:
+        return pool.map(function, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _sequence_data(sequence):
+    """Return the letters of a prepared sequence for the C code (PRIVATE).
+
+    For a BytesSeq this is its memoryview, so the sequence is not copied.
+    """
+    if isinstance(sequence, BytesSeq):
+        return sequence._buffer
+    return sequence
 
 
 if __name__ == "__main__":
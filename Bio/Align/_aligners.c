@@ -1736,6 +1736,9 @@ typedef struct {
     double match;
     double mismatch;
     double epsilon;
+    Py_ssize_t band_width; /* negative if the full matrix is used */
+    Py_ssize_t band_offset;
+    double xdrop; /* negative if X-drop termination is not used */
     double target_open_gap_score;
     double target_extend_gap_score;
     double target_left_open_gap_score;
@@ -1765,6 +1768,9 @@ Aligner_init(Aligner *self, PyObject *args, PyObject *kwds)
     self->match = 1.0;
     self->mismatch = 0.0;
     self->epsilon = 1.e-6;
+    self->band_width = -1;
+    self->band_offset = 0;
+    self->xdrop = -1;
     self->target_open_gap_score = 0;
     self->target_extend_gap_score = 0;
     self->query_open_gap_score = 0;
@@ -1900,6 +1906,16 @@ Aligner_str(Aligner* self)
                        self->query_right_extend_gap_score);
         p += n;
     }
+    if (self->band_width >= 0) {
+        n = sprintf(p, "  band width: %ld\n", (long)self->band_width);
+        p += n;
+        n = sprintf(p, "  band offset: %ld\n", (long)self->band_offset);
+        p += n;
+    }
+    if (self->xdrop >= 0) {
+        n = sprintf(p, "  X-drop: %f\n", self->xdrop);
+        p += n;
+    }
     switch (self->mode) {
         case Global: n = sprintf(p, "  mode: global\n"); break;
         case Local: n = sprintf(p, "  mode: local\n"); break;
@@ -3723,6 +3739,80 @@ Aligner_set_epsilon(Aligner* self, PyObject* value, void* closure)
     return 0;
 }
 
+static char Aligner_band_width__doc__[] = "width of the band of diagonals used in the dynamic programming (None to use the full matrix); align still allocates the full matrix of traces";
+
+static PyObject*
+Aligner_get_band_width(Aligner* self, void* closure)
+{   if (self->band_width < 0) Py_RETURN_NONE;
+#if PY_MAJOR_VERSION >= 3
+    return PyLong_FromSsize_t(self->band_width);
+#else
+    return PyInt_FromSsize_t(self->band_width);
+#endif
+}
+
+static int
+Aligner_set_band_width(Aligner* self, PyObject* value, void* closure)
+{   Py_ssize_t band_width;
+    if (value == Py_None) {
+        self->band_width = -1;
+        return 0;
+    }
+    band_width = PyNumber_AsSsize_t(value, PyExc_OverflowError);
+    if (band_width == -1 && PyErr_Occurred()) return -1;
+    if (band_width < 0) {
+        PyErr_SetString(PyExc_ValueError, "band width should be non-negative");
+        return -1;
+    }
+    self->band_width = band_width;
+    return 0;
+}
+
+static char Aligner_band_offset__doc__[] = "diagonal at the center of the band";
+
+static PyObject*
+Aligner_get_band_offset(Aligner* self, void* closure)
+{
+#if PY_MAJOR_VERSION >= 3
+    return PyLong_FromSsize_t(self->band_offset);
+#else
+    return PyInt_FromSsize_t(self->band_offset);
+#endif
+}
+
+static int
+Aligner_set_band_offset(Aligner* self, PyObject* value, void* closure)
+{   const Py_ssize_t band_offset = PyNumber_AsSsize_t(value, PyExc_OverflowError);
+    if (band_offset == -1 && PyErr_Occurred()) return -1;
+    self->band_offset = band_offset;
+    return 0;
+}
+
+static char Aligner_xdrop__doc__[] = "X-drop score for terminating local alignments (None to align the full sequences)";
+
+static PyObject*
+Aligner_get_xdrop(Aligner* self, void* closure)
+{   if (self->xdrop < 0) Py_RETURN_NONE;
+    return PyFloat_FromDouble(self->xdrop);
+}
+
+static int
+Aligner_set_xdrop(Aligner* self, PyObject* value, void* closure)
+{   double xdrop;
+    if (value == Py_None) {
+        self->xdrop = -1;
+        return 0;
+    }
+    xdrop = PyFloat_AsDouble(value);
+    if (PyErr_Occurred()) return -1;
+    if (xdrop < 0) {
+        PyErr_SetString(PyExc_ValueError, "X-drop score should be non-negative");
+        return -1;
+    }
+    self->xdrop = xdrop;
+    return 0;
+}
+
 static Algorithm _get_algorithm(Aligner* self)
 {
     Algorithm algorithm = self->algorithm;
@@ -4007,6 +4097,18 @@ static PyGetSetDef Aligner_getset[] = {
         (getter)Aligner_get_epsilon,
         (setter)Aligner_set_epsilon,
         Aligner_epsilon__doc__, NULL},
+    {"band_width",
+        (getter)Aligner_get_band_width,
+        (setter)Aligner_set_band_width,
+        Aligner_band_width__doc__, NULL},
+    {"band_offset",
+        (getter)Aligner_get_band_offset,
+        (setter)Aligner_set_band_offset,
+        Aligner_band_offset__doc__, NULL},
+    {"xdrop",
+        (getter)Aligner_get_xdrop,
+        (setter)Aligner_set_xdrop,
+        Aligner_xdrop__doc__, NULL},
     {"algorithm",
         (getter)Aligner_get_algorithm,
         (setter)NULL,
@@ -4500,9 +4602,10 @@ exit:
 
 /* ----------------- alignment algorithms ----------------- */
 
-static PyObject*
+static int
 Aligner_needlemanwunsch_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                             const char* sB, Py_ssize_t nB)
+                                             const char* sB, Py_ssize_t nB,
+                                             double* result)
 {
     char c;
     int i;
@@ -4521,8 +4624,8 @@ Aligner_needlemanwunsch_score(Aligner* self, const char* sA, Py_ssize_t nA,
     double* scores;
 
     /* Needleman-Wunsch algorithm */
-    scores = PyMem_Malloc((nB+1)*sizeof(double));
-    if (!scores) return PyErr_NoMemory();
+    scores = malloc((nB+1)*sizeof(double));
+    if (!scores) return MEMORY_ERROR;
 
     /* The top row of the score matrix is a special case,
      * as there are no previously aligned characters.
@@ -4563,13 +4666,15 @@ Aligner_needlemanwunsch_score(Aligner* self, const char* sA, Py_ssize_t nA,
     SELECT_SCORE_GLOBAL(temp + self->substitution_matrix[kA][kB],
                         scores[nB] + right_gap_extend_B,
                         scores[nB-1] + right_gap_extend_A);
-    PyMem_Free(scores);
-    return PyFloat_FromDouble(score);
+    free(scores);
+    *result = score;
+    return 0;
 }
 
-static PyObject*
+static int
 Aligner_smithwaterman_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                           const char* sB, Py_ssize_t nB)
+                                           const char* sB, Py_ssize_t nB,
+                                           double* result)
 {
     char c;
     int i;
@@ -4584,8 +4689,8 @@ Aligner_smithwaterman_score(Aligner* self, const char* sA, Py_ssize_t nA,
     double maximum = 0;
 
     /* Smith-Waterman algorithm */
-    scores = PyMem_Malloc((nB+1)*sizeof(double));
-    if (!scores) return PyErr_NoMemory();
+    scores = malloc((nB+1)*sizeof(double));
+    if (!scores) return MEMORY_ERROR;
 
     /* The top row of the score matrix is a special case,
      * as there are no previously aligned characters.
@@ -4618,8 +4723,9 @@ Aligner_smithwaterman_score(Aligner* self, const char* sA, Py_ssize_t nA,
     }
     kB = CHARINDEX(sB[nB-1]);
     SELECT_SCORE_LOCAL1(temp + self->substitution_matrix[kA][kB]);
-    PyMem_Free(scores);
-    return PyFloat_FromDouble(maximum);
+    free(scores);
+    *result = maximum;
+    return 0;
 }
 
 static PyObject*
@@ -4654,6 +4760,8 @@ Aligner_needlemanwunsch_align(Aligner* self, const char* sA, Py_ssize_t nA,
         return PyErr_NoMemory();
     }
     M = paths->M;
+    /* The dynamic programming does not use the Python API */
+    Py_BEGIN_ALLOW_THREADS
     scores[0] = 0;
     for (j = 1; j <= nB; j++) scores[j] = j * left_gap_extend_A;
     for (i = 1; i < nA; i++) {
@@ -4676,8 +4784,9 @@ Aligner_needlemanwunsch_align(Aligner* self, const char* sA, Py_ssize_t nA,
     }
     kB = CHARINDEX(sB[j-1]);
     SELECT_TRACE_NEEDLEMAN_WUNSCH(right_gap_extend_A, right_gap_extend_B);
-    PyMem_Free(scores);
     M[nA][nB].path = 0;
+    Py_END_ALLOW_THREADS
+    PyMem_Free(scores);
 
     return Py_BuildValue("fN", score, paths);
 }
@@ -4713,6 +4822,8 @@ Aligner_smithwaterman_align(Aligner* self, const char* sA, Py_ssize_t nA,
         return PyErr_NoMemory();
     }
     M = paths->M;
+    /* The dynamic programming does not use the Python API */
+    Py_BEGIN_ALLOW_THREADS
     for (j = 0; j <= nB; j++) scores[j] = 0;
     for (i = 1; i < nA; i++) {
         temp = 0;
@@ -4732,7 +4843,6 @@ Aligner_smithwaterman_align(Aligner* self, const char* sA, Py_ssize_t nA,
     }
     kB = CHARINDEX(sB[nB-1]);
     SELECT_TRACE_SMITH_WATERMAN_D;
-    PyMem_Free(scores);
 
     /* As we don't allow zero-score extensions to alignments,
      * we need to remove all traces towards an ENDPOINT.
@@ -4768,13 +4878,16 @@ Aligner_smithwaterman_align(Aligner* self, const char* sA, Py_ssize_t nA,
 
     if (maximum == 0) M[0][0].path = NONE;
     else M[0][0].path = 0;
+    Py_END_ALLOW_THREADS
+    PyMem_Free(scores);
 
     return Py_BuildValue("fN", maximum, paths);
 }
 
-static PyObject*
+static int
 Aligner_gotoh_global_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                          const char* sB, Py_ssize_t nB)
+                                          const char* sB, Py_ssize_t nB,
+                                          double* result)
 {
     char c;
     int i;
@@ -4803,11 +4916,11 @@ Aligner_gotoh_global_score(Aligner* self, const char* sA, Py_ssize_t nA,
     double Iy_temp;
 
     /* Gotoh algorithm with three states */
-    M_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    M_scores = malloc((nB+1)*sizeof(double));
     if (!M_scores) goto exit;
-    Ix_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    Ix_scores = malloc((nB+1)*sizeof(double));
     if (!Ix_scores) goto exit;
-    Iy_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    Iy_scores = malloc((nB+1)*sizeof(double));
     if (!Iy_scores) goto exit;
 
     /* The top row of the score matrix is a special case,
@@ -4908,21 +5021,23 @@ Aligner_gotoh_global_score(Aligner* self, const char* sA, Py_ssize_t nA,
     Iy_scores[nB] = score;
 
     SELECT_SCORE_GLOBAL(M_scores[nB], Ix_scores[nB], Iy_scores[nB]);
-    PyMem_Free(M_scores);
-    PyMem_Free(Ix_scores);
-    PyMem_Free(Iy_scores);
-    return PyFloat_FromDouble(score);
+    free(M_scores);
+    free(Ix_scores);
+    free(Iy_scores);
+    *result = score;
+    return 0;
 
 exit:
-    if (M_scores) PyMem_Free(M_scores);
-    if (Ix_scores) PyMem_Free(Ix_scores);
-    if (Iy_scores) PyMem_Free(Iy_scores);
-    return PyErr_NoMemory();
+    if (M_scores) free(M_scores);
+    if (Ix_scores) free(Ix_scores);
+    if (Iy_scores) free(Iy_scores);
+    return MEMORY_ERROR;
 }
 
-static PyObject*
+static int
 Aligner_gotoh_local_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                         const char* sB, Py_ssize_t nB)
+                                         const char* sB, Py_ssize_t nB,
+                                         double* result)
 {
     char c;
     int i;
@@ -4944,11 +5059,11 @@ Aligner_gotoh_local_score(Aligner* self, const char* sA, Py_ssize_t nA,
     double maximum = 0.0;
 
     /* Gotoh algorithm with three states */
-    M_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    M_scores = malloc((nB+1)*sizeof(double));
     if (!M_scores) goto exit;
-    Ix_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    Ix_scores = malloc((nB+1)*sizeof(double));
     if (!Ix_scores) goto exit;
-    Iy_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    Iy_scores = malloc((nB+1)*sizeof(double));
     if (!Iy_scores) goto exit;
 
     /* The top row of the score matrix is a special case,
@@ -5030,16 +5145,17 @@ Aligner_gotoh_local_score(Aligner* self, const char* sA, Py_ssize_t nA,
                                    Iy_temp,
                                    self->substitution_matrix[kA][kB]);
 
-    PyMem_Free(M_scores);
-    PyMem_Free(Ix_scores);
-    PyMem_Free(Iy_scores);
-    return PyFloat_FromDouble(maximum);
+    free(M_scores);
+    free(Ix_scores);
+    free(Iy_scores);
+    *result = maximum;
+    return 0;
 
 exit:
-    if (M_scores) PyMem_Free(M_scores);
-    if (Ix_scores) PyMem_Free(Ix_scores);
-    if (Iy_scores) PyMem_Free(Iy_scores);
-    return PyErr_NoMemory();
+    if (M_scores) free(M_scores);
+    if (Ix_scores) free(Ix_scores);
+    if (Iy_scores) free(Iy_scores);
+    return MEMORY_ERROR;
 }
 
 static PyObject*
@@ -5090,7 +5206,8 @@ Aligner_gotoh_global_align(Aligner* self, const char* sA, Py_ssize_t nA,
     M = paths->M;
     gaps = paths->gaps.gotoh;
 
-    /* Gotoh algorithm with three states */
+    /* The dynamic programming does not use the Python API */
+    Py_BEGIN_ALLOW_THREADS
     M_scores[0] = 0;
     Ix_scores[0] = -DBL_MAX;
     Iy_scores[0] = -DBL_MAX;
@@ -5190,6 +5307,10 @@ Aligner_gotoh_global_align(Aligner* self, const char* sA, Py_ssize_t nA,
     if (M_scores[nB] < score - epsilon) M[nA][nB].trace = 0;
     if (Ix_scores[nB] < score - epsilon) gaps[nA][nB].Ix = 0;
     if (Iy_scores[nB] < score - epsilon) gaps[nA][nB].Iy = 0;
+    Py_END_ALLOW_THREADS
+    PyMem_Free(M_scores);
+    PyMem_Free(Ix_scores);
+    PyMem_Free(Iy_scores);
     return Py_BuildValue("fN", score, paths);
 exit:
     Py_DECREF(paths);
@@ -5241,6 +5362,8 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
     if (!Ix_scores) goto exit;
     Iy_scores = PyMem_Malloc((nB+1)*sizeof(double));
     if (!Iy_scores) goto exit;
+    /* The dynamic programming does not use the Python API */
+    Py_BEGIN_ALLOW_THREADS
     M_scores[0] = 0;
     Ix_scores[0] = -DBL_MAX;
     Iy_scores[0] = -DBL_MAX;
@@ -5314,10 +5437,6 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
     gaps[nA][nB].Ix = 0;
     gaps[nA][nB].Iy = 0;
 
-    PyMem_Free(M_scores);
-    PyMem_Free(Ix_scores);
-    PyMem_Free(Iy_scores);
-
     /* As we don't allow zero-score extensions to alignments,
      * we need to remove all traces towards an ENDPOINT.
      * In addition, some points then won't have any path to a STARTPOINT.
@@ -5383,6 +5502,10 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
     /* traceback */
     if (maximum == 0) M[0][0].path = DONE;
     else M[0][0].path = 0;
+    Py_END_ALLOW_THREADS
+    PyMem_Free(M_scores);
+    PyMem_Free(Ix_scores);
+    PyMem_Free(Iy_scores);
 
     return Py_BuildValue("fN", maximum, paths);
 exit:
@@ -5393,159 +5516,941 @@ exit:
     return PyErr_NoMemory();
 }
 
-static int
-_call_query_gap_function(Aligner* aligner, int i, int j, double* score)
-{
-    double value;
-    PyObject* result;
-    PyObject* function = aligner->query_gap_function;
-    if (!function)
-        value = aligner->query_open_gap_score
-              + (j-1) * aligner->query_extend_gap_score;
-    else {
-        result = PyObject_CallFunction(function, "ii", i, j);
-        if (result == NULL) return 0;
-        value = PyFloat_AsDouble(result);
-        Py_DECREF(result);
-        if (value == -1.0 && PyErr_Occurred()) return 0;
+/* ------------ banded alignment and X-drop termination ------------ */
+
+/* The band consists of the diagonals j - i between band_offset - band_width
+ * and band_offset + band_width; points outside the band cannot be part of an
+ * alignment. For each row i, lo and hi are the first and last column inside
+ * the band (lo > hi if the row does not intersect the band).
+ *
+ * The align functions only fill in the traces inside the band, but the
+ * PathGenerator still holds (and reads) complete rows of the trace matrix,
+ * so the traces outside the band are cleared and memory use is O(nA*nB). */
+#define BAND_LIMITS(row) \
+    if (width < 0) { \
+        lo = 0; \
+        hi = nB; \
+    } \
+    else { \
+        lo = (row) + offset - width; \
+        if (lo < 0) lo = 0; \
+        hi = (row) + offset + width; \
+        if (hi > nB) hi = nB; \
+    }
+
+#define CLEAR_OUTSIDE_BAND(row, type) \
+    if (lo > hi) memset(row, 0, (nB+1)*sizeof(type)); \
+    else { \
+        memset(row, 0, lo*sizeof(type)); \
+        memset(row + hi + 1, 0, (nB-hi)*sizeof(type)); \
     }
-    *score = value;
-    return 1;
-}
+
+#define BANDED(self) ((self)->band_width >= 0 || (self)->xdrop >= 0)
 
 static int
-_call_target_gap_function(Aligner* aligner, int i, int j, double* score)
+_check_band(Aligner* self, Algorithm algorithm, Py_ssize_t nA, Py_ssize_t nB)
 {
-    double value;
-    PyObject* result;
-    PyObject* function = aligner->target_gap_function;
-    if (!function)
-        value = aligner->target_open_gap_score
-              + (j-1) * aligner->target_extend_gap_score;
-    else {
-        result = PyObject_CallFunction(function, "ii", i, j);
-        if (result == NULL) return 0;
-        value = PyFloat_AsDouble(result);
-        Py_DECREF(result);
-        if (value == -1.0 && PyErr_Occurred()) return 0;
+    const Py_ssize_t width = self->band_width;
+    const Py_ssize_t offset = self->band_offset;
+
+    if (!BANDED(self)) return 0;
+    if (algorithm == WatermanSmithBeyer) {
+        PyErr_SetString(PyExc_ValueError,
+                        "banded alignment and X-drop termination are not "
+                        "available for the Waterman-Smith-Beyer algorithm");
+        return -1;
     }
-    *score = value;
-    return 1;
+    if (self->mode == Global) {
+        if (self->xdrop >= 0) {
+            PyErr_SetString(PyExc_ValueError,
+                            "X-drop termination requires local mode");
+            return -1;
+        }
+        if (offset - width > 0 || offset + width < 0
+         || offset - width > nB - nA || offset + width < nB - nA) {
+            PyErr_SetString(PyExc_ValueError,
+                            "the band does not include both ends of the "
+                            "global alignment");
+            return -1;
+        }
+    }
+    return 0;
 }
 
-static PyObject*
-Aligner_waterman_smith_beyer_global_score(Aligner* self,
-                                          const char* sA, Py_ssize_t nA,
-                                          const char* sB, Py_ssize_t nB)
+static int
+Aligner_banded_needlemanwunsch_smithwaterman_score(Aligner* self,
+                                                   const char* sA,
+                                                   Py_ssize_t nA,
+                                                   const char* sB,
+                                                   Py_ssize_t nB,
+                                                   double* result)
 {
     char c;
     int i;
     int j;
-    int k;
     int kA;
     int kB;
-    double** M = NULL;
-    double** Ix = NULL;
-    double** Iy = NULL;
-    double score = 0.0;
-    double gapscore;
+    const Mode mode = self->mode;
+    const Py_ssize_t width = self->band_width;
+    const Py_ssize_t offset = self->band_offset;
+    const double xdrop = self->xdrop;
+    const double gap_extend_A = self->target_extend_gap_score;
+    const double gap_extend_B = self->query_extend_gap_score;
+    const double left_gap_extend_A = self->target_left_extend_gap_score;
+    const double right_gap_extend_A = self->target_right_extend_gap_score;
+    const double left_gap_extend_B = self->query_left_extend_gap_score;
+    const double right_gap_extend_B = self->query_right_extend_gap_score;
+    Py_ssize_t lo;
+    Py_ssize_t hi;
+    double score;
     double temp;
-    int ok = 1;
-
-    /* Waterman-Smith-Beyer algorithm */
-    M = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!M) goto exit;
-    Ix = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!Ix) goto exit;
-    Iy = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!Iy) goto exit;
-    for (i = 0; i <= nA; i++) {
-        M[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!M[i]) goto exit;
-        Ix[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!Ix[i]) goto exit;
-        Iy[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!Iy[i]) goto exit;
-    }
+    double row_maximum;
+    double maximum = 0;
+    double* scores;
 
-    /* The top row of the score matrix is a special case,
-     *  as there are no previously aligned characters.
-     */
-    M[0][0] = 0;
-    Ix[0][0] = -DBL_MAX;
-    Iy[0][0] = -DBL_MAX;
-    for (i = 1; i <= nA; i++) {
-        ok = _call_query_gap_function(self, 0, i, &score);
-        if (!ok) goto exit;
-        M[i][0] = -DBL_MAX;
-        Ix[i][0] = score;
-        Iy[i][0] = -DBL_MAX;
-    }
-    for (j = 1; j <= nB; j++) {
-        ok = _call_target_gap_function(self, 0, j, &score);
-        if (!ok) goto exit;
-        M[0][j] = -DBL_MAX;
-        Ix[0][j] = -DBL_MAX;
-        Iy[0][j] = score;
-    }
+    scores = malloc((nB+1)*sizeof(double));
+    if (!scores) return MEMORY_ERROR;
+    for (j = 0; j <= nB; j++) scores[j] = -DBL_MAX;
+    BAND_LIMITS(0);
+    for (j = lo; j <= hi; j++)
+        scores[j] = (mode == Global) ? j * left_gap_extend_A : 0;
     for (i = 1; i <= nA; i++) {
+        BAND_LIMITS(i);
+        if (lo > hi) continue;
         kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j <= nB; j++) {
+        if (lo == 0) {
+            temp = scores[0];
+            if (mode == Local) scores[0] = 0;
+            else if (i == nA) scores[0] = nA * right_gap_extend_B;
+            else scores[0] = i * left_gap_extend_B;
+            j = 1;
+        }
+        else {
+            temp = scores[lo-1];
+            scores[lo-1] = -DBL_MAX;
+            j = lo;
+        }
+        for ( ; j <= hi; j++) {
             kB = CHARINDEX(sB[j-1]);
-            SELECT_SCORE_GLOBAL(M[i-1][j-1], Ix[i-1][j-1], Iy[i-1][j-1]);
-            M[i][j] = score + self->substitution_matrix[kA][kB];
-            score = -DBL_MAX;
-            for (k = 1; k <= i; k++) {
-                ok = _call_query_gap_function(self, j, k, &gapscore);
-                if (!ok) goto exit;
-                SELECT_SCORE_WATERMAN_SMITH_BEYER(M[i-k][j], Iy[i-k][j]);
+            if (mode == Global) {
+                SELECT_SCORE_GLOBAL(temp + self->substitution_matrix[kA][kB],
+                                    scores[j] + (j == nB ? right_gap_extend_B
+                                                         : gap_extend_B),
+                                    scores[j-1] + (i == nA ? right_gap_extend_A
+                                                           : gap_extend_A));
             }
-            Ix[i][j] = score;
-            score = -DBL_MAX;
-            for (k = 1; k <= j; k++) {
-                ok = _call_target_gap_function(self, i, k, &gapscore);
-                if (!ok) goto exit;
-                SELECT_SCORE_WATERMAN_SMITH_BEYER(M[i][j-k], Ix[i][j-k]);
+            else if (i < nA && j < nB) {
+                SELECT_SCORE_LOCAL3(temp + self->substitution_matrix[kA][kB],
+                                    scores[j] + gap_extend_B,
+                                    scores[j-1] + gap_extend_A);
             }
-            Iy[i][j] = score;
-        }
-    }
-    SELECT_SCORE_GLOBAL(M[nA][nB], Ix[nA][nB], Iy[nA][nB]);
-
-exit:
-    if (M) {
-        /* If M is NULL, then Ix is also NULL. */
-        if (Ix) {
-            /* If Ix is NULL, then Iy is also NULL. */
-            if (Iy) {
-                /* If Iy is NULL, then M[i], Ix[i], and Iy[i] are also NULL. */ 
-                for (i = 0; i <= nA; i++) {
-                    if (!M[i]) break;
-                    PyMem_Free(M[i]); 
-                    if (!Ix[i]) break;
-                    PyMem_Free(Ix[i]);
-                    if (!Iy[i]) break;
-                    PyMem_Free(Iy[i]);
-                }
-                PyMem_Free(Iy);
+            else {
+                SELECT_SCORE_LOCAL1(temp + self->substitution_matrix[kA][kB]);
             }
-            PyMem_Free(Ix);
+            temp = scores[j];
+            scores[j] = score;
+        }
+        if (xdrop >= 0) {
+            /* Stop if all scores in this row dropped too far */
+            row_maximum = 0;
+            for (j = lo; j <= hi; j++)
+                if (scores[j] > row_maximum) row_maximum = scores[j];
+            if (maximum - row_maximum > xdrop) break;
         }
-        PyMem_Free(M);
     }
-    if (!ok) return NULL;
-    return PyFloat_FromDouble(score);
+    if (mode == Global) maximum = scores[nB];
+    free(scores);
+    *result = maximum;
+    return 0;
 }
 
-static PyObject*
-Aligner_waterman_smith_beyer_global_align(Aligner* self,
-                                          const char* sA, Py_ssize_t nA,
-                                          const char* sB, Py_ssize_t nB)
+static int
+Aligner_banded_gotoh_score(Aligner* self, const char* sA, Py_ssize_t nA,
+                                          const char* sB, Py_ssize_t nB,
+                                          double* result)
 {
     char c;
     int i;
     int j;
-    int gap;
+    int kA;
+    int kB;
+    const Mode mode = self->mode;
+    const Py_ssize_t width = self->band_width;
+    const Py_ssize_t offset = self->band_offset;
+    const double xdrop = self->xdrop;
+    const double gap_open_A = self->target_open_gap_score;
+    const double gap_open_B = self->query_open_gap_score;
+    const double gap_extend_A = self->target_extend_gap_score;
+    const double gap_extend_B = self->query_extend_gap_score;
+    const double left_gap_open_A = self->target_left_open_gap_score;
+    const double left_gap_open_B = self->query_left_open_gap_score;
+    const double left_gap_extend_A = self->target_left_extend_gap_score;
+    const double left_gap_extend_B = self->query_left_extend_gap_score;
+    const double right_gap_open_A = self->target_right_open_gap_score;
+    const double right_gap_open_B = self->query_right_open_gap_score;
+    const double right_gap_extend_A = self->target_right_extend_gap_score;
+    const double right_gap_extend_B = self->query_right_extend_gap_score;
+    Py_ssize_t lo;
+    Py_ssize_t hi;
+    double* M_scores = NULL;
+    double* Ix_scores = NULL;
+    double* Iy_scores = NULL;
+    double score;
+    double temp;
+    double M_temp;
+    double Ix_temp;
+    double Iy_temp;
+    double row_maximum;
+    double maximum = 0;
+
+    M_scores = malloc((nB+1)*sizeof(double));
+    if (!M_scores) goto exit;
+    Ix_scores = malloc((nB+1)*sizeof(double));
+    if (!Ix_scores) goto exit;
+    Iy_scores = malloc((nB+1)*sizeof(double));
+    if (!Iy_scores) goto exit;
+
+    for (j = 0; j <= nB; j++) {
+        M_scores[j] = -DBL_MAX;
+        Ix_scores[j] = -DBL_MAX;
+        Iy_scores[j] = -DBL_MAX;
+    }
+    BAND_LIMITS(0);
+    for (j = lo; j <= hi; j++) {
+        if (j == 0) M_scores[0] = 0;
+        else if (mode == Global)
+            Iy_scores[j] = left_gap_open_A + left_gap_extend_A * (j-1);
+        else Iy_scores[j] = 0;
+    }
+    for (i = 1; i <= nA; i++) {
+        BAND_LIMITS(i);
+        if (lo > hi) continue;
+        kA = CHARINDEX(sA[i-1]);
+        if (lo == 0) {
+            M_temp = M_scores[0];
+            Ix_temp = Ix_scores[0];
+            Iy_temp = Iy_scores[0];
+            M_scores[0] = -DBL_MAX;
+            if (mode == Global)
+                Ix_scores[0] = left_gap_open_B + left_gap_extend_B * (i-1);
+            else Ix_scores[0] = 0;
+            Iy_scores[0] = -DBL_MAX;
+            j = 1;
+        }
+        else {
+            M_temp = M_scores[lo-1];
+            Ix_temp = Ix_scores[lo-1];
+            Iy_temp = Iy_scores[lo-1];
+            M_scores[lo-1] = -DBL_MAX;
+            Ix_scores[lo-1] = -DBL_MAX;
+            Iy_scores[lo-1] = -DBL_MAX;
+            j = lo;
+        }
+        for ( ; j <= hi; j++) {
+            kB = CHARINDEX(sB[j-1]);
+            if (mode == Global) {
+                SELECT_SCORE_GLOBAL(M_temp,
+                                    Ix_temp,
+                                    Iy_temp);
+                M_temp = M_scores[j];
+                M_scores[j] = score + self->substitution_matrix[kA][kB];
+                if (j == nB) {
+                    SELECT_SCORE_GLOBAL(M_temp + right_gap_open_B,
+                                        Ix_scores[j] + right_gap_extend_B,
+                                        Iy_scores[j] + right_gap_open_B);
+                }
+                else {
+                    SELECT_SCORE_GLOBAL(M_temp + gap_open_B,
+                                        Ix_scores[j] + gap_extend_B,
+                                        Iy_scores[j] + gap_open_B);
+                }
+                Ix_temp = Ix_scores[j];
+                Ix_scores[j] = score;
+                if (i == nA) {
+                    SELECT_SCORE_GLOBAL(M_scores[j-1] + right_gap_open_A,
+                                        Ix_scores[j-1] + right_gap_open_A,
+                                        Iy_scores[j-1] + right_gap_extend_A);
+                }
+                else {
+                    SELECT_SCORE_GLOBAL(M_scores[j-1] + gap_open_A,
+                                        Ix_scores[j-1] + gap_open_A,
+                                        Iy_scores[j-1] + gap_extend_A);
+                }
+                Iy_temp = Iy_scores[j];
+                Iy_scores[j] = score;
+            }
+            else {
+                SELECT_SCORE_GOTOH_LOCAL_ALIGN(M_temp,
+                                               Ix_temp,
+                                               Iy_temp,
+                                               self->substitution_matrix[kA][kB]);
+                M_temp = M_scores[j];
+                M_scores[j] = score;
+                Ix_temp = Ix_scores[j];
+                Iy_temp = Iy_scores[j];
+                if (i < nA && j < nB) {
+                    SELECT_SCORE_LOCAL3(M_temp + gap_open_B,
+                                        Ix_scores[j] + gap_extend_B,
+                                        Iy_scores[j] + gap_open_B);
+                    Ix_scores[j] = score;
+                    SELECT_SCORE_LOCAL3(M_scores[j-1] + gap_open_A,
+                                        Ix_scores[j-1] + gap_open_A,
+                                        Iy_scores[j-1] + gap_extend_A);
+                    Iy_scores[j] = score;
+                }
+                else {
+                    Ix_scores[j] = 0;
+                    Iy_scores[j] = 0;
+                }
+            }
+        }
+        if (xdrop >= 0) {
+            /* Stop if all scores in this row dropped too far */
+            row_maximum = 0;
+            for (j = lo; j <= hi; j++) {
+                if (M_scores[j] > row_maximum) row_maximum = M_scores[j];
+                if (Ix_scores[j] > row_maximum) row_maximum = Ix_scores[j];
+                if (Iy_scores[j] > row_maximum) row_maximum = Iy_scores[j];
+            }
+            if (maximum - row_maximum > xdrop) break;
+        }
+    }
+    if (mode == Global) {
+        SELECT_SCORE_GLOBAL(M_scores[nB], Ix_scores[nB], Iy_scores[nB]);
+        maximum = score;
+    }
+    free(M_scores);
+    free(Ix_scores);
+    free(Iy_scores);
+    *result = maximum;
+    return 0;
+
+exit:
+    if (M_scores) free(M_scores);
+    if (Ix_scores) free(Ix_scores);
+    if (Iy_scores) free(Iy_scores);
+    return MEMORY_ERROR;
+}
+
+static PyObject*
+Aligner_banded_needlemanwunsch_smithwaterman_align(Aligner* self,
+                                                   const char* sA,
+                                                   Py_ssize_t nA,
+                                                   const char* sB,
+                                                   Py_ssize_t nB)
+{
+    char c;
+    int i;
+    int j;
+    int im = 0;
+    int jm = 0;
+    int last = nA;
+    int kA;
+    int kB;
+    const Mode mode = self->mode;
+    const Py_ssize_t width = self->band_width;
+    const Py_ssize_t offset = self->band_offset;
+    const double xdrop = self->xdrop;
+    const double gap_extend_A = self->target_extend_gap_score;
+    const double gap_extend_B = self->query_extend_gap_score;
+    const double left_gap_extend_A = self->target_left_extend_gap_score;
+    const double left_gap_extend_B = self->query_left_extend_gap_score;
+    const double right_gap_extend_A = self->target_right_extend_gap_score;
+    const double right_gap_extend_B = self->query_right_extend_gap_score;
+    const double epsilon = self->epsilon;
+    Py_ssize_t lo;
+    Py_ssize_t hi;
+    Trace** M;
+    double score = 0;
+    double maximum = 0;
+    double row_maximum;
+    double temp;
+    int trace;
+    double* scores;
+    PathGenerator* paths;
+
+    paths = PathGenerator_create_NWSW(nA, nB, mode);
+    if (!paths) return NULL;
+    scores = PyMem_Malloc((nB+1)*sizeof(double));
+    if (!scores) {
+        Py_DECREF(paths);
+        return PyErr_NoMemory();
+    }
+    M = paths->M;
+    /* The dynamic programming does not use the Python API */
+    Py_BEGIN_ALLOW_THREADS
+    for (j = 0; j <= nB; j++) scores[j] = -DBL_MAX;
+    BAND_LIMITS(0);
+    CLEAR_OUTSIDE_BAND(M[0], Trace);
+    for (j = lo; j <= hi; j++)
+        scores[j] = (mode == Global) ? j * left_gap_extend_A : 0;
+    for (i = 1; i <= nA; i++) {
+        BAND_LIMITS(i);
+        CLEAR_OUTSIDE_BAND(M[i], Trace);
+        if (lo > hi) continue;
+        kA = CHARINDEX(sA[i-1]);
+        if (lo == 0) {
+            temp = scores[0];
+            scores[0] = (mode == Global) ? i * left_gap_extend_B : 0;
+            j = 1;
+        }
+        else {
+            temp = scores[lo-1];
+            scores[lo-1] = -DBL_MAX;
+            j = lo;
+        }
+        for ( ; j <= hi; j++) {
+            kB = CHARINDEX(sB[j-1]);
+            if (mode == Global) {
+                SELECT_TRACE_NEEDLEMAN_WUNSCH(
+                    (i == nA ? right_gap_extend_A : gap_extend_A),
+                    (j == nB ? right_gap_extend_B : gap_extend_B));
+                continue;
+            }
+            /* As SELECT_TRACE_SMITH_WATERMAN_HVD and _D, but the ENDPOINTs
+             * before the last maximum are removed afterwards. */
+            trace = DIAGONAL;
+            score = temp + self->substitution_matrix[kA][kB];
+            if (i < nA && j < nB) {
+                temp = scores[j-1] + gap_extend_A;
+                if (temp > score + epsilon) {
+                    score = temp;
+                    trace = HORIZONTAL;
+                }
+                else if (temp > score - epsilon) trace |= HORIZONTAL;
+                temp = scores[j] + gap_extend_B;
+                if (temp > score + epsilon) {
+                    score = temp;
+                    trace = VERTICAL;
+                }
+                else if (temp > score - epsilon) trace |= VERTICAL;
+            }
+            if (score < epsilon) {
+                score = 0;
+                if (i < nA && j < nB) trace = STARTPOINT;
+            }
+            else if (trace & DIAGONAL && score > maximum - epsilon) {
+                if (score > maximum + epsilon) {
+                    im = i;
+                    jm = j;
+                }
+                trace |= ENDPOINT;
+            }
+            M[i][j].trace = trace;
+            if (score > maximum) maximum = score;
+            temp = scores[j];
+            scores[j] = score;
+        }
+        if (xdrop >= 0 && i < nA) {
+            /* Stop if all scores in this row dropped too far */
+            row_maximum = 0;
+            for (j = lo; j <= hi; j++)
+                if (scores[j] > row_maximum) row_maximum = scores[j];
+            if (maximum - row_maximum > xdrop) {
+                last = i;
+                for (i = last + 1; i <= nA; i++)
+                    memset(M[i], 0, (nB+1)*sizeof(Trace));
+                break;
+            }
+        }
+    }
+
+    if (mode == Global) M[nA][nB].path = 0;
+    else {
+        /* Remove the ENDPOINTs found before the last maximum. */
+        for (i = 0; i <= im; i++) {
+            BAND_LIMITS(i);
+            for (j = lo; j <= hi && (i < im || j < jm); j++)
+                M[i][j].trace &= ~ENDPOINT;
+        }
+        /* Remove traces to unreachable points, as for the Smith-Waterman
+         * algorithm, but only inside the band. */
+        BAND_LIMITS(0);
+        for (j = lo; j <= hi; j++) M[0][j].path = 1;
+        for (i = 1; i <= last; i++) {
+            BAND_LIMITS(i);
+            if (lo > hi) continue;
+            if (lo == 0) {
+                M[i][0].path = 1;
+                lo = 1;
+            }
+            for (j = lo; j <= hi; j++) {
+                trace = M[i][j].trace;
+                if (!M[i-1][j-1].path) trace &= ~DIAGONAL;
+                if (!M[i][j-1].path) trace &= ~HORIZONTAL;
+                if (!M[i-1][j].path) trace &= ~VERTICAL;
+                if (trace & (STARTPOINT | HORIZONTAL | VERTICAL | DIAGONAL)) {
+                    if (trace & ENDPOINT) M[i][j].path = 0;
+                    else M[i][j].path = 1;
+                }
+                else {
+                    M[i][j].path = 0;
+                    trace = 0;
+                }
+                M[i][j].trace = trace;
+            }
+        }
+        if (maximum == 0) M[0][0].path = NONE;
+        else M[0][0].path = 0;
+        score = maximum;
+    }
+    Py_END_ALLOW_THREADS
+    PyMem_Free(scores);
+
+    return Py_BuildValue("fN", score, paths);
+}
+
+static PyObject*
+Aligner_banded_gotoh_align(Aligner* self, const char* sA, Py_ssize_t nA,
+                                          const char* sB, Py_ssize_t nB)
+{
+    char c;
+    int i;
+    int j;
+    int im = 0;
+    int jm = 0;
+    int last = nA;
+    int kA;
+    int kB;
+    const Mode mode = self->mode;
+    const Py_ssize_t width = self->band_width;
+    const Py_ssize_t offset = self->band_offset;
+    const double xdrop = self->xdrop;
+    const double gap_open_A = self->target_open_gap_score;
+    const double gap_open_B = self->query_open_gap_score;
+    const double gap_extend_A = self->target_extend_gap_score;
+    const double gap_extend_B = self->query_extend_gap_score;
+    const double left_gap_open_A = self->target_left_open_gap_score;
+    const double left_gap_open_B = self->query_left_open_gap_score;
+    const double left_gap_extend_A = self->target_left_extend_gap_score;
+    const double left_gap_extend_B = self->query_left_extend_gap_score;
+    const double right_gap_open_A = self->target_right_open_gap_score;
+    const double right_gap_open_B = self->query_right_open_gap_score;
+    const double right_gap_extend_A = self->target_right_extend_gap_score;
+    const double right_gap_extend_B = self->query_right_extend_gap_score;
+    const double epsilon = self->epsilon;
+    Py_ssize_t lo;
+    Py_ssize_t hi;
+    TraceGapsGotoh** gaps;
+    Trace** M;
+    double* M_scores = NULL;
+    double* Ix_scores = NULL;
+    double* Iy_scores = NULL;
+    double score = 0;
+    int trace;
+    double temp;
+    double M_temp;
+    double Ix_temp;
+    double Iy_temp;
+    double row_maximum;
+    double maximum = 0;
+    PathGenerator* paths;
+
+    paths = PathGenerator_create_Gotoh(nA, nB, mode);
+    if (!paths) return NULL;
+    M_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    if (!M_scores) goto exit;
+    Ix_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    if (!Ix_scores) goto exit;
+    Iy_scores = PyMem_Malloc((nB+1)*sizeof(double));
+    if (!Iy_scores) goto exit;
+    M = paths->M;
+    gaps = paths->gaps.gotoh;
+
+    /* The dynamic programming does not use the Python API */
+    Py_BEGIN_ALLOW_THREADS
+    for (j = 0; j <= nB; j++) {
+        M_scores[j] = -DBL_MAX;
+        Ix_scores[j] = -DBL_MAX;
+        Iy_scores[j] = -DBL_MAX;
+    }
+    BAND_LIMITS(0);
+    CLEAR_OUTSIDE_BAND(M[0], Trace);
+    CLEAR_OUTSIDE_BAND(gaps[0], TraceGapsGotoh);
+    for (j = lo; j <= hi; j++) {
+        if (j == 0) M_scores[0] = 0;
+        else if (mode == Global)
+            Iy_scores[j] = left_gap_open_A + left_gap_extend_A * (j-1);
+        else M_scores[j] = 0;
+    }
+    for (i = 1; i <= nA; i++) {
+        BAND_LIMITS(i);
+        CLEAR_OUTSIDE_BAND(M[i], Trace);
+        CLEAR_OUTSIDE_BAND(gaps[i], TraceGapsGotoh);
+        if (lo > hi) continue;
+        kA = CHARINDEX(sA[i-1]);
+        if (lo == 0) {
+            M_temp = M_scores[0];
+            Ix_temp = Ix_scores[0];
+            Iy_temp = Iy_scores[0];
+            if (mode == Global) {
+                M_scores[0] = -DBL_MAX;
+                Ix_scores[0] = left_gap_open_B + left_gap_extend_B * (i-1);
+            }
+            else {
+                M_scores[0] = 0;
+                Ix_scores[0] = -DBL_MAX;
+                if (i == nA) {
+                    M[nA][0].trace = 0;
+                    gaps[nA][0].Ix = 0;
+                    gaps[nA][0].Iy = 0;
+                }
+            }
+            Iy_scores[0] = -DBL_MAX;
+            j = 1;
+        }
+        else {
+            M_temp = M_scores[lo-1];
+            Ix_temp = Ix_scores[lo-1];
+            Iy_temp = Iy_scores[lo-1];
+            M_scores[lo-1] = -DBL_MAX;
+            Ix_scores[lo-1] = -DBL_MAX;
+            Iy_scores[lo-1] = -DBL_MAX;
+            j = lo;
+        }
+        for ( ; j <= hi; j++) {
+            kB = CHARINDEX(sB[j-1]);
+            if (mode == Global) {
+                SELECT_TRACE_GOTOH_GLOBAL_ALIGN;
+                M_temp = M_scores[j];
+                M_scores[j] = score + self->substitution_matrix[kA][kB];
+                if (j == nB) {
+                    SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix,
+                                                  M_temp + right_gap_open_B,
+                                                  Ix_scores[j] + right_gap_extend_B,
+                                                  Iy_scores[j] + right_gap_open_B);
+                }
+                else {
+                    SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix,
+                                                  M_temp + gap_open_B,
+                                                  Ix_scores[j] + gap_extend_B,
+                                                  Iy_scores[j] + gap_open_B);
+                }
+                Ix_temp = Ix_scores[j];
+                Ix_scores[j] = score;
+                if (i == nA) {
+                    SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy,
+                                                  M_scores[j-1] + right_gap_open_A,
+                                                  Ix_scores[j-1] + right_gap_open_A,
+                                                  Iy_scores[j-1] + right_gap_extend_A);
+                }
+                else {
+                    SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy,
+                                                  M_scores[j-1] + gap_open_A,
+                                                  Ix_scores[j-1] + gap_open_A,
+                                                  Iy_scores[j-1] + gap_extend_A);
+                }
+                Iy_temp = Iy_scores[j];
+                Iy_scores[j] = score;
+                continue;
+            }
+            /* As SELECT_TRACE_GOTOH_LOCAL_ALIGN, but the ENDPOINTs before
+             * the last maximum are removed afterwards. */
+            trace = M_MATRIX;
+            score = M_temp;
+            if (Ix_temp > score + epsilon) {
+                score = Ix_temp;
+                trace = Ix_MATRIX;
+            }
+            else if (Ix_temp > score - epsilon) trace |= Ix_MATRIX;
+            if (Iy_temp > score + epsilon) {
+                score = Iy_temp;
+                trace = Iy_MATRIX;
+            }
+            else if (Iy_temp > score - epsilon) trace |= Iy_MATRIX;
+            score += self->substitution_matrix[kA][kB];
+            if (score < epsilon) {
+                score = 0;
+                trace = STARTPOINT;
+            }
+            else if (score > maximum - epsilon) {
+                if (score > maximum + epsilon) {
+                    maximum = score;
+                    im = i;
+                    jm = j;
+                }
+                trace |= ENDPOINT;
+            }
+            M[i][j].trace = trace;
+            M_temp = M_scores[j];
+            M_scores[j] = score;
+            if (i < nA && j < nB) {
+                SELECT_TRACE_GOTOH_LOCAL_GAP(Ix,
+                                             M_temp + gap_open_B,
+                                             Ix_scores[j] + gap_extend_B,
+                                             Iy_scores[j] + gap_open_B);
+                Ix_temp = Ix_scores[j];
+                Ix_scores[j] = score;
+                SELECT_TRACE_GOTOH_LOCAL_GAP(Iy,
+                                             M_scores[j-1] + gap_open_A,
+                                             Ix_scores[j-1] + gap_open_A,
+                                             Iy_scores[j-1] + gap_extend_A);
+                Iy_temp = Iy_scores[j];
+                Iy_scores[j] = score;
+            }
+            else {
+                Ix_temp = Ix_scores[j];
+                Ix_scores[j] = 0;
+                gaps[i][j].Ix = 0;
+                Iy_temp = Iy_scores[j];
+                Iy_scores[j] = 0;
+                gaps[i][j].Iy = 0;
+            }
+        }
+        if (xdrop >= 0 && i < nA) {
+            /* Stop if all scores in this row dropped too far */
+            row_maximum = 0;
+            for (j = lo; j <= hi; j++) {
+                if (M_scores[j] > row_maximum) row_maximum = M_scores[j];
+                if (Ix_scores[j] > row_maximum) row_maximum = Ix_scores[j];
+                if (Iy_scores[j] > row_maximum) row_maximum = Iy_scores[j];
+            }
+            if (maximum - row_maximum > xdrop) {
+                last = i;
+                for (i = last + 1; i <= nA; i++) {
+                    memset(M[i], 0, (nB+1)*sizeof(Trace));
+                    memset(gaps[i], 0, (nB+1)*sizeof(TraceGapsGotoh));
+                }
+                break;
+            }
+        }
+    }
+
+    if (mode == Global) {
+        M[nA][nB].path = 0;
+        /* traceback */
+        SELECT_SCORE_GLOBAL(M_scores[nB], Ix_scores[nB], Iy_scores[nB]);
+        if (M_scores[nB] < score - epsilon) M[nA][nB].trace = 0;
+        if (Ix_scores[nB] < score - epsilon) gaps[nA][nB].Ix = 0;
+        if (Iy_scores[nB] < score - epsilon) gaps[nA][nB].Iy = 0;
+    }
+    else {
+        /* Remove the ENDPOINTs found before the last maximum. */
+        for (i = 0; i <= im; i++) {
+            BAND_LIMITS(i);
+            for (j = lo; j <= hi && (i < im || j < jm); j++)
+                M[i][j].trace &= ~ENDPOINT;
+        }
+        /* Remove traces to unreachable points, as for the Gotoh local
+         * alignment algorithm, but only inside the band. */
+        BAND_LIMITS(0);
+        for (j = lo; j <= hi; j++) M[0][j].path = M_MATRIX;
+        for (i = 1; i <= last; i++) {
+            BAND_LIMITS(i);
+            if (lo > hi) continue;
+            if (lo == 0) {
+                M[i][0].path = M_MATRIX;
+                lo = 1;
+            }
+            for (j = lo; j <= hi; j++) {
+                trace = M[i][j].trace;
+                if (!(M[i-1][j-1].path & M_MATRIX)) trace &= ~M_MATRIX;
+                if (!(M[i-1][j-1].path & Ix_MATRIX)) trace &= ~Ix_MATRIX;
+                if (!(M[i-1][j-1].path & Iy_MATRIX)) trace &= ~Iy_MATRIX;
+                if (trace & (STARTPOINT | M_MATRIX | Ix_MATRIX | Iy_MATRIX)) {
+                    if (trace & ENDPOINT) M[i][j].path = 0;
+                    else M[i][j].path |= M_MATRIX;
+                }
+                else {
+                    M[i][j].path &= ~M_MATRIX;
+                    trace = 0;
+                }
+                M[i][j].trace = trace;
+                trace = gaps[i][j].Ix;
+                if (!(M[i-1][j].path & M_MATRIX)) trace &= ~M_MATRIX;
+                if (!(M[i-1][j].path & Ix_MATRIX)) trace &= ~Ix_MATRIX;
+                if (!(M[i-1][j].path & Iy_MATRIX)) trace &= ~Iy_MATRIX;
+                if (trace & (M_MATRIX | Ix_MATRIX | Iy_MATRIX))
+                    M[i][j].path |= Ix_MATRIX;
+                else {
+                    M[i][j].path &= ~Ix_MATRIX;
+                    trace = 0;
+                }
+                gaps[i][j].Ix = trace;
+                trace = gaps[i][j].Iy;
+                if (!(M[i][j-1].path & M_MATRIX)) trace &= ~M_MATRIX;
+                if (!(M[i][j-1].path & Ix_MATRIX)) trace &= ~Ix_MATRIX;
+                if (!(M[i][j-1].path & Iy_MATRIX)) trace &= ~Iy_MATRIX;
+                if (trace & (M_MATRIX | Ix_MATRIX | Iy_MATRIX))
+                    M[i][j].path |= Iy_MATRIX;
+                else {
+                    M[i][j].path &= ~Iy_MATRIX;
+                    trace = 0;
+                }
+                gaps[i][j].Iy = trace;
+            }
+        }
+        if (maximum == 0) M[0][0].path = DONE;
+        else M[0][0].path = 0;
+        score = maximum;
+    }
+    Py_END_ALLOW_THREADS
+    PyMem_Free(M_scores);
+    PyMem_Free(Ix_scores);
+    PyMem_Free(Iy_scores);
+
+    return Py_BuildValue("fN", score, paths);
+exit:
+    Py_DECREF(paths);
+    if (M_scores) PyMem_Free(M_scores);
+    if (Ix_scores) PyMem_Free(Ix_scores);
+    if (Iy_scores) PyMem_Free(Iy_scores);
+    return PyErr_NoMemory();
+}
+
+static int
+_call_query_gap_function(Aligner* aligner, int i, int j, double* score)
+{
+    double value;
+    PyObject* result;
+    PyObject* function = aligner->query_gap_function;
+    if (!function)
+        value = aligner->query_open_gap_score
+              + (j-1) * aligner->query_extend_gap_score;
+    else {
+        result = PyObject_CallFunction(function, "ii", i, j);
+        if (result == NULL) return 0;
+        value = PyFloat_AsDouble(result);
+        Py_DECREF(result);
+        if (value == -1.0 && PyErr_Occurred()) return 0;
+    }
+    *score = value;
+    return 1;
+}
+
+static int
+_call_target_gap_function(Aligner* aligner, int i, int j, double* score)
+{
+    double value;
+    PyObject* result;
+    PyObject* function = aligner->target_gap_function;
+    if (!function)
+        value = aligner->target_open_gap_score
+              + (j-1) * aligner->target_extend_gap_score;
+    else {
+        result = PyObject_CallFunction(function, "ii", i, j);
+        if (result == NULL) return 0;
+        value = PyFloat_AsDouble(result);
+        Py_DECREF(result);
+        if (value == -1.0 && PyErr_Occurred()) return 0;
+    }
+    *score = value;
+    return 1;
+}
+
+static PyObject*
+Aligner_waterman_smith_beyer_global_score(Aligner* self,
+                                          const char* sA, Py_ssize_t nA,
+                                          const char* sB, Py_ssize_t nB)
+{
+    char c;
+    int i;
+    int j;
+    int k;
+    int kA;
+    int kB;
+    double** M = NULL;
+    double** Ix = NULL;
+    double** Iy = NULL;
+    double score = 0.0;
+    double gapscore;
+    double temp;
+    int ok = 1;
+
+    /* Waterman-Smith-Beyer algorithm */
+    M = PyMem_Malloc((nA+1)*sizeof(double*));
+    if (!M) goto exit;
+    Ix = PyMem_Malloc((nA+1)*sizeof(double*));
+    if (!Ix) goto exit;
+    Iy = PyMem_Malloc((nA+1)*sizeof(double*));
+    if (!Iy) goto exit;
+    for (i = 0; i <= nA; i++) {
+        M[i] = PyMem_Malloc((nB+1)*sizeof(double));
+        if (!M[i]) goto exit;
+        Ix[i] = PyMem_Malloc((nB+1)*sizeof(double));
+        if (!Ix[i]) goto exit;
+        Iy[i] = PyMem_Malloc((nB+1)*sizeof(double));
+        if (!Iy[i]) goto exit;
+    }
+
+    /* The top row of the score matrix is a special case,
+     *  as there are no previously aligned characters.
+     */
+    M[0][0] = 0;
+    Ix[0][0] = -DBL_MAX;
+    Iy[0][0] = -DBL_MAX;
+    for (i = 1; i <= nA; i++) {
+        ok = _call_query_gap_function(self, 0, i, &score);
+        if (!ok) goto exit;
+        M[i][0] = -DBL_MAX;
+        Ix[i][0] = score;
+        Iy[i][0] = -DBL_MAX;
+    }
+    for (j = 1; j <= nB; j++) {
+        ok = _call_target_gap_function(self, 0, j, &score);
+        if (!ok) goto exit;
+        M[0][j] = -DBL_MAX;
+        Ix[0][j] = -DBL_MAX;
+        Iy[0][j] = score;
+    }
+    for (i = 1; i <= nA; i++) {
+        kA = CHARINDEX(sA[i-1]);
+        for (j = 1; j <= nB; j++) {
+            kB = CHARINDEX(sB[j-1]);
+            SELECT_SCORE_GLOBAL(M[i-1][j-1], Ix[i-1][j-1], Iy[i-1][j-1]);
+            M[i][j] = score + self->substitution_matrix[kA][kB];
+            score = -DBL_MAX;
+            for (k = 1; k <= i; k++) {
+                ok = _call_query_gap_function(self, j, k, &gapscore);
+                if (!ok) goto exit;
+                SELECT_SCORE_WATERMAN_SMITH_BEYER(M[i-k][j], Iy[i-k][j]);
+            }
+            Ix[i][j] = score;
+            score = -DBL_MAX;
+            for (k = 1; k <= j; k++) {
+                ok = _call_target_gap_function(self, i, k, &gapscore);
+                if (!ok) goto exit;
+                SELECT_SCORE_WATERMAN_SMITH_BEYER(M[i][j-k], Ix[i][j-k]);
+            }
+            Iy[i][j] = score;
+        }
+    }
+    SELECT_SCORE_GLOBAL(M[nA][nB], Ix[nA][nB], Iy[nA][nB]);
+
+exit:
+    if (M) {
+        /* If M is NULL, then Ix is also NULL. */
+        if (Ix) {
+            /* If Ix is NULL, then Iy is also NULL. */
+            if (Iy) {
+                /* If Iy is NULL, then M[i], Ix[i], and Iy[i] are also NULL. */ 
+                for (i = 0; i <= nA; i++) {
+                    if (!M[i]) break;
+                    PyMem_Free(M[i]); 
+                    if (!Ix[i]) break;
+                    PyMem_Free(Ix[i]);
+                    if (!Iy[i]) break;
+                    PyMem_Free(Iy[i]);
+                }
+                PyMem_Free(Iy);
+            }
+            PyMem_Free(Ix);
+        }
+        PyMem_Free(M);
+    }
+    if (!ok) return NULL;
+    return PyFloat_FromDouble(score);
+}
+
+static PyObject*
+Aligner_waterman_smith_beyer_global_align(Aligner* self,
+                                          const char* sA, Py_ssize_t nA,
+                                          const char* sB, Py_ssize_t nB)
+{
+    char c;
+    int i;
+    int j;
+    int gap;
     int kA;
     int kB;
     const double epsilon = self->epsilon;
@@ -6095,50 +7000,251 @@ exit:
     return NULL;
 }
  
-static const char Aligner_score__doc__[] = "calculates the alignment score";
-
-static PyObject*
-Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
+static int
+_calculate_score(Aligner* self, Algorithm algorithm, Mode mode,
+                 const char* sA, Py_ssize_t nA,
+                 const char* sB, Py_ssize_t nB, double* score)
 {
-    const char* sA;
-    const char* sB;
-    Py_ssize_t nA;
-    Py_ssize_t nB;
-    const Mode mode = self->mode;
-    const Algorithm algorithm = _get_algorithm(self);
-
-    static char *kwlist[] = {"sequenceA", "sequenceB", NULL};
-    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s#s#", kwlist,
-                                    &sA, &nA, &sB, &nB))
-        return NULL;
-
+    /* Calculate the score using the Needleman-Wunsch, Smith-Waterman, or
+     * Gotoh algorithm. These do not use the Python API, so this function
+     * can be called without holding the GIL. */
+    if (BANDED(self)) {
+        switch (algorithm) {
+            case NeedlemanWunschSmithWaterman:
+                return Aligner_banded_needlemanwunsch_smithwaterman_score(
+                    self, sA, nA, sB, nB, score);
+            case Gotoh:
+                return Aligner_banded_gotoh_score(self, sA, nA, sB, nB, score);
+            default:
+                return -1;
+        }
+    }
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
                 case Global:
-                    return Aligner_needlemanwunsch_score(self, sA, nA, sB, nB);
+                    return Aligner_needlemanwunsch_score(self, sA, nA, sB, nB,
+                                                         score);
                 case Local:
-                    return Aligner_smithwaterman_score(self, sA, nA, sB, nB);
+                    return Aligner_smithwaterman_score(self, sA, nA, sB, nB,
+                                                       score);
             }
+            break;
         case Gotoh:
             switch (mode) {
                 case Global:
-                    return Aligner_gotoh_global_score(self, sA, nA, sB, nB);
+                    return Aligner_gotoh_global_score(self, sA, nA, sB, nB,
+                                                      score);
                 case Local:
-                    return Aligner_gotoh_local_score(self, sA, nA, sB, nB);
+                    return Aligner_gotoh_local_score(self, sA, nA, sB, nB,
+                                                     score);
             }
+            break;
+        default:
+            break;
+    }
+    return -1;
+}
+
+static PyObject*
+_calculate_score_object(Aligner* self, Algorithm algorithm, Mode mode,
+                        const char* sA, Py_ssize_t nA,
+                        const char* sB, Py_ssize_t nB)
+{
+    int status;
+    double score;
+
+    if (_check_band(self, algorithm, nA, nB) < 0) return NULL;
+    switch (algorithm) {
+        case NeedlemanWunschSmithWaterman:
+        case Gotoh:
+            Py_BEGIN_ALLOW_THREADS
+            status = _calculate_score(self, algorithm, mode, sA, nA, sB, nB,
+                                      &score);
+            Py_END_ALLOW_THREADS
+            if (status == MEMORY_ERROR) return PyErr_NoMemory();
+            return PyFloat_FromDouble(score);
         case WatermanSmithBeyer:
+            /* The gap score functions are Python callables */
             switch (mode) {
                 case Global:
                     return Aligner_waterman_smith_beyer_global_score(self, sA, nA, sB, nB);
                 case Local:
                     return Aligner_waterman_smith_beyer_local_score(self, sA, nA, sB, nB);
             }
+            break;
         case Unknown:
         default:
-            PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
-            return NULL;
+            break;
+    }
+    PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
+    return NULL;
+}
+
+static const char Aligner_score__doc__[] = "calculates the alignment score";
+
+static PyObject*
+Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    Py_buffer bA;
+    Py_buffer bB;
+    PyObject* result;
+
+    /* Accept strings, or any bytes-like object (e.g. bytes, bytearray,
+     * mmap, or memoryview) without copying the sequence. */
+    static char *kwlist[] = {"sequenceA", "sequenceB", NULL};
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s*s*", kwlist,
+                                    &bA, &bB))
+        return NULL;
+    result = _calculate_score_object(self, _get_algorithm(self), self->mode,
+                                     bA.buf, bA.len, bB.buf, bB.len);
+    PyBuffer_Release(&bA);
+    PyBuffer_Release(&bB);
+    return result;
+}
+
+static const char Aligner_score_many__doc__[] =
+"score_many(sequencesA, sequencesB, scores)\n"
+"\n"
+"Calculate the alignment scores of pairs of sequences.\n"
+"\n"
+"The sequences are taken pairwise from the two lists; if one list\n"
+"contains a single sequence, it is aligned to each sequence in the\n"
+"other list. The scores are stored in scores, a writable contiguous\n"
+"buffer of doubles (such as a NumPy array) with one element per pair.\n"
+"Except for the Waterman-Smith-Beyer algorithm, which calls the gap\n"
+"score functions, the scores are calculated without holding the GIL.";
+
+static PyObject*
+Aligner_score_many(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    PyObject* sequencesA;
+    PyObject* sequencesB;
+    PyObject* scores;
+    PyObject* listA = NULL;
+    PyObject* listB = NULL;
+    PyObject* item;
+    PyObject* result = NULL;
+    Py_buffer* buffers = NULL;
+    Py_buffer view;
+    Py_ssize_t nA;
+    Py_ssize_t nB;
+    Py_ssize_t n;
+    Py_ssize_t i;
+    Py_ssize_t k;
+    Py_ssize_t nbuffers = 0;
+    Py_buffer* bA;
+    Py_buffer* bB;
+    double* values;
+    double value;
+    int status = 0;
+    int has_view = 0;
+    const Mode mode = self->mode;
+    const Algorithm algorithm = _get_algorithm(self);
+
+    static char *kwlist[] = {"sequencesA", "sequencesB", "scores", NULL};
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "OOO", kwlist,
+                                    &sequencesA, &sequencesB, &scores))
+        return NULL;
+    if (algorithm == Unknown) {
+        PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
+        return NULL;
+    }
+    listA = PySequence_Fast(sequencesA, "sequencesA should be a sequence");
+    if (!listA) goto exit;
+    listB = PySequence_Fast(sequencesB, "sequencesB should be a sequence");
+    if (!listB) goto exit;
+    nA = PySequence_Fast_GET_SIZE(listA);
+    nB = PySequence_Fast_GET_SIZE(listB);
+    if (nA == 1) n = nB;
+    else if (nB == 1 || nA == nB) n = nA;
+    else {
+        PyErr_SetString(PyExc_ValueError,
+                        "sequencesA and sequencesB have different lengths");
+        goto exit;
+    }
+    if (PyObject_GetBuffer(scores, &view,
+                           PyBUF_WRITABLE | PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) < 0)
+        goto exit;
+    has_view = 1;
+    if (strcmp(view.format, "d") != 0 || view.len != n * (Py_ssize_t)sizeof(double)) {
+        PyErr_Format(PyExc_ValueError,
+                     "scores should be an array of %zd doubles", n);
+        goto exit;
+    }
+    values = view.buf;
+    if (nA == 0 || nB == 0) {
+        Py_INCREF(Py_None);
+        result = Py_None;
+        goto exit;
+    }
+
+    /* Accept strings, or any bytes-like object, as for score. */
+    buffers = PyMem_Malloc((nA+nB)*sizeof(Py_buffer));
+    if (!buffers) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    for (i = 0; i < nA; i++) {
+        item = PySequence_Fast_GET_ITEM(listA, i);
+        if (!PyArg_Parse(item, "s*", &buffers[nbuffers])) goto exit;
+        nbuffers++;
+    }
+    for (i = 0; i < nB; i++) {
+        item = PySequence_Fast_GET_ITEM(listB, i);
+        if (!PyArg_Parse(item, "s*", &buffers[nbuffers])) goto exit;
+        nbuffers++;
+    }
+
+    switch (algorithm) {
+        case NeedlemanWunschSmithWaterman:
+        case Gotoh:
+            for (k = 0; k < n; k++) {
+                bA = &buffers[nA == 1 ? 0 : k];
+                bB = &buffers[nA + (nB == 1 ? 0 : k)];
+                if (_check_band(self, algorithm, bA->len, bB->len) < 0)
+                    goto exit;
+            }
+            Py_BEGIN_ALLOW_THREADS
+            for (k = 0; k < n; k++) {
+                bA = &buffers[nA == 1 ? 0 : k];
+                bB = &buffers[nA + (nB == 1 ? 0 : k)];
+                status = _calculate_score(self, algorithm, mode,
+                                          bA->buf, bA->len, bB->buf, bB->len,
+                                          &values[k]);
+                if (status < 0) break;
+            }
+            Py_END_ALLOW_THREADS
+            if (status == MEMORY_ERROR) {
+                PyErr_NoMemory();
+                goto exit;
+            }
+            break;
+        default:
+            for (k = 0; k < n; k++) {
+                bA = &buffers[nA == 1 ? 0 : k];
+                bB = &buffers[nA + (nB == 1 ? 0 : k)];
+                item = _calculate_score_object(self, algorithm, mode,
+                                               bA->buf, bA->len,
+                                               bB->buf, bB->len);
+                if (!item) goto exit;
+                value = PyFloat_AsDouble(item);
+                Py_DECREF(item);
+                if (value == -1.0 && PyErr_Occurred()) goto exit;
+                values[k] = value;
+            }
+            break;
     }
+    Py_INCREF(Py_None);
+    result = Py_None;
+
+exit:
+    for (i = 0; i < nbuffers; i++) PyBuffer_Release(&buffers[i]);
+    if (buffers) PyMem_Free(buffers);
+    if (has_view) PyBuffer_Release(&view);
+    Py_XDECREF(listA);
+    Py_XDECREF(listB);
+    return result;
 }
 
 static const char Aligner_align__doc__[] = "align two sequences";
@@ -6150,41 +7256,80 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
     const char* sB;
     Py_ssize_t nA;
     Py_ssize_t nB;
+    Py_buffer bA;
+    Py_buffer bB;
+    PyObject* result = NULL;
     const Mode mode = self->mode;
     const Algorithm algorithm = _get_algorithm(self);
 
+    /* Accept strings, or any bytes-like object (e.g. bytes, bytearray,
+     * mmap, or memoryview) without copying the sequence. */
     static char *kwlist[] = {"sequenceA", "sequenceB", NULL};
-    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s#s#", kwlist,
-                                    &sA, &nA, &sB, &nB))
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s*s*", kwlist,
+                                    &bA, &bB))
         return NULL;
-
+    sA = bA.buf;
+    nA = bA.len;
+    sB = bB.buf;
+    nB = bB.len;
+
+    if (_check_band(self, algorithm, nA, nB) < 0) goto exit;
+    if (BANDED(self)) {
+        switch (algorithm) {
+            case NeedlemanWunschSmithWaterman:
+                result = Aligner_banded_needlemanwunsch_smithwaterman_align(
+                    self, sA, nA, sB, nB);
+                break;
+            case Gotoh:
+                result = Aligner_banded_gotoh_align(self, sA, nA, sB, nB);
+                break;
+            default:
+                PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
+                break;
+        }
+        goto exit;
+    }
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
                 case Global:
-                    return Aligner_needlemanwunsch_align(self, sA, nA, sB, nB);
+                    result = Aligner_needlemanwunsch_align(self, sA, nA, sB, nB);
+                    break;
                 case Local:
-                    return Aligner_smithwaterman_align(self, sA, nA, sB, nB);
+                    result = Aligner_smithwaterman_align(self, sA, nA, sB, nB);
+                    break;
             }
+            break;
         case Gotoh:
             switch (mode) {
                 case Global:
-                    return Aligner_gotoh_global_align(self, sA, nA, sB, nB);
+                    result = Aligner_gotoh_global_align(self, sA, nA, sB, nB);
+                    break;
                 case Local:
-                    return Aligner_gotoh_local_align(self, sA, nA, sB, nB);
+                    result = Aligner_gotoh_local_align(self, sA, nA, sB, nB);
+                    break;
             }
+            break;
         case WatermanSmithBeyer:
             switch (mode) {
                 case Global:
-                    return Aligner_waterman_smith_beyer_global_align(self, sA, nA, sB, nB);
+                    result = Aligner_waterman_smith_beyer_global_align(self, sA, nA, sB, nB);
+                    break;
                 case Local:
-                    return Aligner_waterman_smith_beyer_local_align(self, sA, nA, sB, nB);
+                    result = Aligner_waterman_smith_beyer_local_align(self, sA, nA, sB, nB);
+                    break;
             }
+            break;
         case Unknown:
         default:
             PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
-            return NULL;
+            break;
     }
+
+exit:
+    PyBuffer_Release(&bA);
+    PyBuffer_Release(&bB);
+    return result;
 }
 
 static char Aligner_doc[] =
@@ -6196,6 +7341,11 @@ static PyMethodDef Aligner_methods[] = {
      METH_VARARGS | METH_KEYWORDS,
      Aligner_score__doc__
     },
+    {"score_many",
+     (PyCFunction)Aligner_score_many,
+     METH_VARARGS | METH_KEYWORDS,
+     Aligner_score_many__doc__
+    },
     {"align",
      (PyCFunction)Aligner_align,
      METH_VARARGS | METH_KEYWORDS,
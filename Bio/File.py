@@ -22,7 +22,9 @@ import os
 import sys
 import contextlib
 import itertools
+import multiprocessing
 import platform
+from io import BytesIO
 
 from Bio._py3k import basestring
 
@@ -116,13 +118,15 @@ def as_handle(handleish, mode='r', **kwargs):
         yield handleish
 
 
-def _open_for_random_access(filename):
+def _open_for_random_access(filename, gzi=None):
     """Open a file in binary mode, spot if it is BGZF format etc (PRIVATE).
 
     This functionality is used by the Bio.SeqIO and Bio.SearchIO index
     and index_db functions.
 
     If the file is gzipped but not BGZF, a specific ValueError is raised.
+    The optional gzi argument is the filename of a .gzi block index to
+    use if the file is BGZF.
     """
     handle = open(filename, "rb")
     magic = handle.read(2)
@@ -133,7 +137,7 @@ def _open_for_random_access(filename):
         from . import bgzf
         try:
             # If it is BGZF, we support that
-            return bgzf.BgzfReader(mode="rb", fileobj=handle)
+            return bgzf.BgzfReader(mode="rb", fileobj=handle, gzi=gzi)
         except ValueError as e:
             assert "BGZF" in str(e)
             # Not a BGZF file after all,
@@ -264,6 +268,10 @@ class _IndexedSeqFileProxy(object):
     and optionally 'get_raw' methods.
     """
 
+    def close(self):
+        """Close the file handle (and anything else) used to read the data."""
+        self._handle.close()
+
     def __iter__(self):
         """Return (identifier, offset, length in bytes) tuples.
 
@@ -339,7 +347,7 @@ class _IndexedSeqFileDict(_dict_base):
             #       "%s at offset %i given length %r (%s format %s)" \
             #       % (key, offset, length, filename, format)
             if key in offsets:
-                self._proxy._handle.close()
+                self._proxy.close()
                 raise ValueError("Duplicate key '%s'" % key)
             else:
                 offsets[key] = offset
@@ -508,7 +516,187 @@ class _IndexedSeqFileDict(_dict_base):
         if you wish to delete the file, on Windows you must first close
         all open handles to that file.
         """
-        self._proxy._handle.close()
+        self._proxy.close()
+
+
+class _MmapIndexedSeqFileDict(_IndexedSeqFileDict):
+    """Read only dictionary interface to a memory mapped sequential record file.
+
+    This is a variant of _IndexedSeqFileDict for uncompressed files, where
+    the file is memory mapped (using the mmap module) rather than read via
+    a file handle. The random access proxy reads from the mapping (which
+    supports the seek, tell, read and readline methods of a file handle),
+    and the get_raw method returns a memoryview slice of the mapping so
+    no data is copied. On Python 2, where an mmap object cannot be used
+    with memoryview, get_raw returns a bytes string copied from the mapping.
+
+    Rather than a Python dictionary of keys to offsets, the offsets and
+    lengths are held in NumPy int64 arrays. The keys are held in a list
+    (in file order), with a sorted NumPy array of their hash values used
+    to look them up. This takes a small fraction of the memory needed for
+    a dictionary with millions of Python integer objects as values.
+
+    Note that on Python 3 any memoryview objects returned by get_raw must
+    be released before the mapping can be closed.
+    """
+
+    # Number of entries collected as Python integers before these are
+    # converted into NumPy arrays
+    _block_size = 65536
+
+    def __init__(self, random_access_proxy, key_function,
+                 repr, obj_repr):
+        """Initialize the class."""
+        try:
+            import numpy
+        except ImportError:
+            random_access_proxy.close()
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Install NumPy if you want to memory map an indexed file.")
+        import mmap
+        from . import bgzf
+        handle = random_access_proxy._handle
+        if isinstance(handle, bgzf.BgzfReader):
+            handle.close()
+            raise ValueError("Memory mapping requires an uncompressed file.")
+        self._handle = handle
+        if os.fstat(handle.fileno()).st_size:
+            self._mmap = mmap.mmap(handle.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        else:
+            # Can't map an empty file, but this offers the same interface
+            self._mmap = BytesIO(b"")
+        random_access_proxy._handle = self._mmap
+        self._proxy = random_access_proxy
+        self._key_function = key_function
+        self._repr = repr
+        self._obj_repr = obj_repr
+        if key_function:
+            offset_iter = (
+                (key_function(k), o, l) for (k, o, l) in random_access_proxy)
+        else:
+            offset_iter = random_access_proxy
+        keys = []
+        offsets = []
+        lengths = []
+        offset_blocks = []
+        length_blocks = []
+        for key, offset, length in offset_iter:
+            keys.append(key)
+            offsets.append(offset)
+            lengths.append(length)
+            if len(offsets) == self._block_size:
+                offset_blocks.append(numpy.array(offsets, numpy.int64))
+                length_blocks.append(numpy.array(lengths, numpy.int64))
+                offsets = []
+                lengths = []
+        offset_blocks.append(numpy.array(offsets, numpy.int64))
+        length_blocks.append(numpy.array(lengths, numpy.int64))
+        self._keys = keys
+        self._offsets = numpy.concatenate(offset_blocks)
+        self._lengths = numpy.concatenate(length_blocks)
+        hashes = numpy.fromiter((hash(k) for k in keys), numpy.int64,
+                                len(keys))
+        order = numpy.argsort(hashes, kind="mergesort")
+        self._hashes = hashes[order]
+        self._order = order
+        # Only keys with the same hash can be duplicates:
+        for i in numpy.flatnonzero(self._hashes[1:] == self._hashes[:-1]):
+            key = keys[order[i]]
+            j = i + 1
+            while j < len(keys) and self._hashes[j] == self._hashes[i]:
+                if keys[order[j]] == key:
+                    self.close()
+                    raise ValueError("Duplicate key '%s'" % key)
+                j += 1
+
+    def _lookup(self, key):
+        """Return the row number of the given key, or raise KeyError (PRIVATE)."""
+        hashes = self._hashes
+        try:
+            h = hash(key)
+        except TypeError:
+            raise KeyError(key)
+        i = int(hashes.searchsorted(h))
+        while i < len(hashes) and hashes[i] == h:
+            row = int(self._order[i])
+            if self._keys[row] == key:
+                return row
+            i += 1
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        """Return key if contained in the index."""
+        try:
+            self._lookup(key)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        """Return the number of records."""
+        return len(self._keys)
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(self._keys)
+
+    def __getitem__(self, key):
+        """Return record for the specified key."""
+        # Pass the offset to the proxy
+        record = self._proxy.get(int(self._offsets[self._lookup(key)]))
+        if self._key_function:
+            key2 = self._key_function(record.id)
+        else:
+            key2 = record.id
+        if key != key2:
+            raise ValueError("Key did not match (%s vs %s)" % (key, key2))
+        return record
+
+    def get_raw(self, key):
+        """Return the raw record from the file as a memoryview.
+
+        This is a read only view of the memory mapped file, so no data is
+        copied. Use bytes(...) on it if you need a bytes string. On Python 2
+        this returns a bytes string (a copy of the data) instead.
+
+        If the key is not found, a KeyError exception is raised.
+        """
+        row = self._lookup(key)
+        offset = int(self._offsets[row])
+        length = int(self._lengths[row])
+        if not length:
+            # Not all formats provide the length, e.g. SFF with a Roche index
+            length = len(self._proxy.get_raw(offset))
+        if sys.version_info[0] < 3:
+            # Python 2 mmap objects don't support the new buffer protocol
+            return self._mmap[offset:offset + length]
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def close(self):
+        """Close the memory mapping and file handle being used to read the data.
+
+        Once called, further use of the index won't work. Any memoryview
+        objects returned by get_raw must be released first.
+        """
+        # The proxy reads from the memory mapping, so this closes it
+        self._proxy.close()
+        self._handle.close()
+
+
+def _scan_file_offsets(task):
+    """Return a list of the (key, offset, length) tuples for a file (PRIVATE).
+
+    This is called in the worker processes when building an SQLite index
+    in parallel, and so must be a top level function which can be pickled.
+    """
+    proxy_factory, format, filename = task
+    random_access_proxy = proxy_factory(format, filename)
+    try:
+        return list(random_access_proxy)
+    finally:
+        random_access_proxy.close()
 
 
 class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
@@ -528,7 +716,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
 
     def __init__(self, index_filename, filenames,
                  proxy_factory, format,
-                 key_function, repr, max_open=10):
+                 key_function, repr, max_open=10, processes=1):
         """Initialize the class."""
         # TODO? - Don't keep filename list in memory (just in DB)?
         # Should save a chunk of memory if dealing with 1000s of files.
@@ -551,6 +739,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         self._proxy_factory = proxy_factory
         self._repr = repr
         self._max_open = max_open
+        self._processes = processes
         self._proxies = {}
 
         # Note if using SQLite :memory: trick index filename, this will
@@ -648,13 +837,9 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     def _build_index(self):
         """Call from __init__ to create a new index (PRIVATE)."""
         index_filename = self._index_filename
-        relative_path = self._relative_path
         filenames = self._filenames
         format = self._format
-        key_function = self._key_function
         proxy_factory = self._proxy_factory
-        max_open = self._max_open
-        random_access_proxies = self._proxies
 
         if not format or not filenames:
             raise ValueError("Filenames to index and format required to build %r" % index_filename)
@@ -664,9 +849,12 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         con = _sqlite.connect(index_filename)
         self._con = con
         # print("Creating index")
-        # Sqlite PRAGMA settings for speed
+        # Sqlite PRAGMA settings for speed. The whole build is one
+        # transaction (an unfinished index has a count of -1 anyway),
+        # so there is no need to write a rollback journal to disk.
         con.execute("PRAGMA synchronous=OFF")
         con.execute("PRAGMA locking_mode=EXCLUSIVE")
+        con.execute("PRAGMA journal_mode=MEMORY")
         # Don't index the key column until the end (faster)
         # con.execute("CREATE TABLE offset_data (key TEXT PRIMARY KEY, "
         #             "offset INTEGER);")
@@ -683,36 +871,106 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             "CREATE TABLE file_data (file_number INTEGER, name TEXT);")
         con.execute("CREATE TABLE offset_data (key TEXT, "
                     "file_number INTEGER, offset INTEGER, length INTEGER);")
+        self._filenames = []
+        count = self._add_files(filenames)
+        self._length = count
+        # print("About to index %i entries" % count)
+        try:
+            con.execute("CREATE UNIQUE INDEX IF NOT EXISTS "
+                        "key_index ON offset_data(key);")
+        except _IntegrityError as err:
+            self.close()
+            con.close()
+            raise ValueError("Duplicate key? %s" % err)
+        con.execute("PRAGMA locking_mode=NORMAL")
+        con.execute("UPDATE meta_data SET value = ? WHERE key = ?;",
+                    (count, "count"))
+        con.commit()
+        # print("Index created")
+
+    def _stored_filename(self, filename):
+        """Return filename as recorded in the index, relative if possible (PRIVATE)."""
+        relative_path = self._relative_path
+        # Default to storing as an absolute path,
+        f = os.path.abspath(filename)
+        if not os.path.isabs(filename) and not os.path.isabs(self._index_filename):
+            # Since user gave BOTH filename & index as relative paths,
+            # we will store this relative to the index file even though
+            # if it may now start ../ (meaning up a level)
+            # Note for cross platform use (e.g. shared drive over SAMBA),
+            # convert any Windows slash into Unix style for rel paths.
+            f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
+        elif (os.path.dirname(os.path.abspath(filename)) +
+              os.path.sep).startswith(relative_path + os.path.sep):
+            # Since sequence file is in same directory or sub directory,
+            # might as well make this into a relative path:
+            f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
+            assert not f.startswith("../"), f
+        # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
+        return f
+
+    def _scan_files(self, filenames):
+        """Iterate over the (key, offset, length) tuples of each file (PRIVATE).
+
+        With more than one process, the files are scanned in a pool of
+        worker processes (still returned in order), otherwise one by one
+        in this process keeping the first few file handles open for use.
+        """
+        format = self._format
+        processes = self._processes
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = min(processes, len(filenames))
+        if processes <= 1:
+            random_access_proxies = self._proxies
+            for i, filename in enumerate(filenames, len(self._filenames)):
+                random_access_proxy = self._proxy_factory(format, filename)
+                try:
+                    yield random_access_proxy
+                except GeneratorExit:
+                    # Stopped part way through this file, e.g. on an error
+                    random_access_proxy.close()
+                    raise
+                if len(random_access_proxies) < self._max_open:
+                    random_access_proxies[i] = random_access_proxy
+                else:
+                    random_access_proxy.close()
+            return
+        pool = multiprocessing.Pool(processes)
+        try:
+            tasks = [(self._proxy_factory, format, filename)
+                     for filename in filenames]
+            for offsets in pool.imap(_scan_file_offsets, tasks):
+                yield offsets
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _add_files(self, filenames):
+        """Insert the offsets for the given files into the database (PRIVATE).
+
+        This does not commit the transaction. Returns the number of records.
+        """
+        con = self._con
+        key_function = self._key_function
         count = 0
-        for i, filename in enumerate(filenames):
-            # Default to storing as an absolute path,
-            f = os.path.abspath(filename)
-            if not os.path.isabs(filename) and not os.path.isabs(index_filename):
-                # Since user gave BOTH filename & index as relative paths,
-                # we will store this relative to the index file even though
-                # if it may now start ../ (meaning up a level)
-                # Note for cross platform use (e.g. shared drive over SAMBA),
-                # convert any Windows slash into Unix style for rel paths.
-                f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
-            elif (os.path.dirname(os.path.abspath(filename)) +
-                  os.path.sep).startswith(relative_path + os.path.sep):
-                # Since sequence file is in same directory or sub directory,
-                # might as well make this into a relative path:
-                f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
-                assert not f.startswith("../"), f
-            # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
+        # The generator must come first, so that zip resumes it after the
+        # last file (letting it keep or close that file's handle)
+        for i, (offsets, filename) in enumerate(
+                zip(self._scan_files(filenames), filenames),
+                len(self._filenames)):
             con.execute(
                 "INSERT INTO file_data (file_number, name) VALUES (?,?);",
-                (i, f))
-            random_access_proxy = proxy_factory(format, filename)
+                (i, self._stored_filename(filename)))
             if key_function:
                 offset_iter = ((key_function(k), i, o, l)
-                               for (k, o, l) in random_access_proxy)
+                               for (k, o, l) in offsets)
             else:
                 offset_iter = ((k, i, o, l)
-                               for (k, o, l) in random_access_proxy)
+                               for (k, o, l) in offsets)
             while True:
-                batch = list(itertools.islice(offset_iter, 100))
+                batch = list(itertools.islice(offset_iter, 10000))
                 if not batch:
                     break
                 # print("Inserting batch of %i offsets, %s ... %s"
@@ -720,27 +978,49 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
                 con.executemany(
                     "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
                     batch)
-                con.commit()
                 count += len(batch)
-            if len(random_access_proxies) < max_open:
-                random_access_proxies[i] = random_access_proxy
-            else:
-                random_access_proxy._handle.close()
-        self._length = count
-        # print("About to index %i entries" % count)
+            self._filenames.append(filename)
+        return count
+
+    def add_files(self, filenames):
+        """Index more files, adding them to the existing index.
+
+        This lets you add new files to an index without re-indexing the
+        files already in it. The new records must not use any keys already
+        in the index, otherwise a ValueError is raised and the index is left
+        unchanged. If given more than one process when the index was opened,
+        the new files are scanned in parallel.
+        """
+        if isinstance(filenames, basestring):
+            filenames = [filenames]
+        filenames = list(filenames)
+        con = self._con
+        old_filenames = self._filenames[:]
         try:
-            con.execute("CREATE UNIQUE INDEX IF NOT EXISTS "
-                        "key_index ON offset_data(key);")
+            count = self._add_files(filenames)
+            con.execute("UPDATE meta_data SET value = ? WHERE key = ?;",
+                        (self._length + count, "count"))
+            con.commit()
         except _IntegrityError as err:
-            self._proxies = random_access_proxies
-            self.close()
-            con.close()
+            self._rollback(old_filenames)
             raise ValueError("Duplicate key? %s" % err)
-        con.execute("PRAGMA locking_mode=NORMAL")
-        con.execute("UPDATE meta_data SET value = ? WHERE key = ?;",
-                    (count, "count"))
-        con.commit()
-        # print("Index created")
+        except Exception:
+            self._rollback(old_filenames)
+            raise
+        self._length += count
+
+    def _rollback(self, old_filenames):
+        """Undo adding files to the index, after an error (PRIVATE).
+
+        This also closes any handles kept for the files which were added,
+        as their file numbers will be reused.
+        """
+        self._con.rollback()
+        self._filenames = old_filenames
+        proxies = self._proxies
+        for file_number in list(proxies):
+            if file_number >= len(old_filenames):
+                proxies.pop(file_number).close()
 
     def __repr__(self):
         return self._repr
@@ -787,7 +1067,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         else:
             if len(proxies) >= self._max_open:
                 # Close an old handle...
-                proxies.popitem()[1]._handle.close()
+                proxies.popitem()[1].close()
             # Open a new handle...
             proxy = self._proxy_factory(self._format, self._filenames[file_number])
             record = proxy.get(offset)
@@ -836,7 +1116,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             # This code is duplicated from __getitem__ to avoid a function call
             if len(proxies) >= self._max_open:
                 # Close an old handle...
-                proxies.popitem()[1]._handle.close()
+                proxies.popitem()[1].close()
             # Open a new handle...
             proxy = self._proxy_factory(self._format, self._filenames[file_number])
             proxies[file_number] = proxy
@@ -852,4 +1132,4 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         """Close any open file handles."""
         proxies = self._proxies
         while proxies:
-            proxies.popitem()[1]._handle.close()
+            proxies.popitem()[1].close()
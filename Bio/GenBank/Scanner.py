@@ -37,6 +37,64 @@ from Bio.Alphabet import generic_protein
 from Bio import BiopythonParserWarning
 
 
+class Projection(object):
+    """Which parts of a GenBank or EMBL record should be parsed.
+
+    Arguments:
+     - header - optional collection of header fields to parse, given by
+       their GenBank keyword (e.g. "DEFINITION", or "SOURCE" which includes
+       the ORGANISM lines, or "REFERENCE" which includes the AUTHORS, TITLE
+       and JOURNAL lines) or their EMBL line code (e.g. "DE", or "OS" which
+       includes the OC and OG lines, or "RN" which includes the other
+       reference lines). Default None means all the header is parsed.
+     - features - optional collection of feature types to parse (e.g.
+       ["CDS"]). Default None means all features are parsed.
+     - qualifiers - optional collection of qualifier keys to keep on the
+       parsed features (e.g. ["locus_tag", "product"]). Default None means
+       all qualifiers are kept.
+     - sequence - boolean, should the sequence be parsed (default True)?
+       If not, the record will have an UnknownSeq of the expected length.
+
+    The LOCUS/ID line and the accession and version lines are always parsed,
+    so that the record identifiers are as usual. Anything not requested is
+    skipped by the scanner without building any objects, which can make
+    parsing many times faster:
+
+    >>> from Bio import SeqIO
+    >>> from Bio.GenBank.Scanner import Projection
+    >>> projection = Projection(header=[], features=["CDS"],
+    ...                         qualifiers=["locus_tag"], sequence=False)
+    >>> record = next(SeqIO.parse("GenBank/NC_005816.gb", "gb",
+    ...                           projection=projection))
+    >>> print("%s %i %i" % (record.id, len(record), len(record.features)))
+    NC_005816.1 9609 10
+    >>> print(record.features[0].qualifiers)
+    OrderedDict([('locus_tag', ['YP_pPCP01'])])
+
+    """
+
+    def __init__(self, header=None, features=None, qualifiers=None,
+                 sequence=True):
+        """Initialize the projection."""
+        self.header = None if header is None else frozenset(header)
+        self.features = None if features is None else frozenset(features)
+        self.qualifiers = None if qualifiers is None else frozenset(qualifiers)
+        self.sequence = bool(sequence)
+
+    def __repr__(self):
+        """Represent the projection as a string for debugging."""
+        def _sorted(values):
+            return None if values is None else sorted(values)
+
+        return "%s(header=%r, features=%r, qualifiers=%r, sequence=%r)" % (
+            self.__class__.__name__, _sorted(self.header),
+            _sorted(self.features), _sorted(self.qualifiers), self.sequence)
+
+
+# Default, everything is parsed
+_ALL = Projection()
+
+
 class InsdcScanner(object):
     """Basic functions for breaking up a GenBank/EMBL file into sub sections.
 
@@ -56,6 +114,8 @@ class InsdcScanner(object):
     FEATURE_QUALIFIER_INDENT = 0
     FEATURE_QUALIFIER_SPACER = ""
     SEQUENCE_HEADERS = ["XXX"]  # with right hand side spaces removed
+    HEADER_IDENTIFIERS = ()  # header lines always parsed with a projection
+    HEADER_GROUPS = {}  # header lines belonging to another line's group
 
     def __init__(self, debug=0):
         """Initialize."""
@@ -139,7 +199,8 @@ class InsdcScanner(object):
         self.line = line
         return header_lines
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_keys=None,
+                       qualifier_keys=None):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -147,6 +208,10 @@ class InsdcScanner(object):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If feature_keys is given, only features of those types are returned
+        and the rest are skipped. If qualifier_keys is given, only those
+        qualifiers are returned (see the parse_feature method).
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -189,6 +254,13 @@ class InsdcScanner(object):
                 line = self.handle.readline()
                 while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER:
                     line = self.handle.readline()
+            elif feature_keys is not None \
+                    and line[2:].split(None, 1)[0] not in feature_keys:
+                # Not wanted, skip this feature (including any blank lines)
+                line = self.handle.readline()
+                while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
+                        or (line != '' and line.rstrip() == ""):
+                    line = self.handle.readline()
             else:
                 # Build up a list of the lines making up this feature:
                 if line[self.FEATURE_QUALIFIER_INDENT] != " " \
@@ -210,11 +282,12 @@ class InsdcScanner(object):
                     # white space (e.g. out of spec files with too much indentation)
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
-                features.append(self.parse_feature(feature_key, feature_lines))
+                features.append(self.parse_feature(feature_key, feature_lines,
+                                                   qualifier_keys))
         self.line = line
         return features
 
-    def parse_feature(self, feature_key, lines):
+    def parse_feature(self, feature_key, lines, qualifier_keys=None):
         r"""Parse a feature given as a list of strings into a tuple.
 
         Expects a feature as a list of strings, returns a tuple (key, location,
@@ -269,6 +342,9 @@ class InsdcScanner(object):
         transl_table) then the quotes are NOT removed.
 
         Note that no whitespace is removed.
+
+        If qualifier_keys is given, any other qualifiers are skipped and
+        are not included in the list.
         """
         # Skip any blank lines
         iterator = (x for x in lines if x)
@@ -290,6 +366,7 @@ class InsdcScanner(object):
                     feature_location += line.strip()
 
             qualifiers = []
+            skipping = False
 
             for line_number, line in enumerate(iterator):
                 # check for extra wrapping of the location closing parentheses
@@ -300,6 +377,20 @@ class InsdcScanner(object):
                     i = line.find("=")
                     key = line[1:i]  # does not work if i==-1
                     value = line[i + 1:]  # we ignore 'value' if i==-1
+                    if qualifier_keys is not None:
+                        skipping = (line[1:] if i == -1 else key) not in qualifier_keys
+                        if skipping:
+                            value = value.lstrip()
+                            if value[:1] == '"' and value != '"':
+                                # Skip the rest of this quoted value
+                                try:
+                                    while value[-1] != '"':
+                                        value = next(iterator)
+                                except StopIteration:
+                                    # Unterminated quoted value
+                                    raise ValueError("Problem with '%s' feature:\n%s"
+                                                     % (feature_key, "\n".join(lines)))
+                            continue
                     if i and value.startswith(' ') and value.lstrip().startswith('"'):
                         warnings.warn("White space after equals in qualifier", BiopythonParserWarning)
                         value = value.lstrip()
@@ -328,6 +419,9 @@ class InsdcScanner(object):
                         # Unquoted
                         # if debug : print("Unquoted line %s:%s" % (key,value))
                         qualifiers.append((key, value))
+                elif skipping:
+                    # Unquoted continuation of a skipped qualifier
+                    continue
                 else:
                     # Unquoted continuation
                     assert len(qualifiers) > 0
@@ -342,7 +436,7 @@ class InsdcScanner(object):
             raise ValueError("Problem with '%s' feature:\n%s"
                              % (feature_key, "\n".join(lines)))
 
-    def parse_footer(self):
+    def parse_footer(self, skip=False):
         """Return a tuple containing a list of any misc strings, and the sequence."""
         # This is a basic bit of code to scan and discard the sequence,
         # which was useful when developing the sub classes.
@@ -365,6 +459,23 @@ class InsdcScanner(object):
         self.line = line
         return [], ""  # Dummy values!
 
+    def _project_header_lines(self, lines, header):
+        """Return the header lines for the requested fields only (PRIVATE).
+
+        Lines indented with spaces belong to the preceding field, so for
+        example the GenBank ORGANISM lines are kept with the SOURCE line.
+        """
+        keep = header.union(self.HEADER_IDENTIFIERS)
+        wanted = []
+        line_type = None
+        for line in lines:
+            if line[:1] != " ":
+                line_type = line[:self.HEADER_WIDTH].strip()
+                line_type = self.HEADER_GROUPS.get(line_type, line_type)
+            if line_type in keep:
+                wanted.append(line)
+        return wanted
+
     def _feed_first_line(self, consumer, line):
         """Handle the LOCUS/ID line, passing data to the comsumer (PRIVATE).
 
@@ -408,7 +519,7 @@ class InsdcScanner(object):
         """
         pass
 
-    def feed(self, handle, consumer, do_features=True):
+    def feed(self, handle, consumer, do_features=True, projection=None):
         """Feed a set of data into the consumer.
 
         This method is intended for use with the "old" code in Bio.GenBank
@@ -418,6 +529,8 @@ class InsdcScanner(object):
          - consumer - The consumer that should be informed of events.
          - do_features - Boolean, should the features be parsed?
            Skipping the features can be much faster.
+         - projection - Optional Projection object, saying which parts of
+           the record should be parsed (the rest is skipped).
 
         Return values:
          - true  - Passed a record
@@ -436,18 +549,31 @@ class InsdcScanner(object):
         # The first line, header lines and any misc lines after the features will be
         # dealt with by GenBank / EMBL specific derived classes.
 
+        if projection is None:
+            projection = _ALL
+
         # First line and header:
         self._feed_first_line(consumer, self.line)
-        self._feed_header_lines(consumer, self.parse_header())
+        header_lines = self.parse_header()
+        if projection.header is not None:
+            header_lines = self._project_header_lines(header_lines,
+                                                      projection.header)
+        self._feed_header_lines(consumer, header_lines)
 
         # Features (common to both EMBL and GenBank):
-        if do_features:
-            self._feed_feature_table(consumer, self.parse_features(skip=False))
-        else:
+        if not do_features or projection.features == frozenset():
             self.parse_features(skip=True)  # ignore the data
+            if projection is not _ALL:
+                # Still need to tell the consumer the header is finished
+                self._feed_feature_table(consumer, [])
+        else:
+            self._feed_feature_table(consumer, self.parse_features(
+                skip=False, feature_keys=projection.features,
+                qualifier_keys=projection.qualifiers))
 
         # Footer and sequence
-        misc_lines, sequence_string = self.parse_footer()
+        misc_lines, sequence_string = self.parse_footer(
+            skip=not projection.sequence)
         self._feed_misc_lines(consumer, misc_lines)
 
         consumer.sequence(sequence_string)
@@ -459,9 +585,12 @@ class InsdcScanner(object):
         # And we are done
         return True
 
-    def parse(self, handle, do_features=True):
+    def parse(self, handle, do_features=True, projection=None):
         """Return a SeqRecord (with SeqFeatures if do_features=True).
 
+        The optional projection argument restricts which parts of the
+        record are parsed, see the Projection class.
+
         See also the method parse_records() for use on multi-record files.
         """
         from Bio.GenBank import _FeatureConsumer
@@ -470,23 +599,27 @@ class InsdcScanner(object):
         consumer = _FeatureConsumer(use_fuzziness=1,
                                     feature_cleaner=FeatureValueCleaner())
 
-        if self.feed(handle, consumer, do_features):
+        if self.feed(handle, consumer, do_features, projection):
             return consumer.data
         else:
             return None
 
-    def parse_records(self, handle, do_features=True):
+    def parse_records(self, handle, do_features=True, projection=None):
         """Parse records, return a SeqRecord object iterator.
 
         Each record (from the ID/LOCUS line to the // line) becomes a SeqRecord
 
-        The SeqRecord objects include SeqFeatures if do_features=True
+        The SeqRecord objects include SeqFeatures if do_features=True, and
+        only the parts of the record requested by the optional projection
+        argument (a Projection object, or a dictionary of its arguments).
 
         This method is intended for use in Bio.SeqIO
         """
         # This is a generator function
+        if isinstance(projection, dict):
+            projection = Projection(**projection)
         while True:
-            record = self.parse(handle, do_features)
+            record = self.parse(handle, do_features, projection)
             if record is None:
                 break
             if record.id is None:
@@ -590,12 +723,20 @@ class EmblScanner(InsdcScanner):
     FEATURE_QUALIFIER_INDENT = 21
     FEATURE_QUALIFIER_SPACER = "FT" + " " * (FEATURE_QUALIFIER_INDENT - 2)
     SEQUENCE_HEADERS = ["SQ", "CO"]  # Remove trailing spaces
+    HEADER_IDENTIFIERS = ("AC", "SV")
+    HEADER_GROUPS = {"RC": "RN", "RP": "RN", "RX": "RN", "RG": "RN",
+                     "RA": "RN", "RT": "RN", "RL": "RN",
+                     "OC": "OS", "OG": "OS"}
 
     EMBL_INDENT = HEADER_WIDTH
     EMBL_SPACER = " " * EMBL_INDENT
 
-    def parse_footer(self):
-        """Return a tuple containing a list of any misc strings, and the sequence."""
+    def parse_footer(self, skip=False):
+        """Return a tuple containing a list of any misc strings, and the sequence.
+
+        If skip=True, the sequence lines are read but not checked, and an
+        empty sequence string is returned.
+        """
         if self.line[:self.HEADER_WIDTH].rstrip() not in self.SEQUENCE_HEADERS:
             raise ValueError("Footer format unexpected: '%s'" % self.line)
 
@@ -615,6 +756,9 @@ class EmblScanner(InsdcScanner):
 
         seq_lines = []
         line = self.line
+        if skip:
+            while line and line.strip() != "//":
+                line = self.handle.readline()
         while True:
             if not line:
                 raise ValueError("Premature end of file in sequence data")
@@ -1015,7 +1159,8 @@ class _ImgtScanner(EmblScanner):
         consumer.data_file_division(fields[4])
         self._feed_seq_length(consumer, fields[5])
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_keys=None,
+                       qualifier_keys=None):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -1023,6 +1168,10 @@ class _ImgtScanner(EmblScanner):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If feature_keys is given, only features of those types are returned
+        and the rest are skipped. If qualifier_keys is given, only those
+        qualifiers are returned (see the parse_feature method).
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -1062,6 +1211,13 @@ class _ImgtScanner(EmblScanner):
                 line = self.handle.readline()
                 while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER:
                     line = self.handle.readline()
+            elif feature_keys is not None \
+                    and line[2:].split(None, 1)[0] not in feature_keys:
+                # Not wanted, skip this feature (including any blank lines)
+                line = self.handle.readline()
+                while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
+                        or (line != '' and line.rstrip() == ""):
+                    line = self.handle.readline()
             else:
                 assert line[:2] == "FT"
                 try:
@@ -1107,6 +1263,7 @@ class GenBankScanner(InsdcScanner):
     FEATURE_QUALIFIER_INDENT = 21
     FEATURE_QUALIFIER_SPACER = " " * FEATURE_QUALIFIER_INDENT
     SEQUENCE_HEADERS = ["CONTIG", "ORIGIN", "BASE COUNT", "WGS"]  # trailing spaces removed
+    HEADER_IDENTIFIERS = ("ACCESSION", "VERSION")
 
     GENBANK_INDENT = HEADER_WIDTH
     GENBANK_SPACER = " " * GENBANK_INDENT
@@ -1115,8 +1272,12 @@ class GenBankScanner(InsdcScanner):
     STRUCTURED_COMMENT_END = "-END##"
     STRUCTURED_COMMENT_DELIM = " :: "
 
-    def parse_footer(self):
-        """Return a tuple containing a list of any misc strings, and the sequence."""
+    def parse_footer(self, skip=False):
+        """Return a tuple containing a list of any misc strings, and the sequence.
+
+        If skip=True, the sequence lines are read but not checked, and an
+        empty sequence string is returned.
+        """
         if self.line[:self.HEADER_WIDTH].rstrip() not in self.SEQUENCE_HEADERS:
             raise ValueError("Footer format unexpected:  '%s'" % self.line)
 
@@ -1137,6 +1298,9 @@ class GenBankScanner(InsdcScanner):
         # or a CONTIG line
         seq_lines = []
         line = self.line
+        if skip:
+            while line and line.rstrip() != "//" and not line.startswith("CONTIG"):
+                line = self.handle.readline()
         while True:
             if not line:
                 warnings.warn("Premature end of file in sequence data",
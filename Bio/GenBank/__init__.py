@@ -46,6 +46,7 @@ import sys  # for checking if Python 2
 
 # other Biopython stuff
 from Bio import SeqFeature
+from Bio._py3k import intern
 
 # other Bio.GenBank stuff
 from .utils import FeatureValueCleaner
@@ -62,6 +63,10 @@ FEATURE_QUALIFIER_INDENT = 21
 FEATURE_KEY_SPACER = " " * FEATURE_KEY_INDENT
 FEATURE_QUALIFIER_SPACER = " " * FEATURE_QUALIFIER_INDENT
 
+# Qualifier values up to this length are interned, so that repeated values
+# (like the gene and locus_tag of a gene and its CDS) share a single string
+_INTERN_LENGTH = 40
+
 # Regular expressions for location parsing
 _solo_location = r"[<>]?\d+"
 _pair_location = r"[<>]?\d+\.\.[<>]?\d+"
@@ -151,6 +156,17 @@ assert _solo_bond.search("bond(196)")
 assert _solo_bond.search("join(bond(284),bond(305),bond(309),bond(305))")
 
 
+def _intern(text):
+    """Return the interned string, or the text unchanged if not a str (PRIVATE).
+
+    Only native strings can be interned. On Python 2, parsing a handle opened
+    in text mode with io.open gives unicode strings, which are kept as they are.
+    """
+    if isinstance(text, str):
+        return intern(text)
+    return text
+
+
 def _pos(pos_str, offset=0):
     """Build a Position object (PRIVATE).
 
@@ -1010,7 +1026,7 @@ class _FeatureConsumer(_BaseGenBankConsumer):
     def feature_key(self, content):
         # start a new feature
         self._cur_feature = SeqFeature.SeqFeature()
-        self._cur_feature.type = content
+        self._cur_feature.type = _intern(content)
         self.data.features.append(self._cur_feature)
 
     def location(self, content):
@@ -1188,6 +1204,7 @@ class _FeatureConsumer(_BaseGenBankConsumer):
 
         Can receive None, since you can have valueless keys such as /pseudo
         """
+        key = _intern(key)
         # Hack to try to preserve historical behaviour of /pseudo etc
         if value is None:
             # if the key doesn't exist yet, add an empty string
@@ -1213,6 +1230,9 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         if self._feature_cleaner is not None:
             value = self._feature_cleaner.clean_value(key, value)
 
+        if len(value) <= _INTERN_LENGTH:
+            value = _intern(value)
+
         # if the qualifier name exists, append the value
         if key in self._cur_feature.qualifiers:
             self._cur_feature.qualifiers[key].append(value)
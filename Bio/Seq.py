@@ -23,11 +23,17 @@ from __future__ import print_function
 
 import string  # for maketrans only
 import array
+import binascii
+import re
 import sys
 import warnings
+import weakref
 
 from Bio._py3k import range
 from Bio._py3k import basestring
+from Bio._py3k import _bytes_to_string
+
+from bisect import bisect_right
 
 from Bio import BiopythonWarning
 from Bio import Alphabet
@@ -67,6 +73,82 @@ _dna_complement_table = _maketrans(ambiguous_dna_complement)
 _rna_complement_table = _maketrans(ambiguous_rna_complement)
 
 
+def _maketrans_bytes(complement_mapping):
+    """Make a bytes translation table for a (reverse) complement (PRIVATE).
+
+    As the _maketrans function, but for use with the translate method of
+    bytes and bytearray objects.
+    """
+    before = ''.join(complement_mapping.keys())
+    after = ''.join(complement_mapping.values())
+    before += before.lower()
+    after += after.lower()
+    if sys.version_info[0] == 3:
+        return bytes.maketrans(before.encode("ascii"), after.encode("ascii"))
+    else:
+        return string.maketrans(before, after)
+
+
+_dna_complement_bytes = _maketrans_bytes(ambiguous_dna_complement)
+_rna_complement_bytes = _maketrans_bytes(ambiguous_rna_complement)
+
+
+# Two bit packing of DNA for the PackedSeq object. As in the UCSC .2bit
+# format, four bases are packed per byte with the first in the most
+# significant bits, using T=0, C=1, A=2 and G=3 (so the complement of a
+# base is given by flipping the high bit of its code).
+_packed_letters = "TCAG"
+_packed_to_letters = ["".join(_packed_letters[(byte >> shift) & 3]
+                              for shift in (6, 4, 2, 0))
+                      for byte in range(256)]
+_packed_complement = bytes(bytearray(byte ^ 0xAA for byte in range(256)))
+_packed_reverse_complement = bytes(bytearray(
+    (((byte & 3) << 6) | ((byte & 12) << 2) |
+     ((byte & 48) >> 2) | ((byte & 192) >> 6)) ^ 0xAA
+    for byte in range(256)))
+# Maps A, C, G and T to their codes as base four digits (others to zero)
+_packed_digits = bytes(bytearray(
+    ord(str(max(0, _packed_letters.find(chr(byte))))) for byte in range(256)))
+_packed_exception_runs = re.compile(r"([^ACGT])\1*")
+_packed_lower_runs = re.compile(r"[a-z]+")
+# Number of bases decoded at a time by PackedSeq methods like find,
+# a multiple of both three (for translation) and four (for packing)
+_PACKED_CHUNK = 3 * 4 * 65536
+
+
+def _pack_dna(data):
+    """Pack a DNA string as two bits per base (PRIVATE).
+
+    Returns a tuple of the packed bytes, the runs of letters other than
+    A, C, G and T, and the runs of lower case letters. The exception runs
+    are a tuple of three lists (start positions, end positions, and the
+    upper case letter of each run), and the soft-masked runs a tuple of two
+    lists (start and end positions). The exception letters are packed as T.
+    """
+    upper = data.upper()
+    starts = []
+    ends = []
+    letters = []
+    for match in _packed_exception_runs.finditer(upper):
+        starts.append(match.start())
+        ends.append(match.end())
+        letters.append(match.group(1))
+    mask_starts = []
+    mask_ends = []
+    for match in _packed_lower_runs.finditer(data):
+        mask_starts.append(match.start())
+        mask_ends.append(match.end())
+    digits = upper.encode("ascii").translate(_packed_digits)
+    digits += b"0" * (-len(digits) % 4)
+    if digits:
+        # Converting to and from power of two bases takes linear time
+        packed = binascii.unhexlify("%0*x" % (len(digits) // 2,
+                                              int(digits, 4)))
+    else:
+        packed = b""
+    return packed, (starts, ends, letters), (mask_starts, mask_ends)
+
+
 class Seq(object):
     """Read-only sequence object (essentially a string with an alphabet).
 
@@ -1189,8 +1271,8 @@ class Seq(object):
                     "Gap {0!r} does not match {1!r} from alphabet".format(
                         gap, self.alphabet.gap_char))
 
-        protein = _translate_str(str(self), codon_table, stop_symbol, to_stop,
-                                 cds, gap=gap)
+        protein = self._translate_data(codon_table, stop_symbol, to_stop,
+                                       cds, gap)
 
         if gap and gap in protein:
             alphabet = Alphabet.Gapped(codon_table.protein_alphabet, gap)
@@ -1202,6 +1284,15 @@ class Seq(object):
 
         return Seq(protein, alphabet)
 
+    def _translate_data(self, codon_table, stop_symbol, to_stop, cds, gap):
+        """Translate the sequence, returning a string (PRIVATE).
+
+        Used by the translate method once the arguments have been checked,
+        subclasses may override this to avoid making a full string copy.
+        """
+        return _translate_str(str(self), codon_table, stop_symbol, to_stop,
+                              cds, gap=gap)
+
     def ungap(self, gap=None):
         """Return a copy of the sequence without the gap character(s).
 
@@ -1290,6 +1381,514 @@ class Seq(object):
         return Seq(str(self).replace(gap, ""), alpha)
 
 
+class BytesSeq(Seq):
+    """Read-only sequence object backed by bytes, bytearray or mmap data.
+
+    This behaves like a Seq object, but holds the sequence as a memoryview
+    of the given bytes-like object (one byte per letter) rather than as a
+    string. Slicing without a step gives another BytesSeq which is a view
+    of the same memory, so no letters are copied:
+
+    >>> from Bio.Seq import BytesSeq
+    >>> from Bio.Alphabet import generic_dna
+    >>> my_seq = BytesSeq(b"CCCCCGATAGNR", generic_dna)
+    >>> my_seq
+    BytesSeq('CCCCCGATAGNR', DNAAlphabet())
+    >>> my_seq[2:8]
+    BytesSeq('CCCGAT', DNAAlphabet())
+    >>> print(my_seq[5])
+    G
+
+    The complement and reverse complement are done using byte translation
+    tables, and give new BytesSeq objects:
+
+    >>> my_seq.reverse_complement()
+    BytesSeq('YNCTATCGGGGG', DNAAlphabet())
+    >>> bytes(my_seq.complement()) == b"GGGGGCTATCNY"
+    True
+
+    Any other string based operation (e.g. str(my_seq), translate, or find)
+    works as for a Seq object, using a copy of the sequence as a string.
+    This copy is not kept (which would double the memory used), so is made
+    again by each such call. If you need many of these on a long sequence,
+    convert it once using Seq(str(my_seq)).
+
+    As with memory mapping a file, the sequence is not copied when using an
+    mmap object, which is useful for very long sequences like chromosomes.
+    Note the underlying data should not be changed while the BytesSeq
+    exists, and (for a bytearray or mmap) cannot be resized or closed.
+    On Python 2, objects like mmap or array.array which only offer the old
+    buffer interface cannot be used (only bytes, bytearray or memoryview).
+    """
+
+    def __init__(self, data, alphabet=Alphabet.generic_alphabet):
+        """Create a BytesSeq object.
+
+        Arguments:
+         - data - Sequence, required (a bytes-like object such as bytes,
+           bytearray, mmap or memoryview, or a string)
+         - alphabet - Optional argument, an Alphabet object from
+           Bio.Alphabet
+
+        """
+        if isinstance(data, (Seq, MutableSeq)):
+            raise TypeError("The sequence data given to a BytesSeq object "
+                            "should be bytes or a string (not another Seq "
+                            "object etc)")
+        if isinstance(data, basestring) and not isinstance(data, bytes):
+            # Unicode string, e.g. from the Seq addition methods
+            data = data.encode("ascii")
+        try:
+            view = memoryview(data)
+        except TypeError:
+            if sys.version_info[0] < 3:
+                raise TypeError("The sequence data given to a BytesSeq "
+                                "object should be bytes, bytearray or "
+                                "memoryview on Python 2, not %s"
+                                % type(data).__name__)
+            raise
+        if view.ndim != 1 or view.itemsize != 1:
+            raise ValueError("The sequence data given to a BytesSeq object "
+                             "should use one byte per letter")
+        if view.format != "B" and sys.version_info[0] >= 3:
+            # Python 2 memoryview has no cast, but gives bytes anyway
+            view = view.cast("B")
+        self._buffer = view
+        self.alphabet = alphabet  # Seq API requirement
+
+    @property
+    def _data(self):
+        """Full sequence as a string (a copy, made every time)."""
+        return _bytes_to_string(self._buffer.tobytes())
+
+    def __bytes__(self):
+        """Return the full sequence as a bytes object (a copy)."""
+        return self._buffer.tobytes()
+
+    def __buffer__(self, flags):
+        """Export the sequence data for the buffer protocol (Python 3.12+).
+
+        This allows memoryview(my_seq) without copying the sequence.
+        """
+        return self._buffer
+
+    def __reduce__(self):
+        """Support pickling (and copying) via a bytes copy of the sequence."""
+        return (self.__class__, (self._buffer.tobytes(), self.alphabet))
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if len(self) <= 60:
+            return Seq.__repr__(self)
+        # As in the Seq object, but only decode the letters shown
+        if self.alphabet is Alphabet.generic_alphabet:
+            a = ""
+        else:
+            a = ", %r" % self.alphabet
+        return "{0}('{1}...{2}'{3!s})".format(self.__class__.__name__,
+                                              str(self[:54]),
+                                              str(self[-3:]),
+                                              a)
+
+    def __len__(self):
+        """Return the length of the sequence, use len(my_seq)."""
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        """Return a subsequence or single letter, use my_seq[index].
+
+        Slices without a step are views sharing the same memory, slices
+        with a step are copied.
+        """
+        if isinstance(index, int):
+            letter = self._buffer[index]
+            if isinstance(letter, int):
+                # Python 3 memoryview gives the byte as an integer
+                letter = chr(letter)
+            return letter
+        if index.step is None or index.step == 1:
+            return self.__class__(self._buffer[index], self.alphabet)
+        try:
+            data = self._buffer[index].tobytes()
+        except NotImplementedError:
+            # Python 2 memoryview does not support steps
+            data = self._buffer.tobytes()[index]
+        return self.__class__(data, self.alphabet)
+
+    def upper(self):
+        """Return an upper case copy of the sequence as a BytesSeq object."""
+        return self.__class__(self._buffer.tobytes().upper(),
+                              self.alphabet._upper())
+
+    def lower(self):
+        """Return a lower case copy of the sequence as a BytesSeq object."""
+        return self.__class__(self._buffer.tobytes().lower(),
+                              self.alphabet._lower())
+
+    def _complement_table(self, data):
+        """Return the bytes translation table for the complement (PRIVATE)."""
+        base = Alphabet._get_base_alphabet(self.alphabet)
+        if isinstance(base, Alphabet.ProteinAlphabet):
+            raise ValueError("Proteins do not have complements!")
+        if isinstance(base, Alphabet.DNAAlphabet):
+            return _dna_complement_bytes
+        elif isinstance(base, Alphabet.RNAAlphabet):
+            return _rna_complement_bytes
+        elif (b"U" in data or b"u" in data) \
+                and (b"T" in data or b"t" in data):
+            raise ValueError("Mixed RNA/DNA found")
+        elif b"U" in data or b"u" in data:
+            return _rna_complement_bytes
+        else:
+            return _dna_complement_bytes
+
+    def complement(self):
+        """Return the complement sequence as a new BytesSeq object.
+
+        See the Seq object's complement method for details.
+        """
+        data = self._buffer.tobytes()
+        return self.__class__(data.translate(self._complement_table(data)),
+                              self.alphabet)
+
+    def reverse_complement(self):
+        """Return the reverse complement sequence as a new BytesSeq object.
+
+        See the Seq object's reverse_complement method for details.
+        """
+        data = bytearray(self._buffer)
+        table = self._complement_table(data)
+        data.reverse()
+        return self.__class__(data.translate(table), self.alphabet)
+
+
+class PackedSeq(Seq):
+    """Read-only DNA sequence object stored using two bits per base.
+
+    This behaves like a Seq object, but packs the unambiguous bases A, C,
+    G and T four per byte, using about a quarter of the memory of a string.
+    Runs of any other letters (such as N or IUPAC ambiguity codes) and of
+    lower case (soft-masked) letters are recorded separately, so are best
+    suited to sequences like genome assemblies where these are sparse:
+
+    >>> from Bio.Seq import PackedSeq
+    >>> from Bio.Alphabet import generic_dna
+    >>> my_seq = PackedSeq("CCCCCGATAGNNNNacgtR", generic_dna)
+    >>> my_seq
+    PackedSeq('CCCCCGATAGNNNNacgtR', DNAAlphabet())
+    >>> print(my_seq[5])
+    G
+
+    Slicing without a step gives another PackedSeq sharing the same packed
+    data, and the complement and reverse complement are calculated on the
+    packed bytes directly:
+
+    >>> my_seq[8:16]
+    PackedSeq('AGNNNNac', DNAAlphabet())
+    >>> my_seq.reverse_complement()
+    PackedSeq('YacgtNNNNCTATCGGGGG', DNAAlphabet())
+
+    Searching and translation decode the sequence a chunk at a time, so
+    do not need a full copy of a long sequence as a string:
+
+    >>> my_seq.find("NNa")
+    12
+    >>> my_seq.count("C")
+    5
+    >>> my_seq[:9].translate()
+    Seq('PPI', ExtendedIUPACProtein())
+
+    Any other operation (e.g. str(my_seq), or adding sequences) works as for
+    a Seq object, using a copy of the sequence as a string. RNA and protein
+    alphabets are not supported.
+    """
+
+    def __init__(self, data, alphabet=Alphabet.generic_dna):
+        """Create a PackedSeq object.
+
+        Arguments:
+         - data - Sequence, required (a string of ASCII letters)
+         - alphabet - Optional argument, a DNA or generic Alphabet object
+           from Bio.Alphabet (default generic DNA)
+
+        """
+        if isinstance(data, (Seq, MutableSeq)):
+            raise TypeError("The sequence data given to a PackedSeq object "
+                            "should be a string (not another Seq object etc)")
+        base = Alphabet._get_base_alphabet(alphabet)
+        if isinstance(base, (Alphabet.ProteinAlphabet, Alphabet.RNAAlphabet)):
+            raise ValueError("PackedSeq objects only support DNA, not %r"
+                             % alphabet)
+        if isinstance(data, bytes):
+            data = _bytes_to_string(data)
+        packed, blocks, mask = _pack_dna(data)
+        self._set_packed(packed, 0, len(data), blocks, mask, alphabet)
+
+    def _set_packed(self, packed, offset, length, blocks, mask, alphabet):
+        """Set the packed data and runs, shared with any other views (PRIVATE).
+
+        The sequence is the length bases starting offset bases into the
+        packed bytes, and the exception and soft-masked runs use positions
+        in the packed bytes (not the sequence) as described in _pack_dna.
+        """
+        self._packed = packed
+        self._offset = offset
+        self._length = length
+        self._blocks = blocks
+        self._mask = mask
+        self.alphabet = alphabet  # Seq API requirement
+
+    def _view(self, start, end, blocks=None, mask=None, alphabet=None):
+        """Return a PackedSeq for [start:end] sharing the packed data (PRIVATE)."""
+        seq = self.__class__.__new__(self.__class__)
+        seq._set_packed(self._packed, self._offset + start, end - start,
+                        self._blocks if blocks is None else blocks,
+                        self._mask if mask is None else mask,
+                        self.alphabet if alphabet is None else alphabet)
+        return seq
+
+    def _runs(self, runs, start, end, shift):
+        """Return the runs overlapping [start:end], clipped and shifted (PRIVATE).
+
+        The start and end are positions in the packed data.
+        """
+        starts, ends = runs[:2]
+        i = bisect_right(ends, start)
+        j = i
+        while j < len(starts) and starts[j] < end:
+            j += 1
+        clipped = ([max(start, s) + shift for s in starts[i:j]],
+                   [min(end, e) + shift for e in ends[i:j]])
+        return clipped + tuple(extra[i:j] for extra in runs[2:])
+
+    def _decode(self, start, end):
+        """Return the sequence [start:end] as a string (PRIVATE).
+
+        Only the packed bytes, exception runs, and soft-masked runs which
+        overlap this region are used. Assumes 0 <= start <= end <= len(self).
+        """
+        start += self._offset
+        end += self._offset
+        packed = bytearray(self._packed[start // 4:(end + 3) // 4])
+        text = "".join(map(_packed_to_letters.__getitem__, packed))
+        text = text[start % 4:start % 4 + end - start]
+        starts, ends, letters = self._runs(self._blocks, start, end, -start)
+        if starts:
+            pieces = []
+            pos = 0
+            for s, e, letter in zip(starts, ends, letters):
+                pieces.append(text[pos:s])
+                pieces.append(letter * (e - s))
+                pos = e
+            pieces.append(text[pos:])
+            text = "".join(pieces)
+        starts, ends = self._runs(self._mask, start, end, -start)
+        if starts:
+            pieces = []
+            pos = 0
+            for s, e in zip(starts, ends):
+                pieces.append(text[pos:s])
+                pieces.append(text[s:e].lower())
+                pos = e
+            pieces.append(text[pos:])
+            text = "".join(pieces)
+        return text
+
+    def _chunks(self, start, end, overlap=0):
+        """Decode [start:end] in chunks, yielding (position, string) (PRIVATE).
+
+        Each chunk extends up to overlap letters into the next one, so that
+        any match of a string of length overlap + 1 is found in one chunk.
+        """
+        for pos in range(start, end, _PACKED_CHUNK):
+            yield pos, self._decode(pos, min(end, pos + _PACKED_CHUNK +
+                                             overlap))
+
+    @property
+    def _data(self):
+        """Full sequence as a string (a copy, made every time)."""
+        return self._decode(0, self._length)
+
+    def __reduce__(self):
+        """Support pickling (and copying) via a string copy of the sequence."""
+        return (self.__class__, (self._data, self.alphabet))
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if len(self) <= 60:
+            return Seq.__repr__(self)
+        # As in the Seq object, but only decode the letters shown
+        if self.alphabet is Alphabet.generic_alphabet:
+            a = ""
+        else:
+            a = ", %r" % self.alphabet
+        return "{0}('{1}...{2}'{3!s})".format(self.__class__.__name__,
+                                              self._decode(0, 54),
+                                              self._decode(len(self) - 3,
+                                                           len(self)),
+                                              a)
+
+    def __len__(self):
+        """Return the length of the sequence, use len(my_seq)."""
+        return self._length
+
+    def __getitem__(self, index):
+        """Return a subsequence or single letter, use my_seq[index].
+
+        Slices without a step are views sharing the same packed data, slices
+        with a step are decoded and packed again.
+        """
+        if isinstance(index, int):
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("PackedSeq index out of range")
+            return self._decode(index, index + 1)
+        start, end, step = index.indices(self._length)
+        if step == 1:
+            return self._view(start, max(start, end))
+        return self.__class__(self._data[index], self.alphabet)
+
+    def __contains__(self, char):
+        """Implement the 'in' keyword, like a python string."""
+        return self.find(char) != -1
+
+    def count(self, sub, start=0, end=sys.maxsize):
+        """Return a non-overlapping count, like that of a python string.
+
+        See the Seq object's count method for details.
+        """
+        sub_str = self._get_seq_str_and_check_alphabet(sub)
+        if not sub_str:
+            return Seq.count(self, sub_str, start, end)
+        start, end = slice(start, end).indices(self._length)[:2]
+        if len(sub_str) == 1:
+            return sum(text.count(sub_str)
+                       for pos, text in self._chunks(start, end))
+        count = 0
+        while True:
+            start = self.find(sub_str, start, end)
+            if start == -1:
+                return count
+            count += 1
+            start += len(sub_str)
+
+    def find(self, sub, start=0, end=sys.maxsize):
+        """Find method, like that of a python string.
+
+        See the Seq object's find method for details.
+        """
+        sub_str = self._get_seq_str_and_check_alphabet(sub)
+        if not sub_str:
+            return Seq.find(self, sub_str, start, end)
+        start, end = slice(start, end).indices(self._length)[:2]
+        for pos, text in self._chunks(start, end, len(sub_str) - 1):
+            index = text.find(sub_str)
+            if index != -1:
+                return pos + index
+        return -1
+
+    def rfind(self, sub, start=0, end=sys.maxsize):
+        """Find from right method, like that of a python string.
+
+        See the Seq object's rfind method for details.
+        """
+        sub_str = self._get_seq_str_and_check_alphabet(sub)
+        if not sub_str:
+            return Seq.rfind(self, sub_str, start, end)
+        start, end = slice(start, end).indices(self._length)[:2]
+        pos = end
+        while pos > start:
+            chunk_end = min(end, pos + len(sub_str) - 1)
+            pos = max(start, pos - _PACKED_CHUNK)
+            index = self._decode(pos, chunk_end).rfind(sub_str)
+            if index != -1:
+                return pos + index
+        return -1
+
+    def upper(self):
+        """Return an upper case copy of the sequence as a PackedSeq object."""
+        return self._view(0, self._length, mask=([], []),
+                          alphabet=self.alphabet._upper())
+
+    def lower(self):
+        """Return a lower case copy of the sequence as a PackedSeq object."""
+        start = self._offset
+        end = self._offset + self._length
+        return self._view(0, self._length, mask=([start], [end]),
+                          alphabet=self.alphabet._lower())
+
+    def _packed_region(self):
+        """Return the packed bytes covering the sequence, and its offset (PRIVATE)."""
+        start = self._offset
+        end = self._offset + self._length
+        return bytes(self._packed[start // 4:(end + 3) // 4]), start % 4
+
+    def complement(self):
+        """Return the complement sequence as a new PackedSeq object.
+
+        See the Seq object's complement method for details.
+        """
+        if self._length == 0:
+            return self._view(0, 0)
+        data, offset = self._packed_region()
+        shift = offset - self._offset
+        start = self._offset
+        end = self._offset + self._length
+        starts, ends, letters = self._runs(self._blocks, start, end, shift)
+        letters = [letter.translate(_dna_complement_table)
+                   for letter in letters]
+        seq = self.__class__.__new__(self.__class__)
+        seq._set_packed(data.translate(_packed_complement), offset,
+                        self._length, (starts, ends, letters),
+                        self._runs(self._mask, start, end, shift),
+                        self.alphabet)
+        return seq
+
+    def reverse_complement(self):
+        """Return the reverse complement sequence as a new PackedSeq object.
+
+        See the Seq object's reverse_complement method for details.
+        """
+        if self._length == 0:
+            return self._view(0, 0)
+        data, offset = self._packed_region()
+        data = bytearray(data)
+        data.reverse()
+        # Position p in the old packed data is position 4 * len(data) - p
+        # in the reversed data (using positions between the bases)
+        offset = 4 * len(data) - offset - self._length
+        flip = 4 * len(data) + self._offset - self._offset % 4
+        start = self._offset
+        end = self._offset + self._length
+        starts, ends, letters = self._runs(self._blocks, start, end, 0)
+        blocks = ([flip - e for e in reversed(ends)],
+                  [flip - s for s in reversed(starts)],
+                  [letter.translate(_dna_complement_table)
+                   for letter in reversed(letters)])
+        starts, ends = self._runs(self._mask, start, end, 0)
+        mask = ([flip - e for e in reversed(ends)],
+                [flip - s for s in reversed(starts)])
+        seq = self.__class__.__new__(self.__class__)
+        seq._set_packed(bytes(data.translate(_packed_reverse_complement)),
+                        offset, self._length, blocks, mask, self.alphabet)
+        return seq
+
+    def _translate_data(self, codon_table, stop_symbol, to_stop, cds, gap):
+        """Translate the sequence a chunk at a time, returning a string (PRIVATE)."""
+        if cds or self._length <= _PACKED_CHUNK:
+            return Seq._translate_data(self, codon_table, stop_symbol,
+                                       to_stop, cds, gap)
+        pieces = []
+        for pos, text in self._chunks(0, self._length):
+            protein = _translate_str(text, codon_table, stop_symbol, to_stop,
+                                     gap=gap)
+            pieces.append(protein)
+            if to_stop and len(protein) < len(text) // 3:
+                break
+        return "".join(pieces)
+
+
 class UnknownSeq(Seq):
     """Read-only sequence object of known length but unknown contents.
 
@@ -2572,17 +3171,21 @@ def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
        ...
     Bio.Data.CodonTable.TranslationError: Extra in frame stop codon found.
     """
-    sequence = sequence.upper()
-    amino_acids = []
+    return _translate_strs([sequence], table, stop_symbol, to_stop, cds,
+                           pos_stop, gap)[0]
+
+
+def _translate_strs(sequences, table, stop_symbol="*", to_stop=False,
+                    cds=False, pos_stop="X", gap=None):
+    """Translate a list of nucleotide strings into protein strings (PRIVATE).
+
+    Takes the same arguments as the _translate_str function, but with a
+    list of strings which are translated together. Returns a list of
+    strings. If NumPy is available and there are enough codons, all the
+    codons are translated in one go using a precompiled lookup table.
+    """
     forward_table = table.forward_table
     stop_codons = table.stop_codons
-    if table.nucleotide_alphabet.letters is not None:
-        valid_letters = set(table.nucleotide_alphabet.letters.upper())
-    else:
-        # Assume the worst case, ambiguous DNA or RNA:
-        valid_letters = set(_ambiguous_dna_letters.upper() +
-                            _ambiguous_rna_letters.upper())
-    n = len(sequence)
 
     # Check for tables with 'ambiguous' (dual-coding) stop codons:
     dual_coding = [c for c in stop_codons if c in forward_table]
@@ -2600,25 +3203,29 @@ def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
                       .format(len(dual_coding), c, forward_table[c]),
                       BiopythonWarning)
 
-    if cds:
-        if str(sequence[:3]).upper() not in table.start_codons:
-            raise CodonTable.TranslationError(
-                "First codon '{0}' is not a start codon".format(sequence[:3]))
-        if n % 3 != 0:
-            raise CodonTable.TranslationError(
-                "Sequence length {0} is not a multiple of three".format(n))
-        if str(sequence[-3:]).upper() not in stop_codons:
-            raise CodonTable.TranslationError(
-                "Final codon '{0}' is not a stop codon".format(sequence[-3:]))
-        # Don't translate the stop symbol, and manually translate the M
-        sequence = sequence[3:-3]
-        n -= 6
-        amino_acids = ["M"]
-    elif n % 3 != 0:
-        warnings.warn("Partial codon, len(sequence) not a multiple of three. "
-                      "Explicitly trim the sequence or add trailing N before "
-                      "translation. This may become an error in future.",
-                      BiopythonWarning)
+    trimmed = []
+    for sequence in sequences:
+        sequence = sequence.upper()
+        n = len(sequence)
+        if cds:
+            if str(sequence[:3]).upper() not in table.start_codons:
+                raise CodonTable.TranslationError(
+                    "First codon '{0}' is not a start codon".format(sequence[:3]))
+            if n % 3 != 0:
+                raise CodonTable.TranslationError(
+                    "Sequence length {0} is not a multiple of three".format(n))
+            if str(sequence[-3:]).upper() not in stop_codons:
+                raise CodonTable.TranslationError(
+                    "Final codon '{0}' is not a stop codon".format(sequence[-3:]))
+            # Don't translate the stop symbol, and manually translate the M
+            sequence = sequence[3:-3]
+        elif n % 3 != 0:
+            warnings.warn("Partial codon, len(sequence) not a multiple of three. "
+                          "Explicitly trim the sequence or add trailing N before "
+                          "translation. This may become an error in future.",
+                          BiopythonWarning)
+            sequence = sequence[:n - n % 3]
+        trimmed.append(sequence)
     if gap is not None:
         if not isinstance(gap, basestring):
             raise TypeError("Gap character should be a single character "
@@ -2627,28 +3234,203 @@ def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
             raise ValueError("Gap character should be a single character "
                              "string.")
 
-    for i in range(0, n - n % 3, 3):
-        codon = sequence[i:i + 3]
+    translator = _get_codon_translator(table)
+    proteins = None
+    if sum(len(s) for s in trimmed) >= 3 * _VECTORIZE_CODONS:
+        proteins = translator.translate_vectorized(
+            trimmed, stop_symbol, to_stop, cds, pos_stop, gap)
+    if proteins is None:
+        proteins = [translator.translate(sequence, stop_symbol, to_stop, cds,
+                                         pos_stop, gap)
+                    for sequence in trimmed]
+    if cds:
+        proteins = ["M" + protein for protein in proteins]
+    return proteins
+
+
+# Placeholders used in the precompiled codon translations for a stop codon
+# and a possible stop codon (as the stop_symbol and pos_stop can change),
+# and in the NumPy lookup table for an invalid codon:
+_STOP = "\x01"
+_POS_STOP = "\x02"
+_INVALID = 0
+
+# Use NumPy when translating at least this many codons in one go:
+_VECTORIZE_CODONS = 100
+
+# Cache of _CodonTranslator objects, keyed by CodonTable object:
+_codon_translators = weakref.WeakKeyDictionary()
+
+
+def _get_codon_translator(table):
+    """Return the cached _CodonTranslator for a CodonTable object (PRIVATE)."""
+    try:
+        return _codon_translators[table]
+    except KeyError:
+        translator = _CodonTranslator(table)
+        _codon_translators[table] = translator
+        return translator
+
+
+class _CodonTranslator(object):
+    """Precompiled translation of codons using a CodonTable (PRIVATE).
+
+    Each codon is looked up in the table once, and its translation cached
+    as a single character (an amino acid, or the _STOP or _POS_STOP
+    placeholders). For translating long sequences, this is also held as a
+    NumPy array indexed by the letters of the codon packed into an integer.
+
+    >>> from Bio.Data import CodonTable
+    >>> translator = _CodonTranslator(CodonTable.ambiguous_dna_by_id[1])
+    >>> translator.translate("ATGTAGTAN", "*", False, False, "X", None)
+    'M*X'
+    >>> translator.codons["TAN"] == _POS_STOP
+    True
+    """
+
+    def __init__(self, table):
+        """Initialize the lookup table for the given CodonTable object."""
+        self.table = table
+        if table.nucleotide_alphabet.letters is not None:
+            letters = table.nucleotide_alphabet.letters.upper()
+        else:
+            # Assume the worst case, ambiguous DNA or RNA:
+            letters = _ambiguous_dna_letters.upper() + _ambiguous_rna_letters.upper()
+        self.letters = "".join(sorted(set(letters)))
+        self.codons = {}  # filled in as needed by the compile method
+        self._lookup = None  # NumPy arrays, made by _lookup_arrays
+
+    def compile(self, codon):
+        """Return the single character translation of a codon, or None if invalid.
+
+        This follows the rules of the original codon by codon translation,
+        and caches the result.
+        """
         try:
-            amino_acids.append(forward_table[codon])
+            amino_acid = self.table.forward_table[codon]
         except (KeyError, CodonTable.TranslationError):
-            if codon in table.stop_codons:
+            if codon in self.table.stop_codons:
+                amino_acid = _STOP
+            elif set(self.letters).issuperset(codon):
+                # Possible stop codon (e.g. NNN or TAN)
+                amino_acid = _POS_STOP
+            else:
+                # Invalid or gap codon, depends on the gap argument
+                return None
+        self.codons[codon] = amino_acid
+        return amino_acid
+
+    def translate(self, sequence, stop_symbol, to_stop, cds, pos_stop, gap):
+        """Translate an upper case string of whole codons, one by one."""
+        codons = self.codons
+        amino_acids = []
+        for i in range(0, len(sequence), 3):
+            codon = sequence[i:i + 3]
+            amino_acid = codons.get(codon)
+            if amino_acid is None:
+                amino_acid = self.compile(codon)
+            if amino_acid is None:
+                if gap is not None and codon == gap * 3:
+                    # Gapped translation
+                    amino_acid = gap
+                else:
+                    raise CodonTable.TranslationError(
+                        "Codon '{0}' is invalid".format(codon))
+            elif amino_acid == _STOP:
                 if cds:
                     raise CodonTable.TranslationError(
                         "Extra in frame stop codon found.")
                 if to_stop:
                     break
-                amino_acids.append(stop_symbol)
-            elif valid_letters.issuperset(set(codon)):
-                # Possible stop codon (e.g. NNN or TAN)
-                amino_acids.append(pos_stop)
-            elif gap is not None and codon == gap * 3:
-                # Gapped translation
-                amino_acids.append(gap)
-            else:
-                raise CodonTable.TranslationError(
-                    "Codon '{0}' is invalid".format(codon))
-    return "".join(amino_acids)
+                amino_acid = stop_symbol
+            elif amino_acid == _POS_STOP:
+                amino_acid = pos_stop
+            amino_acids.append(amino_acid)
+        return "".join(amino_acids)
+
+    def _lookup_arrays(self):
+        """Return NumPy arrays mapping letters to indices, and codons to amino acids."""
+        if self._lookup is None:
+            import numpy
+            size = len(self.letters)
+            # Map each byte (upper or lower case) to the letter index, or
+            # to one past the last letter if not valid:
+            index = numpy.full(256, size, numpy.intp)
+            for i, letter in enumerate(self.letters):
+                index[ord(letter)] = i
+                index[ord(letter.lower())] = i
+            # Codon i * size^2 + j * size + k has letters i, j, k with the
+            # translation as an ASCII code, any invalid codon gives zero:
+            packed = numpy.zeros((size + 1) ** 3, numpy.uint8)
+            for i, first in enumerate(self.letters):
+                for j, second in enumerate(self.letters):
+                    for k, third in enumerate(self.letters):
+                        codon = first + second + third
+                        amino_acid = self.codons.get(codon) or self.compile(codon)
+                        packed[(i * (size + 1) + j) * (size + 1) + k] = ord(amino_acid)
+            self._lookup = index, packed
+        return self._lookup
+
+    def translate_vectorized(self, sequences, stop_symbol, to_stop, cds,
+                             pos_stop, gap):
+        """Translate a list of upper case strings of whole codons in one go.
+
+        Returns a list of strings, or None if NumPy is not available (or a
+        sequence contains non-ASCII characters).
+        """
+        try:
+            import numpy
+        except ImportError:
+            return None
+        sequence = "".join(sequences)
+        try:
+            data = numpy.frombuffer(sequence.encode("ascii"), numpy.uint8)
+        except UnicodeError:
+            return None
+        index, packed = self._lookup_arrays()
+        size = len(self.letters) + 1
+        codons = index[data].reshape(-1, 3)
+        codes = packed[(codons[:, 0] * size + codons[:, 1]) * size + codons[:, 2]]
+        protein = _bytes_to_string(codes.tobytes())
+        # Any stop codons or invalid codons need special treatment:
+        special = numpy.flatnonzero(codes <= ord(_STOP))
+        ends = numpy.cumsum([len(s) // 3 for s in sequences])
+        firsts = numpy.searchsorted(special, ends)
+        proteins = []
+        start = first = 0
+        for end, last in zip(ends.tolist(), firsts.tolist()):
+            stop = end
+            fixes = []
+            for i in special[first:last].tolist():
+                amino_acid = chr(codes[i])
+                if codes[i] == _INVALID:
+                    # Codons with letters not in the array (e.g. X) may
+                    # still be in the table, otherwise they may be gaps
+                    codon = sequence[3 * i:3 * i + 3]
+                    amino_acid = self.codons.get(codon) or self.compile(codon)
+                    if amino_acid is None:
+                        if gap is None or codon != gap * 3:
+                            raise CodonTable.TranslationError(
+                                "Codon '{0}' is invalid".format(codon))
+                        amino_acid = gap
+                    fixes.append((i - start, amino_acid))
+                if amino_acid == _STOP:
+                    if cds:
+                        raise CodonTable.TranslationError(
+                            "Extra in frame stop codon found.")
+                    if to_stop:
+                        stop = i
+                        break
+            text = protein[start:stop]
+            if fixes:
+                text = list(text)
+                for i, amino_acid in fixes:
+                    text[i] = amino_acid
+                text = "".join(text)
+            proteins.append(text.replace(_STOP, stop_symbol)
+                            .replace(_POS_STOP, pos_stop))
+            start, first = end, last
+        return proteins
 
 
 def translate(sequence, table="Standard", stop_symbol="*", to_stop=False,
@@ -2751,19 +3533,79 @@ def translate(sequence, table="Standard", stop_symbol="*", to_stop=False,
         return sequence.toseq().translate(table, stop_symbol, to_stop, cds)
     else:
         # Assume its a string, return a string
-        try:
-            codon_table = CodonTable.ambiguous_generic_by_id[int(table)]
-        except ValueError:
-            codon_table = CodonTable.ambiguous_generic_by_name[table]
-        except (AttributeError, TypeError):
-            if isinstance(table, CodonTable.CodonTable):
-                codon_table = table
-            else:
-                raise ValueError('Bad table argument')
+        codon_table = _get_generic_codon_table(table)
         return _translate_str(sequence, codon_table, stop_symbol, to_stop, cds,
                               gap=gap)
 
 
+def translate_many(sequences, table="Standard", stop_symbol="*",
+                   to_stop=False, cds=False, gap=None):
+    """Translate many nucleotide sequences into amino acids in one go.
+
+    Takes an iterable of strings (or Seq or MutableSeq objects), and returns
+    a list of strings. The other arguments are as for the translate function,
+    and are applied to every sequence.
+
+    >>> translate_many(["ATGGCACGGAAGTGA", "GTGGCCATTGTAATG"])
+    ['MARK*', 'VAIVM']
+    >>> translate_many(["ATGGCACGGAAGTGA", "GTGGCCATTTAGATG"], to_stop=True)
+    ['MARK', 'VAI']
+    >>> translate_many(["ATGGCACGGAAGTGA", "GTGGCCATTTAG"], table=11, cds=True)
+    ['MARK', 'MAI']
+
+    This is much faster than calling the translate function for each
+    sequence in turn when NumPy is installed, as all the codons are then
+    looked up together in a precompiled table.
+    """
+    codon_table = _get_generic_codon_table(table)
+    return _translate_strs([str(sequence) for sequence in sequences],
+                           codon_table, stop_symbol, to_stop, cds, gap=gap)
+
+
+def translate_six_frames(sequence, table="Standard", stop_symbol="*",
+                         gap=None):
+    """Translate a nucleotide sequence in all six reading frames.
+
+    Returns a list of six strings, the translations of the forward strand
+    starting at the first, second and third letter, followed by those of
+    the reverse complement starting at its first, second and third letter.
+    Any partial codon at the end of a frame is ignored.
+
+    >>> for protein in translate_six_frames("ATGGCACGGAAGTGATT"):
+    ...     print(protein)
+    MARK*
+    WHGSD
+    GTEVI
+    NHFRA
+    ITSVP
+    SLPCH
+
+    See also the Bio.SeqUtils.six_frame_translations function, which shows
+    the six translations aligned under the sequence.
+    """
+    sequence = str(sequence)
+    frames = []
+    for strand in (sequence, reverse_complement(sequence)):
+        for offset in range(3):
+            frame = strand[offset:]
+            frames.append(frame[:len(frame) - len(frame) % 3])
+    return _translate_strs(frames, _get_generic_codon_table(table),
+                           stop_symbol, gap=gap)
+
+
+def _get_generic_codon_table(table):
+    """Return the generic ambiguous CodonTable for a name, NCBI id or object (PRIVATE)."""
+    try:
+        return CodonTable.ambiguous_generic_by_id[int(table)]
+    except ValueError:
+        return CodonTable.ambiguous_generic_by_name[table]
+    except (AttributeError, TypeError):
+        if isinstance(table, CodonTable.CodonTable):
+            return table
+        else:
+            raise ValueError('Bad table argument')
+
+
 def reverse_complement(sequence):
     """Return the reverse complement sequence of a nucleotide string.
 
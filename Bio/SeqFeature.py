@@ -87,8 +87,31 @@ class SeqFeature(object):
        the dictionary are qualifier names, the values are the qualifier
        values. As of Biopython 1.69 this is an ordered dictionary.
 
+    To keep large annotated genomes compact, the attributes are held in
+    __slots__. Other attributes can still be added to a feature, in which
+    case an instance dictionary is created for them.
     """
 
+    __slots__ = ("location", "type", "id", "qualifiers", "__dict__")
+
+    def __getstate__(self):
+        """Return the attributes set, for pickling (PRIVATE).
+
+        Without this, objects with __slots__ cannot be pickled with
+        protocols 0 and 1 (the default on Python 2). Any attributes in
+        the instance dictionary are included too.
+        """
+        state = dict(getattr(self, "__dict__", {}))
+        for name in self.__slots__:
+            if name != "__dict__" and hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the attributes when unpickling (PRIVATE)."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __init__(self, location=None, type='', location_operator='',
                  strand=None, id="<unknown id>",
                  qualifiers=None, sub_features=None,
@@ -684,8 +707,28 @@ class FeatureLocation(object):
     are also specialised position objects used to represent fuzzy positions
     as well, for example a GenBank location like complement(<123..150)
     would use a BeforePosition object for the start.
+
+    To save memory, exact positions are stored internally as plain integers,
+    but are still given as ExactPosition objects by the start and end
+    properties.
     """
 
+    __slots__ = ("_start", "_end", "_strand", "ref", "ref_db")
+
+    def __getstate__(self):
+        """Return the attributes set, for pickling (PRIVATE).
+
+        Without this, objects with __slots__ cannot be pickled with
+        protocols 0 and 1 (the default on Python 2).
+        """
+        return dict((name, getattr(self, name)) for name in self.__slots__
+                    if hasattr(self, name))
+
+    def __setstate__(self, state):
+        """Restore the attributes when unpickling (PRIVATE)."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __init__(self, start, end, strand=None, ref=None, ref_db=None):
         """Initialize the class.
 
@@ -742,16 +785,22 @@ class FeatureLocation(object):
 
         """
         # TODO - Check 0 <= start <= end (<= length of reference)
-        if isinstance(start, AbstractPosition):
+        # Exact positions are held as plain integers (see the start and
+        # end properties), only fuzzy positions need their own objects
+        if type(start) is ExactPosition:
+            self._start = int(start)
+        elif isinstance(start, AbstractPosition):
             self._start = start
         elif _is_int_or_long(start):
-            self._start = ExactPosition(start)
+            self._start = int(start)
         else:
             raise TypeError("start=%r %s" % (start, type(start)))
-        if isinstance(end, AbstractPosition):
+        if type(end) is ExactPosition:
+            self._end = int(end)
+        elif isinstance(end, AbstractPosition):
             self._end = end
         elif _is_int_or_long(end):
-            self._end = ExactPosition(end)
+            self._end = int(end)
         else:
             raise TypeError("end=%r %s" % (end, type(end)))
         if isinstance(self.start.position, int) and \
@@ -968,8 +1017,8 @@ class FeatureLocation(object):
         if self.ref or self.ref_db:
             # TODO - Return self?
             raise ValueError("Feature references another sequence.")
-        return FeatureLocation(start=self._start._shift(offset),
-                               end=self._end._shift(offset),
+        return FeatureLocation(start=self.start._shift(offset),
+                               end=self.end._shift(offset),
                                strand=self.strand)
 
     def _flip(self, length):
@@ -985,8 +1034,8 @@ class FeatureLocation(object):
         else:
             # 0 or None
             flip_strand = self.strand
-        return FeatureLocation(start=self._end._flip(length),
-                               end=self._start._flip(length),
+        return FeatureLocation(start=self.end._flip(length),
+                               end=self.start._flip(length),
                                strand=flip_strand)
 
     @property
@@ -1006,7 +1055,9 @@ class FeatureLocation(object):
         Read only, returns an integer like position object, possibly a fuzzy
         position.
         """
-        return self._start
+        if isinstance(self._start, AbstractPosition):
+            return self._start
+        return ExactPosition(self._start)
 
     @property
     def end(self):
@@ -1015,7 +1066,9 @@ class FeatureLocation(object):
         Read only, returns an integer like position object, possibly a fuzzy
         position.
         """
-        return self._end
+        if isinstance(self._end, AbstractPosition):
+            return self._end
+        return ExactPosition(self._end)
 
     @property
     def nofuzzy_start(self):
@@ -1083,6 +1136,22 @@ class FeatureLocation(object):
 class CompoundLocation(object):
     """For handling joins etc where a feature location has several parts."""
 
+    __slots__ = ("operator", "parts")
+
+    def __getstate__(self):
+        """Return the attributes set, for pickling (PRIVATE).
+
+        Without this, objects with __slots__ cannot be pickled with
+        protocols 0 and 1 (the default on Python 2).
+        """
+        return dict((name, getattr(self, name)) for name in self.__slots__
+                    if hasattr(self, name))
+
+    def __setstate__(self, state):
+        """Restore the attributes when unpickling (PRIVATE)."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __init__(self, parts, operator="join"):
         """Initialize the class.
 
@@ -1492,6 +1561,8 @@ class CompoundLocation(object):
 class AbstractPosition(object):
     """Abstract base class representing a position."""
 
+    __slots__ = ()
+
     def __repr__(self):
         """Represent the AbstractPosition object as a string for debugging."""
         return "%s(...)" % (self.__class__.__name__)
@@ -1532,6 +1603,9 @@ class ExactPosition(int, AbstractPosition):
 
     """
 
+    # Without an instance dictionary, this is no bigger than an int
+    __slots__ = ()
+
     def __new__(cls, position, extension=0):
         """Create an ExactPosition object."""
         if extension != 0:
@@ -1571,7 +1645,7 @@ class UncertainPosition(ExactPosition):
     XML format explicitly marked as uncertain. Does not apply to GenBank/EMBL.
     """
 
-    pass
+    __slots__ = ()
 
 
 class UnknownPosition(AbstractPosition):
@@ -1580,6 +1654,8 @@ class UnknownPosition(AbstractPosition):
     This is used in UniProt, e.g. ? or in the XML as unknown.
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         """Represent the UnknownPosition object as a string for debugging."""
         return "%s()" % self.__class__.__name__
@@ -1875,6 +1951,8 @@ class BeforePosition(int, AbstractPosition):
     like integers.
     """
 
+    __slots__ = ()
+
     # Subclasses int so can't use __init__
     def __new__(cls, position, extension=0):
         """Create a new instance in BeforePosition object."""
@@ -1950,6 +2028,8 @@ class AfterPosition(int, AbstractPosition):
     like integers.
     """
 
+    __slots__ = ()
+
     # Subclasses int so can't use __init__
     def __new__(cls, position, extension=0):
         """Create a new instance of the AfterPosition object."""
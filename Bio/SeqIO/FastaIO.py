@@ -14,11 +14,17 @@ You are expected to use this module via the Bio.SeqIO functions.
 
 from __future__ import print_function
 
+import os
+from collections import OrderedDict
+
+from Bio._py3k import _bytes_to_string
+
 from Bio.Alphabet import single_letter_alphabet
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqIO.Interfaces import SequentialSequenceWriter
 from Bio.SeqIO.Interfaces import _clean, _get_seq_string
+from Bio.File import _open_for_random_access
 
 
 def SimpleFastaParser(handle):
@@ -385,6 +391,194 @@ def as_fasta_2line(record):
     return ">%s\n%s\n" % (title, data)
 
 
+def _build_fai(handle):
+    """Scan a FASTA file and return its samtools faidx entries (PRIVATE).
+
+    Expects a handle in binary mode (which may be a BGZF reader). Returns
+    an ordered dictionary mapping each record identifier (the first word
+    of the title line) to a tuple of the sequence length, offset of the
+    first base, number of bases per line, and number of bytes per line
+    (including the new line characters).
+    """
+    entries = OrderedDict()
+    name = None
+    offset = seq_offset = length = 0
+    line_bases = line_width = None
+    short_line = False
+    for line in handle:
+        if line[:1] == b">":
+            if name is not None:
+                entries[name] = (length, seq_offset,
+                                 line_bases or 0, line_width or 0)
+            try:
+                name = _bytes_to_string(line[1:].split(None, 1)[0])
+            except IndexError:
+                raise ValueError("Missing record identifier at offset %i"
+                                 % offset)
+            if name in entries:
+                raise ValueError("Duplicate key '%s'" % name)
+            seq_offset = offset + len(line)
+            length = 0
+            line_bases = line_width = None
+            short_line = False
+        elif name is None:
+            if line.strip():
+                raise ValueError("FASTA file should start with '>'")
+        else:
+            bases = len(line.rstrip(b"\r\n"))
+            if bases and short_line:
+                raise ValueError("Different line length in sequence '%s'"
+                                 % name)
+            if line_bases is None:
+                line_bases = bases
+                line_width = len(line)
+            elif bases != line_bases or len(line) != line_width:
+                if bases > line_bases:
+                    raise ValueError("Different line length in sequence "
+                                     "'%s'" % name)
+                # Only allowed for the last line of the sequence
+                short_line = True
+            length += bases
+        offset += len(line)
+    if name is not None:
+        entries[name] = (length, seq_offset, line_bases or 0, line_width or 0)
+    return entries
+
+
+class FastaIndex(object):
+    """Random access to regions of sequences in a FASTA file via a .fai index.
+
+    This reads and writes the ``.fai`` index files used by ``samtools faidx``,
+    which record for each sequence its identifier, length, the offset of its
+    first base, and the number of bases and bytes per line. Using these, any
+    region of a sequence can be read directly from the file without loading
+    the rest of the sequence. This requires every line of a sequence except
+    the last to be the same length (as is usual for FASTA files).
+
+    >>> from Bio.SeqIO.FastaIO import FastaIndex
+    >>> fasta = FastaIndex("GenBank/NC_005816.fna", fai_filename=False)
+    >>> len(fasta)
+    1
+    >>> for name in fasta:
+    ...     print("%s length %i" % (name, fasta.length(name)))
+    gi|45478711|ref|NC_005816.1| length 9609
+    >>> print(fasta.fetch("gi|45478711|ref|NC_005816.1|", 65, 80))
+    TCTCCTGATTCAGGA
+    >>> fasta.close()
+
+    Regions use Python style zero based counting and are half open, so the
+    above fetches the sequence ``[65:80]`` spanning the end of the first
+    line. By default the index is loaded from the FASTA filename plus the
+    ``.fai`` extension, and if that does not exist the FASTA file is scanned
+    and the index saved there. Use fai_filename to give another filename,
+    or False to build the index in memory without saving it.
+
+    BGZF compressed FASTA files (e.g. from ``bgzip``) are also supported,
+    in which case the ``.fai`` index offsets refer to the decompressed data
+    as in samtools. These are mapped to the compressed file using a ``.gzi``
+    block index (see Bio.bgzf), which is loaded from the FASTA filename plus
+    ``.gzi`` if present, and saved there when building the ``.fai`` index.
+    """
+
+    def __init__(self, filename, fai_filename=None,
+                 alphabet=single_letter_alphabet):
+        """Load or build the index and open the FASTA file."""
+        if fai_filename is None:
+            fai_filename = filename + ".fai"
+        gzi_filename = filename + ".gzi"
+        self._alphabet = alphabet
+        self._handle = _open_for_random_access(filename)
+        self._bgzf = hasattr(self._handle, "seek_uncompressed")
+        if fai_filename is not False and os.path.isfile(fai_filename):
+            self._entries = self._load_fai(fai_filename)
+        else:
+            try:
+                self._entries = _build_fai(self._handle)
+            except ValueError:
+                self._handle.close()
+                raise
+            if fai_filename is not False:
+                self._save_fai(fai_filename)
+                if self._bgzf and not os.path.isfile(gzi_filename):
+                    from Bio import bgzf
+                    bgzf.make_gzi(filename, gzi_filename)
+        if self._bgzf and os.path.isfile(gzi_filename):
+            self._handle.close()
+            self._handle = _open_for_random_access(filename, gzi_filename)
+
+    def _load_fai(self, fai_filename):
+        """Parse a .fai index file (PRIVATE)."""
+        entries = OrderedDict()
+        with open(fai_filename) as handle:
+            for line in handle:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) < 5:
+                    raise ValueError("Bad line in FASTA index %s: %r"
+                                     % (fai_filename, line))
+                entries[parts[0]] = tuple(int(x) for x in parts[1:5])
+        return entries
+
+    def _save_fai(self, fai_filename):
+        """Write the index as a .fai file (PRIVATE)."""
+        with open(fai_filename, "w") as handle:
+            for name, values in self._entries.items():
+                handle.write("%s\t%i\t%i\t%i\t%i\n" % ((name,) + values))
+
+    def __len__(self):
+        """Return the number of sequences in the index."""
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate over the sequence identifiers, in file order."""
+        return iter(self._entries)
+
+    def __contains__(self, name):
+        """Return True if the sequence identifier is in the index."""
+        return name in self._entries
+
+    def keys(self):
+        """Return a list of the sequence identifiers, in file order."""
+        return list(self._entries)
+
+    def length(self, name):
+        """Return the length of the named sequence."""
+        return self._entries[name][0]
+
+    def fetch(self, name, start=None, end=None):
+        """Return the named sequence, or a region of it, as a Seq object.
+
+        The start and end are zero based, and as with Python slicing are
+        clipped to the length of the sequence. Only the lines of the file
+        containing the region are read.
+        """
+        length, offset, line_bases, line_width = self._entries[name]
+        start, end, step = slice(start, end).indices(length)
+        if start >= end:
+            return Seq("", self._alphabet)
+        first = offset + (start // line_bases) * line_width + \
+            start % line_bases
+        last = offset + (end // line_bases) * line_width + end % line_bases
+        if self._bgzf:
+            self._handle.seek_uncompressed(first)
+        else:
+            self._handle.seek(first)
+        data = self._handle.read(last - first)
+        data = _bytes_to_string(data).replace("\n", "").replace("\r", "")
+        return Seq(data, self._alphabet)
+
+    def close(self):
+        """Close the FASTA file handle."""
+        self._handle.close()
+
+    def __enter__(self):
+        """Support the with statement."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Close the file at the end of a with statement."""
+        self.close()
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
     run_doctest(verbose=0)
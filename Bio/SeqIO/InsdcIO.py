@@ -54,7 +54,7 @@ from Bio._py3k import basestring
 # However, all the writing code is in this file.
 
 
-def GenBankIterator(handle):
+def GenBankIterator(handle, projection=None):
     """Break up a Genbank file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -63,6 +63,24 @@ def GenBankIterator(handle):
     Note that for genomes or chromosomes, there is typically only
     one record.
 
+    The optional projection argument (a Bio.GenBank.Scanner.Projection
+    object, or a dictionary of its arguments) restricts which parts of
+    the records are parsed, e.g. only the CDS features and no sequence:
+
+    >>> from Bio import SeqIO
+    >>> projection = {"features": ["CDS"], "sequence": False}
+    >>> for record in SeqIO.parse("GenBank/cor6_6.gb", "gb",
+    ...                           projection=projection):
+    ...     print("%s %i %s" % (record.id, len(record.features),
+    ...                         record.seq.__class__.__name__))
+    ...
+    X55053.1 1 UnknownSeq
+    X62281.1 1 UnknownSeq
+    M81224.1 1 UnknownSeq
+    AJ237582.1 1 UnknownSeq
+    L31939.1 1 UnknownSeq
+    AF297471.1 1 UnknownSeq
+
     This gets called internally by Bio.SeqIO for the GenBank file format:
 
     >>> from Bio import SeqIO
@@ -91,10 +109,10 @@ def GenBankIterator(handle):
 
     """
     # This calls a generator function:
-    return GenBankScanner(debug=0).parse_records(handle)
+    return GenBankScanner(debug=0).parse_records(handle, projection=projection)
 
 
-def EmblIterator(handle):
+def EmblIterator(handle, projection=None):
     """Break up an EMBL file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -103,6 +121,9 @@ def EmblIterator(handle):
     Note that for genomes or chromosomes, there is typically only
     one record.
 
+    As for the GenBankIterator, an optional projection argument restricts
+    which parts of the records are parsed.
+
     This gets called internally by Bio.SeqIO for the EMBL file format:
 
     >>> from Bio import SeqIO
@@ -137,10 +158,10 @@ def EmblIterator(handle):
 
     """
     # This calls a generator function:
-    return EmblScanner(debug=0).parse_records(handle)
+    return EmblScanner(debug=0).parse_records(handle, projection=projection)
 
 
-def ImgtIterator(handle):
+def ImgtIterator(handle, projection=None):
     """Break up an IMGT file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -150,7 +171,7 @@ def ImgtIterator(handle):
     one record.
     """
     # This calls a generator function:
-    return _ImgtScanner(debug=0).parse_records(handle)
+    return _ImgtScanner(debug=0).parse_records(handle, projection=projection)
 
 
 def GenBankCdsFeatureIterator(handle, alphabet=Alphabet.generic_protein):
@@ -366,7 +366,9 @@ from Bio.Seq import Seq, UnknownSeq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqIO.Interfaces import SequentialSequenceWriter
 from Bio.SeqIO.Interfaces import _clean, _get_seq_string
+from Bio._py3k import _as_bytes, _bytes_to_string
 
+from array import array
 from math import log
 import warnings
 from Bio import BiopythonWarning, BiopythonParserWarning
@@ -547,6 +549,48 @@ _solexa_to_sanger_quality_str = dict(
     for qs in range(-5, 93 + 1))
 
 
+# Translation tables for _compact_quality_str, made as needed
+_quality_byte_tables = {}
+
+
+def _compact_quality_str(qualities, mapping):
+    """Encode quality scores held as bytes using a precomputed mapping (PRIVATE).
+
+    This is a fast path for scores in an array.array or NumPy array of signed
+    or unsigned bytes, such as from the FASTQ parsers with compact=True. It
+    returns None if the scores are held some other way, or if any are not in
+    the mapping (e.g. too high), in which case the caller should fall back
+    on the general code.
+    """
+    try:
+        typecode = qualities.typecode  # array.array
+    except AttributeError:
+        try:
+            typecode = qualities.dtype.char  # NumPy array
+        except AttributeError:
+            return None
+    if typecode not in ("b", "B"):
+        return None
+    try:
+        table = _quality_byte_tables[id(mapping), typecode]
+    except KeyError:
+        # Zero marks the scores which are not in the mapping
+        table = bytearray(256)
+        for score, letter in mapping.items():
+            if (-128 <= score < 128) if typecode == "b" else (0 <= score < 256):
+                table[score & 0xFF] = ord(letter)
+        table = _quality_byte_tables[id(mapping), typecode] = bytes(table)
+    try:
+        data = qualities.tobytes()
+    except AttributeError:
+        # array.array on Python 2
+        data = qualities.tostring()
+    data = data.translate(table)
+    if b"\x00" in data:
+        return None
+    return _bytes_to_string(data)
+
+
 def _get_sanger_quality_str(record):
     """Return a Sanger FASTQ encoded quality string (PRIVATE).
 
@@ -617,6 +661,9 @@ def _get_sanger_quality_str(record):
         pass
     else:
         # Try and use the precomputed mapping:
+        answer = _compact_quality_str(qualities, _phred_to_sanger_quality_str)
+        if answer is not None:
+            return answer
         try:
             return "".join(_phred_to_sanger_quality_str[qp]
                            for qp in qualities)
@@ -639,6 +686,9 @@ def _get_sanger_quality_str(record):
                          "letter_annotations of SeqRecord (id=%s)."
                          % record.id)
     # Try and use the precomputed mapping:
+    answer = _compact_quality_str(qualities, _solexa_to_sanger_quality_str)
+    if answer is not None:
+        return answer
     try:
         return "".join(_solexa_to_sanger_quality_str[qs]
                        for qs in qualities)
@@ -686,6 +736,9 @@ def _get_illumina_quality_str(record):
         pass
     else:
         # Try and use the precomputed mapping:
+        answer = _compact_quality_str(qualities, _phred_to_illumina_quality_str)
+        if answer is not None:
+            return answer
         try:
             return "".join(_phred_to_illumina_quality_str[qp]
                            for qp in qualities)
@@ -708,6 +761,9 @@ def _get_illumina_quality_str(record):
                          "letter_annotations of SeqRecord (id=%s)."
                          % record.id)
     # Try and use the precomputed mapping:
+    answer = _compact_quality_str(qualities, _solexa_to_illumina_quality_str)
+    if answer is not None:
+        return answer
     try:
         return "".join(_solexa_to_illumina_quality_str[qs]
                        for qs in qualities)
@@ -756,6 +812,9 @@ def _get_solexa_quality_str(record):
         pass
     else:
         # Try and use the precomputed mapping:
+        answer = _compact_quality_str(qualities, _solexa_to_solexa_quality_str)
+        if answer is not None:
+            return answer
         try:
             return "".join(_solexa_to_solexa_quality_str[qs]
                            for qs in qualities)
@@ -778,6 +837,9 @@ def _get_solexa_quality_str(record):
                          "letter_annotations of SeqRecord (id=%s)."
                          % record.id)
     # Try and use the precomputed mapping:
+    answer = _compact_quality_str(qualities, _phred_to_solexa_quality_str)
+    if answer is not None:
+        return answer
     try:
         return "".join(_phred_to_solexa_quality_str[qp]
                        for qp in qualities)
@@ -953,7 +1015,168 @@ def FastqGeneralIterator(handle):
         yield (title_line, seq_string, quality_string)
 
 
-def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+class FastqBatch(object):
+    """A batch of FASTQ records held in columnar form.
+
+    This is the object returned by FastqBatchIterator. Rather than one
+    SeqRecord (and one list of integers) per read, the reads in a batch
+    are stored as a handful of flat arrays:
+
+     - titles - list of the title lines (without the leading "@")
+     - seq - all the sequences concatenated as a single bytes string
+     - qualities - all the PHRED quality scores concatenated as a NumPy
+       uint8 array (the same length as seq)
+     - offsets - NumPy int64 array of length len(batch) + 1, where the
+       sequence and quality of read i are held at offsets[i]:offsets[i+1]
+
+    Indexing a batch returns a (title, sequence, qualities) tuple for that
+    read, where the qualities are a view into the batch's quality array.
+    """
+
+    def __init__(self, titles, seq, qualities, offsets):
+        """Initialize the class."""
+        self.titles = titles
+        self.seq = seq
+        self.qualities = qualities
+        self.offsets = offsets
+
+    def __len__(self):
+        """Return the number of reads in the batch."""
+        return len(self.titles)
+
+    def __getitem__(self, index):
+        """Return the (title, sequence, qualities) tuple for one read."""
+        if index < 0:
+            index += len(self.titles)
+        start = int(self.offsets[index])
+        end = int(self.offsets[index + 1])
+        return (self.titles[index], self.seq[start:end],
+                self.qualities[start:end])
+
+    def __iter__(self):
+        """Iterate over the reads as (title, sequence, qualities) tuples."""
+        for index in range(len(self.titles)):
+            yield self[index]
+
+    def lengths(self):
+        """Return the read lengths as a NumPy array."""
+        import numpy
+        return numpy.diff(self.offsets)
+
+
+def _phred_lookup_table(variant):
+    """Return a 256 entry table mapping ASCII codes to PHRED scores (PRIVATE).
+
+    Characters which are not valid for the given FASTQ variant map to 255,
+    which is not a valid PHRED score in any variant. Solexa scores are
+    converted to the nearest integer PHRED score, as done when writing
+    Solexa style FASTQ data out as Sanger style FASTQ.
+    """
+    import numpy
+    table = numpy.full(256, 255, numpy.uint8)
+    if variant in ("sanger", "fastq", "fastq-sanger"):
+        for q in range(0, 93 + 1):
+            table[q + SANGER_SCORE_OFFSET] = q
+    elif variant in ("illumina", "fastq-illumina"):
+        for q in range(0, 62 + 1):
+            table[q + SOLEXA_SCORE_OFFSET] = q
+    elif variant in ("solexa", "fastq-solexa"):
+        for q in range(-5, 62 + 1):
+            table[q + SOLEXA_SCORE_OFFSET] = int(round(
+                phred_quality_from_solexa(q)))
+    else:
+        raise ValueError("Unknown FASTQ variant %r, expected 'sanger', "
+                         "'solexa' or 'illumina'" % variant)
+    return table
+
+
+def FastqBatchIterator(handle, batch_size=10000, variant="sanger"):
+    """Iterate over FASTQ records in fixed size columnar batches.
+
+    Arguments:
+     - handle - input file, opened in text mode
+     - batch_size - maximum number of reads per batch (default 10000);
+       every batch except perhaps the last will hold exactly this many
+     - variant - the quality encoding, one of "sanger" (default),
+       "solexa" or "illumina" (the Bio.SeqIO format names "fastq",
+       "fastq-sanger", "fastq-solexa" and "fastq-illumina" are also
+       accepted)
+
+    This is built on FastqGeneralIterator, so copes with the same FASTQ
+    oddities (multi-line records, "@" at the start of quality lines, etc),
+    but returns FastqBatch objects rather than SeqRecord objects. This
+    avoids creating a SeqRecord and a Python list of integers for every
+    read, and decodes the quality strings of a whole batch at once using
+    a NumPy lookup table.
+
+    The quality scores are always returned as PHRED scores in a NumPy
+    uint8 array. For the old Solexa variant, the Solexa scores are mapped
+    to the nearest integer PHRED score (see phred_quality_from_solexa).
+
+    This requires NumPy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        from Bio import MissingPythonDependencyError
+        raise MissingPythonDependencyError(
+            "Install NumPy if you want to use FastqBatchIterator")
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least one")
+    table = _phred_lookup_table(variant)
+
+    def make_batch(titles, seqs, quals):
+        lengths = numpy.fromiter((len(s) for s in seqs), numpy.int64,
+                                 len(seqs))
+        offsets = numpy.zeros(len(seqs) + 1, numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+        codes = numpy.frombuffer(_as_bytes("".join(quals)), numpy.uint8)
+        qualities = table[codes]
+        if qualities.size and qualities.max() == 255:
+            raise ValueError("Invalid character in quality string")
+        return FastqBatch(titles, _as_bytes("".join(seqs)), qualities,
+                          offsets)
+
+    titles = []
+    seqs = []
+    quals = []
+    for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
+        titles.append(title_line)
+        seqs.append(seq_string)
+        quals.append(quality_string)
+        if len(titles) == batch_size:
+            yield make_batch(titles, seqs, quals)
+            titles = []
+            seqs = []
+            quals = []
+    if titles:
+        yield make_batch(titles, seqs, quals)
+
+
+def _quality_decoder(offset, low, high, typecode):
+    """Return a function decoding FASTQ quality strings into arrays (PRIVATE).
+
+    The scores from low to high are encoded with the given ASCII offset, and
+    are returned in an array.array of signed ("b") or unsigned ("B") bytes.
+    Invalid characters give a ValueError.
+    """
+    table = bytearray(256)
+    for score in range(low, high + 1):
+        table[score + offset] = score & 0xFF
+    table = bytes(table)
+    valid = bytes(bytearray(range(low + offset, high + offset + 1)))
+
+    def decode(quality_string):
+        data = _as_bytes(quality_string)
+        if data.translate(None, valid):
+            raise ValueError("Invalid character in quality string")
+        return array(typecode, data.translate(table))
+
+    return decode
+
+
+def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                       compact=False):
     """Iterate over FASTQ records as SeqRecord objects.
 
     Arguments:
@@ -964,6 +1187,10 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
        description (in that order) for the record as a tuple of strings.
        If this is not given, then the entire title line will be used as
        the description, and the first word as the id and name.
+     - compact - If True, the qualities are stored as an array.array of
+       unsigned bytes (typecode "B") rather than a list of integers, using
+       one byte per base. This is much smaller when holding many reads in
+       memory, and is also faster to parse and to write out again.
 
     Note that use of title2ids matches that of Bio.SeqIO.FastaIO.
 
@@ -1016,6 +1243,13 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
     >>> print(record.letter_annotations["phred_quality"])
     [26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 24, 26, 22, 26, 26, 13, 22, 26, 18, 24, 18, 18, 18, 18]
 
+    Or, with the compact option, as an array of bytes:
+
+    >>> with open("Quality/example.fastq", "rU") as handle:
+    ...     records = list(FastqPhredIterator(handle, compact=True))
+    >>> print(records[-1].letter_annotations["phred_quality"])
+    array('B', [26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 24, 26, 22, 26, 26, 13, 22, 26, 18, 24, 18, 18, 18, 18])
+
     """
     assert SANGER_SCORE_OFFSET == ord("!")
     # Originally, I used a list expression for each record:
@@ -1026,6 +1260,7 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
     q_mapping = dict()
     for letter in range(0, 255):
         q_mapping[chr(letter)] = letter - SANGER_SCORE_OFFSET
+    decode = _quality_decoder(SANGER_SCORE_OFFSET, 0, 93, "B")
     for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
         if title2ids:
             id, name, descr = title2ids(title_line)
@@ -1035,9 +1270,12 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
             name = id
         record = SeqRecord(Seq(seq_string, alphabet),
                            id=id, name=name, description=descr)
-        qualities = [q_mapping[letter] for letter in quality_string]
-        if qualities and (min(qualities) < 0 or max(qualities) > 93):
-            raise ValueError("Invalid character in quality string")
+        if compact:
+            qualities = decode(quality_string)
+        else:
+            qualities = [q_mapping[letter] for letter in quality_string]
+            if qualities and (min(qualities) < 0 or max(qualities) > 93):
+                raise ValueError("Invalid character in quality string")
         # For speed, will now use a dirty trick to speed up assigning the
         # qualities. We do this to bypass the length check imposed by the
         # per-letter-annotations restricted dict (as this has already been
@@ -1048,10 +1286,13 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
         yield record
 
 
-def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                        compact=False):
     r"""Parse old Solexa/Illumina FASTQ like files (which differ in the quality mapping).
 
-    The optional arguments are the same as those for the FastqPhredIterator.
+    The optional arguments are the same as those for the FastqPhredIterator,
+    except that with compact=True the Solexa qualities (which can be
+    negative) are stored as an array.array of signed bytes (typecode "b").
 
     For each sequence in Solexa/Illumina FASTQ files there is a matching string
     encoding the Solexa integer qualities using ASCII values with an offset
@@ -1185,6 +1426,7 @@ def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None)
     q_mapping = dict()
     for letter in range(0, 255):
         q_mapping[chr(letter)] = letter - SOLEXA_SCORE_OFFSET
+    decode = _quality_decoder(SOLEXA_SCORE_OFFSET, -5, 62, "b")
     for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
         if title2ids:
             id, name, descr = title_line
@@ -1194,10 +1436,13 @@ def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None)
             name = id
         record = SeqRecord(Seq(seq_string, alphabet),
                            id=id, name=name, description=descr)
-        qualities = [q_mapping[letter] for letter in quality_string]
         # DO NOT convert these into PHRED qualities automatically!
-        if qualities and (min(qualities) < -5 or max(qualities) > 62):
-            raise ValueError("Invalid character in quality string")
+        if compact:
+            qualities = decode(quality_string)
+        else:
+            qualities = [q_mapping[letter] for letter in quality_string]
+            if qualities and (min(qualities) < -5 or max(qualities) > 62):
+                raise ValueError("Invalid character in quality string")
         # Dirty trick to speed up this line:
         # record.letter_annotations["solexa_quality"] = qualities
         dict.__setitem__(record._per_letter_annotations,
@@ -1205,7 +1450,8 @@ def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None)
         yield record
 
 
-def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                          compact=False):
     """Parse Illumina 1.3 to 1.7 FASTQ like files (which differ in the quality mapping).
 
     The optional arguments are the same as those for the FastqPhredIterator.
@@ -1237,6 +1483,7 @@ def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=Non
     q_mapping = dict()
     for letter in range(0, 255):
         q_mapping[chr(letter)] = letter - SOLEXA_SCORE_OFFSET
+    decode = _quality_decoder(SOLEXA_SCORE_OFFSET, 0, 62, "B")
     for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
         if title2ids:
             id, name, descr = title2ids(title_line)
@@ -1246,9 +1493,12 @@ def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=Non
             name = id
         record = SeqRecord(Seq(seq_string, alphabet),
                            id=id, name=name, description=descr)
-        qualities = [q_mapping[letter] for letter in quality_string]
-        if qualities and (min(qualities) < 0 or max(qualities) > 62):
-            raise ValueError("Invalid character in quality string")
+        if compact:
+            qualities = decode(quality_string)
+        else:
+            qualities = [q_mapping[letter] for letter in quality_string]
+            if qualities and (min(qualities) < 0 or max(qualities) > 62):
+                raise ValueError("Invalid character in quality string")
         # Dirty trick to speed up this line:
         # record.letter_annotations["phred_quality"] = qualities
         dict.__setitem__(record._per_letter_annotations,
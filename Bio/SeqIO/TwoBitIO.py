@@ -0,0 +1,246 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Bio.SeqIO support for the UCSC 2bit file format.
+
+The 2bit format stores nucleotide sequences using two bits per base (with
+T=0, C=1, A=2 and G=3), with separate lists of the blocks of N and of the
+blocks of lower case (soft-masked) letters. It is typically used for whole
+genome assemblies, and holds an index of the sequence names at the start of
+the file. You are expected to use this module via the Bio.SeqIO functions
+under the format name "twobit":
+
+    >>> from Bio import SeqIO
+    >>> for record in SeqIO.parse("TwoBit/sequence.littleendian.2bit", "twobit"):
+    ...     print("%s %i" % (record.id, len(record)))
+    seq11111 290
+    seq222 144
+    seq3333 88
+
+Only the file header and index are read when parsing, and each record's
+sequence is a Bio.Seq.PackedSeq object which reads the packed bases from the
+file as needed. This makes fetching a region of a long sequence fast, as
+only the bytes holding the region are decoded, and only the N and mask
+blocks overlapping the region are looked at:
+
+    >>> record = SeqIO.index("TwoBit/sequence.bigendian.2bit", "twobit")["seq222"]
+    >>> print(record.seq[15:40])
+    TTGACNNNNNNNNNNNNNTACGACG
+
+Where possible the file is memory mapped. Otherwise (e.g. for a BytesIO
+handle), the whole file is read into memory. When parsing, the mapping is
+independent of the handle, so the records can still be used after the file
+has been closed. The mapping stays open as long as any of the records (or
+the iterator) refer to it, and is released when they are garbage collected.
+
+Records from Bio.SeqIO.index share the index's mapping instead, which is
+closed when the index is closed. After that, reading their sequences raises
+a ValueError. To keep such a sequence, make a copy of it first (for example
+with Seq(str(record.seq))) before closing the index.
+
+For detailed information on the file format, please see the UCSC
+description at https://genome.ucsc.edu/FAQ/FAQformat.html#format7
+"""
+
+from __future__ import print_function
+
+import mmap
+import struct
+
+from Bio._py3k import _bytes_to_string
+
+from Bio import Alphabet
+from Bio.Seq import PackedSeq
+from Bio.SeqRecord import SeqRecord
+
+
+_SIGNATURE = 0x1A412743
+
+
+def _open_data(handle):
+    """Return the file contents as a bytes like object, memory mapped if possible (PRIVATE)."""
+    try:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, EnvironmentError, ValueError):
+        # No file number (e.g. BytesIO), or an empty file
+        handle.seek(0)
+        return handle.read()
+
+
+def _read_header(data):
+    """Return the byte order and list of (name, offset) tuples from the index (PRIVATE)."""
+    if len(data) < 16:
+        raise ValueError("File too short to be a 2bit file")
+    for byteorder in "<>":
+        signature, version, count, reserved = struct.unpack(byteorder + "4I",
+                                                            data[:16])
+        if signature == _SIGNATURE:
+            break
+    else:
+        raise ValueError("Unexpected signature in 2bit header")
+    if version == 0:
+        offset_format = byteorder + "I"
+    elif version == 1:
+        # Version 1 uses 64 bit offsets for files over 4GB
+        offset_format = byteorder + "Q"
+    else:
+        raise ValueError("Unsupported 2bit file version %i" % version)
+    index = []
+    pos = 16
+    for i in range(count):
+        size = ord(data[pos:pos + 1])
+        name = _bytes_to_string(data[pos + 1:pos + 1 + size])
+        pos += 1 + size
+        offset, = struct.unpack_from(offset_format, data, pos)
+        pos += struct.calcsize(offset_format)
+        index.append((name, offset))
+    return byteorder, index
+
+
+class _BlockPositions(object):
+    """Read only list like view of the block starts or ends in a 2bit file (PRIVATE).
+
+    The 32 bit block start positions (and block sizes, for the ends) are
+    unpacked from the file data when accessed, so that the Bio.Seq.PackedSeq
+    object can do a binary search of the blocks without reading them all.
+    """
+
+    def __init__(self, data, byteorder, starts, count, sizes=None):
+        """Initialize the class."""
+        self._data = data
+        self._byteorder = byteorder
+        self._starts = starts
+        self._sizes = sizes
+        self._count = count
+
+    def __len__(self):
+        """Return the number of blocks."""
+        return self._count
+
+    def _unpack(self, offset, index, count):
+        """Unpack count 32 bit integers from the given array (PRIVATE)."""
+        return struct.unpack_from("%s%iI" % (self._byteorder, count),
+                                  self._data, offset + 4 * index)
+
+    def __getitem__(self, index):
+        """Return the position of one block, or a list for a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                return list(self)[index]
+            count = max(0, stop - start)
+            values = self._unpack(self._starts, start, count)
+            if self._sizes is None:
+                return list(values)
+            sizes = self._unpack(self._sizes, start, count)
+            return [value + size for value, size in zip(values, sizes)]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("block index out of range")
+        return self[index:index + 1][0]
+
+
+class _PackedBases(object):
+    """The packed bases of one sequence in a 2bit file (PRIVATE).
+
+    Slicing gives the packed bytes, using positions relative to the start
+    of this sequence.
+    """
+
+    def __init__(self, data, offset, length):
+        """Initialize the class."""
+        self._data = data
+        self._offset = offset
+        self._length = length
+
+    def __len__(self):
+        """Return the number of bytes holding the packed bases."""
+        return self._length
+
+    def __getitem__(self, index):
+        """Return the packed bytes for a slice."""
+        start, stop, step = index.indices(self._length)
+        return self._data[self._offset + start:self._offset + stop:step]
+
+
+def _read_record(data, byteorder, name, offset, alphabet):
+    """Return a SeqRecord for the sequence at the given offset (PRIVATE).
+
+    Only the sequence length and the number of N and mask blocks are read,
+    the blocks and packed bases are left in the file until needed.
+    """
+    length, n_count = struct.unpack_from(byteorder + "2I", data, offset)
+    n_starts = offset + 8
+    mask_offset = n_starts + 8 * n_count
+    mask_count, = struct.unpack_from(byteorder + "I", data, mask_offset)
+    mask_starts = mask_offset + 4
+    # There is a 32 bit reserved field before the packed bases
+    dna_offset = mask_starts + 8 * mask_count + 4
+    dna_size = (length + 3) // 4
+    if dna_offset + dna_size > len(data):
+        raise ValueError("Truncated 2bit file, sequence %s incomplete" % name)
+    blocks = (_BlockPositions(data, byteorder, n_starts, n_count),
+              _BlockPositions(data, byteorder, n_starts, n_count,
+                              n_starts + 4 * n_count),
+              ["N"] * n_count)
+    mask = (_BlockPositions(data, byteorder, mask_starts, mask_count),
+            _BlockPositions(data, byteorder, mask_starts, mask_count,
+                            mask_starts + 4 * mask_count))
+    seq = PackedSeq.__new__(PackedSeq)
+    seq._set_packed(_PackedBases(data, dna_offset, dna_size), 0, length,
+                    blocks, mask, alphabet)
+    return SeqRecord(seq, id=name, name=name, description="")
+
+
+def _check_alphabet(alphabet):
+    """Return the alphabet to use, checking it is for DNA (PRIVATE)."""
+    if alphabet is None:
+        return Alphabet.generic_dna
+    base = Alphabet._get_base_alphabet(alphabet)
+    if isinstance(base, (Alphabet.ProteinAlphabet, Alphabet.RNAAlphabet)):
+        raise ValueError("Invalid alphabet for a 2bit file, %r" % alphabet)
+    return alphabet
+
+
+# This is a generator function!
+def TwoBitIterator(handle, alphabet=None):
+    """Iterate over a 2bit file yielding SeqRecord objects.
+
+    Arguments:
+     - handle - input file in the 2bit file format as defined by UCSC.
+       This must be opened in binary mode!
+     - alphabet - optional DNA alphabet (default generic DNA).
+
+    This function is used internally via the Bio.SeqIO functions:
+
+    >>> from Bio import SeqIO
+    >>> record = next(SeqIO.parse("TwoBit/sequence.bigendian.2bit", "twobit"))
+    >>> print(record.id)
+    seq11111
+    >>> print(record.seq[:20])
+    GCTAAAGACAATTAcaTAAC
+
+    You can also call it directly:
+
+    >>> with open("TwoBit/sequence.bigendian.2bit", "rb") as handle:
+    ...     for record in TwoBitIterator(handle):
+    ...         print("%s %s" % (record.id, record.seq[-10:]))
+    ...
+    seq11111 GTAACCGaat
+    seq222 TGCCGCCTGA
+    seq3333 tgataaatga
+
+    """
+    alphabet = _check_alphabet(alphabet)
+    data = _open_data(handle)
+    byteorder, index = _read_header(data)
+    for name, offset in index:
+        yield _read_record(data, byteorder, name, offset, alphabet)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest(verbose=0)
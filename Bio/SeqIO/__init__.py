@@ -320,6 +320,8 @@ names are also used in Bio.AlignIO and include the following:
       line holds a record's identifier and sequence. For example,
       this is used as by Aligent's eArray software when saving
       microarray probes in a minimal tab delimited text file.
+    - twobit  - UCSC's 2bit file format for nucleotide sequences, which uses
+      two bits per base, with the sequences read from the file on demand.
     - qual    - A "FASTA like" format holding PHRED quality values from
       sequencing DNA, but no actual sequences (usually provided
       in separate FASTA files).
@@ -401,6 +403,7 @@ from . import SffIO
 from . import SwissIO
 from . import TabIO
 from . import QualityIO  # FastQ and qual files
+from . import TwoBitIO
 from . import UniprotIO
 
 if sys.version_info < (3, 6):
@@ -448,9 +451,13 @@ _FormatToIterator = {"abi": AbiIO.AbiIterator,
                      "sff-trim": SffIO._SffTrimIterator,
                      "swiss": SwissIO.SwissIterator,
                      "tab": TabIO.TabIterator,
+                     "twobit": TwoBitIO.TwoBitIterator,
                      "uniprot-xml": UniprotIO.UniprotIterator,
                      }
 
+# Formats whose iterator accepts a projection argument
+_ProjectionFormats = ["embl", "gb", "genbank", "imgt"]
+
 _FormatToString = {
     "fasta": FastaIO.as_fasta,
     "fasta-2line": FastaIO.as_fasta_2line,
@@ -483,7 +490,8 @@ _FormatToWriter = {"fasta": FastaIO.FastaWriter,
                    "tab": TabIO.TabWriter,
                    }
 
-_BinaryFormats = ["sff", "sff-trim", "abi", "abi-trim", "seqxml", "nib"]
+_BinaryFormats = ["sff", "sff-trim", "abi", "abi-trim", "seqxml", "nib",
+                  "twobit"]
 
 
 def write(sequences, handle, format):
@@ -562,7 +570,7 @@ def write(sequences, handle, format):
     return count
 
 
-def parse(handle, format, alphabet=None):
+def parse(handle, format, alphabet=None, projection=None):
     r"""Turn a sequence file into an iterator returning SeqRecords.
 
     Arguments:
@@ -572,6 +580,11 @@ def parse(handle, format, alphabet=None):
      - alphabet - optional Alphabet object, useful when the sequence type
        cannot be automatically inferred from the file itself
        (e.g. format="fasta" or "tab")
+     - projection - optional Bio.GenBank.Scanner.Projection object (or a
+       dictionary of its arguments) saying which header fields, feature
+       types, qualifiers and whether the sequence should be parsed, with
+       everything else skipped. Only for the "genbank" (or "gb"), "embl"
+       and "imgt" formats.
 
     Typical usage, opening a file to read in, and looping over the record(s):
 
@@ -638,10 +651,17 @@ def parse(handle, format, alphabet=None):
     if alphabet is not None and not (isinstance(alphabet, Alphabet) or
                                      isinstance(alphabet, AlphabetEncoder)):
         raise ValueError("Invalid alphabet, %r" % alphabet)
+    if projection is not None and format not in _ProjectionFormats:
+        raise ValueError("Projection is not supported for format '%s'"
+                         % format)
 
     with as_handle(handle, mode) as fp:
         # Map the file format to a sequence iterator:
-        if format in _FormatToIterator:
+        if projection is not None:
+            i = _FormatToIterator[format](fp, projection=projection)
+            if alphabet is not None:
+                i = _force_alphabet(i, alphabet)
+        elif format in _FormatToIterator:
             iterator_generator = _FormatToIterator[format]
             if alphabet is None:
                 i = iterator_generator(fp)
@@ -677,6 +697,71 @@ def _force_alphabet(record_iterator, alphabet):
                              % (alphabet, record.seq.alphabet))
 
 
+def parse_parallel(filename, format, alphabet=None, processes=None,
+                   map_function=None, ordered=True, chunk_size=2 ** 24):
+    """Parse a large sequence file using multiple processes.
+
+    Arguments:
+     - filename - string giving name of the (uncompressed) file to parse
+     - format   - lower case string describing the file format, one of
+       "fasta", "fasta-2line", "qual", "fastq" (and its variants "fastq-sanger",
+       "fastq-solexa" and "fastq-illumina"), "genbank" (or "gb"), "embl",
+       "imgt" or "swiss"
+     - alphabet - optional Alphabet object, as for Bio.SeqIO.parse()
+     - processes - number of worker processes (default is the number of
+       CPUs on the machine)
+     - map_function - optional function applied to each SeqRecord in the
+       worker processes, whose result is returned instead of the record
+     - ordered - if True (default) the results are returned in the same
+       order as the records in the file, otherwise each chunk of the
+       file is returned as soon as it has been parsed
+     - chunk_size - approximate size in bytes of the pieces the file is
+       split into (default 16 MB)
+
+    The file is split into chunks at record boundaries (found using the same
+    record start markers as Bio.SeqIO.index, e.g. a ">" line for FASTA), and
+    each chunk is parsed with Bio.SeqIO.parse() in a worker process. This
+    returns an iterator over the parsed records (or the results of calling
+    map_function on them). For FASTQ files, only the usual four lines per
+    record layout (without line wrapping of the sequence or quality) is
+    supported.
+
+    >>> from Bio import SeqIO
+    >>> for record in SeqIO.parse_parallel("Quality/example.fastq", "fastq",
+    ...                                    processes=2, chunk_size=100):
+    ...     print("%s %s" % (record.id, record.seq))
+    EAS54_6_R1_2_1_413_324 CCCTTCTTGTCTTCAGCGTTTCTCC
+    EAS54_6_R1_2_1_540_792 TTGGCAGGCCAAGGCCGATGGATCA
+    EAS54_6_R1_2_1_443_348 GTTGCTTCTGGCGTGGGTGGGGGGG
+
+    As the records or results are sent between processes by pickling, any
+    map_function must be defined at the top level of a module. Doing as much
+    of the work as possible in the map_function (e.g. calculating the GC
+    content of each record rather than returning the whole record) will
+    reduce the overhead of this and give the biggest speed up.
+
+    See Also: Bio.SeqIO.parse()
+    """
+    # Try and give helpful error messages:
+    if not isinstance(filename, basestring):
+        raise TypeError("Need a filename (not a handle)")
+    if not isinstance(format, basestring):
+        raise TypeError("Need a string for the file format (lower case)")
+    if not format:
+        raise ValueError("Format required (lower case string)")
+    if format != format.lower():
+        raise ValueError("Format string '%s' should be lower case" % format)
+    if alphabet is not None and not (isinstance(alphabet, Alphabet) or
+                                     isinstance(alphabet, AlphabetEncoder)):
+        raise ValueError("Invalid alphabet, %r" % alphabet)
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least one byte")
+
+    from ._parallel import _parse_parallel  # Lazy import
+    return _parse_parallel(filename, format, alphabet, processes,
+                           map_function, ordered, chunk_size)
+
+
 def read(handle, format, alphabet=None):
     """Turn a sequence file into a single SeqRecord.
 
@@ -812,7 +897,8 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(filename, format, alphabet=None, key_function=None, mmap=False,
+          lazy=False):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -824,6 +910,10 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - mmap - Optional boolean, memory map the file rather than reading it
+       via a file handle (uncompressed files only, requires NumPy).
+     - lazy - Optional boolean, leave the sequences in the file until needed
+       (uncompressed "fasta", "embl" and "genbank" files only).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values.
@@ -858,6 +948,43 @@ def index(filename, format, alphabet=None, key_function=None):
     TTGGCAGGCCAAGGCCGATGGATCA
     >>> records.close()
 
+    For very large uncompressed files with millions of random lookups, you
+    can ask for the file to be memory mapped. The file offsets are then held
+    in compact NumPy arrays rather than a dictionary of Python integers, and
+    the get_raw method returns a memoryview of the mapped file (no copy,
+    except on Python 2 where it returns a bytes string):
+
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq", mmap=True)
+    >>> len(records)
+    3
+    >>> print(records["EAS54_6_R1_2_1_540_792"].seq)
+    TTGGCAGGCCAAGGCCGATGGATCA
+    >>> raw = records.get_raw("EAS54_6_R1_2_1_540_792")
+    >>> print(bytes(raw[:23]).decode())
+    @EAS54_6_R1_2_1_540_792
+    >>> del raw
+    >>> records.close()
+
+    If you only need small regions of long sequences, you can ask for the
+    sequences to be loaded lazily. Each record's annotation is parsed as
+    usual, but its seq is a LazySeq object which only reads letters from
+    the file when they are needed, and slicing it reads just that region:
+
+    >>> from Bio import SeqIO
+    >>> records = SeqIO.index("GenBank/NC_005816.gb", "gb", lazy=True)
+    >>> record = records["NC_005816.1"]
+    >>> len(record)
+    9609
+    >>> print(record.seq[4342:4358])
+    ATGGGAGGGGGAATGA
+    >>> records.close()
+
+    This relies on every sequence line but the last having the same length
+    (as is usual), otherwise that record's sequence is loaded as normal.
+    Operations needing the whole sequence, like str(record.seq), will load
+    it from the file (which must not yet have been closed).
+
     Note that this pseudo dictionary will not support all the methods of a
     true Python dictionary, for example values() is not defined as in Python 2
     since this would require loading all of the records into memory at once.
@@ -940,6 +1067,7 @@ def index(filename, format, alphabet=None, key_function=None):
 
     # Map the file format to a sequence iterator:
     from ._index import _FormatToRandomAccess  # Lazy import
+    from ._index import _FormatToLazyRandomAccess
     from Bio.File import _IndexedSeqFileDict
     try:
         proxy_class = _FormatToRandomAccess[format]
@@ -947,12 +1075,24 @@ def index(filename, format, alphabet=None, key_function=None):
         raise ValueError("Unsupported format %r" % format)
     repr = "SeqIO.index(%r, %r, alphabet=%r, key_function=%r)" \
         % (filename, format, alphabet, key_function)
+    if lazy:
+        try:
+            proxy_class = _FormatToLazyRandomAccess[format]
+        except KeyError:
+            raise ValueError("Lazy loading is not supported for format %r"
+                             % format)
+        repr = repr[:-1] + ", lazy=True)"
+    if mmap:
+        from Bio.File import _MmapIndexedSeqFileDict
+        repr = repr[:-1] + ", mmap=True)"
+        return _MmapIndexedSeqFileDict(proxy_class(filename, format, alphabet),
+                                       key_function, repr, "SeqRecord")
     return _IndexedSeqFileDict(proxy_class(filename, format, alphabet),
                                key_function, repr, "SeqRecord")
 
 
 def index_db(index_filename, filenames=None, format=None, alphabet=None,
-             key_function=None):
+             key_function=None, processes=1):
     """Index several sequence files and return a dictionary like object.
 
     The index is stored in an SQLite database rather than in memory (as in the
@@ -971,6 +1111,9 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique
        key for the dictionary.
+     - processes - Optional number of worker processes used to scan the
+       files when building the index (default one, i.e. no worker
+       processes, or None for one per CPU).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -995,6 +1138,18 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
 
     In this example the two files contain 85 and 10 records respectively.
 
+    When indexing many files, the processes argument can be used to scan
+    the files in parallel. More files can be added to an existing index
+    later on, without having to re-index the files already in it:
+
+    >>> records = SeqIO.index_db(idx_name, files[:1], "fasta", generic_protein)
+    >>> len(records)
+    85
+    >>> records.add_files(files[1:])
+    >>> len(records)
+    95
+    >>> records.close()
+
     BGZF compressed files are supported, and detected automatically. Ordinary
     GZIP compressed files are not supported.
 
@@ -1021,21 +1176,15 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
         raise ValueError("Invalid alphabet, %r" % alphabet)
 
     # Map the file format to a sequence iterator:
-    from ._index import _FormatToRandomAccess  # Lazy import
+    from functools import partial
+    from ._index import _proxy_factory  # Lazy import
     from Bio.File import _SQLiteManySeqFilesDict
     repr = ("SeqIO.index_db(%r, filenames=%r, format=%r, alphabet=%r, key_function=%r)"
             % (index_filename, filenames, format, alphabet, key_function))
 
-    def proxy_factory(format, filename=None):
-        """Given a filename returns proxy object, else boolean if format OK."""
-        if filename:
-            return _FormatToRandomAccess[format](filename, format, alphabet)
-        else:
-            return format in _FormatToRandomAccess
-
     return _SQLiteManySeqFilesDict(index_filename, filenames,
-                                   proxy_factory, format,
-                                   key_function, repr)
+                                   partial(_proxy_factory, alphabet), format,
+                                   key_function, repr, processes=processes)
 
 
 def convert(in_file, in_format, out_file, out_format, alphabet=None):
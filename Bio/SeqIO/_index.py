@@ -35,7 +35,9 @@ from Bio._py3k import _bytes_to_string
 
 from Bio import SeqIO
 from Bio import Alphabet
+from Bio import bgzf
 from Bio.File import _IndexedSeqFileProxy, _open_for_random_access
+from Bio.Seq import Seq
 
 
 class SeqFileRandomAccess(_IndexedSeqFileProxy):
@@ -171,6 +173,37 @@ class SffTrimedRandomAccess(SffRandomAccess):
 # Simple indexers #
 ###################
 
+class TwoBitRandomAccess(SeqFileRandomAccess):
+    """Random access to a UCSC 2bit file, using the index in its header."""
+
+    def __init__(self, filename, format, alphabet):
+        """Initialize the class."""
+        SeqFileRandomAccess.__init__(self, filename, format, alphabet)
+        self._alphabet = SeqIO.TwoBitIO._check_alphabet(alphabet)
+        self._data = SeqIO.TwoBitIO._open_data(self._handle)
+        self._byteorder, self._index = \
+            SeqIO.TwoBitIO._read_header(self._data)
+        self._names = dict((offset, name) for name, offset in self._index)
+
+    def __iter__(self):
+        """Return (name, offset, 0) tuples from the file's own index."""
+        for name, offset in self._index:
+            yield name, offset, 0
+
+    def get(self, offset):
+        """Return SeqRecord, with the sequence left in the file until needed."""
+        return SeqIO.TwoBitIO._read_record(self._data, self._byteorder,
+                                           self._names[offset], offset,
+                                           self._alphabet)
+
+    def close(self):
+        """Close the memory mapping and the file handle."""
+        if hasattr(self._data, "close"):
+            # A memory mapping, rather than the file contents as bytes
+            self._data.close()
+        self._handle.close()
+
+
 class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
     def __init__(self, filename, format, alphabet):
         """Initialize the class."""
@@ -665,6 +698,340 @@ class FastqRandomAccess(SeqFileRandomAccess):
         return data
 
 
+##################
+# Lazy indexers  #
+##################
+# Records whose sequence is only read from the file on demand, useful
+# with long sequences where only a small region is needed. This relies
+# on every sequence line (bar the last) having the same layout, so that
+# the file offset of any letter can be calculated.
+
+class _LazySeqSource(object):
+    """Location and line layout of a sequence within a file (PRIVATE)."""
+
+    def __init__(self, handle, seq_offset, seq_end, line_bases, line_width,
+                 length, delete, upper):
+        """Initialize the class."""
+        self._handle = handle
+        self._seq_offset = seq_offset
+        self._seq_end = seq_end
+        self._line_bases = line_bases
+        self._line_width = line_width
+        self.length = length
+        self._delete = delete
+        self._upper = upper
+
+    def fetch(self, start, end):
+        """Return the letters start to end as a string, reading only those lines."""
+        if start >= end:
+            return ""
+        first = start // self._line_bases
+        last = (end - 1) // self._line_bases + 1
+        begin = self._seq_offset + first * self._line_width
+        finish = min(self._seq_offset + last * self._line_width,
+                     self._seq_end)
+        self._handle.seek(begin)
+        data = self._handle.read(finish - begin).translate(None, self._delete)
+        offset = first * self._line_bases
+        data = _bytes_to_string(data[start - offset:end - offset])
+        if self._upper:
+            return data.upper()
+        return data
+
+
+class LazySeq(Seq):
+    """Seq object which reads its sequence from an indexed file on demand.
+
+    You wouldn't normally create a LazySeq object yourself, this is done
+    for you when using Bio.SeqIO.index(..., lazy=True). The length is known
+    without reading the sequence, and slicing gives another LazySeq object.
+    Only when the letters themselves are needed are they read from the file,
+    which must therefore still be open (i.e. the index not yet closed).
+
+    Any other operation needing the whole sequence (e.g. str(my_seq), or
+    the reverse_complement method) will load it all from the file, and
+    keep it in memory as a normal Seq object would. Adding or multiplying
+    a LazySeq, or copying or pickling it, gives a normal Seq object.
+    """
+
+    def __init__(self, source, alphabet, start=0, length=None):
+        """Create a new LazySeq object for part of an indexed sequence."""
+        self._source = source
+        self.alphabet = alphabet
+        self._start = start
+        if length is None:
+            length = source.length - start
+        self._length = length
+        self._loaded = None
+
+    @property
+    def _data(self):
+        """Full sequence as a string, loaded from the file when first used."""
+        if self._loaded is None:
+            self._loaded = self._source.fetch(self._start,
+                                              self._start + self._length)
+        return self._loaded
+
+    def __len__(self):
+        """Return the length of the sequence."""
+        return self._length
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if self._loaded is not None or self._length <= 60:
+            return Seq.__repr__(self)
+        # As in the Seq object, but only read the letters shown
+        if self.alphabet is Alphabet.generic_alphabet:
+            a = ""
+        else:
+            a = ", %r" % self.alphabet
+        return "{0}('{1}...{2}'{3!s})".format(self.__class__.__name__,
+                                              str(self[:54]),
+                                              str(self[-3:]),
+                                              a)
+
+    def __getitem__(self, index):
+        """Return a subsequence or single letter.
+
+        Slices without a step give another LazySeq object, reading nothing
+        from the file. Other slices are returned as Seq objects, reading
+        just the region needed from the file.
+        """
+        if self._loaded is not None:
+            return Seq.__getitem__(self, index)
+        if isinstance(index, int):
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("sequence index out of range")
+            return self._source.fetch(self._start + index,
+                                      self._start + index + 1)
+        start, stop, step = index.indices(self._length)
+        if step == 1:
+            return self.__class__(self._source, self.alphabet,
+                                  self._start + start, max(0, stop - start))
+        positions = range(start, stop, step)
+        if not positions:
+            return Seq("", self.alphabet)
+        low = min(positions[0], positions[-1])
+        high = max(positions[0], positions[-1]) + 1
+        data = self._source.fetch(self._start + low, self._start + high)
+        return Seq(data[positions[0] - low::step][:len(positions)],
+                   self.alphabet)
+
+    def _as_seq(self):
+        """Return the sequence as a Seq object, loading it if needed (PRIVATE)."""
+        return Seq(self._data, self.alphabet)
+
+    def __add__(self, other):
+        """Add another sequence or string, giving a Seq object."""
+        return Seq.__add__(self._as_seq(), other)
+
+    def __radd__(self, other):
+        """Add a sequence or string on the left, giving a Seq object."""
+        return Seq.__radd__(self._as_seq(), other)
+
+    def __mul__(self, other):
+        """Multiply by an integer, giving a Seq object."""
+        return Seq.__mul__(self._as_seq(), other)
+
+    def __rmul__(self, other):
+        """Multiply an integer by the sequence, giving a Seq object."""
+        return Seq.__rmul__(self._as_seq(), other)
+
+    def __imul__(self, other):
+        """Multiply in-place, giving a Seq object."""
+        return Seq.__imul__(self._as_seq(), other)
+
+    def __deepcopy__(self, memo):
+        """Return a Seq object with a copy of the sequence.
+
+        The copy does not refer to the file, so can be used once the index
+        has been closed.
+        """
+        return self._as_seq()
+
+    def __reduce__(self):
+        """Pickle as a Seq object, as the file handle cannot be pickled."""
+        return Seq, (self._data, self.alphabet)
+
+
+class _LazyRandomAccess(object):
+    """Mixin class giving records with LazySeq sequences (PRIVATE).
+
+    For FASTA the sequence follows the title line, for the other formats
+    the sequence follows a line starting with _seq_marker, and the record
+    header is parsed without the sequence lines.
+
+    As in a samtools faidx index, the line layout of each sequence is found
+    once while indexing the file, so fetching a record only reads its
+    header, and its sequence letters when these are needed.
+    """
+
+    _seq_marker = None
+    _end_marker = b">"
+    _delete = b" \t\r\n"
+    _upper = False
+    _chunk_size = 65536
+
+    def __init__(self, filename, format, alphabet):
+        """Initialize the class."""
+        super(_LazyRandomAccess, self).__init__(filename, format, alphabet)
+        if isinstance(self._handle, bgzf.BgzfReader):
+            self._handle.close()
+            raise ValueError("Lazy loading is not supported on BGZF files")
+        # Sequence layouts found while indexing, keyed by record offset
+        self._layouts = {}
+
+    def __iter__(self):
+        """Return (id, offset, length) tuples, recording the sequence layouts."""
+        entries = list(super(_LazyRandomAccess, self).__iter__())
+        layouts = {}
+        for entry in entries:
+            offset = entry[1]
+            header = self._read_header(offset)
+            if header is None:
+                layouts[offset] = None
+            else:
+                layouts[offset] = self._scan_sequence(header[1])
+        self._layouts = layouts
+        for entry in entries:
+            yield entry
+
+    def _read_header(self, offset):
+        """Return the header lines and sequence offset of a record (PRIVATE).
+
+        Returns None if the record has no sequence lines to leave in the file.
+        """
+        handle = self._handle
+        handle.seek(offset)
+        lines = [handle.readline()]
+        if self._seq_marker is not None:
+            while True:
+                line = handle.readline()
+                if not line or line.startswith(self._end_marker) or \
+                        self._marker_re.match(line):
+                    return None
+                lines.append(line)
+                if line.startswith(self._seq_marker):
+                    break
+            lines.append(self._end_marker + b"\n")
+        return lines, handle.tell()
+
+    def _scan_sequence(self, seq_offset):
+        """Find the end of the sequence and check its line layout (PRIVATE).
+
+        Reads the sequence lines in chunks without keeping them in memory.
+        Returns a tuple of the end offset, letters per line, bytes per line,
+        and sequence length, or None if the lines are not regular.
+        """
+        handle = self._handle
+        handle.seek(seq_offset)
+        first = handle.readline()
+        line_width = len(first)
+        line_bases = len(first.translate(None, self._delete))
+        if not line_bases or first.startswith(self._end_marker):
+            return None
+        # Read whole lines at a time, so chunks start at a line start
+        size = line_width * max(1, self._chunk_size // line_width)
+        marker = b"\n" + self._end_marker
+        handle.seek(seq_offset)
+        offset = seq_offset
+        length = 0
+        while True:
+            chunk = handle.read(size)
+            if chunk.startswith(self._end_marker):
+                return offset, line_bases, line_width, length
+            i = chunk.find(marker)
+            if i != -1:
+                chunk = chunk[:i + 1]
+            if len(chunk) < size:
+                # Reached the end of the sequence, last line may be shorter
+                last = chunk.rfind(b"\n", 0, len(chunk) - 1) + 1
+            else:
+                last = len(chunk)
+            body = chunk[:last]
+            tail = chunk[last:]
+            full_lines = len(body) // line_width
+            letters = len(body.translate(None, self._delete))
+            tail_letters = len(tail.translate(None, self._delete))
+            if len(body) != full_lines * line_width or \
+                    body.count(b"\n") != full_lines or \
+                    body[line_width - 1::line_width].count(b"\n") != \
+                    full_lines or \
+                    letters != full_lines * line_bases or \
+                    len(tail) > line_width or tail_letters > line_bases:
+                return None
+            length += letters + tail_letters
+            offset += len(chunk)
+            if len(chunk) < size:
+                return offset, line_bases, line_width, length
+
+    def get(self, offset):
+        """Return SeqRecord, with the sequence left in the file as a LazySeq."""
+        header = self._read_header(offset)
+        if header is None:
+            # No sequence, just parse the record as normal
+            return super(_LazyRandomAccess, self).get(offset)
+        lines, seq_offset = header
+        if offset in self._layouts:
+            layout = self._layouts[offset]
+        else:
+            # Not an offset found while indexing, so check the layout now
+            layout = self._scan_sequence(seq_offset)
+        if layout is None:
+            # Empty or irregularly laid out sequence, parse as normal
+            return super(_LazyRandomAccess, self).get(offset)
+        seq_end, line_bases, line_width, length = layout
+        record = self._parse(StringIO(_bytes_to_string(b"".join(lines))))
+        if self._seq_marker is not None and \
+                (len(record.seq) != length or
+                 isinstance(record.seq.alphabet, Alphabet.RNAAlphabet)):
+            # Header disagrees with the sequence (let the parser complain),
+            # or the parser would look at the sequence to pick DNA or RNA
+            return super(_LazyRandomAccess, self).get(offset)
+        source = _LazySeqSource(self._handle, seq_offset, seq_end, line_bases,
+                                line_width, length, self._delete,
+                                self._upper)
+        record.seq = LazySeq(source, record.seq.alphabet)
+        return record
+
+
+class LazyFastaRandomAccess(_LazyRandomAccess, SequentialSeqFileRandomAccess):
+    """Indexed access to a FASTA file, with lazy loading of the sequences."""
+
+
+class LazyGenBankRandomAccess(_LazyRandomAccess, GenBankRandomAccess):
+    """Indexed access to a GenBank file, with lazy loading of the sequences."""
+
+    _seq_marker = b"ORIGIN"
+    _end_marker = b"//"
+    _delete = b" \t\r\n0123456789"
+    _upper = True
+
+
+class LazyEmblRandomAccess(_LazyRandomAccess, EmblRandomAccess):
+    """Indexed access to an EMBL file, with lazy loading of the sequences."""
+
+    _seq_marker = b"SQ "
+    _end_marker = b"//"
+    _delete = b" \t\r\n0123456789"
+    _upper = True
+
+
+def _proxy_factory(alphabet, format, filename=None):
+    """Given a filename returns proxy object, else boolean if format OK (PRIVATE).
+
+    Used by Bio.SeqIO.index_db(...) with the alphabet bound using
+    functools.partial, which unlike a nested function can be pickled
+    for use in worker processes.
+    """
+    if filename:
+        return _FormatToRandomAccess[format](filename, format, alphabet)
+    else:
+        return format in _FormatToRandomAccess
+
+
 ###############################################################################
 
 _FormatToRandomAccess = {"ace": SequentialSeqFileRandomAccess,
@@ -684,6 +1051,13 @@ _FormatToRandomAccess = {"ace": SequentialSeqFileRandomAccess,
                          "sff-trim": SffTrimedRandomAccess,
                          "swiss": SwissRandomAccess,
                          "tab": TabRandomAccess,
+                         "twobit": TwoBitRandomAccess,
                          "qual": SequentialSeqFileRandomAccess,
                          "uniprot-xml": UniprotRandomAccess,
                          }
+
+_FormatToLazyRandomAccess = {"embl": LazyEmblRandomAccess,
+                             "fasta": LazyFastaRandomAccess,
+                             "genbank": LazyGenBankRandomAccess,
+                             "gb": LazyGenBankRandomAccess,
+                             }
@@ -0,0 +1,172 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Parallel parsing of large sequence files (PRIVATE).
+
+You are not expected to access this module, or any of its code, directly. This
+is all handled internally by the Bio.SeqIO.parse_parallel(...) function which
+is the public interface for this functionality.
+
+The basic idea is that we split a (seekable, uncompressed) sequence file into
+chunks of roughly equal size, moving each split point forward to the start
+of the next record. This uses the same record markers as the Bio.SeqIO.index
+code (e.g. a line starting with ">" for FASTA). Each chunk is then read and
+parsed by a separate worker process using Bio.SeqIO.parse, and the resulting
+SeqRecord objects (or the results of a user supplied function applied to
+them) are sent back to the parent process.
+"""
+
+from __future__ import print_function
+
+import os
+import re
+import multiprocessing
+
+from Bio._py3k import StringIO
+from Bio._py3k import _bytes_to_string
+
+from Bio import SeqIO
+
+
+# Line prefixes marking the start of a record, as used for indexing
+# in Bio.SeqIO._index (except FASTQ, see _next_fastq_start below)
+_FormatToMarker = {"embl": b"ID ",
+                   "fasta": b">",
+                   "fasta-2line": b">",
+                   "genbank": b"LOCUS ",
+                   "gb": b"LOCUS ",
+                   "imgt": b"ID ",
+                   "qual": b">",
+                   "swiss": b"ID ",
+                   }
+
+_FastqFormats = ["fastq", "fastq-sanger", "fastq-solexa", "fastq-illumina"]
+
+
+def _next_line_start(handle, offset):
+    """Position the handle at the first line start at or after offset (PRIVATE)."""
+    if offset == 0:
+        handle.seek(0)
+    else:
+        # Reading from one byte earlier means we stay put if offset is
+        # already at the start of a line (previous byte is a new line)
+        handle.seek(offset - 1)
+        handle.readline()
+
+
+def _next_marker_start(handle, offset, marker_re):
+    """Return offset of the next record starting with the marker (PRIVATE)."""
+    _next_line_start(handle, offset)
+    while True:
+        start = handle.tell()
+        line = handle.readline()
+        if not line or marker_re.match(line):
+            return start
+
+
+def _next_fastq_start(handle, offset):
+    """Return offset of the next four line FASTQ record (PRIVATE).
+
+    As quality lines can start with "@" (or "+"), we look for an "@" line
+    followed by a sequence line, a "+" line, and a quality line of the same
+    length as the sequence. This assumes the FASTQ file does not use line
+    wrapping, as is almost always the case with large files.
+    """
+    _next_line_start(handle, offset)
+    window = []
+    while True:
+        while len(window) < 4:
+            start = handle.tell()
+            line = handle.readline()
+            if not line:
+                # End of file, no more complete records to be found
+                return start
+            window.append((start, line))
+        title, seq, plus, qual = [line for start, line in window]
+        if title[:1] == b"@" and plus[:1] == b"+" and \
+                seq[:1] not in (b"@", b"+") and \
+                len(seq.rstrip()) == len(qual.rstrip()):
+            return window[0][0]
+        window.pop(0)
+
+
+def _chunk_offsets(filename, format, chunk_size):
+    """Return list of (start, end) offsets splitting the file at records (PRIVATE)."""
+    if format in _FastqFormats:
+        def next_start(handle, offset):
+            return _next_fastq_start(handle, offset)
+    else:
+        try:
+            marker_re = re.compile(b"^" + re.escape(_FormatToMarker[format]))
+        except KeyError:
+            raise ValueError("Parallel parsing is not supported for format %r"
+                             % format)
+
+        def next_start(handle, offset):
+            return _next_marker_start(handle, offset, marker_re)
+
+    size = os.path.getsize(filename)
+    chunks = []
+    with open(filename, "rb") as handle:
+        start = 0
+        while start < size:
+            end = next_start(handle, min(size, start + chunk_size))
+            if end <= start:
+                # Only possible for a very odd file, don't loop forever
+                end = size
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def _parse_chunk(task):
+    """Parse the records in one chunk of the file (PRIVATE).
+
+    This is called in the worker processes, and so must be a top level
+    function which can be pickled.
+    """
+    filename, format, alphabet, start, end, map_function = task
+    with open(filename, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    handle = StringIO(_bytes_to_string(data))
+    if map_function is None:
+        return list(SeqIO.parse(handle, format, alphabet))
+    else:
+        return [map_function(r) for r in SeqIO.parse(handle, format, alphabet)]
+
+
+def _parse_parallel(filename, format, alphabet, processes, map_function,
+                    ordered, chunk_size):
+    """Split the file into chunks and return an iterator over the results (PRIVATE)."""
+    # Done up front (rather than in the generator) so that problems like
+    # an unsupported format are reported immediately
+    tasks = [(filename, format, alphabet, start, end, map_function)
+             for start, end in _chunk_offsets(filename, format, chunk_size)]
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(processes, len(tasks)))
+    return _iterate_chunks(tasks, processes, ordered)
+
+
+def _iterate_chunks(tasks, processes, ordered):
+    """Parse the chunks in a pool of worker processes, yielding the results (PRIVATE)."""
+    if not tasks:
+        return
+    pool = multiprocessing.Pool(processes)
+    try:
+        if ordered:
+            results = pool.imap(_parse_chunk, tasks)
+        else:
+            results = pool.imap_unordered(_parse_chunk, tasks)
+        for chunk in results:
+            for r in chunk:
+                yield r
+        pool.close()
+    finally:
+        # Also cleans up if the caller stops iterating early
+        pool.terminate()
+        pool.join()
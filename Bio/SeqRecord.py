@@ -8,6 +8,8 @@
 # package.
 """Represent a Sequence Record, a sequence with annotation."""
 
+from array import array
+from bisect import bisect_left, bisect_right
 
 from Bio._py3k import basestring
 
@@ -90,6 +92,191 @@ class _RestrictedDict(dict):
             self[key] = value
 
 
+def _join_letter_annotations(first, second):
+    """Concatenate two per-letter-annotation values (PRIVATE).
+
+    Lists, tuples, strings and array.array objects are joined with +, but
+    for NumPy arrays that would add the values together, so these are
+    concatenated using NumPy instead.
+    """
+    if hasattr(first, "dtype") or hasattr(second, "dtype"):
+        import numpy
+        return numpy.concatenate((first, second))
+    if isinstance(first, array) and not isinstance(second, array):
+        second = array(first.typecode, second)
+    elif isinstance(second, array) and not isinstance(first, array):
+        first = array(second.typecode, first)
+    return first + second
+
+
+class _FeatureIndex(object):
+    """Index of the feature locations of a SeqRecord for region queries (PRIVATE).
+
+    This is a nested containment list (Alekseyenko and Lee 2007,
+    Bioinformatics 23: 1386-1393) of the start and end of each feature
+    (as integers, approximated if fuzzy). The intervals are sorted by
+    start, and any interval contained in another is nested in a sublist
+    below it, so within each (sub)list the ends are sorted too. Finding
+    the k features overlapping a region then takes O(log n + k) time, plus
+    the time to check any pending features (see below).
+
+    Features without a (known) location, and those referencing other
+    sequences (with ref or ref_db set), are not indexed.
+
+    The index keeps the length of the features list it was built from,
+    and its first and last features. When features have been appended to
+    the list, they are added to a short list of pending features which
+    are checked one by one, until there are enough of them to make it
+    worth rebuilding the index. To keep this check cheap, any other change
+    to the list is only noticed if it makes the list shorter, or replaces
+    its first feature or the last feature seen before. The record builds
+    a new index when its features attribute is set to a new list.
+    """
+
+    def __init__(self, features):
+        """Build the index of a list of SeqFeature objects."""
+        self.features = features
+        self.count = len(features)
+        self.first = features[0] if features else None
+        self.last = features[-1] if features else None
+        self.pending = []
+        self.refs = []
+        intervals = []
+        for i, feature in enumerate(features):
+            interval = self._interval(i, feature)
+            if interval is not None:
+                intervals.append(interval)
+        intervals.sort(key=lambda interval: (interval[0], -interval[1]))
+        self.starts = [start for start, end, i in intervals]
+        self.start_indices = [i for start, end, i in intervals]
+        intervals_by_end = sorted(intervals, key=lambda interval: interval[1])
+        self.ends = [end for start, end, i in intervals_by_end]
+        self.end_indices = [i for start, end, i in intervals_by_end]
+        # Each (sub)list holds the starts, ends, feature indices and any
+        # sublist of the intervals contained in each interval
+        self.top = ([], [], [], [])
+        stack = []
+        for start, end, i in intervals:
+            while stack and stack[-1][0] < end:
+                stack.pop()
+            if stack:
+                parent, j = stack[-1][1:]
+                if parent[3][j] is None:
+                    parent[3][j] = ([], [], [], [])
+                current = parent[3][j]
+            else:
+                current = self.top
+            current[0].append(start)
+            current[1].append(end)
+            current[2].append(i)
+            current[3].append(None)
+            stack.append((end, current, len(current[0]) - 1))
+
+    def _interval(self, i, feature):
+        """Return the (start, end, i) tuple for a feature, or None (PRIVATE)."""
+        if feature.ref or feature.ref_db:
+            self.refs.append(i)
+            return None
+        location = feature.location
+        if location is None:
+            return None
+        try:
+            return int(location.start), int(location.end), i
+        except TypeError:
+            # Unknown position
+            return None
+
+    def update(self, features):
+        """Add any features appended to the list, return False if out of date.
+
+        The index cannot be updated (and must be rebuilt) if it is for a
+        different list, if the list has got shorter, if its first feature
+        or the last one seen before has been replaced, or if there are too
+        many pending features. This takes O(1) time (plus the time to add
+        any appended features), so other changes made in place to the list
+        which keep these the same are not detected.
+        """
+        count = self.count
+        if features is not self.features or len(features) < count:
+            return False
+        if count and (features[0] is not self.first or
+                      features[count - 1] is not self.last):
+            return False
+        for i in range(count, len(features)):
+            interval = self._interval(i, features[i])
+            if interval is not None:
+                self.pending.append(interval)
+        if len(features) > count:
+            self.count = len(features)
+            self.first = features[0]
+            self.last = features[-1]
+        return len(self.pending) <= max(16, len(self.starts) // 8)
+
+    def search(self, start, end, closed=False):
+        """Return the indices of the features overlapping start to end.
+
+        By default these are the features starting before the end of the
+        region, and ending after its start. If closed is True, the features
+        starting at the end of the region, or ending at its start, are also
+        included. The indices are not sorted.
+        """
+        found = []
+        lists = [self.top]
+        while lists:
+            starts, ends, indices, sublists = lists.pop()
+            if closed:
+                first = bisect_left(ends, start)
+                last = bisect_right(starts, end)
+            else:
+                first = bisect_right(ends, start)
+                last = bisect_left(starts, end)
+            for j in range(first, last):
+                found.append(indices[j])
+                if sublists[j] is not None:
+                    lists.append(sublists[j])
+        for s, e, i in self.pending:
+            if (s <= end and start <= e) if closed else (s < end and start < e):
+                found.append(i)
+        return found
+
+    def within(self, start, end):
+        """Return the indices of the features within start to end, in order."""
+        features = self.features
+        found = []
+        for i in self.search(start, end, closed=True):
+            location = features[i].location
+            if start <= int(location.start) and int(location.end) <= end:
+                found.append(i)
+        found.sort()
+        return found
+
+    def nearest(self, start, end):
+        """Return the indices of the features nearest to start to end, in order.
+
+        The distance is the gap between a feature and the region, zero if
+        they overlap or are next to each other.
+        """
+        found = self.search(start, end, closed=True)
+        if not found:
+            distances = {}
+            # The features ending before the region, with the largest end
+            j = bisect_right(self.ends, start)
+            if j:
+                k = bisect_left(self.ends, self.ends[j - 1])
+                distances[start - self.ends[j - 1]] = self.end_indices[k:j]
+            # The features starting after the region, with the smallest start
+            j = bisect_left(self.starts, end)
+            if j < len(self.starts):
+                k = bisect_right(self.starts, self.starts[j])
+                distances.setdefault(self.starts[j] - end, []).extend(
+                    self.start_indices[j:k])
+            for s, e, i in self.pending:
+                distances.setdefault(max(start - e, s - end), []).append(i)
+            if distances:
+                found = distances[min(distances)]
+        return sorted(set(found))
+
+
 class SeqRecord(object):
     """A SeqRecord object holds a sequence and information about it.
 
@@ -151,6 +338,9 @@ class SeqRecord(object):
 
     """
 
+    # Index of the feature locations, see the overlapping_features method
+    _feature_index = None
+
     def __init__(self, seq, id="<unknown id>", name="<unknown name>",
                  description="<unknown description>", dbxrefs=None,
                  features=None, annotations=None,
@@ -166,8 +356,8 @@ class SeqRecord(object):
          - features    - Any (sub)features, optional (list of SeqFeature objects)
          - annotations - Dictionary of annotations for the whole sequence
          - letter_annotations - Dictionary of per-letter-annotations, values
-           should be strings, list or tuples of the same length as the full
-           sequence.
+           should be strings, list or tuples (or arrays) of the same length
+           as the full sequence.
 
         You will typically use Bio.SeqIO to read in sequences from files as
         SeqRecord objects.  However, you may want to create your own SeqRecord
@@ -296,6 +486,21 @@ class SeqRecord(object):
 
         Note that if replacing the record's sequence with a sequence of a
         different length you must first clear the letter_annotations dict.
+
+        For large numbers of reads, quality scores can be held much more
+        compactly in an array.array (or a NumPy array) of bytes than in a
+        list, and these are kept as they are when slicing or adding records
+        (slicing a NumPy array gives a view, rather than a copy):
+
+        >>> from array import array
+        >>> record.letter_annotations["solexa_quality"] = array(
+        ...     "b", record.letter_annotations["solexa_quality"])
+        >>> sub_record = record[-10:] + record[:2]
+        >>> print(sub_record.letter_annotations["solexa_quality"])
+        array('b', [4, 3, 2, 1, 0, -1, -2, -3, -4, -5, 40, 39])
+
+        The FASTQ parsers in Bio.SeqIO.QualityIO can store the qualities like
+        this directly, see their compact argument.
         """)
 
     def _set_seq(self, value):
@@ -470,6 +675,8 @@ class SeqRecord(object):
             if step == 1:
                 # Select relevant features, add them with shifted locations
                 # assert str(self.seq)[index] == str(self.seq)[start:stop]
+                # Check every feature rather than using the feature index,
+                # as the index may not notice changes made in place
                 for f in self.features:
                     if f.ref or f.ref_db:
                         # TODO - Implement this (with lots of tests)?
@@ -478,6 +685,8 @@ class SeqRecord(object):
                                       "SeqFeature referencing other sequences (e.g. "
                                       "from segmented GenBank records) are ignored.")
                         continue
+                    if f.location is None:
+                        continue
                     if start <= f.location.nofuzzy_start \
                             and f.location.nofuzzy_end <= stop:
                         answer.features.append(f._shift(-start))
@@ -490,6 +699,119 @@ class SeqRecord(object):
             return answer
         raise ValueError("Invalid index")
 
+    def _get_feature_index(self):
+        """Return the index of the features, building it if needed (PRIVATE)."""
+        feature_index = self._feature_index
+        if feature_index is None or not feature_index.update(self.features):
+            feature_index = self._feature_index = _FeatureIndex(self.features)
+        return feature_index
+
+    def overlapping_features(self, start, end):
+        """Return a list of the features overlapping the region start to end.
+
+        The region is given in Python slice style (zero based, with the end
+        excluded), as are the feature locations. A feature overlaps if it
+        starts before the end of the region, and ends after its start:
+
+        >>> from Bio.Seq import Seq
+        >>> from Bio.SeqRecord import SeqRecord
+        >>> from Bio.SeqFeature import SeqFeature, FeatureLocation
+        >>> rec = SeqRecord(Seq("ACGT" * 25), id="example")
+        >>> rec.features.append(SeqFeature(FeatureLocation(10, 60), type="gene"))
+        >>> rec.features.append(SeqFeature(FeatureLocation(20, 30), type="CDS"))
+        >>> rec.features.append(SeqFeature(FeatureLocation(70, 90), type="gene"))
+        >>> for feature in rec.overlapping_features(25, 75):
+        ...     print("%s %i-%i" % (feature.type, feature.location.start,
+        ...                         feature.location.end))
+        gene 10-60
+        CDS 20-30
+        gene 70-90
+        >>> for feature in rec.overlapping_features(30, 70):
+        ...     print("%s %i-%i" % (feature.type, feature.location.start,
+        ...                         feature.location.end))
+        gene 10-60
+
+        The features are returned in the same order as in the features list.
+        Fuzzy positions are approximated by integers (see the nofuzzy_start
+        and nofuzzy_end properties of the locations), and for compound
+        locations (e.g. joins) the region spanned by all the parts is used.
+        Features without a known location, or referencing other sequences,
+        are ignored.
+
+        This uses an index of the feature locations, built the first time
+        it is needed, so it does not have to check every feature. Features
+        appended to the features list afterwards are taken into account,
+        as are features removed from the end of the list. Other changes
+        made to the list in place (such as sorting it, or replacing a
+        feature in the middle), or to the location of a feature already in
+        the list, may not be noticed. After such changes, set the features
+        to a new list (e.g. rec.features = list(rec.features)) so that the
+        index is rebuilt.
+        """
+        feature_index = self._get_feature_index()
+        return [self.features[i] for i in sorted(feature_index.search(start,
+                                                                      end))]
+
+    def contained_features(self, start, end):
+        """Return a list of the features lying within the region start to end.
+
+        These are the features which would be kept when slicing the record
+        with start:end, with their original locations:
+
+        >>> from Bio.Seq import Seq
+        >>> from Bio.SeqRecord import SeqRecord
+        >>> from Bio.SeqFeature import SeqFeature, FeatureLocation
+        >>> rec = SeqRecord(Seq("ACGT" * 25), id="example")
+        >>> rec.features.append(SeqFeature(FeatureLocation(10, 60), type="gene"))
+        >>> rec.features.append(SeqFeature(FeatureLocation(20, 30), type="CDS"))
+        >>> rec.features.append(SeqFeature(FeatureLocation(70, 90), type="gene"))
+        >>> for feature in rec.contained_features(0, 60):
+        ...     print("%s %i-%i" % (feature.type, feature.location.start,
+        ...                         feature.location.end))
+        gene 10-60
+        CDS 20-30
+
+        See the overlapping_features method for details.
+        """
+        feature_index = self._get_feature_index()
+        return [self.features[i] for i in feature_index.within(start, end)]
+
+    def nearest_features(self, start, end=None):
+        """Return a list of the features nearest to a position or region.
+
+        Arguments:
+         - start - the position, or the start of the region.
+         - end - the end of the region (default start, meaning the
+           position between start - 1 and start).
+
+        The distance is the gap between a feature and the region, which
+        is zero if they overlap or are next to each other. All the
+        features with the smallest distance are returned:
+
+        >>> from Bio.Seq import Seq
+        >>> from Bio.SeqRecord import SeqRecord
+        >>> from Bio.SeqFeature import SeqFeature, FeatureLocation
+        >>> rec = SeqRecord(Seq("ACGT" * 25), id="example")
+        >>> rec.features.append(SeqFeature(FeatureLocation(10, 60), type="gene"))
+        >>> rec.features.append(SeqFeature(FeatureLocation(20, 30), type="CDS"))
+        >>> rec.features.append(SeqFeature(FeatureLocation(70, 90), type="gene"))
+        >>> for feature in rec.nearest_features(66):
+        ...     print("%s %i-%i" % (feature.type, feature.location.start,
+        ...                         feature.location.end))
+        gene 70-90
+        >>> for feature in rec.nearest_features(65):
+        ...     print("%s %i-%i" % (feature.type, feature.location.start,
+        ...                         feature.location.end))
+        gene 10-60
+        gene 70-90
+
+        See the overlapping_features method for details.
+        """
+        if end is None:
+            end = start
+        feature_index = self._get_feature_index()
+        return [self.features[i] for i in feature_index.nearest(start, end)]
+
     def __iter__(self):
         """Iterate over the letters in the sequence.
 
@@ -894,7 +1216,8 @@ class SeqRecord(object):
         # Can append matching per-letter-annotation
         for k, v in self.letter_annotations.items():
             if k in other.letter_annotations:
-                answer.letter_annotations[k] = v + other.letter_annotations[k]
+                answer.letter_annotations[k] = _join_letter_annotations(
+                    v, other.letter_annotations[k])
         return answer
 
     def __radd__(self, other):
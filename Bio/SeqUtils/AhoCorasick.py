@@ -0,0 +1,126 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Find every occurrence of many patterns in a sequence in a single pass.
+
+The Automaton class implements the Aho-Corasick algorithm in C. The
+patterns (e.g. motif instances, adapters, or barcodes) are combined into a
+single finite automaton, which then finds all the matches to all the
+patterns in one scan of the sequence, taking time proportional to the
+length of the sequence plus the number of matches:
+
+>>> from Bio.SeqUtils.AhoCorasick import Automaton
+>>> automaton = Automaton(["GATC", "GGATCC", "TCC"])
+>>> for position, index in automaton.search("AGGATCCGATC"):
+...     print("%i %s" % (position, automaton.patterns[index]))
+1 GGATCC
+2 GATC
+4 TCC
+7 GATC
+
+Matching is case sensitive, and the matches are given in order of their
+start position (then in the order of the patterns). With both=True, the
+reverse complement of each pattern is searched for too, and matches on the
+reverse strand are given as negative positions, as in the search method of
+Bio.motifs position specific scoring matrices:
+
+>>> for position, index in Automaton(["AAGG"]).search("AAGGTACCTT", both=True):
+...     print(position)
+0
+-4
+
+Here the reverse complement CCTT was found starting at position 6, which
+is reported as 6 - 10, using the length of the sequence.
+
+Automaton objects can be pickled, which saves the patterns; the automaton
+is rebuilt (in time proportional to the total length of the patterns)
+when unpickled.
+"""
+
+from Bio.Seq import reverse_complement
+from Bio.SeqRecord import SeqRecord
+
+from Bio.SeqUtils import _ahocorasick
+
+
+def _as_bytes(sequence):
+    """Return a string, Seq, or SeqRecord as a bytes string (PRIVATE)."""
+    if isinstance(sequence, SeqRecord):
+        sequence = sequence.seq
+    if isinstance(sequence, bytes):
+        return sequence
+    return str(sequence).encode("ascii")
+
+
+class Automaton(object):
+    """Aho-Corasick automaton for searching for many patterns at once.
+
+    Attributes:
+     - patterns - list of the patterns (as strings).
+
+    """
+
+    def __init__(self, patterns):
+        """Build the automaton.
+
+        Arguments:
+         - patterns - an iterable of patterns (strings or Seq objects),
+           which must not be empty. Matches are reported using the index
+           of the pattern in this list, so a repeated pattern gives a
+           match for each copy.
+
+        """
+        self.patterns = [str(pattern) for pattern in patterns]
+        self._forward = _ahocorasick.Automaton([_as_bytes(pattern)
+                                                for pattern in self.patterns])
+        self._both = None
+
+    def __len__(self):
+        """Return the number of patterns."""
+        return len(self.patterns)
+
+    def __repr__(self):
+        """Return a string representation of the automaton for debugging."""
+        return "<%s of %i patterns, %i states>" % (
+            self.__class__.__name__, len(self.patterns), self._forward.states)
+
+    def __reduce__(self):
+        """Support pickling by saving the patterns."""
+        return (self.__class__, (self.patterns,))
+
+    def search(self, sequence, both=False):
+        """Return a list of (position, index) tuples for each match.
+
+        Arguments:
+         - sequence - the sequence to search (string, Seq, or SeqRecord).
+         - both - whether to search for the reverse complement of each
+           pattern too (default False).
+
+        The position is the start of the match, or for a match to the
+        reverse complement of a pattern, the start minus the length of the
+        sequence. The index gives the matching pattern in the patterns
+        list. The matches are sorted by their start position in the
+        sequence, with forward strand matches before reverse strand
+        matches, and then in the order of the patterns.
+        """
+        data = _as_bytes(sequence)
+        if not both:
+            return self._forward.search(data)
+        if self._both is None:
+            patterns = self.patterns + [reverse_complement(pattern)
+                                        for pattern in self.patterns]
+            self._both = _ahocorasick.Automaton([_as_bytes(pattern)
+                                                 for pattern in patterns])
+        count = len(self.patterns)
+        length = len(data)
+        return [(position, index) if index < count else
+                (position - length, index - count)
+                for position, index in self._both.search(data)]
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
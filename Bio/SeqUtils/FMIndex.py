@@ -0,0 +1,313 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""FM-index for exact (and IUPAC ambiguous) search of nucleotide sequences.
+
+Searching a sequence with Seq.find or Bio.SeqUtils.nt_search looks at the
+whole sequence for each query, which is slow when looking for thousands of
+primers or probes in a collection of genomes. The FMIndex class holds the
+suffix array and Burrows-Wheeler transform (BWT) of the sequences, built
+using NumPy, so that the number of matches to a pattern is found in time
+proportional to the length of the pattern, whatever the size of the
+sequences:
+
+>>> from Bio import SeqIO
+>>> from Bio.SeqUtils.FMIndex import FMIndex
+>>> index = FMIndex(SeqIO.parse("Fasta/f002", "fasta"))
+>>> index.names
+['gi|1348912|gb|G26680|G26680', 'gi|1348917|gb|G26685|G26685', 'gi|1592936|gb|G29385|G29385']
+>>> index.count("GATTA")
+2
+>>> index.locate("GATTA")
+[('gi|1348917|gb|G26685|G26685', 205), ('gi|1592936|gb|G29385|G29385', 237)]
+
+Only the letters A, C, G, and T (or U) in the sequences can be matched, in
+either case. The pattern may use the IUPAC ambiguity codes (e.g. N or R),
+which are matched by trying each possible base in turn:
+
+>>> index.locate("GGNTC")
+[('gi|1348912|gb|G26680|G26680', 154), ('gi|1348912|gb|G26680|G26680', 199), ('gi|1592936|gb|G29385|G29385', 198)]
+
+Only the given strand is searched, so search for the reverse complement
+of the pattern as well if both strands are wanted.
+
+Building the index takes some time, so it can be saved to a file with the
+save_index function. The load_index function memory maps the file, so an
+index larger than the available memory can be searched.
+"""
+
+from __future__ import print_function
+
+import struct
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.FMIndex.")
+
+from Bio.Data.IUPACData import ambiguous_dna_values
+from Bio.SeqUtils.KmerCount import _sequence_bytes
+
+
+# Code of each letter (either case) in the indexed text. Zero is used for
+# the separator after each sequence, and 5 for anything which can't be
+# matched (such as N).
+_letter_codes = numpy.full(256, 5, dtype=numpy.uint8)
+for _code, _letters in enumerate(["Aa", "Cc", "Gg", "TtUu"]):
+    for _letter in _letters:
+        _letter_codes[ord(_letter)] = _code + 1
+del _code, _letters, _letter
+_ALPHABET_SIZE = 6
+
+# Base codes for each letter of a pattern, including the ambiguity codes
+_pattern_codes = dict((letter, ["ACGT".index(base) + 1
+                                for base in sorted(bases)])
+                      for letter, bases in ambiguous_dna_values.items())
+_pattern_codes["U"] = _pattern_codes["T"]
+
+# Number of BWT positions between the stored occurrence counts
+_CHECKPOINT = 64
+
+# Binary file format for a saved index, after the magic bytes:
+# text length, number of sequences, checkpoint interval, suffix array item
+# size and length of the names (UTF-8, separated by newlines), then the
+# names, then the arrays (each starting on a multiple of 8 bytes) for the
+# sequence starts, the counts of smaller codes, the occurrence counts, the
+# BWT, and the suffix array. All integers are little endian.
+_MAGIC = b"BioFMIndex\x00\x01"
+_HEADER = struct.Struct("<QQIII")
+
+
+def _suffix_array(text, max_key=numpy.iinfo(numpy.int64).max):
+    """Return the suffix array of a NumPy array of codes (PRIVATE).
+
+    This uses prefix doubling, sorting the suffixes by their first 2**i
+    letters on pass i using the ranks from the previous pass, until all the
+    suffixes have different ranks. Each pass is a NumPy sort, so this takes
+    O(n log(n) log(r)) time where r is the length of the longest repeat.
+
+    The two ranks of each suffix are combined into a single sort key if
+    that cannot exceed max_key (for texts up to about 3e9 letters), which
+    is faster, otherwise they are sorted as two keys.
+    """
+    n = len(text)
+    # Ranks must be below n + 1 for the combined sort key
+    rank = numpy.unique(text, return_inverse=True)[1].astype(numpy.int64)
+    combine = (n + 1) ** 2 - 1 <= max_key
+    width = 1
+    while True:
+        second = numpy.zeros(n, dtype=numpy.int64)
+        second[:n - width] = rank[width:] + 1
+        if combine:
+            key = rank * (n + 1) + second
+            order = numpy.argsort(key, kind="mergesort")
+            key = key[order]
+            changes = key[1:] != key[:-1]
+        else:
+            order = numpy.lexsort((second, rank))
+            first, second = rank[order], second[order]
+            changes = (first[1:] != first[:-1]) | (second[1:] != second[:-1])
+        rank = numpy.empty(n, dtype=numpy.int64)
+        rank[order] = numpy.cumsum(numpy.concatenate(([0], changes)))
+        if rank.max() == n - 1 or width >= n:
+            return order
+        width *= 2
+
+
+def _occurrences(bwt, checkpoint):
+    """Return the count of each code in the BWT before each checkpoint (PRIVATE)."""
+    blocks = (len(bwt) + checkpoint - 1) // checkpoint
+    padded = numpy.full(blocks * checkpoint, _ALPHABET_SIZE, dtype=numpy.uint8)
+    padded[:len(bwt)] = bwt
+    padded = padded.reshape(blocks, checkpoint)
+    occ = numpy.zeros((blocks + 1, _ALPHABET_SIZE), dtype=numpy.int64)
+    for code in range(_ALPHABET_SIZE):
+        numpy.cumsum((padded == code).sum(axis=1), out=occ[1:, code])
+    return occ
+
+
+class FMIndex(object):
+    """FM-index of a collection of nucleotide sequences.
+
+    Attributes:
+     - names - list of the sequence names (the SeqRecord identifiers).
+     - lengths - list of the sequence lengths.
+
+    """
+
+    def __init__(self, records=None):
+        """Build the index of the sequences.
+
+        Arguments:
+         - records - an iterable of SeqRecord objects, such as from the
+           Bio.SeqIO.parse function.
+
+        """
+        self.names = []
+        if records is None:
+            # For load_index
+            return
+        parts = []
+        starts = [0]
+        for record in records:
+            self.names.append(record.id)
+            data = _sequence_bytes(record)
+            parts.append(_letter_codes[numpy.frombuffer(data,
+                                                        dtype=numpy.uint8)])
+            # Separator
+            parts.append(numpy.zeros(1, dtype=numpy.uint8))
+            starts.append(starts[-1] + len(data) + 1)
+        if parts:
+            text = numpy.concatenate(parts)
+        else:
+            text = numpy.zeros(1, dtype=numpy.uint8)
+        self._starts = numpy.array(starts, dtype=numpy.int64)
+        suffixes = _suffix_array(text)
+        if len(text) < 1 << 32:
+            suffixes = suffixes.astype(numpy.uint32)
+        self._suffixes = suffixes
+        self._bwt = text[suffixes.astype(numpy.int64) - 1]
+        counts = numpy.bincount(text, minlength=_ALPHABET_SIZE)
+        self._smaller = numpy.concatenate(([0], numpy.cumsum(counts)))
+        self._checkpoint = _CHECKPOINT
+        self._occ = _occurrences(self._bwt, _CHECKPOINT)
+
+    @property
+    def lengths(self):
+        """List of the sequence lengths."""
+        return (numpy.diff(self._starts) - 1).tolist()
+
+    def __repr__(self):
+        """Return a string representation of the index for debugging."""
+        return "<%s of %i sequences, %i letters>" % (
+            self.__class__.__name__, len(self.names),
+            len(self._bwt) - len(self.names))
+
+    def _rank(self, code, position):
+        """Return the number of times the code occurs in the BWT before position (PRIVATE)."""
+        block = position // self._checkpoint
+        start = block * self._checkpoint
+        return int(self._occ[block, code]) + \
+            int(numpy.count_nonzero(self._bwt[start:position] == code))
+
+    def _ranges(self, pattern):
+        """Return the suffix array ranges matching the pattern (PRIVATE).
+
+        Uses backward search, starting from the last letter of the pattern.
+        Each ambiguous letter splits each current range into one range per
+        possible base, and empty ranges are dropped.
+        """
+        pattern = str(pattern).upper()
+        if not pattern:
+            raise ValueError("Empty search pattern")
+        ranges = [(0, len(self._bwt))]
+        for letter in reversed(pattern):
+            try:
+                codes = _pattern_codes[letter]
+            except KeyError:
+                raise ValueError("Invalid letter %r in search pattern"
+                                 % letter)
+            new = []
+            for start, end in ranges:
+                for code in codes:
+                    smaller = int(self._smaller[code])
+                    new_start = smaller + self._rank(code, start)
+                    new_end = smaller + self._rank(code, end)
+                    if new_start < new_end:
+                        new.append((new_start, new_end))
+            if not new:
+                return []
+            ranges = new
+        return ranges
+
+    def count(self, pattern):
+        """Return the number of matches to the pattern (string or Seq).
+
+        Overlapping matches are counted, as in Seq.count_overlap.
+        """
+        return sum(end - start for start, end in self._ranges(pattern))
+
+    def locate(self, pattern):
+        """Return a sorted list of (name, start) tuples of the pattern matches.
+
+        The start positions are zero based, and overlapping matches are
+        included.
+        """
+        ranges = self._ranges(pattern)
+        if not ranges:
+            return []
+        positions = numpy.sort(numpy.concatenate(
+            [self._suffixes[start:end] for start, end in ranges]).astype(
+                numpy.int64))
+        records = numpy.searchsorted(self._starts, positions,
+                                     side="right") - 1
+        offsets = positions - self._starts[records]
+        names = self.names
+        return [(names[record], offset) for record, offset
+                in zip(records.tolist(), offsets.tolist())]
+
+
+def save_index(index, filename):
+    """Write an FMIndex to a file, which can be loaded with load_index."""
+    names = "\n".join(index.names).encode("utf-8")
+    arrays = [index._starts.astype("<i8"), index._smaller.astype("<i8"),
+              index._occ.astype("<i8"), index._bwt,
+              index._suffixes.astype(index._suffixes.dtype.newbyteorder("<"))]
+    with open(filename, "wb") as handle:
+        handle.write(_MAGIC)
+        handle.write(_HEADER.pack(len(index._bwt), len(index.names),
+                                  index._checkpoint,
+                                  index._suffixes.dtype.itemsize, len(names)))
+        handle.write(names)
+        for array in arrays:
+            handle.write(b"\0" * (-handle.tell() % 8))
+            handle.write(array.tobytes())
+
+
+def load_index(filename):
+    """Load an FMIndex saved with save_index, using memory mapping.
+
+    Only the parts of the file needed for each search are read from disk.
+    """
+    with open(filename, "rb") as handle:
+        if handle.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Not a Biopython FM-index file")
+        header = handle.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Truncated FM-index file")
+        length, count, checkpoint, itemsize, names_size = \
+            _HEADER.unpack(header)
+        names = handle.read(names_size).decode("utf-8")
+        offset = handle.tell()
+        handle.seek(0, 2)
+        file_size = handle.tell()
+    index = FMIndex()
+    index.names = names.split("\n") if count else []
+    if len(index.names) != count:
+        raise ValueError("Corrupt FM-index file, expected %i names" % count)
+    index._checkpoint = checkpoint
+    blocks = (length + checkpoint - 1) // checkpoint
+    arrays = []
+    for dtype, shape in [("<i8", (count + 1,)), ("<i8", (_ALPHABET_SIZE + 1,)),
+                         ("<i8", (blocks + 1, _ALPHABET_SIZE)),
+                         ("u1", (length,)), ("<u%i" % itemsize, (length,))]:
+        offset += -offset % 8
+        size = numpy.dtype(dtype).itemsize * int(numpy.prod(shape))
+        if offset + size > file_size:
+            raise ValueError("Truncated FM-index file")
+        arrays.append(numpy.memmap(filename, dtype=dtype, mode="r",
+                                   offset=offset, shape=shape))
+        offset += size
+    (index._starts, index._smaller, index._occ, index._bwt,
+     index._suffixes) = arrays
+    return index
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
@@ -0,0 +1,441 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Count k-mers (words of length k) in nucleotide sequences using NumPy.
+
+Each k-mer of up to 31 bases is encoded as an integer using two bits per
+base (A=0, C=1, G=2, T=3, with U treated as T), so sorting the integers
+puts the k-mers in alphabetical order. The k-mers of a whole sequence are
+encoded at once with NumPy, skipping any k-mer containing an ambiguous
+letter such as N:
+
+>>> from Bio.SeqUtils.KmerCount import kmer_codes, decode_kmer
+>>> codes = kmer_codes("ACGTNACG", 3)
+>>> [int(code) for code in codes]
+[6, 27, 6]
+>>> print(decode_kmer(27, 3))
+CGT
+
+For strand independent counting, the canonical k-mer (whichever of the
+k-mer and its reverse complement comes first alphabetically) is used:
+
+>>> [decode_kmer(code, 3) for code in kmer_codes("ACGTNACG", 3, canonical=True)]
+['ACG', 'ACG', 'ACG']
+
+The KmerCounter class accumulates the counts for any number of sequences,
+such as the records from Bio.SeqIO.parse, holding the distinct k-mers and
+their counts as sorted NumPy arrays rather than as a Python dictionary:
+
+>>> from Bio import SeqIO
+>>> from Bio.SeqUtils.KmerCount import KmerCounter
+>>> counter = KmerCounter(5, canonical=True)
+>>> counter.update(SeqIO.parse("Fasta/f002", "fasta"))
+>>> len(counter)
+386
+>>> counter.most_common(3)
+[('AAAGG', 12), ('TGAAA', 10), ('TTAAA', 10)]
+>>> counter["AAAAA"], counter["TTTTT"]
+(9, 9)
+
+The minimizers of a sequence, the smallest k-mer (in a pseudo-random hash
+order) of each window of w consecutive k-mers, give a much smaller set of
+k-mers which is still shared by similar sequences:
+
+>>> from Bio.SeqUtils.KmerCount import minimizers
+>>> positions, codes = minimizers("ACGTTGCATGTCGCATGATGCATGAGAGCT", 5, 4)
+>>> positions.tolist()
+[0, 3, 5, 7, 10, 12, 15, 19, 23, 24]
+
+"""
+
+from __future__ import print_function
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.KmerCount.")
+
+from Bio._py3k import basestring
+
+from Bio.Seq import Seq, MutableSeq
+from Bio.SeqRecord import SeqRecord
+
+
+#: Largest k-mer size supported, as each k-mer is held in a 64 bit integer
+MAX_K = 31
+
+# Two bit code of each letter (either case), with 4 for anything else
+_letter_codes = numpy.full(256, 4, dtype=numpy.uint8)
+for _code, _letters in enumerate(["Aa", "Cc", "Gg", "TtUu"]):
+    for _letter in _letters:
+        _letter_codes[ord(_letter)] = _code
+del _code, _letters, _letter
+
+# Number of distinct k-mers to collect from new sequences before merging
+# them into the running totals in the KmerCounter class
+_MERGE_SIZE = 1 << 22
+
+
+def _sequence_bytes(sequence):
+    """Return the sequence (string, Seq, or SeqRecord) as bytes (PRIVATE)."""
+    if isinstance(sequence, SeqRecord):
+        sequence = sequence.seq
+    if isinstance(sequence, bytes):
+        return sequence
+    return str(sequence).encode("ascii")
+
+
+def _check_k(k):
+    """Check the k-mer size is valid (PRIVATE)."""
+    if not 1 <= k <= MAX_K:
+        raise ValueError("k must be between 1 and %i, not %r" % (MAX_K, k))
+
+
+def _base_codes(sequence):
+    """Return the two bit codes of the letters, and a mask of invalid ones (PRIVATE)."""
+    data = numpy.frombuffer(_sequence_bytes(sequence), dtype=numpy.uint8)
+    codes = _letter_codes[data]
+    return codes.astype(numpy.uint64), codes == 4
+
+
+def _combine(codes, k, reverse=False):
+    """Return the k-mer codes at every position from the base codes (PRIVATE).
+
+    Codes for words of length a and b are combined into codes for words of
+    length a + b, so only about log2(k) passes over the sequence are made.
+    With reverse=True, the first base is put in the lowest bits (as needed
+    to give the reverse complement from the complemented base codes).
+    """
+    result = None
+    length = 0
+    power = codes
+    size = 1
+    while True:
+        if k & 1:
+            if result is None:
+                result = power
+            else:
+                n = len(power) - length
+                if reverse:
+                    result = result[:n] | (power[length:] <<
+                                           numpy.uint64(2 * length))
+                else:
+                    result = (result[:n] << numpy.uint64(2 * size)) | \
+                        power[length:]
+            length += size
+        k >>= 1
+        if not k:
+            return result
+        n = len(power) - size
+        if reverse:
+            power = power[:n] | (power[size:] << numpy.uint64(2 * size))
+        else:
+            power = (power[:n] << numpy.uint64(2 * size)) | power[size:]
+        size *= 2
+
+
+def _kmer_codes(sequence, k, canonical):
+    """Return codes of every k-mer and a mask of those with invalid letters (PRIVATE)."""
+    _check_k(k)
+    codes, invalid = _base_codes(sequence)
+    if len(codes) < k:
+        empty = numpy.zeros(0, dtype=numpy.uint64)
+        return empty, numpy.zeros(0, dtype=bool)
+    kmers = _combine(codes, k)
+    if canonical:
+        reverse = _combine(numpy.uint64(3) - codes, k, reverse=True)
+        kmers = numpy.minimum(kmers, reverse)
+    cumulative = numpy.concatenate(([0], numpy.cumsum(invalid)))
+    return kmers, cumulative[k:] != cumulative[:-k]
+
+
+def kmer_codes(sequence, k, canonical=False):
+    """Return the integer codes of the k-mers in a sequence as a NumPy array.
+
+    Arguments:
+     - sequence - a string, Seq, or SeqRecord object.
+     - k - the k-mer size, from 1 to 31.
+     - canonical - if True, use the smaller of the codes for the k-mer and
+       its reverse complement (default False).
+
+    The codes are given in the order of the k-mers in the sequence, leaving
+    out any k-mer containing a letter other than A, C, G, T, or U (in upper
+    or lower case).
+
+    >>> [int(code) for code in kmer_codes("GATTACA", 4)]
+    [143, 60, 241, 196]
+    >>> [int(code) for code in kmer_codes("GATTACA", 4, canonical=True)]
+    [13, 60, 176, 196]
+    >>> [int(code) for code in kmer_codes("TGTAATC", 4, canonical=True)]
+    [196, 176, 60, 13]
+    """
+    kmers, invalid = _kmer_codes(sequence, k, canonical)
+    return kmers[~invalid]
+
+
+def encode_kmer(kmer):
+    """Return the integer code of a k-mer (given as a string or Seq).
+
+    >>> encode_kmer("ACGT")
+    27
+    """
+    codes = kmer_codes(kmer, len(kmer))
+    if len(codes) != 1:
+        raise ValueError("Invalid k-mer %r" % str(kmer))
+    return int(codes[0])
+
+
+def decode_kmer(code, k):
+    """Return the k-mer string for an integer code.
+
+    >>> print(decode_kmer(27, 4))
+    ACGT
+    >>> print(decode_kmer(27, 6))
+    AAACGT
+    """
+    code = int(code)
+    return "".join("ACGT"[(code >> (2 * i)) & 3]
+                   for i in range(k - 1, -1, -1))
+
+
+def hash_codes(codes, bits=64):
+    """Return an invertible pseudo-random hash of k-mer codes.
+
+    Arguments:
+     - codes - NumPy array of k-mer codes (unsigned 64 bit integers)
+     - bits - the hash values are limited to this many bits (default 64).
+       Using 2 * k bits gives a one to one mapping of the k-mer codes.
+
+    This is Thomas Wang's 64 bit integer hash (as used in minimap2 to order
+    minimizers). Sorting by hash gives a random looking ordering of the
+    k-mers, and the smallest hashes are a random sample of them (as used
+    for MinHash sketches).
+
+    >>> [int(key) for key in hash_codes(kmer_codes("ACGT", 2), bits=4)]
+    [6, 5, 4]
+    """
+    codes = numpy.asarray(codes, dtype=numpy.uint64)
+    mask = numpy.uint64((1 << bits) - 1)
+    key = (~codes + (codes << numpy.uint64(21))) & mask
+    key = key ^ (key >> numpy.uint64(24))
+    key = (key + (key << numpy.uint64(3)) + (key << numpy.uint64(8))) & mask
+    key = key ^ (key >> numpy.uint64(14))
+    key = (key + (key << numpy.uint64(2)) + (key << numpy.uint64(4))) & mask
+    key = key ^ (key >> numpy.uint64(28))
+    key = (key + (key << numpy.uint64(31))) & mask
+    return key
+
+
+def minimizers(sequence, k, w, canonical=False):
+    """Return the positions and codes of the minimizers of a sequence.
+
+    Arguments:
+     - sequence - a string, Seq, or SeqRecord object.
+     - k - the k-mer size, from 1 to 31.
+     - w - the window size, as a number of consecutive k-mers.
+     - canonical - if True, use canonical k-mers (default False).
+
+    For each window of w consecutive k-mers, the k-mer with the smallest
+    hash value (see the hash_codes function) is picked, taking the left
+    most in case of ties. Returns two NumPy arrays, the start positions of
+    the distinct minimizers in the sequence, and their k-mer codes. Windows
+    where every k-mer contains an ambiguous letter have no minimizer.
+
+    >>> positions, codes = minimizers("ACGTACGTACGT", 4, 3)
+    >>> positions.tolist()
+    [0, 3, 4, 7]
+    >>> [decode_kmer(code, 4) for code in codes]
+    ['ACGT', 'TACG', 'ACGT', 'TACG']
+    """
+    if w < 1:
+        raise ValueError("Window size must be at least one, not %r" % w)
+    kmers, invalid = _kmer_codes(sequence, k, canonical)
+    empty = numpy.zeros(0, dtype=numpy.intp)
+    if len(kmers) < w:
+        return empty, kmers[:0]
+    hashes = hash_codes(kmers, 2 * k)
+    # Invalid k-mers sort after every valid k-mer
+    hashes[invalid] = numpy.uint64(1 << (2 * k))
+    # Position of the smallest hash in windows of size 1, 2, 4, ...
+    best = numpy.arange(len(hashes))
+    size = 1
+    while 2 * size <= w:
+        right = best[size:]
+        left = best[:len(right)]
+        best = numpy.where(hashes[right] < hashes[left], right, left)
+        size *= 2
+    # Combine two overlapping windows of this size to cover w k-mers
+    right = best[w - size:]
+    left = best[:len(right)]
+    best = numpy.where(hashes[right] < hashes[left], right, left)
+    best = best[~invalid[best]]
+    if len(best):
+        best = best[numpy.concatenate(([True], best[1:] != best[:-1]))]
+    return best, kmers[best]
+
+
+class KmerCounter(object):
+    """Count the k-mers in any number of nucleotide sequences.
+
+    The distinct k-mers are held as a sorted NumPy array of their integer
+    codes (see the kmer_codes function), with a matching array of counts:
+
+    >>> counter = KmerCounter(2)
+    >>> counter.add("ACGTAC")
+    >>> counter.add("NNACG")
+    >>> [int(code) for code in counter.codes]
+    [1, 6, 11, 12]
+    >>> [int(count) for count in counter.counts]
+    [3, 2, 1, 1]
+    >>> for kmer, count in counter.items():
+    ...     print("%s %i" % (kmer, count))
+    AC 3
+    CG 2
+    GT 1
+    TA 1
+
+    The k-mers from each sequence added are counted using NumPy, then
+    merged into the running totals in batches.
+    """
+
+    def __init__(self, k, canonical=False):
+        """Initialize the counter.
+
+        Arguments:
+         - k - the k-mer size, from 1 to 31.
+         - canonical - if True, count each k-mer together with its reverse
+           complement (using the first of the two alphabetically), giving
+           strand independent counts (default False).
+
+        """
+        _check_k(k)
+        self.k = k
+        self.canonical = canonical
+        self._codes = numpy.zeros(0, dtype=numpy.uint64)
+        self._counts = numpy.zeros(0, dtype=numpy.int64)
+        self._pending = []
+        self._pending_size = 0
+
+    def add(self, sequence):
+        """Count the k-mers in a sequence (string, Seq, or SeqRecord)."""
+        codes = kmer_codes(sequence, self.k, self.canonical)
+        if len(codes):
+            codes, counts = numpy.unique(codes, return_counts=True)
+            self._pending.append((codes, counts.astype(numpy.int64)))
+            self._pending_size += len(codes)
+            if self._pending_size > _MERGE_SIZE:
+                self._merge()
+
+    def update(self, sequences):
+        """Count the k-mers in each sequence (or SeqRecord) from an iterable.
+
+        For example, the SeqRecord objects from Bio.SeqIO.parse. A single
+        string, Seq, or SeqRecord is also accepted.
+        """
+        if isinstance(sequences, (basestring, Seq, MutableSeq, SeqRecord)):
+            sequences = [sequences]
+        for sequence in sequences:
+            self.add(sequence)
+
+    def _merge(self):
+        """Merge the counts from newly added sequences into the totals (PRIVATE)."""
+        if not self._pending:
+            return
+        codes = numpy.concatenate([self._codes] +
+                                  [c for c, n in self._pending])
+        counts = numpy.concatenate([self._counts] +
+                                   [n for c, n in self._pending])
+        self._pending = []
+        self._pending_size = 0
+        order = numpy.argsort(codes, kind="mergesort")
+        codes = codes[order]
+        starts = numpy.flatnonzero(numpy.concatenate(
+            ([True], codes[1:] != codes[:-1])))
+        self._codes = codes[starts]
+        self._counts = numpy.add.reduceat(counts[order], starts)
+
+    @property
+    def codes(self):
+        """Sorted NumPy array of the distinct k-mer codes."""
+        self._merge()
+        return self._codes
+
+    @property
+    def counts(self):
+        """Count of each k-mer in the codes array, as a NumPy array."""
+        self._merge()
+        return self._counts
+
+    def __len__(self):
+        """Return the number of distinct k-mers."""
+        return len(self.codes)
+
+    def __getitem__(self, kmer):
+        """Return the count for a k-mer (string or Seq), zero if not seen."""
+        if len(kmer) != self.k:
+            raise ValueError("Expected a k-mer of length %i, not %r"
+                             % (self.k, str(kmer)))
+        codes = kmer_codes(kmer, self.k, self.canonical)
+        if not len(codes):
+            raise ValueError("Invalid k-mer %r" % str(kmer))
+        index = numpy.searchsorted(self.codes, codes[0])
+        if index < len(self._codes) and self._codes[index] == codes[0]:
+            return int(self._counts[index])
+        return 0
+
+    def items(self):
+        """Iterate over the (k-mer string, count) pairs in alphabetical order."""
+        for code, count in zip(self.codes, self.counts):
+            yield decode_kmer(code, self.k), int(count)
+
+    def most_common(self, n=None):
+        """Return a list of the n most common (k-mer string, count) pairs.
+
+        Ties are given in alphabetical order. With n=None, all the k-mers
+        are returned.
+        """
+        order = numpy.argsort(-self.counts, kind="mergesort")[:n]
+        return [(decode_kmer(code, self.k), int(count))
+                for code, count in zip(self._codes[order],
+                                       self._counts[order])]
+
+    def spectrum(self):
+        """Return the k-mer spectrum as two NumPy arrays.
+
+        The first array gives each count (multiplicity) seen, in increasing
+        order, and the second gives the number of distinct k-mers with that
+        count.
+
+        >>> counter = KmerCounter(2)
+        >>> counter.add("AAAACGCG")
+        >>> multiplicity, frequency = counter.spectrum()
+        >>> multiplicity.tolist(), frequency.tolist()
+        ([1, 2, 3], [2, 1, 1])
+        """
+        return numpy.unique(self.counts, return_counts=True)
+
+
+def count_kmers(sequences, k, canonical=False):
+    """Return a KmerCounter for the sequences (or SeqRecord objects) given.
+
+    This is a short cut for creating a KmerCounter and calling its update
+    method, for example with the records from Bio.SeqIO.parse:
+
+    >>> from Bio import SeqIO
+    >>> counter = count_kmers(SeqIO.parse("Fasta/f002", "fasta"), 3)
+    >>> counter.most_common(2)
+    [('TTT', 64), ('GGG', 42)]
+    """
+    counter = KmerCounter(k, canonical)
+    counter.update(sequences)
+    return counter
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
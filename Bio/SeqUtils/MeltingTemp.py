@@ -18,6 +18,9 @@ temperature of oligonucleotides:
    Correction for mismatches, dangling ends, salt concentration and other
    additives are available.
 
+Tm_NN_batch gives the same results as Tm_NN for a whole list of sequences at
+once, e.g. a primer library, using NumPy arrays.
+
 Tm_staluc is the 'old' NN calculation and is kept for compatibility. It is,
 however, recommended to use Tm_NN instead, since Tm_staluc may be depreceated
 in the future. Also, Tm_NN has much more options. Using Tm_staluc and Tm_NN
@@ -164,6 +167,7 @@ by '1':
 from __future__ import print_function
 
 import math
+import re
 import warnings
 
 from Bio import SeqUtils, Seq
@@ -779,6 +783,74 @@ def _key_error(neighbors, strict):
         return
 
 
+def _dangling_ends(seq, c_seq, shift, de_table, strict):
+    """Align the two strands and return them with any dangling end values (PRIVATE).
+
+    Returns the aligned sequences with the dangling ends removed, and the
+    dH and dS contributions of the dangling ends. Used by Tm_NN and
+    Tm_NN_batch.
+    """
+    tmp_seq = seq
+    tmp_cseq = c_seq
+    delta_h = 0
+    delta_s = 0
+    d_h = 0  # Names for indexes
+    d_s = 1  # 0 and 1
+    # Align both sequences using the shift parameter
+    if shift > 0:
+        tmp_seq = '.' * shift + seq
+    if shift < 0:
+        tmp_cseq = '.' * abs(shift) + c_seq
+    if len(tmp_cseq) > len(tmp_seq):
+        tmp_seq += (len(tmp_cseq) - len(tmp_seq)) * '.'
+    if len(tmp_cseq) < len(tmp_seq):
+        tmp_cseq += (len(tmp_seq) - len(tmp_cseq)) * '.'
+    # Remove 'over-dangling' ends
+    while tmp_seq.startswith('..') or tmp_cseq.startswith('..'):
+        tmp_seq = tmp_seq[1:]
+        tmp_cseq = tmp_cseq[1:]
+    while tmp_seq.endswith('..') or tmp_cseq.endswith('..'):
+        tmp_seq = tmp_seq[:-1]
+        tmp_cseq = tmp_cseq[:-1]
+    # Now for the dangling ends
+    if tmp_seq.startswith('.') or tmp_cseq.startswith('.'):
+        left_de = tmp_seq[:2] + '/' + tmp_cseq[:2]
+        try:
+            delta_h += de_table[left_de][d_h]
+            delta_s += de_table[left_de][d_s]
+        except KeyError:
+            _key_error(left_de, strict)
+        tmp_seq = tmp_seq[1:]
+        tmp_cseq = tmp_cseq[1:]
+    if tmp_seq.endswith('.') or tmp_cseq.endswith('.'):
+        right_de = tmp_cseq[-2:][::-1] + '/' + tmp_seq[-2:][::-1]
+        try:
+            delta_h += de_table[right_de][d_h]
+            delta_s += de_table[right_de][d_s]
+        except KeyError:
+            _key_error(right_de, strict)
+        tmp_seq = tmp_seq[:-1]
+        tmp_cseq = tmp_cseq[:-1]
+    return tmp_seq, tmp_cseq, delta_h, delta_s
+
+
+def _nn_values(neighbors, nn_table, imm_table):
+    """Return the (dH, dS) values of a nearest neighbor duplex, or None (PRIVATE).
+
+    Internal mismatches (imm_table) take precedence over the nearest
+    neighbor table, and each key is also tried in reverse.
+    """
+    if neighbors in imm_table:
+        return imm_table[neighbors]
+    elif neighbors[::-1] in imm_table:
+        return imm_table[neighbors[::-1]]
+    elif neighbors in nn_table:
+        return nn_table[neighbors]
+    elif neighbors[::-1] in nn_table:
+        return nn_table[neighbors[::-1]]
+    return None
+
+
 def Tm_NN(seq, check=True, strict=True, c_seq=None, shift=0, nn_table=DNA_NN3,
           tmm_table=DNA_TMM1, imm_table=DNA_IMM1, de_table=DNA_DE1,
           dnac1=25, dnac2=25, selfcomp=False, Na=50, K=0, Tris=0, Mg=0,
@@ -867,41 +939,8 @@ def Tm_NN(seq, check=True, strict=True, c_seq=None, shift=0, nn_table=DNA_NN3,
 
     # Dangling ends?
     if shift or len(seq) != len(c_seq):
-        # Align both sequences using the shift parameter
-        if shift > 0:
-            tmp_seq = '.' * shift + seq
-        if shift < 0:
-            tmp_cseq = '.' * abs(shift) + c_seq
-        if len(tmp_cseq) > len(tmp_seq):
-            tmp_seq += (len(tmp_cseq) - len(tmp_seq)) * '.'
-        if len(tmp_cseq) < len(tmp_seq):
-            tmp_cseq += (len(tmp_seq) - len(tmp_cseq)) * '.'
-        # Remove 'over-dangling' ends
-        while tmp_seq.startswith('..') or tmp_cseq.startswith('..'):
-            tmp_seq = tmp_seq[1:]
-            tmp_cseq = tmp_cseq[1:]
-        while tmp_seq.endswith('..') or tmp_cseq.endswith('..'):
-            tmp_seq = tmp_seq[:-1]
-            tmp_cseq = tmp_cseq[:-1]
-        # Now for the dangling ends
-        if tmp_seq.startswith('.') or tmp_cseq.startswith('.'):
-            left_de = tmp_seq[:2] + '/' + tmp_cseq[:2]
-            try:
-                delta_h += de_table[left_de][d_h]
-                delta_s += de_table[left_de][d_s]
-            except KeyError:
-                _key_error(left_de, strict)
-            tmp_seq = tmp_seq[1:]
-            tmp_cseq = tmp_cseq[1:]
-        if tmp_seq.endswith('.') or tmp_cseq.endswith('.'):
-            right_de = tmp_cseq[-2:][::-1] + '/' + tmp_seq[-2:][::-1]
-            try:
-                delta_h += de_table[right_de][d_h]
-                delta_s += de_table[right_de][d_s]
-            except KeyError:
-                _key_error(right_de, strict)
-            tmp_seq = tmp_seq[:-1]
-            tmp_cseq = tmp_cseq[:-1]
+        tmp_seq, tmp_cseq, delta_h, delta_s = _dangling_ends(seq, c_seq, shift,
+                                                             de_table, strict)
 
     # Now for terminal mismatches
     left_tmm = tmp_cseq[:2][::-1] + '/' + tmp_seq[:2][::-1]
@@ -954,18 +993,10 @@ def Tm_NN(seq, check=True, strict=True, c_seq=None, shift=0, nn_table=DNA_NN3,
     for basenumber in range(len(tmp_seq) - 1):
         neighbors = tmp_seq[basenumber:basenumber + 2] + '/' + \
             tmp_cseq[basenumber:basenumber + 2]
-        if neighbors in imm_table:
-            delta_h += imm_table[neighbors][d_h]
-            delta_s += imm_table[neighbors][d_s]
-        elif neighbors[::-1] in imm_table:
-            delta_h += imm_table[neighbors[::-1]][d_h]
-            delta_s += imm_table[neighbors[::-1]][d_s]
-        elif neighbors in nn_table:
-            delta_h += nn_table[neighbors][d_h]
-            delta_s += nn_table[neighbors][d_s]
-        elif neighbors[::-1] in nn_table:
-            delta_h += nn_table[neighbors[::-1]][d_h]
-            delta_s += nn_table[neighbors[::-1]][d_s]
+        values = _nn_values(neighbors, nn_table, imm_table)
+        if values is not None:
+            delta_h += values[d_h]
+            delta_s += values[d_s]
         else:
             # We haven't found the key...
             _key_error(neighbors, strict)
@@ -991,6 +1022,296 @@ def Tm_NN(seq, check=True, strict=True, c_seq=None, shift=0, nn_table=DNA_NN3,
     return melting_temp
 
 
+# Characters removed by _check(seq, 'Tm_NN'), other than the NUL
+# separator used by _check_batch
+_not_nn_bases = re.compile('[^ACGTI\x00]')
+
+
+def _check_batch(seqs):
+    """Apply _check(seq, 'Tm_NN') to a list of sequence strings (PRIVATE).
+
+    The sequences are checked together, joined by NUL characters, unless
+    one of them contains a NUL character.
+    """
+    if not seqs:
+        return []
+    joined = "\x00".join(seqs)
+    if joined.count("\x00") != len(seqs) - 1:
+        return [_check(seq, 'Tm_NN') for seq in seqs]
+    joined = _not_nn_bases.sub("", joined.upper().replace("U", "T"))
+    return joined.split("\x00")
+
+
+def _letter_matrices(*groups):
+    """Return the letters used and a code matrix for each list of strings (PRIVATE).
+
+    The letters are coded from one upwards in the order of the returned
+    string of letters, with zero for the padding after the end of each
+    string. Each matrix (with at least two columns) is returned with an
+    array of the string lengths.
+    """
+    import numpy
+    data = []
+    for strings in groups:
+        try:
+            codes = numpy.frombuffer("".join(strings).encode("ascii"),
+                                     numpy.uint8)
+        except UnicodeError:
+            codes = numpy.frombuffer("".join(strings).encode("utf-32-le"),
+                                     numpy.uint32)
+        data.append(codes)
+    size = max([int(codes.max()) + 1 for codes in data if len(codes)] + [1])
+    present = sum(numpy.bincount(codes, minlength=size) for codes in data)
+    letters = numpy.flatnonzero(present)
+    if len(letters) < 255:
+        lookup = numpy.zeros(size, numpy.uint8)
+    else:
+        lookup = numpy.zeros(size, numpy.uint32)
+    lookup[letters] = numpy.arange(1, len(letters) + 1)
+    matrices = []
+    for strings, codes in zip(groups, data):
+        lengths = numpy.fromiter(map(len, strings), numpy.intp, len(strings))
+        width = max(2, int(lengths.max()) if len(strings) else 0)
+        matrix = numpy.zeros((len(strings), width), lookup.dtype)
+        # Position of each letter in the flattened matrix
+        offsets = numpy.arange(len(strings)) * width - \
+            (numpy.cumsum(lengths) - lengths)
+        positions = numpy.arange(len(codes)) + numpy.repeat(offsets, lengths)
+        matrix.ravel()[positions] = lookup[codes]
+        matrices.append((matrix, lengths))
+    letters = letters.astype("<u4").tobytes().decode("utf-32-le")
+    return letters, matrices
+
+
+# Number of sequences handled at once by Tm_NN_batch
+_BATCH_SIZE = 10000
+
+
+def Tm_NN_batch(seqs, check=True, strict=True, c_seqs=None, shifts=0,
+                nn_table=DNA_NN3, tmm_table=DNA_TMM1, imm_table=DNA_IMM1,
+                de_table=DNA_DE1, dnac1=25, dnac2=25, selfcomp=False, Na=50,
+                K=0, Tris=0, Mg=0, dNTPs=0, saltcorr=5):
+    """Return a NumPy array of the Tm of many sequences, as given by Tm_NN.
+
+    Arguments:
+     - seqs: A list (or other iterable) of the primer/probe sequences as
+       strings or Biopython sequence objects, which may differ in length.
+     - c_seqs: A list of the complementary sequences, one for each sequence
+       (see Tm_NN), where None means the perfect complement. Default=None,
+       the perfect complement for all the sequences.
+     - shifts: The shift (see Tm_NN) of each sequence, as a list, or as a
+       single value for all the sequences. Default=0.
+
+    All other arguments, including the thermodynamic tables for nearest
+    neighbors, mismatches and dangling ends, are used as in Tm_NN, and the
+    value for each sequence is the same as Tm_NN would return for it.
+
+    Rather than calculating each Tm in turn, the nearest neighbor duplexes
+    of all the sequences are looked up and summed using NumPy arrays, which
+    is much faster for a large number of oligos, such as a primer library.
+    Only the dangling ends (with a shift or sequences of different length)
+    are handled one sequence at a time.
+
+    This requires NumPy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        from Bio import MissingPythonDependencyError
+        raise MissingPythonDependencyError(
+            "Install NumPy if you want to use Tm_NN_batch")
+    seqs = [str(seq) for seq in seqs]
+    number = len(seqs)
+    if c_seqs is None:
+        c_seqs = [None] * number
+    else:
+        c_seqs = [str(c_seq) if c_seq else None for c_seq in c_seqs]
+        if len(c_seqs) != number:
+            raise ValueError("Expected one complementary sequence for each "
+                             "sequence (%i), not %i" % (number, len(c_seqs)))
+    if numpy.ndim(shifts) == 0:
+        shifts = [shifts] * number
+    elif len(shifts) != number:
+        raise ValueError("Expected one shift for each sequence (%i), "
+                         "not %i" % (number, len(shifts)))
+    melting_temps = numpy.zeros(number)
+    for start in range(0, number, _BATCH_SIZE):
+        end = start + _BATCH_SIZE
+        melting_temps[start:end] = _Tm_NN_arrays(
+            seqs[start:end], c_seqs[start:end], shifts[start:end], check,
+            strict, nn_table, tmm_table, imm_table, de_table, dnac1, dnac2,
+            selfcomp, Na, K, Tris, Mg, dNTPs, saltcorr)
+    return melting_temps
+
+
+def _Tm_NN_arrays(seqs, c_seqs, shifts, check, strict, nn_table, tmm_table,
+                  imm_table, de_table, dnac1, dnac2, selfcomp, Na, K, Tris,
+                  Mg, dNTPs, saltcorr):
+    """Return a NumPy array of the Tm for a batch of sequences (PRIVATE).
+
+    This does the work for Tm_NN_batch, with the sequence strings and
+    complementary sequences (or None) in lists, and a list of shifts.
+    """
+    import numpy
+    number = len(seqs)
+
+    # Checking the sequences, and the perfect complements
+    c_seqs = list(c_seqs)
+    missing = [i for i, c_seq in enumerate(c_seqs) if c_seq is None]
+    if check:
+        given = [i for i, c_seq in enumerate(c_seqs) if c_seq is not None]
+        for i, c_seq in zip(given, _check_batch([c_seqs[i] for i in given])):
+            c_seqs[i] = c_seq
+        checked = _check_batch(seqs)
+        joined = "".join(seqs)
+        if "U" in joined or "u" in joined:
+            for i in missing:
+                seq = seqs[i]
+                if ("U" in seq or "u" in seq) and ("T" in seq or "t" in seq):
+                    # Raises the same exception as Tm_NN for mixed RNA/DNA
+                    Seq.Seq(seq).complement()
+        complements = "\x00".join(checked[i] for i in missing)
+        complements = complements.translate(Seq._dna_complement_table)
+        for i, c_seq in zip(missing, complements.split("\x00")):
+            c_seqs[i] = c_seq
+    else:
+        checked = seqs
+        for i in missing:
+            c_seqs[i] = str(Seq.Seq(seqs[i]).complement())
+    if not all(checked):
+        raise ValueError("Empty sequences are not allowed")
+
+    # Dangling ends?
+    tmp_seqs = list(checked)
+    tmp_cseqs = list(c_seqs)
+    delta_h = numpy.zeros(number)
+    delta_s = numpy.zeros(number)
+    dangling = numpy.asarray(shifts) != 0
+    dangling |= numpy.fromiter(map(len, checked), numpy.intp, number) != \
+        numpy.fromiter(map(len, c_seqs), numpy.intp, number)
+    for i in numpy.flatnonzero(dangling):
+        tmp_seqs[i], tmp_cseqs[i], delta_h[i], delta_s[i] = \
+            _dangling_ends(checked[i], c_seqs[i], shifts[i], de_table, strict)
+
+    letters, matrices = _letter_matrices(tmp_seqs, tmp_cseqs, checked)
+    (seq_codes, lengths), (cseq_codes, _), (codes, seq_lengths) = matrices
+    size = len(letters) + 1
+
+    # Each pair of neighbors on both strands is given by a key, with zero
+    # (as the letters are coded from one) used for no neighbors at all
+    def keys(first, second, third, fourth):
+        return ((first.astype(numpy.intp) * size + second) * size +
+                third) * size + fourth
+
+    def neighbors(key):
+        key, fourth = divmod(key, size)
+        key, third = divmod(key, size)
+        first, second = divmod(key, size)
+        return (letters[first - 1] + letters[second - 1] + '/' +
+                letters[third - 1] + letters[fourth - 1])
+
+    def lookup(keys, values):
+        """Return arrays of dH, dS and found for each key (zero for none)."""
+        table_h = numpy.zeros(size ** 4)
+        table_s = numpy.zeros(size ** 4)
+        found = numpy.zeros(size ** 4, bool)
+        found[0] = True
+        used = numpy.bincount(keys.ravel(), minlength=size ** 4)
+        for key in numpy.flatnonzero(used[1:]) + 1:
+            duplex = values(neighbors(key))
+            if duplex is not None:
+                table_h[key], table_s[key] = duplex[0], duplex[1]
+                found[key] = True
+        return table_h, table_s, found
+
+    # Now for terminal mismatches
+    rows = numpy.arange(number)
+    left = keys(cseq_codes[:, 1], cseq_codes[:, 0],
+                seq_codes[:, 1], seq_codes[:, 0])
+    left[lengths < 2] = 0
+    end = numpy.maximum(lengths - 2, 0)
+    right = keys(seq_codes[rows, end], seq_codes[rows, end + 1],
+                 cseq_codes[rows, end], cseq_codes[rows, end + 1])
+    tmm_h, tmm_s, found = lookup(numpy.concatenate((left, right)),
+                                 tmm_table.get)
+    left[~found[left]] = 0
+    starts = (left != 0).astype(numpy.intp)
+    right[(lengths - starts < 2) | ~found[right]] = 0
+    ends = lengths - (right != 0)
+
+    # The nearest neighbors for the 'zipping', one column at a time
+    columns = numpy.arange(seq_codes.shape[1] - 1)
+    nn_keys = keys(seq_codes[:, :-1], seq_codes[:, 1:],
+                   cseq_codes[:, :-1], cseq_codes[:, 1:])
+    nn_keys[(columns < starts[:, None]) | (columns + 2 > ends[:, None])] = 0
+    nn_keys = nn_keys.T.copy()
+    nn_h, nn_s, found = lookup(nn_keys,
+                               lambda key: _nn_values(key, nn_table,
+                                                      imm_table))
+    for key in numpy.unique(nn_keys[~found[nn_keys]]):
+        # We haven't found the key...
+        _key_error(neighbors(key), strict)
+
+    # The initiation depends on the (checked) sequences themselves
+    def is_in(bases, array):
+        flags = numpy.zeros(size, bool)
+        flags[[letters.index(base) + 1 for base in bases
+               if base in letters]] = True
+        return flags[array]
+
+    first = codes[:, 0]
+    last = codes[rows, seq_lengths - 1]
+    gc_count = is_in('GCgcSs', codes).sum(axis=1)
+    AT = is_in('AT', first).astype(int) + is_in('AT', last)
+    GC = is_in('GC', first).astype(int) + is_in('GC', last)
+
+    # Summing the terms for each sequence in the same order as Tm_NN, where
+    # adding the zero values for the key zero leaves a sum unchanged
+    for index, delta, tmm, nn in ((0, delta_h, tmm_h, nn_h),
+                                  (1, delta_s, tmm_s, nn_s)):
+        delta += tmm[left]
+        delta += tmm[right]
+        delta += nn_table['init'][index]
+        delta += numpy.where(gc_count == 0, nn_table['init_allA/T'][index],
+                             nn_table['init_oneG/C'][index])
+        delta += numpy.where(is_in('T', first), nn_table['init_5T/A'][index],
+                             0.0)
+        delta += numpy.where(is_in('A', last), nn_table['init_5T/A'][index],
+                             0.0)
+        delta += nn_table['init_A/T'][index] * AT
+        delta += nn_table['init_G/C'][index] * GC
+        for column_keys in nn_keys:
+            delta += nn[column_keys]
+
+    k = (dnac1 - (dnac2 / 2.0)) * 1e-9
+    if selfcomp:
+        k = dnac1 * 1e-9
+        delta_h += nn_table['sym'][0]
+        delta_s += nn_table['sym'][1]
+    R = 1.987  # universal gas constant in Cal/degrees C*Mol
+    if saltcorr in (5, 6, 7):
+        # These depend on the length and GC content of each sequence
+        groups = seq_lengths * (int(seq_lengths.max()) + 1) + gc_count
+        groups, indices, inverse = numpy.unique(groups, return_index=True,
+                                                return_inverse=True)
+        corr = numpy.array([salt_correction(Na=Na, K=K, Tris=Tris, Mg=Mg,
+                                            dNTPs=dNTPs, method=saltcorr,
+                                            seq=checked[i])
+                            for i in indices])[inverse]
+    elif saltcorr:
+        corr = salt_correction(Na=Na, K=K, Tris=Tris, Mg=Mg, dNTPs=dNTPs,
+                               method=saltcorr)
+    if saltcorr == 5:
+        delta_s += corr
+    melting_temp = (1000 * delta_h) / (delta_s + (R * (math.log(k)))) - 273.15
+    if saltcorr in (1, 2, 3, 4):
+        melting_temp += corr
+    if saltcorr in (6, 7):
+        # Tm = 1/(1/Tm + corr)
+        melting_temp = (1 / (1 / (melting_temp + 273.15) + corr) - 273.15)
+    return melting_temp
+
+
 def Tm_staluc(s, dnac=50, saltc=50, rna=0):
     """Return DNA/DNA Tm using nearest neighbor thermodynamics (OBSOLETE).
 
@@ -0,0 +1,307 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""MinHash sketches for fast estimation of genome distances.
+
+A bottom-k MinHash sketch keeps the smallest hash values of the distinct
+canonical k-mers in a genome (see Bio.SeqUtils.KmerCount). Comparing the
+sketches of two genomes estimates the Jaccard index of their k-mer sets,
+from which the Mash distance (Ondov et al. 2016), an estimate of the
+mutation rate between the genomes, is calculated. This is much faster than
+aligning the genomes, so is useful for picking reference genomes or finding
+duplicated assemblies.
+
+Sketches can be made from a sequence, a SeqRecord, or any number of them
+(e.g. all the contigs of an assembly from Bio.SeqIO.parse):
+
+>>> from Bio import SeqIO
+>>> from Bio.SeqUtils.MinHash import Sketch, sketch_file
+>>> hiv = sketch_file("GFF/NC_001802.fna", k=15, size=200)
+>>> print(hiv)
+Sketch('GFF/NC_001802.fna', k=15, size=200, hashes=200)
+>>> record = SeqIO.read("GFF/NC_001802.fna", "fasta")
+>>> start = Sketch(record[:6000], k=15, size=200, name="start")
+>>> print("%0.2f" % hiv.jaccard(start))
+0.67
+>>> print("%0.4f" % hiv.distance(start))
+0.0147
+
+For many sketches, the all against all distances are calculated together
+using NumPy, giving a Bio.Phylo.TreeConstruction.DistanceMatrix which can
+be used to build a tree with the DistanceTreeConstructor:
+
+>>> from Bio.SeqUtils.MinHash import distance_matrix
+>>> end = Sketch(record[3000:], k=15, size=200, name="end")
+>>> dm = distance_matrix([hiv, start, end])
+>>> print(dm.names)
+['GFF/NC_001802.fna', 'start', 'end']
+>>> print("%0.4f" % dm["start", "end"])
+0.0417
+
+Sketches can be saved to and loaded from a compact binary file using the
+save_sketches and load_sketches functions. Note the hash function differs
+from that used by the Mash tool, so the sketches are not interchangeable.
+"""
+
+from __future__ import print_function
+
+import struct
+
+from Bio._py3k import basestring
+
+from Bio.File import as_handle
+from Bio import SeqIO
+from Bio.Phylo.TreeConstruction import DistanceMatrix
+from Bio.Seq import Seq, MutableSeq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.KmerCount import numpy, hash_codes, kmer_codes, _check_k
+
+
+# Padding for the hashes of sketches with fewer than size hashes
+_EMPTY = numpy.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Maximum number of hashes compared at once in the all against all distances
+_CHUNK_SIZE = 1 << 22
+
+# Binary file format for saved sketches. After the header (magic bytes and
+# number of sketches), each sketch has k, size, number of hashes, length of
+# the name, the name (UTF-8), and the hashes. All integers are little endian.
+_MAGIC = b"BioMinHash\x00\x01"
+_HEADER = struct.Struct("<I")
+_SKETCH = struct.Struct("<BIIH")
+
+
+class Sketch(object):
+    """Bottom-k MinHash sketch of the canonical k-mers in a genome.
+
+    Attributes:
+     - name - the genome name (string or None).
+     - k - the k-mer size, from 1 to 31.
+     - size - the maximum number of hashes kept.
+     - hashes - sorted NumPy array of the smallest hash values of the
+       distinct canonical k-mers seen so far.
+
+    """
+
+    def __init__(self, sequences=None, k=21, size=1000, name=None):
+        """Create a sketch, optionally of some sequences.
+
+        Arguments:
+         - sequences - a string, Seq, or SeqRecord, or an iterable of them
+           (such as the SeqRecord objects from Bio.SeqIO.parse), optional.
+         - k - the k-mer size, from 1 to 31 (default 21).
+         - size - the maximum number of hashes kept (default 1000).
+         - name - the name for the sketch. If not given, the identifier of
+           the first SeqRecord added is used.
+
+        """
+        _check_k(k)
+        if size < 1:
+            raise ValueError("Sketch size must be at least one, not %r"
+                             % size)
+        self.k = k
+        self.size = size
+        self.name = name
+        self.hashes = numpy.zeros(0, dtype=numpy.uint64)
+        if sequences is not None:
+            self.update(sequences)
+
+    def __repr__(self):
+        """Return a string representation of the sketch for debugging."""
+        return "%s(%r, k=%i, size=%i, hashes=%i)" % (
+            self.__class__.__name__, self.name, self.k, self.size,
+            len(self.hashes))
+
+    def __len__(self):
+        """Return the number of hashes in the sketch."""
+        return len(self.hashes)
+
+    def add(self, sequence):
+        """Add the k-mers of a sequence (string, Seq, or SeqRecord)."""
+        if self.name is None and isinstance(sequence, SeqRecord):
+            self.name = sequence.id
+        hashes = hash_codes(kmer_codes(sequence, self.k, canonical=True))
+        if len(self.hashes) == self.size:
+            # Only hashes smaller than the current largest can be kept
+            hashes = hashes[hashes < self.hashes[-1]]
+        hashes = numpy.union1d(self.hashes, hashes)
+        self.hashes = hashes[:self.size]
+
+    def update(self, sequences):
+        """Add the k-mers of each sequence (or SeqRecord) from an iterable.
+
+        A single string, Seq, or SeqRecord is also accepted.
+        """
+        if isinstance(sequences, (basestring, Seq, MutableSeq, SeqRecord)):
+            sequences = [sequences]
+        for sequence in sequences:
+            self.add(sequence)
+
+    def _check_compatible(self, other):
+        """Check the two sketches can be compared (PRIVATE)."""
+        if self.k != other.k or self.size != other.size:
+            raise ValueError("Sketches with different k-mer or sketch sizes "
+                             "(k=%i and k=%i, size=%i and size=%i)"
+                             % (self.k, other.k, self.size, other.size))
+
+    def jaccard(self, other):
+        """Return the estimated Jaccard index of the k-mers in two genomes."""
+        self._check_compatible(other)
+        shared, union = _compare(_as_matrix([self], self.size),
+                                 _as_matrix([other], self.size), self.size)
+        if not union[0]:
+            return 0.0
+        return float(shared[0]) / union[0]
+
+    def distance(self, other):
+        """Return the Mash distance between two genomes."""
+        return float(_mash_distance(self.jaccard(other), self.k))
+
+
+def sketch_file(filename, format="fasta", k=21, size=1000, name=None):
+    """Return a Sketch of all the sequences in a file (e.g. an assembly).
+
+    Arguments:
+     - filename - the file name (or handle) to read, using Bio.SeqIO.
+     - format - the file format (default "fasta").
+     - k - the k-mer size, from 1 to 31 (default 21).
+     - size - the maximum number of hashes kept (default 1000).
+     - name - the name for the sketch, defaults to the file name.
+
+    """
+    if name is None and isinstance(filename, basestring):
+        name = filename
+    return Sketch(SeqIO.parse(filename, format), k, size, name)
+
+
+def _as_matrix(sketches, size):
+    """Return the sketch hashes as rows of a matrix, padded with _EMPTY (PRIVATE)."""
+    matrix = numpy.full((len(sketches), size), _EMPTY, dtype=numpy.uint64)
+    for row, sketch in zip(matrix, sketches):
+        row[:len(sketch.hashes)] = sketch.hashes
+    return matrix
+
+
+def _compare(a, b, size):
+    """Compare the sketches in each row of two matrices (PRIVATE).
+
+    Returns two arrays, the number of hashes shared by each pair of sketches
+    within the smallest size hashes of their union, and the number of hashes
+    in the union (up to size).
+    """
+    both = numpy.sort(numpy.concatenate((a, b), axis=1), axis=1)
+    valid = both != _EMPTY
+    # Each sketch has distinct hashes, so a repeat is shared by both
+    shared = numpy.zeros(both.shape, dtype=bool)
+    shared[:, 1:] = (both[:, 1:] == both[:, :-1]) & valid[:, 1:]
+    distinct = valid & ~shared
+    rank = numpy.cumsum(distinct, axis=1)
+    shared_count = (shared & (rank <= size)).sum(axis=1)
+    union = numpy.minimum(distinct.sum(axis=1), size)
+    return shared_count, union
+
+
+def _mash_distance(jaccard, k):
+    """Return the Mash distance for Jaccard index estimates (PRIVATE)."""
+    jaccard = numpy.asarray(jaccard, dtype=float)
+    with numpy.errstate(divide="ignore"):
+        distance = -numpy.log(2 * jaccard / (1 + jaccard)) / k
+    return numpy.where(jaccard > 0, distance, 1.0)
+
+
+def mash_distances(sketches):
+    """Return the all against all Mash distances as a NumPy array.
+
+    The sketches must all use the same k-mer and sketch sizes. Returns a
+    symmetric square array of distances, with zeros on the diagonal.
+    """
+    sketches = list(sketches)
+    n = len(sketches)
+    distances = numpy.zeros((n, n))
+    if not n:
+        return distances
+    for sketch in sketches[1:]:
+        sketches[0]._check_compatible(sketch)
+    size = sketches[0].size
+    matrix = _as_matrix(sketches, size)
+    rows = max(1, _CHUNK_SIZE // (2 * size))
+    for i in range(n - 1):
+        for start in range(i + 1, n, rows):
+            others = matrix[start:start + rows]
+            shared, union = _compare(numpy.repeat(matrix[i:i + 1],
+                                                  len(others), axis=0),
+                                     others, size)
+            jaccard = shared / numpy.maximum(union, 1).astype(float)
+            distance = _mash_distance(jaccard, sketches[0].k)
+            distances[i, start:start + len(others)] = distance
+            distances[start:start + len(others), i] = distance
+    return distances
+
+
+def distance_matrix(sketches, names=None):
+    """Return the all against all Mash distances as a DistanceMatrix.
+
+    Arguments:
+     - sketches - list of Sketch objects, using the same k-mer and sketch
+       sizes.
+     - names - optional list of names for the matrix, by default the
+       sketch names.
+
+    The result can be used with Bio.Phylo.TreeConstruction's
+    DistanceTreeConstructor to build a tree with UPGMA or neighbor joining.
+    """
+    sketches = list(sketches)
+    if names is None:
+        names = [sketch.name for sketch in sketches]
+    distances = mash_distances(sketches)
+    return DistanceMatrix(list(names), [distances[i, :i + 1].tolist()
+                                        for i in range(len(sketches))])
+
+
+def save_sketches(sketches, handle):
+    """Write sketches to a file (handle or file name) in a binary format.
+
+    Each hash is stored as an 8 byte integer, so a sketch takes about 8
+    bytes per hash.
+    """
+    sketches = list(sketches)
+    with as_handle(handle, "wb") as fp:
+        fp.write(_MAGIC)
+        fp.write(_HEADER.pack(len(sketches)))
+        for sketch in sketches:
+            name = (sketch.name or "").encode("utf-8")
+            fp.write(_SKETCH.pack(sketch.k, sketch.size, len(sketch.hashes),
+                                  len(name)))
+            fp.write(name)
+            fp.write(sketch.hashes.astype("<u8").tobytes())
+
+
+def load_sketches(handle):
+    """Read sketches saved with the save_sketches function, returns a list."""
+    with as_handle(handle, "rb") as fp:
+        if fp.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Not a Biopython MinHash sketch file")
+        count, = _HEADER.unpack(fp.read(_HEADER.size))
+        sketches = []
+        for i in range(count):
+            data = fp.read(_SKETCH.size)
+            if len(data) != _SKETCH.size:
+                raise ValueError("Truncated sketch file")
+            k, size, length, name_length = _SKETCH.unpack(data)
+            name = fp.read(name_length).decode("utf-8") or None
+            data = fp.read(8 * length)
+            if len(data) != 8 * length:
+                raise ValueError("Truncated sketch file")
+            sketch = Sketch(k=k, size=size, name=name)
+            sketch.hashes = numpy.frombuffer(data, dtype="<u8").astype(
+                numpy.uint64)
+            sketches.append(sketch)
+    return sketches
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
@@ -0,0 +1,232 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Sliding window statistics of nucleotide sequences using NumPy.
+
+The functions here calculate statistics such as the GC content or GC skew
+in windows along a sequence, for any window size and step between windows.
+Rather than counting the letters in each window separately, the letter
+counts of all the windows come from differences of cumulative counts along
+the sequence, so overlapping windows cost no more than adjacent ones:
+
+>>> from Bio.SeqUtils.WindowStats import gc_content, gc_skew
+>>> sequence = "GGGCCCAAATTTGGGGGGAAAC"
+>>> gc_content(sequence, window=6).tolist()
+[100.0, 0.0, 100.0, 25.0]
+>>> gc_skew(sequence, window=6, step=3).tolist()
+[0.0, -1.0, 0.0, 1.0, 1.0, 1.0, -1.0, -1.0]
+
+The windows start at zero and every step bases after that (by default the
+step is the window size), with the windows at the end of the sequence
+shortened to fit. Their positions are given by the window_positions
+function:
+
+>>> from Bio.SeqUtils.WindowStats import window_positions
+>>> starts, ends = window_positions(len(sequence), window=6, step=3)
+>>> starts.tolist()
+[0, 3, 6, 9, 12, 15, 18, 21]
+>>> ends.tolist()
+[6, 9, 12, 15, 18, 21, 22, 22]
+
+Counts for any letter or group of letters (in either case) are given by the
+window_counts function, with one column per group:
+
+>>> from Bio.SeqUtils.WindowStats import window_counts
+>>> window_counts(sequence, ["GC", "AT", "N"], window=10).tolist()
+[[6, 4, 0], [6, 4, 0], [1, 1, 0]]
+
+Long sequences are processed in pieces, so the memory used does not depend
+on the sequence length. Together with the genome_tracks function, which
+goes through the records (e.g. chromosomes) from an iterator one at a
+time, this allows tracks for a whole genome to be calculated, for example
+from a UCSC 2bit file, without loading it all into memory.
+
+The GC_skew function in Bio.SeqUtils and the lcc_mult function in
+Bio.SeqUtils.lcc give similar results one window at a time in pure Python.
+"""
+
+from __future__ import print_function
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.WindowStats.")
+
+from Bio._py3k import basestring
+
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.KmerCount import _sequence_bytes
+
+
+# Approximate number of bases processed at once
+_CHUNK_SIZE = 1 << 22
+
+
+def window_positions(length, window=1000, step=None):
+    """Return NumPy arrays of the start and end of each window.
+
+    Arguments:
+     - length - the sequence length.
+     - window - the window size (default 1000).
+     - step - the distance between window starts (default the window
+       size, for non-overlapping windows).
+
+    The windows start at 0, step, 2*step and so on, up to the end of the
+    sequence, and the windows at the end are shortened to fit.
+    """
+    if step is None:
+        step = window
+    if window < 1 or step < 1:
+        raise ValueError("The window size and step must be positive")
+    starts = numpy.arange(0, length, step, dtype=numpy.int64)
+    ends = numpy.minimum(starts + window, length)
+    return starts, ends
+
+
+def _letter_tables(letters):
+    """Return a lookup table for each group of letters, in either case (PRIVATE)."""
+    if isinstance(letters, basestring):
+        letters = list(letters)
+    tables = numpy.zeros((len(letters), 256), dtype=numpy.uint8)
+    for table, group in zip(tables, letters):
+        for letter in str(group).upper() + str(group).lower():
+            table[ord(letter)] = 1
+    return tables
+
+
+def window_counts(sequence, letters="ACGT", window=1000, step=None):
+    """Return a NumPy array of the letter counts in each window.
+
+    Arguments:
+     - sequence - string, Seq (including Bio.Seq.PackedSeq), or SeqRecord.
+     - letters - a string of letters to count separately, or a list of
+       strings, each of which gives a group of letters counted together.
+       Either case is counted. Default "ACGT".
+     - window - the window size (default 1000).
+     - step - the distance between window starts (default the window size).
+
+    The array has a row for each window (see the window_positions function)
+    and a column for each letter or group.
+    """
+    if isinstance(sequence, SeqRecord):
+        sequence = sequence.seq
+    tables = _letter_tables(letters)
+    starts, ends = window_positions(len(sequence), window, step)
+    counts = numpy.zeros((len(starts), len(tables)), dtype=numpy.int64)
+    # Windows are done in batches covering about _CHUNK_SIZE bases
+    batch = max(1, _CHUNK_SIZE // (step or window))
+    for i in range(0, len(starts), batch):
+        first = starts[i]
+        last = ends[i:i + batch].max()
+        data = numpy.frombuffer(_sequence_bytes(sequence[first:last]),
+                                dtype=numpy.uint8)
+        batch_starts = starts[i:i + batch] - first
+        batch_ends = ends[i:i + batch] - first
+        cumulative = numpy.zeros(len(data) + 1, dtype=numpy.int64)
+        for column, table in enumerate(tables):
+            numpy.cumsum(table[data], out=cumulative[1:])
+            counts[i:i + batch, column] = cumulative[batch_ends] - \
+                cumulative[batch_starts]
+    return counts
+
+
+def _skew(first, second):
+    """Return (first - second) / (first + second), or zero if both are zero (PRIVATE)."""
+    total = first + second
+    return numpy.where(total > 0,
+                       (first - second) / numpy.maximum(total, 1).astype(float),
+                       0.0)
+
+
+def gc_content(sequence, window=1000, step=None):
+    """Return a NumPy array of the G+C percentage of each window.
+
+    As in the Bio.SeqUtils.GC function, the ambiguous letter S (G or C) is
+    counted along with G and C, and the percentage is of the window length
+    (including any ambiguous letters).
+    """
+    counts = window_counts(sequence, ["GCS"], window, step)[:, 0]
+    starts, ends = window_positions(len(sequence), window, step)
+    return counts * 100.0 / (ends - starts)
+
+
+def gc_skew(sequence, window=1000, step=None):
+    """Return a NumPy array of the GC skew (G-C)/(G+C) of each window.
+
+    As in the Bio.SeqUtils.GC_skew function, windows without any G or C
+    have a skew of zero.
+    """
+    counts = window_counts(sequence, "GC", window, step)
+    return _skew(counts[:, 0], counts[:, 1])
+
+
+def at_skew(sequence, window=1000, step=None):
+    """Return a NumPy array of the AT skew (A-T)/(A+T) of each window.
+
+    Windows without any A or T (or U) have a skew of zero.
+    """
+    counts = window_counts(sequence, ["A", "TU"], window, step)
+    return _skew(counts[:, 0], counts[:, 1])
+
+
+def lcc(sequence, window=1000, step=None):
+    """Return a NumPy array of the local composition complexity of each window.
+
+    This is the entropy (in bits) of the base composition of each window,
+    as calculated for a single sequence by the lcc_simp function in
+    Bio.SeqUtils.lcc, using the frequencies of A, C, G and T in the window.
+    """
+    counts = window_counts(sequence, "ACGT", window, step)
+    starts, ends = window_positions(len(sequence), window, step)
+    lengths = ends - starts
+    # Look up the entropy terms for full length windows, as with lcc_mult
+    frequencies = numpy.arange(1, window + 1) / float(window)
+    table = numpy.concatenate(([0.0], frequencies * numpy.log2(frequencies)))
+    terms = table[counts]
+    # Calculate them for the shorter windows at the end
+    short = lengths < window
+    frequencies = counts[short] / lengths[short, None].astype(float)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        terms[short] = numpy.where(counts[short] > 0,
+                                   frequencies * numpy.log2(frequencies), 0.0)
+    return -terms.sum(axis=1)
+
+
+def genome_tracks(records, statistic=gc_content, window=1000, step=None):
+    """Iterate over records, giving the windows and statistic for each.
+
+    Arguments:
+     - records - an iterable of SeqRecord objects, such as from the
+       Bio.SeqIO.parse function.
+     - statistic - a function taking a sequence, window size and step,
+       such as gc_content (default), gc_skew, at_skew, or lcc.
+     - window - the window size (default 1000).
+     - step - the distance between window starts (default the window size).
+
+    This is a generator function, returning a tuple of the record
+    identifier, and NumPy arrays of the window starts, ends and values
+    for each record in turn, so only one record is used at a time:
+
+    >>> from Bio import SeqIO
+    >>> from Bio.SeqUtils.WindowStats import genome_tracks
+    >>> records = SeqIO.parse("TwoBit/sequence.bigendian.2bit", "twobit")
+    >>> for name, starts, ends, values in genome_tracks(records, window=100):
+    ...     print("%s %s" % (name, ", ".join("%0.1f" % v for v in values)))
+    seq11111 40.0, 50.0, 48.9
+    seq222 43.0, 56.8
+    seq3333 44.3
+
+    """
+    for record in records:
+        starts, ends = window_positions(len(record), window, step)
+        yield record.id, starts, ends, statistic(record.seq, window, step)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
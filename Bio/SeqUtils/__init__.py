@@ -475,16 +475,15 @@ def six_frame_translations(seq, genetic_code=1):
     <BLANKLINE>
 
     """  # noqa for pep8 W291 trailing whitespace
-    from Bio.Seq import reverse_complement, translate
+    from Bio.Seq import reverse_complement, translate_six_frames
     anti = reverse_complement(seq)
     comp = anti[::-1]
     length = len(seq)
+    proteins = translate_six_frames(seq, genetic_code)
     frames = {}
     for i in range(0, 3):
-        fragment_length = 3 * ((length - i) // 3)
-        frames[i + 1] = translate(seq[i:i + fragment_length], genetic_code)
-        frames[-(i + 1)] = translate(anti[i:i + fragment_length],
-                                     genetic_code)[::-1]
+        frames[i + 1] = proteins[i]
+        frames[-(i + 1)] = proteins[3 + i][::-1]
 
     # create header
     if length > 20:
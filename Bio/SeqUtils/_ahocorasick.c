@@ -0,0 +1,421 @@
+/* Copyright 2019 by Biopython contributors.  All rights reserved.
+ *
+ * This file is part of the Biopython distribution and governed by your
+ * choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+ * Please see the LICENSE file that should have been included as part of this
+ * package.
+ *
+ * _ahocorasick.c
+ *
+ * Aho-Corasick automaton for finding every occurrence of a set of patterns
+ * in a sequence in a single pass. Used by Bio/SeqUtils/AhoCorasick.py.
+ *
+ * The patterns are first put into a trie, using only the letters which
+ * appear in the patterns (all other letters lead back to the root). The
+ * failure links are then found in breadth first order, and used to fill in
+ * the missing transitions, so that the automaton is a deterministic finite
+ * automaton with exactly one table lookup per letter of the sequence.
+ */
+
+#include <Python.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+typedef struct {
+    PyObject_HEAD
+    int size;                  /* number of letter codes, including 0 */
+    unsigned char codes[256];  /* letter code, 0 if not in any pattern */
+    Py_ssize_t nstates;
+    Py_ssize_t* transitions;   /* nstates x size table of next states */
+    Py_ssize_t* first;         /* first pattern ending at each state, or -1 */
+    Py_ssize_t* output;        /* nearest state on the failure path with
+                                  patterns ending there, or 0 for none */
+    Py_ssize_t npatterns;
+    Py_ssize_t* lengths;       /* length of each pattern */
+    Py_ssize_t* next;          /* next pattern ending at the same state */
+} Automaton;
+
+typedef struct {
+    Py_ssize_t start;
+    Py_ssize_t index;
+} Hit;
+
+
+static void
+Automaton_free(Automaton* self)
+{
+    PyMem_Free(self->transitions);
+    PyMem_Free(self->first);
+    PyMem_Free(self->output);
+    PyMem_Free(self->lengths);
+    PyMem_Free(self->next);
+    self->transitions = NULL;
+    self->first = NULL;
+    self->output = NULL;
+    self->lengths = NULL;
+    self->next = NULL;
+    self->nstates = 0;
+    self->npatterns = 0;
+}
+
+static void
+Automaton_dealloc(Automaton* self)
+{
+    Automaton_free(self);
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static int
+Automaton_build(Automaton* self, PyObject* patterns)
+{
+    Py_ssize_t i, j, k;
+    Py_ssize_t total = 0;
+    Py_ssize_t state, child, failure;
+    Py_ssize_t head, tail;
+    Py_ssize_t* queue = NULL;
+    Py_ssize_t* fail = NULL;
+    const Py_ssize_t n = PySequence_Fast_GET_SIZE(patterns);
+    PyObject** items = PySequence_Fast_ITEMS(patterns);
+    char* pattern;
+    Py_ssize_t length;
+    int size;
+
+    /* Assign codes to the letters used in the patterns */
+    memset(self->codes, 0, sizeof(self->codes));
+    size = 1;
+    for (i = 0; i < n; i++) {
+        if (PyBytes_AsStringAndSize(items[i], &pattern, &length) == -1)
+            return -1;
+        if (length == 0) {
+            PyErr_SetString(PyExc_ValueError, "patterns must not be empty");
+            return -1;
+        }
+        total += length;
+        for (j = 0; j < length; j++) {
+            unsigned char c = (unsigned char)pattern[j];
+            if (self->codes[c] == 0) self->codes[c] = size++;
+        }
+    }
+    self->size = size;
+    self->npatterns = n;
+
+    /* Allocate for the largest possible trie, with no shared prefixes */
+    self->transitions = PyMem_Malloc((total+1)*size*sizeof(Py_ssize_t));
+    self->first = PyMem_Malloc((total+1)*sizeof(Py_ssize_t));
+    self->output = PyMem_Malloc((total+1)*sizeof(Py_ssize_t));
+    self->lengths = PyMem_Malloc((n+1)*sizeof(Py_ssize_t));
+    self->next = PyMem_Malloc((n+1)*sizeof(Py_ssize_t));
+    fail = PyMem_Malloc((total+1)*sizeof(Py_ssize_t));
+    queue = PyMem_Malloc((total+1)*sizeof(Py_ssize_t));
+    if (!self->transitions || !self->first || !self->output
+     || !self->lengths || !self->next || !fail || !queue) {
+        PyMem_Free(fail);
+        PyMem_Free(queue);
+        PyErr_NoMemory();
+        return -1;
+    }
+    memset(self->transitions, 0, (total+1)*size*sizeof(Py_ssize_t));
+
+    /* Build the trie. A zero transition means there is no child yet, as
+     * the root is never a child. The patterns are added in reverse order,
+     * so that each list of patterns ending at a state is in order. */
+    self->nstates = 1;
+    self->first[0] = -1;
+    for (i = n - 1; i >= 0; i--) {
+        PyBytes_AsStringAndSize(items[i], &pattern, &length);
+        state = 0;
+        for (j = 0; j < length; j++) {
+            k = state * size + self->codes[(unsigned char)pattern[j]];
+            if (self->transitions[k] == 0) {
+                self->first[self->nstates] = -1;
+                self->transitions[k] = self->nstates++;
+            }
+            state = self->transitions[k];
+        }
+        self->lengths[i] = length;
+        self->next[i] = self->first[state];
+        self->first[state] = i;
+    }
+
+    /* Find the failure links in breadth first order, and use them to fill
+     * in the missing transitions. Letter code 0 always leads to the root. */
+    head = 0;
+    tail = 0;
+    fail[0] = 0;
+    self->output[0] = 0;
+    for (k = 1; k < size; k++) {
+        child = self->transitions[k];
+        if (child) {
+            fail[child] = 0;
+            self->output[child] = 0;
+            queue[tail++] = child;
+        }
+    }
+    while (head < tail) {
+        state = queue[head++];
+        failure = fail[state];
+        for (k = 1; k < size; k++) {
+            child = self->transitions[state * size + k];
+            if (child) {
+                fail[child] = self->transitions[failure * size + k];
+                if (self->first[fail[child]] >= 0)
+                    self->output[child] = fail[child];
+                else
+                    self->output[child] = self->output[fail[child]];
+                queue[tail++] = child;
+            }
+            else
+                self->transitions[state * size + k] =
+                    self->transitions[failure * size + k];
+        }
+    }
+    PyMem_Free(fail);
+    PyMem_Free(queue);
+    /* Release the space not used due to shared prefixes */
+    queue = PyMem_Realloc(self->transitions,
+                          self->nstates*size*sizeof(Py_ssize_t));
+    if (queue) self->transitions = queue;
+    return 0;
+}
+
+static int
+Automaton_init(Automaton *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"patterns", NULL};
+    PyObject* patterns;
+    int result;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &patterns))
+        return -1;
+    patterns = PySequence_Fast(patterns, "patterns must be a sequence");
+    if (!patterns) return -1;
+    Automaton_free(self);
+    result = Automaton_build(self, patterns);
+    Py_DECREF(patterns);
+    if (result == -1) Automaton_free(self);
+    return result;
+}
+
+static int
+compare_hits(const void* a, const void* b)
+{
+    const Hit* x = a;
+    const Hit* y = b;
+    if (x->start != y->start) return x->start < y->start ? -1 : 1;
+    if (x->index != y->index) return x->index < y->index ? -1 : 1;
+    return 0;
+}
+
+/* Scan the sequence, returning the number of hits or -1 if out of memory */
+static Py_ssize_t
+scan(const Automaton* self, const char* sequence, Py_ssize_t length,
+     Hit** hits)
+{
+    Py_ssize_t i, p, state = 0, node;
+    Py_ssize_t count = 0;
+    Py_ssize_t allocated = 0;
+    Hit* buffer = NULL;
+    Hit* new_buffer;
+    const int size = self->size;
+    const unsigned char* codes = self->codes;
+    const Py_ssize_t* transitions = self->transitions;
+
+    for (i = 0; i < length; i++) {
+        state = transitions[state * size + codes[(unsigned char)sequence[i]]];
+        node = self->first[state] >= 0 ? state : self->output[state];
+        while (node) {
+            for (p = self->first[node]; p >= 0; p = self->next[p]) {
+                if (count == allocated) {
+                    allocated = allocated ? 2 * allocated : 64;
+                    new_buffer = realloc(buffer, allocated*sizeof(Hit));
+                    if (!new_buffer) {
+                        free(buffer);
+                        return -1;
+                    }
+                    buffer = new_buffer;
+                }
+                buffer[count].start = i + 1 - self->lengths[p];
+                buffer[count].index = p;
+                count++;
+            }
+            node = self->output[node];
+        }
+    }
+    qsort(buffer, count, sizeof(Hit), compare_hits);
+    *hits = buffer;
+    return count;
+}
+
+static char Automaton_search__doc__[] =
+"search(sequence) -> list of (start, index) tuples for each match.\n"
+"\n"
+"The sequence must be a bytes string. The matches are sorted by their\n"
+"start position, then by pattern index.\n";
+
+static PyObject*
+Automaton_search(Automaton* self, PyObject* args, PyObject* kwds)
+{
+    static char *kwlist[] = {"sequence", NULL};
+    PyObject* sequence;
+    PyObject* result;
+    PyObject* item;
+    char* data;
+    Py_ssize_t length;
+    Py_ssize_t i, count;
+    Hit* hits = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &sequence))
+        return NULL;
+    if (!self->transitions) {
+        PyErr_SetString(PyExc_RuntimeError, "automaton not initialized");
+        return NULL;
+    }
+    if (PyBytes_AsStringAndSize(sequence, &data, &length) == -1)
+        return NULL;
+    Py_BEGIN_ALLOW_THREADS
+    count = scan(self, data, length, &hits);
+    Py_END_ALLOW_THREADS
+    if (count < 0) return PyErr_NoMemory();
+    result = PyList_New(count);
+    if (!result) {
+        free(hits);
+        return NULL;
+    }
+    for (i = 0; i < count; i++) {
+        item = Py_BuildValue("nn", hits[i].start, hits[i].index);
+        if (!item) {
+            Py_DECREF(result);
+            free(hits);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, item);
+    }
+    free(hits);
+    return result;
+}
+
+static PyObject*
+Automaton_get_states(Automaton* self, void* closure)
+{
+    return PyLong_FromSsize_t(self->nstates);
+}
+
+static PyGetSetDef Automaton_getset[] = {
+    {"states",
+        (getter)Automaton_get_states,
+        NULL,
+        "number of states in the automaton",
+        NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PyMethodDef Automaton_methods[] = {
+    {"search",
+     (PyCFunction)Automaton_search,
+     METH_VARARGS | METH_KEYWORDS,
+     Automaton_search__doc__
+    },
+    {NULL}  /* Sentinel */
+};
+
+static char Automaton_doc[] =
+"Automaton(patterns) -> Aho-Corasick automaton of a list of bytes strings.";
+
+static PyTypeObject AutomatonType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_ahocorasick.Automaton",      /* tp_name */
+    sizeof(Automaton),             /* tp_basicsize */
+    0,                             /* tp_itemsize */
+    (destructor)Automaton_dealloc, /* tp_dealloc */
+    0,                             /* tp_print */
+    0,                             /* tp_getattr */
+    0,                             /* tp_setattr */
+    0,                             /* tp_compare */
+    0,                             /* tp_repr */
+    0,                             /* tp_as_number */
+    0,                             /* tp_as_sequence */
+    0,                             /* tp_as_mapping */
+    0,                             /* tp_hash */
+    0,                             /* tp_call */
+    0,                             /* tp_str */
+    0,                             /* tp_getattro */
+    0,                             /* tp_setattro */
+    0,                             /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,        /*tp_flags*/
+    Automaton_doc,                 /* tp_doc */
+    0,                             /* tp_traverse */
+    0,                             /* tp_clear */
+    0,                             /* tp_richcompare */
+    0,                             /* tp_weaklistoffset */
+    0,                             /* tp_iter */
+    0,                             /* tp_iternext */
+    Automaton_methods,             /* tp_methods */
+    0,                             /* tp_members */
+    Automaton_getset,              /* tp_getset */
+    0,                             /* tp_base */
+    0,                             /* tp_dict */
+    0,                             /* tp_descr_get */
+    0,                             /* tp_descr_set */
+    0,                             /* tp_dictoffset */
+    (initproc)Automaton_init,      /* tp_init */
+};
+
+/* Module definition */
+
+static PyMethodDef _ahocorasick_methods[] = {
+    {NULL, NULL, 0, NULL}
+};
+
+static char _ahocorasick__doc__[] =
+"C extension module implementing the Aho-Corasick multiple pattern search";
+
+#if PY_MAJOR_VERSION >= 3
+
+static struct PyModuleDef moduledef = {
+        PyModuleDef_HEAD_INIT,
+        "_ahocorasick",
+        _ahocorasick__doc__,
+        -1,
+        _ahocorasick_methods,
+        NULL,
+        NULL,
+        NULL,
+        NULL
+};
+
+PyObject *
+PyInit__ahocorasick(void)
+
+#else
+
+void
+init_ahocorasick(void)
+#endif
+
+{
+  PyObject* module;
+
+  AutomatonType.tp_new = PyType_GenericNew;
+
+  if (PyType_Ready(&AutomatonType) < 0)
+#if PY_MAJOR_VERSION >= 3
+      return NULL;
+#else
+      return;
+#endif
+
+#if PY_MAJOR_VERSION >= 3
+    module = PyModule_Create(&moduledef);
+#else
+    module = Py_InitModule3("_ahocorasick", _ahocorasick_methods,
+                            _ahocorasick__doc__);
+#endif
+
+  Py_INCREF(&AutomatonType);
+  PyModule_AddObject(module, "Automaton", (PyObject*) &AutomatonType);
+
+#if PY_MAJOR_VERSION >= 3
+  return module;
+#endif
+}
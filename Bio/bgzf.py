@@ -225,6 +225,8 @@ from __future__ import print_function
 import sys
 import zlib
 import struct
+from bisect import bisect_right
+from collections import deque, OrderedDict
 
 from Bio._py3k import _as_bytes, _as_string
 from Bio._py3k import open as _open
@@ -238,12 +240,16 @@ _bgzf_eof = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00\x1b\x00
 _bytes_BC = b"BC"
 
 
-def open(filename, mode="rb"):
-    """Open a BGZF file for reading, writing or appending."""
+def open(filename, mode="rb", threads=0):
+    """Open a BGZF file for reading, writing or appending.
+
+    The optional threads argument is passed to the BgzfReader or BgzfWriter,
+    to decompress or compress the BGZF blocks in a pool of worker threads.
+    """
     if "r" in mode.lower():
-        return BgzfReader(filename, mode)
+        return BgzfReader(filename, mode, threads=threads)
     elif "w" in mode.lower() or "a" in mode.lower():
-        return BgzfWriter(filename, mode)
+        return BgzfWriter(filename, mode, threads=threads)
     else:
         raise ValueError("Bad mode %r" % mode)
 
@@ -400,11 +406,104 @@ def BgzfBlocks(handle):
         data_start += data_len
 
 
-def _load_bgzf_block(handle, text_mode=False):
-    """Load the next BGZF block of compressed data (PRIVATE).
+def _gzi_from_blocks(handle):
+    """Scan a BGZF file handle for its block offsets, as in a .gzi index (PRIVATE).
 
-    Returns a tuple (block size and data), or at end of file
-    will raise StopIteration.
+    Returns a list of (compressed offset, uncompressed offset) tuples,
+    starting with (0, 0) for the first block and then one entry for the
+    end of each non-empty block (i.e. the start of the next block). The
+    blocks are not decompressed, the uncompressed size is taken from the
+    end of each block.
+    """
+    handle.seek(0)
+    raw_start = 0
+    data_start = 0
+    index = [(0, 0)]
+    while True:
+        try:
+            block_size, deflated, crc, size = _read_bgzf_block(handle)
+        except StopIteration:
+            break
+        raw_start += block_size
+        if size:
+            data_start += size
+            index.append((raw_start, data_start))
+    return index
+
+
+def read_gzi(filename):
+    """Load a samtools/bgzip style .gzi index of BGZF block offsets.
+
+    The .gzi file format is a little endian unsigned 64 bit count,
+    followed by that many pairs of unsigned 64 bit integers giving
+    the compressed (raw) and uncompressed (data) offsets of the start
+    of each BGZF block, except the first block.
+
+    Returns a list of (compressed offset, uncompressed offset) tuples,
+    including (0, 0) for the first block.
+    """
+    with _open(filename, "rb") as handle:
+        data = handle.read(8)
+        if len(data) != 8:
+            raise ValueError("Empty or truncated .gzi index file")
+        count = struct.unpack("<Q", data)[0]
+        data = handle.read(16 * count)
+        if len(data) != 16 * count:
+            raise ValueError("Truncated .gzi index file, expected %i entries"
+                             % count)
+    values = struct.unpack("<%iQ" % (2 * count), data)
+    return [(0, 0)] + list(zip(values[0::2], values[1::2]))
+
+
+def write_gzi(filename, index):
+    """Save a list of BGZF block offsets as a samtools/bgzip style .gzi index.
+
+    The index should be a list of (compressed offset, uncompressed offset)
+    tuples as returned by the read_gzi or make_gzi functions. The leading
+    (0, 0) entry for the first block is implicit in the .gzi format, so is
+    not written to the file.
+    """
+    if index and tuple(index[0]) == (0, 0):
+        index = index[1:]
+    with _open(filename, "wb") as handle:
+        handle.write(struct.pack("<Q", len(index)))
+        for raw_start, data_start in index:
+            handle.write(struct.pack("<QQ", raw_start, data_start))
+
+
+def make_gzi(filename, gzi_filename=None):
+    """Build a .gzi index of the block offsets for an existing BGZF file.
+
+    This is equivalent to ``bgzip -r filename``, and by default saves the
+    index as the filename plus a .gzi extension. Returns the index as a
+    list of (compressed offset, uncompressed offset) tuples:
+
+    >>> index = make_gzi("GenBank/NC_000932.gb.bgz", gzi_filename=False)
+    >>> for values in index:
+    ...     print("Raw start %i; data start %i" % values)
+    Raw start 0; data start 0
+    Raw start 15073; data start 65536
+    Raw start 32930; data start 131072
+    Raw start 55074; data start 196608
+    Raw start 77304; data start 262144
+    Raw start 92243; data start 305622
+
+    Use gzi_filename=False to just return the index without saving it.
+    """
+    with _open(filename, "rb") as handle:
+        index = _gzi_from_blocks(handle)
+    if gzi_filename is None:
+        gzi_filename = filename + ".gzi"
+    if gzi_filename is not False:
+        write_gzi(gzi_filename, index)
+    return index
+
+
+def _read_bgzf_block(handle):
+    """Read the next BGZF block of compressed data without decompressing it (PRIVATE).
+
+    Returns a tuple (block size, deflated data, expected CRC, expected
+    decompressed length), or at end of file will raise StopIteration.
     """
     magic = handle.read(4)
     if not magic:
@@ -433,10 +532,19 @@ def _load_bgzf_block(handle, text_mode=False):
     assert block_size is not None, "Missing BC, this isn't a BGZF file!"
     # Now comes the compressed data, CRC, and length of uncompressed data.
     deflate_size = block_size - 1 - extra_len - 19
-    d = zlib.decompressobj(-15)  # Negative window size means no headers
-    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    deflated = handle.read(deflate_size)
     expected_crc = handle.read(4)
     expected_size = struct.unpack("<I", handle.read(4))[0]
+    return block_size, deflated, expected_crc, expected_size
+
+
+def _inflate_bgzf_block(deflated, expected_crc, expected_size, text_mode=False):
+    """Decompress and check the data from a BGZF block (PRIVATE).
+
+    This does not touch the file handle, so can be run in a worker thread.
+    """
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(deflated) + d.flush()
     if expected_size != len(data):
         raise RuntimeError("Decompressed to %i, "
                            "not %i" % (len(data), expected_size))
@@ -449,9 +557,52 @@ def _load_bgzf_block(handle, text_mode=False):
     if expected_crc != crc:
         raise RuntimeError("CRC is %s, not %s" % (crc, expected_crc))
     if text_mode:
-        return block_size, _as_string(data)
+        return _as_string(data)
     else:
-        return block_size, data
+        return data
+
+
+def _load_bgzf_block(handle, text_mode=False):
+    """Load the next BGZF block of compressed data (PRIVATE).
+
+    Returns a tuple (block size and data), or at end of file
+    will raise StopIteration.
+    """
+    block_size, deflated, expected_crc, expected_size = _read_bgzf_block(handle)
+    return block_size, _inflate_bgzf_block(deflated, expected_crc,
+                                           expected_size, text_mode)
+
+
+def _compress_bgzf_block(block, compresslevel):
+    """Compress data into a complete BGZF block, returned as bytes (PRIVATE).
+
+    This does not touch any file handle, so can be run in a worker thread.
+    """
+    assert len(block) <= 65536
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel,
+                         zlib.DEFLATED,
+                         -15,
+                         zlib.DEF_MEM_LEVEL,
+                         0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    if len(compressed) > 65536:
+        raise RuntimeError("TODO - Didn't compress enough, "
+                           "try less data in this block")
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xffffffff)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
 
 
 class BgzfReader(object):
@@ -521,14 +672,48 @@ class BgzfReader(object):
     block can be up to 64kb, the default cache could take up to 6MB of
     RAM. The cache is not important for reading through the file in one
     pass, but is important for improving performance of random access.
+    The least recently used block is removed from the cache when full.
+
+    For reading large files sequentially, you can use the threads argument
+    to decompress the following blocks in a pool of worker threads (zlib
+    releases the GIL while decompressing, so this runs in parallel). The
+    read_ahead argument sets how many blocks ahead of the current block
+    are decompressed (default four per thread). These blocks are held in
+    the cache too, so max_cache must be at least as large as read_ahead.
+    Seeking and virtual offsets work exactly as without any threads:
+
+    >>> handle = BgzfReader("SamBam/ex1.bam", "rb", threads=2)
+    >>> magic = handle.read(4)
+    >>> data = handle.read(65536)
+    >>> assert 1195311108 == handle.tell()
+    >>> handle.close()
+
+    If you know an offset in the decompressed data, rather than a virtual
+    offset, use the seek_uncompressed method. This needs the offsets of
+    all the BGZF blocks, which can be loaded from a samtools/bgzip style
+    .gzi index file using the gzi argument (see also the make_gzi function
+    and the BgzfWriter gzi argument), or otherwise will be found by
+    scanning the whole file the first time seek_uncompressed is used:
+
+    >>> handle = BgzfReader("SamBam/ex1.bam", "rb")
+    >>> handle.seek_uncompressed(65540)
+    1195311108
+    >>> handle.close()
     """
 
-    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100,
+                 threads=0, read_ahead=None, gzi=None):
         """Initialize the class."""
         # TODO - Assuming we can seek, check for 28 bytes EOF empty block
         # and if missing warn about possible truncation (as in samtools)?
         if max_cache < 1:
             raise ValueError("Use max_cache with a minimum of 1")
+        if threads < 0:
+            raise ValueError("Use threads with a minimum of 0")
+        if read_ahead is None:
+            read_ahead = 4 * threads
+        if threads and not 0 < read_ahead <= max_cache:
+            raise ValueError("Use read_ahead between 1 and max_cache")
         # Must open the BGZF file in binary mode, but we may want to
         # treat the contents as either text or binary (unicode or
         # bytes under Python 3)
@@ -547,11 +732,38 @@ class BgzfReader(object):
             self._newline = b"\n"
         self._handle = handle
         self.max_cache = max_cache
-        self._buffers = {}
+        # Block start offset to (data, raw block length), least recently
+        # used first:
+        self._buffers = OrderedDict()
+        # Block start offset to (pending result, raw block length) for
+        # blocks being decompressed by the thread pool:
+        self._pending = {}
+        self._read_ahead = read_ahead
+        if threads:
+            from multiprocessing.pool import ThreadPool
+            self._pool = ThreadPool(threads)
+        else:
+            self._pool = None
         self._block_start_offset = None
         self._block_raw_length = None
+        # Block offsets for seek_uncompressed, loaded or built on demand:
+        if gzi is None:
+            self._gzi_index = None
+        else:
+            self._set_gzi_index(read_gzi(gzi))
         self._load_block(handle.tell())
 
+    def _set_gzi_index(self, index):
+        """Record the block offsets used for seek_uncompressed (PRIVATE)."""
+        self._gzi_index = index
+        self._gzi_data_starts = [data_start for raw_start, data_start in index]
+
+    def _cache_block(self, start_offset, buffer, block_size):
+        """Add a decompressed block to the cache, dropping the LRU block if full (PRIVATE)."""
+        while len(self._buffers) >= self.max_cache:
+            self._buffers.popitem(last=False)
+        self._buffers[start_offset] = buffer, block_size
+
     def _load_block(self, start_offset=None):
         if start_offset is None:
             # If the file is being read sequentially, then _handle.tell()
@@ -562,33 +774,75 @@ class BgzfReader(object):
             self._within_block_offset = 0
             return
         elif start_offset in self._buffers:
-            # Already in cache
-            self._buffer, self._block_raw_length = self._buffers[start_offset]
+            # Already in cache, mark as most recently used
+            self._buffer, self._block_raw_length = \
+                self._buffers.pop(start_offset)
+            self._buffers[start_offset] = self._buffer, self._block_raw_length
             self._within_block_offset = 0
             self._block_start_offset = start_offset
-            return
-        # Must hit the disk... first check cache limits,
-        while len(self._buffers) >= self.max_cache:
-            # TODO - Implemente LRU cache removal?
-            self._buffers.popitem()
-        # Now load the block
+        elif start_offset in self._pending:
+            # Being decompressed in a worker thread, wait for it
+            result, block_size = self._pending.pop(start_offset)
+            self._buffer = result.get()
+            self._block_raw_length = block_size
+            self._within_block_offset = 0
+            self._block_start_offset = start_offset
+            self._cache_block(start_offset, self._buffer, block_size)
+        else:
+            # Must hit the disk...
+            handle = self._handle
+            if start_offset is not None:
+                handle.seek(start_offset)
+            self._block_start_offset = handle.tell()
+            try:
+                block_size, self._buffer = _load_bgzf_block(handle, self._text)
+            except StopIteration:
+                # EOF
+                block_size = 0
+                if self._text:
+                    self._buffer = ""
+                else:
+                    self._buffer = b""
+            self._within_block_offset = 0
+            self._block_raw_length = block_size
+            # Finally save the block in our cache,
+            self._cache_block(self._block_start_offset, self._buffer,
+                              block_size)
+        if self._pool is not None and self._block_raw_length:
+            self._schedule_read_ahead()
+
+    def _schedule_read_ahead(self):
+        """Queue the following blocks for decompression in the thread pool (PRIVATE).
+
+        The compressed data is read from the file here (in the calling
+        thread), so only the decompression and CRC checks are done by the
+        worker threads.
+        """
         handle = self._handle
-        if start_offset is not None:
-            handle.seek(start_offset)
-        self._block_start_offset = handle.tell()
-        try:
-            block_size, self._buffer = _load_bgzf_block(handle, self._text)
-        except StopIteration:
-            # EOF
-            block_size = 0
-            if self._text:
-                self._buffer = ""
+        old_pending = self._pending
+        # Anything pending outside the read ahead window (e.g. after a
+        # seek) is dropped, so this is bounded by the read_ahead setting
+        self._pending = pending = {}
+        offset = self._block_start_offset + self._block_raw_length
+        for _ in range(self._read_ahead):
+            if offset in self._buffers:
+                block_size = self._buffers[offset][1]
+            elif offset in old_pending:
+                pending[offset] = old_pending[offset]
+                block_size = pending[offset][1]
             else:
-                self._buffer = b""
-        self._within_block_offset = 0
-        self._block_raw_length = block_size
-        # Finally save the block in our cache,
-        self._buffers[self._block_start_offset] = self._buffer, block_size
+                handle.seek(offset)
+                try:
+                    block_size, deflated, crc, size = _read_bgzf_block(handle)
+                except StopIteration:
+                    # EOF
+                    break
+                result = self._pool.apply_async(
+                    _inflate_bgzf_block, (deflated, crc, size, self._text))
+                pending[offset] = result, block_size
+            if not block_size:
+                break
+            offset += block_size
 
     def tell(self):
         """Return a 64-bit unsigned BGZF virtual offset."""
@@ -629,6 +883,23 @@ class BgzfReader(object):
         #       self._within_block_offset)
         return virtual_offset
 
+    def seek_uncompressed(self, offset):
+        """Seek to an offset in the decompressed data.
+
+        Returns the equivalent 64-bit unsigned BGZF virtual offset, as
+        would be given by the tell method. This uses the block offsets
+        from the .gzi index if one was given, otherwise the first call
+        must scan all the blocks in the file.
+        """
+        if self._gzi_index is None:
+            self._set_gzi_index(_gzi_from_blocks(self._handle))
+        if offset < 0:
+            raise ValueError("Uncompressed offset cannot be negative, got %i"
+                             % offset)
+        raw_start, data_start = \
+            self._gzi_index[bisect_right(self._gzi_data_starts, offset) - 1]
+        return self.seek(make_virtual_offset(raw_start, offset - data_start))
+
     def read(self, size=-1):
         """Read method for the BGZF module."""
         if size < 0:
@@ -701,10 +972,15 @@ class BgzfReader(object):
 
     def close(self):
         """Close BGZF file."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
         self._handle.close()
         self._buffer = None
         self._block_start_offset = None
         self._buffers = None
+        self._pending = None
 
     def seekable(self):
         """Return True indicating the BGZF supports random access."""
@@ -728,10 +1004,29 @@ class BgzfReader(object):
 
 
 class BgzfWriter(object):
-    """Define a BGZFWriter object."""
+    """Define a BGZFWriter object.
+
+    By default each BGZF block is compressed as it is written. With the
+    threads argument, the blocks are instead compressed in a pool of worker
+    threads (zlib releases the GIL while compressing, so this runs in
+    parallel), and written to the file in order once ready. The output is
+    identical to that without threads. Calling the tell, flush or close
+    methods waits for any blocks being compressed to be written first, so
+    that the virtual offsets are exact.
+
+    With the gzi argument, the offsets of the BGZF blocks are recorded as
+    they are written, and saved to this filename as a samtools/bgzip style
+    .gzi index when the file is closed (as done by ``bgzip -i``). This is
+    not supported in append mode.
+    """
 
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
+    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6,
+                 threads=0, gzi=None):
         """Initilize the class."""
+        if threads < 0:
+            raise ValueError("Use threads with a minimum of 0")
+        if gzi is not None and "a" in mode.lower():
+            raise ValueError("Cannot record a .gzi index in append mode")
         if fileobj:
             assert filename is None
             handle = fileobj
@@ -746,43 +1041,49 @@ class BgzfWriter(object):
         self._handle = handle
         self._buffer = b""
         self.compresslevel = compresslevel
+        # Results from the thread pool for blocks not yet written:
+        self._pending = deque()
+        if threads:
+            from multiprocessing.pool import ThreadPool
+            self._pool = ThreadPool(threads)
+            # Limit how much compressed data is held in memory
+            self._max_pending = 4 * threads
+        else:
+            self._pool = None
+        self._gzi = gzi
+        if gzi is not None:
+            # Offsets of the end of each non-empty block written so far
+            self._gzi_index = [(0, 0)]
+            self._gzi_raw_offset = 0
+
+    def _write_compressed(self, compressed, data_len):
+        """Write a compressed BGZF block, noting its offsets if required (PRIVATE)."""
+        self._handle.write(compressed)
+        if self._gzi is not None:
+            self._gzi_raw_offset += len(compressed)
+            if data_len:
+                self._gzi_index.append((self._gzi_raw_offset,
+                                        self._gzi_index[-1][1] + data_len))
 
     def _write_block(self, block):
         """Write provided data to file as a single BGZF compressed block (PRIVATE)."""
         # print("Saving %i bytes" % len(block))
-        start_offset = self._handle.tell()
-        assert len(block) <= 65536
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(self.compresslevel,
-                             zlib.DEFLATED,
-                             -15,
-                             zlib.DEF_MEM_LEVEL,
-                             0)
-        compressed = c.compress(block) + c.flush()
-        del c
-        if len(compressed) > 65536:
-            raise RuntimeError("TODO - Didn't compress enough, "
-                               "try less data in this block")
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xffffffff)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
-        self._handle.write(data)
+        if self._pool is None:
+            self._write_compressed(
+                _compress_bgzf_block(block, self.compresslevel), len(block))
+            return
+        # Compress in a worker thread, but write the blocks in order
+        self._pending.append((self._pool.apply_async(
+            _compress_bgzf_block, (block, self.compresslevel)), len(block)))
+        while len(self._pending) > self._max_pending:
+            result, data_len = self._pending.popleft()
+            self._write_compressed(result.get(), data_len)
+
+    def _write_pending(self):
+        """Wait for any blocks being compressed, and write them to the file (PRIVATE)."""
+        while self._pending:
+            result, data_len = self._pending.popleft()
+            self._write_compressed(result.get(), data_len)
 
     def write(self, data):
         """Write method for the class."""
@@ -808,6 +1109,7 @@ class BgzfWriter(object):
             self._buffer = self._buffer[65535:]
         self._write_block(self._buffer)
         self._buffer = b""
+        self._write_pending()
         self._handle.flush()
 
     def close(self):
@@ -820,12 +1122,21 @@ class BgzfWriter(object):
         """
         if self._buffer:
             self.flush()
+        self._write_pending()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
+        if self._gzi is not None:
+            write_gzi(self._gzi, self._gzi_index)
 
     def tell(self):
         """Return a BGZF 64-bit virtual offset."""
+        # Need the file position after any blocks still being compressed
+        self._write_pending()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
     def seekable(self):
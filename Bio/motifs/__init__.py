@@ -213,12 +213,17 @@ class Instances(list):
 
         This is a generator function, returning found positions of motif
         instances in a given sequence.
+
+        The sequence is scanned once for all the instances together, using
+        the Aho-Corasick algorithm in Bio.SeqUtils.AhoCorasick.
         """
-        for pos in range(0, len(sequence) - self.length + 1):
-            for instance in self:
-                if str(instance) == str(sequence[pos:pos + self.length]):
-                    yield (pos, instance)
-                    break  # no other instance will fit (we don't want to return multiple hits)
+        from Bio.SeqUtils.AhoCorasick import Automaton
+        previous = None
+        for pos, index in Automaton(self).search(sequence):
+            # Only the first of any identical instances is reported
+            if pos != previous:
+                previous = pos
+                yield (pos, self[index])
 
     def reverse_complement(self):
         """Compute reverse complement of sequences."""
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.SeqUtils.AhoCorasick against searching with str.find.
+
+Usage::
+
+    python aho_corasick.py [number [length]]
+
+A number of random barcodes (default 1000, each of 12 bases) are searched
+for on both strands of a random sequence of the given length (default one
+million bases), first using str.find for each barcode and its reverse
+complement, and then with a single scan using an Automaton. The time taken
+and speed up are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio.Seq import reverse_complement
+from Bio.SeqUtils.AhoCorasick import Automaton
+
+
+def find_all(patterns, sequence):
+    """Return the sorted matches of the patterns on both strands."""
+    n = len(sequence)
+    hits = []
+    for index, pattern in enumerate(patterns):
+        for target, strand in ((pattern, 0), (reverse_complement(pattern), 1)):
+            start = sequence.find(target)
+            while start != -1:
+                hits.append((start, strand, index))
+                start = sequence.find(target, start + 1)
+    return [(start - strand * n, index)
+            for start, strand, index in sorted(hits)]
+
+
+def main():
+    """Run the benchmark."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    random.seed(0)
+    sequence = "".join(random.choice("ACGT") for i in range(length))
+    patterns = ["".join(random.choice("ACGT") for i in range(12))
+                for j in range(number)]
+    print("%i patterns, %i bases" % (number, length))
+
+    start = time.time()
+    expected = find_all(patterns, sequence)
+    baseline = time.time() - start
+    print("str.find: %i matches in %0.2fs" % (len(expected), baseline))
+
+    start = time.time()
+    automaton = Automaton(patterns)
+    matches = automaton.search(sequence, both=True)
+    taken = time.time() - start
+    assert matches == expected
+    print("Automaton: %0.2fs including construction, speed up %0.1fx"
+          % (taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
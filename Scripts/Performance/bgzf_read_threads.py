@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark sequential reading of BGZF files with read ahead threads.
+
+Usage::
+
+    python bgzf_read_threads.py [filename.bgz]
+
+Without any arguments, a temporary BGZF compressed FASTQ file is created.
+The file is read line by line with Bio.bgzf.BgzfReader using 0 (no read
+ahead), 1, 2, 4, ... decompression threads (up to the number of CPUs),
+and the throughput in MB of decompressed data per second is printed.
+"""
+
+from __future__ import print_function
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from Bio import bgzf
+
+
+def make_bgzf(filename, reads=200000, length=150):
+    """Write a BGZF compressed FASTQ file of random reads."""
+    random.seed(0)
+    quals = "".join(chr(33 + q) for q in range(41))
+    with bgzf.BgzfWriter(filename, "wb") as handle:
+        for i in range(reads):
+            seq = "".join(random.choice("ACGT") for _ in range(length))
+            qual = "".join(random.choice(quals) for _ in range(length))
+            handle.write("@read%i\n%s\n+\n%s\n" % (i, seq, qual))
+
+
+def read_all(filename, threads):
+    """Read the file line by line, returning the number of bytes."""
+    total = 0
+    with bgzf.BgzfReader(filename, "rb", threads=threads) as handle:
+        for line in handle:
+            total += len(line)
+    return total
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 2:
+        filename = sys.argv[1]
+        temp = None
+    else:
+        temp = tempfile.NamedTemporaryFile(suffix=".fastq.bgz", delete=False)
+        temp.close()
+        filename = temp.name
+        print("Creating %s ..." % filename)
+        make_bgzf(filename)
+    print("File size %0.1f MB" % (os.path.getsize(filename) / 1048576.0))
+
+    threads = 0
+    while True:
+        start = time.time()
+        size = read_all(filename, threads)
+        taken = time.time() - start
+        print("%2i threads: %0.1f MB in %0.2fs, %0.1f MB/s"
+              % (threads, size / 1048576.0, taken, size / 1048576.0 / taken))
+        if threads >= multiprocessing.cpu_count():
+            break
+        threads = max(1, min(2 * threads, multiprocessing.cpu_count()))
+
+    if temp is not None:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
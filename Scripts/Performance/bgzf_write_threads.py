@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark writing BGZF files with compression threads.
+
+Usage::
+
+    python bgzf_write_threads.py
+
+A list of random FASTQ records is written with Bio.SeqIO.write into a
+Bio.bgzf.BgzfWriter using 0 (serial compression), 1, 2, 4, ... threads
+(up to the number of CPUs), and the throughput in MB of uncompressed data
+per second is printed. The output files are checked to be identical.
+"""
+
+from __future__ import print_function
+
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from Bio import bgzf
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+
+def make_records(reads=100000, length=150):
+    """Return a list of random FASTQ style SeqRecord objects."""
+    random.seed(0)
+    records = []
+    for i in range(reads):
+        seq = "".join(random.choice("ACGT") for _ in range(length))
+        quals = [random.randint(0, 40) for _ in range(length)]
+        records.append(SeqRecord(Seq(seq), id="read%i" % i, description="",
+                                 letter_annotations={"phred_quality": quals}))
+    return records
+
+
+def main():
+    """Run the benchmark."""
+    print("Creating records ...")
+    records = make_records()
+    temp = tempfile.NamedTemporaryFile(suffix=".fastq.bgz", delete=False)
+    temp.close()
+    filename = temp.name
+    expected = None
+    size = sum(len(r.format("fastq")) for r in records)
+
+    threads = 0
+    while True:
+        start = time.time()
+        with bgzf.BgzfWriter(filename, "w", threads=threads) as handle:
+            SeqIO.write(records, handle, "fastq")
+        taken = time.time() - start
+        with open(filename, "rb") as handle:
+            data = handle.read()
+        if expected is None:
+            expected = data
+        assert data == expected, "Output differs with %i threads" % threads
+        print("%2i threads: %0.2fs, %0.1f MB/s of FASTQ"
+              % (threads, taken, size / 1048576.0 / taken))
+        if threads >= multiprocessing.cpu_count():
+            break
+        threads = max(1, min(2 * threads, multiprocessing.cpu_count()))
+
+    os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
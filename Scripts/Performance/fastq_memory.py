@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark holding FASTQ reads in memory with compact quality scores.
+
+Usage::
+
+    python fastq_memory.py [filename | number [length]]
+
+Without a filename, a number of random reads (default 100000, each of 150
+bases) is used. The reads are parsed with FastqPhredIterator into a list,
+first with the qualities as lists of integers and then with compact=True
+(as arrays of bytes), and then written out again. The time taken, and the
+memory allocated for the records (as traced by the tracemalloc module)
+and for their qualities alone are printed.
+"""
+
+from __future__ import print_function
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from Bio._py3k import StringIO
+from Bio import SeqIO
+from Bio.SeqIO.QualityIO import FastqPhredIterator
+
+
+def random_fastq(number, length):
+    """Return a FASTQ file of random reads as a string."""
+    random.seed(0)
+    letters = [chr(33 + q) for q in range(42)]
+    lines = []
+    for i in range(number):
+        lines.append("@read%i\n%s\n+\n%s\n"
+                     % (i, "".join(random.choice("ACGT")
+                                   for j in range(length)),
+                        "".join(random.choice(letters)
+                                for j in range(length))))
+    return "".join(lines)
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):
+        with open(sys.argv[1]) as handle:
+            data = handle.read()
+    else:
+        number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+        length = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+        data = random_fastq(number, length)
+
+    results = {}
+    for compact in (False, True):
+        tracemalloc.start()
+        start = time.time()
+        records = list(FastqPhredIterator(StringIO(data), compact=compact))
+        taken = time.time() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        bases = sum(len(record) for record in records)
+        qualities = sum(sys.getsizeof(record.letter_annotations[
+            "phred_quality"]) for record in records)
+        start = time.time()
+        output = StringIO()
+        SeqIO.write(records, output, "fastq")
+        written = time.time() - start
+        results[compact] = output.getvalue()
+        print("compact=%s: parsed in %0.2fs, written in %0.2fs, "
+              "%0.1f bytes per base (%0.1f for the qualities)"
+              % (compact, taken, written, size / float(bases),
+                 qualities / float(bases)))
+        del records
+    assert results[False] == results[True]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark the SeqRecord feature index against checking every feature.
+
+Usage::
+
+    python feature_index.py [filename format]
+
+Without any arguments, a random record of ten million bases with 20000
+features is used; otherwise the first record of the given file (e.g. an
+annotated chromosome in GenBank format). The features overlapping a
+thousand random regions of 10 kb are found by checking every feature,
+and then with the SeqRecord overlapping_features method (including the
+time taken to build the index). The time taken and speed up are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio import SeqIO
+from Bio.Seq import UnknownSeq
+from Bio.SeqFeature import SeqFeature, FeatureLocation
+from Bio.SeqRecord import SeqRecord
+
+
+def scan(record, start, end):
+    """Return the features overlapping the region by checking each one."""
+    return [f for f in record.features
+            if f.location.nofuzzy_start < end and start < f.location.nofuzzy_end]
+
+
+def main():
+    """Run the benchmark."""
+    random.seed(0)
+    if len(sys.argv) > 2:
+        record = next(SeqIO.parse(sys.argv[1], sys.argv[2]))
+    else:
+        length = 10000000
+        record = SeqRecord(UnknownSeq(length, character="N"), id="random")
+        for i in range(20000):
+            start = random.randint(0, length - 5000)
+            end = start + random.randint(100, 5000)
+            record.features.append(SeqFeature(FeatureLocation(start, end),
+                                              type="gene"))
+    regions = []
+    for i in range(1000):
+        start = random.randint(0, len(record))
+        regions.append((start, start + 10000))
+    print("%i bases, %i features" % (len(record), len(record.features)))
+
+    start = time.time()
+    expected = [scan(record, s, e) for s, e in regions]
+    baseline = time.time() - start
+    print("Checking every feature: %0.2fs" % baseline)
+    start = time.time()
+    found = [record.overlapping_features(s, e) for s, e in regions]
+    taken = time.time() - start
+    assert found == expected
+    print("overlapping_features: %0.2fs, speed up %0.1fx"
+          % (taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark the memory used by parsed SeqFeature objects.
+
+Usage::
+
+    python feature_memory.py [filename [format [copies]]]
+
+The file (default the NC_000932 chloroplast genome from the test suite, in
+format "genbank") is parsed the given number of times (default 20) and the
+records kept in memory. The memory allocated, as traced by the tracemalloc
+module, is printed in total and per feature, along with the memory used by
+the locations alone, re-created from their start, end and strand. Run this
+with different versions of Biopython to compare them.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+import tracemalloc
+
+from Bio import SeqIO
+from Bio.SeqFeature import FeatureLocation
+
+
+def traced(function, *args):
+    """Return the result of the function and the memory it allocated."""
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def parse(filename, fmt, copies):
+    """Return a list of the records parsed from the file several times."""
+    records = []
+    for i in range(copies):
+        records.extend(SeqIO.parse(filename, fmt))
+    return records
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        filename = sys.argv[1]
+    else:
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", "Tests", "GenBank", "NC_000932.gb")
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "genbank"
+    copies = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    start = time.time()
+    records, size = traced(parse, filename, fmt, copies)
+    taken = time.time() - start
+    features = [f for record in records for f in record.features]
+    sequence = sum(len(record) for record in records)
+    print("%i records, %i features, parsed in %0.2fs"
+          % (len(records), len(features), taken))
+    print("Total %0.1f MB, %i bytes per feature (excluding the sequence)"
+          % (size / 1048576.0, (size - sequence) / len(features)))
+
+    simple = [f.location for f in features
+              if isinstance(f.location, FeatureLocation)]
+    locations, size = traced(lambda: [FeatureLocation(int(loc.start),
+                                                      int(loc.end),
+                                                      loc.strand)
+                                      for loc in simple])
+    print("%i bytes per FeatureLocation" % (size / len(locations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.SeqUtils.FMIndex against searching with str.find.
+
+Usage::
+
+    python fm_index.py [filename format [number]]
+
+Without any arguments, random sequences totalling two million bases are
+used. A number of primers (default 1000) of 20 bases are taken from the
+sequences, and all their matches are found by scanning each sequence with
+str.find, and then using an FMIndex (the time to build the index is given
+separately). The time taken and speed up are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.FMIndex import FMIndex
+
+
+def find_all(records, primers):
+    """Return the matches of the primers by scanning each sequence."""
+    texts = [(record.id, str(record.seq).upper()) for record in records]
+    matches = []
+    for primer in primers:
+        hits = []
+        for name, text in texts:
+            start = text.find(primer)
+            while start != -1:
+                hits.append((name, start))
+                start = text.find(primer, start + 1)
+        matches.append(hits)
+    return matches
+
+
+def main():
+    """Run the benchmark."""
+    number = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    if len(sys.argv) > 2:
+        records = list(SeqIO.parse(sys.argv[1], sys.argv[2]))
+    else:
+        random.seed(0)
+        records = [SeqRecord(Seq("".join(random.choice("ACGT")
+                                         for i in range(200000))),
+                             id="contig%i" % j)
+                   for j in range(10)]
+    total = sum(len(r) for r in records)
+    print("%i sequences, %i bases, %i primers"
+          % (len(records), total, number))
+    random.seed(1)
+    primers = []
+    while len(primers) < number:
+        record = random.choice(records)
+        start = random.randint(0, len(record) - 20)
+        primer = str(record.seq[start:start + 20]).upper()
+        if set(primer).issubset("ACGT"):
+            primers.append(primer)
+
+    start = time.time()
+    expected = find_all(records, primers)
+    baseline = time.time() - start
+    print("str.find: %i matches in %0.2fs"
+          % (sum(len(hits) for hits in expected), baseline))
+
+    start = time.time()
+    index = FMIndex(records)
+    print("FMIndex built in %0.2fs" % (time.time() - start))
+    start = time.time()
+    matches = [index.locate(primer) for primer in primers]
+    taken = time.time() - start
+    assert matches == expected
+    print("FMIndex.locate: %0.2fs, speed up %0.1fx"
+          % (taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
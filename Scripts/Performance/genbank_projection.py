@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark parsing GenBank or EMBL files with a projection.
+
+Usage::
+
+    python genbank_projection.py filename [format]
+
+The file (default format "genbank") is parsed once in full with
+Bio.SeqIO.parse, and then with projections keeping only the CDS features
+with their locus_tag and product qualifiers, with and without the
+sequence. The time taken and speed up for each are printed.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from Bio import SeqIO
+from Bio.GenBank.Scanner import Projection
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__)
+    filename = sys.argv[1]
+    fmt = sys.argv[2] if len(sys.argv) == 3 else "genbank"
+    print("File size %0.1f MB" % (os.path.getsize(filename) / 1048576.0))
+
+    start = time.time()
+    count = sum(1 for record in SeqIO.parse(filename, fmt))
+    baseline = time.time() - start
+    print("Full parse: %i records in %0.2fs" % (count, baseline))
+
+    for sequence in (True, False):
+        projection = Projection(header=[], features=["CDS"],
+                                qualifiers=["locus_tag", "product"],
+                                sequence=sequence)
+        start = time.time()
+        count = sum(1 for record in SeqIO.parse(filename, fmt,
+                                                projection=projection))
+        taken = time.time() - start
+        print("%r: %0.2fs, speed up %0.2fx"
+              % (projection, taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.SeqUtils.KmerCount against counting k-mers with a dict.
+
+Usage::
+
+    python kmer_count.py [filename format [k]]
+
+Without any arguments, random sequences totalling two million bases are
+used. The canonical k-mers (default k=21) are counted with a Python
+dictionary, and then with the KmerCounter class. The time taken and speed
+up are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio import SeqIO
+from Bio.Seq import reverse_complement
+from Bio.SeqUtils.KmerCount import KmerCounter
+
+
+def dict_count(sequences, k):
+    """Count the canonical k-mers in the sequences using a dictionary."""
+    counts = {}
+    for seq in sequences:
+        seq = seq.upper()
+        for i in range(len(seq) - k + 1):
+            kmer = seq[i:i + k]
+            kmer = min(kmer, reverse_complement(kmer))
+            counts[kmer] = counts.get(kmer, 0) + 1
+    return counts
+
+
+def main():
+    """Run the benchmark."""
+    k = int(sys.argv[3]) if len(sys.argv) > 3 else 21
+    if len(sys.argv) > 2:
+        sequences = [str(r.seq) for r in SeqIO.parse(sys.argv[1], sys.argv[2])]
+    else:
+        random.seed(0)
+        sequences = ["".join(random.choice("ACGT") for i in range(100000))
+                     for j in range(20)]
+    total = sum(len(s) for s in sequences)
+    print("%i sequences, %i bases, k=%i" % (len(sequences), total, k))
+
+    start = time.time()
+    expected = dict_count(sequences, k)
+    baseline = time.time() - start
+    print("dict: %i distinct k-mers in %0.2fs" % (len(expected), baseline))
+
+    start = time.time()
+    counter = KmerCounter(k, canonical=True)
+    counter.update(sequences)
+    found = len(counter)
+    taken = time.time() - start
+    print("KmerCounter: %i distinct k-mers in %0.2fs, speed up %0.1fx"
+          % (found, taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.SeqUtils.MeltingTemp.Tm_NN_batch against Tm_NN.
+
+Usage::
+
+    python melting_temp.py [number]
+
+A number of random primers (default 100000, of 18 to 30 bases) are made,
+and their melting temperatures calculated by calling Tm_NN for each primer
+in turn, and then with a single call to Tm_NN_batch. This is repeated with
+a random mismatch in each template. The results are checked to be the same,
+and the time taken and speed up are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio.Seq import complement
+from Bio.SeqUtils.MeltingTemp import Tm_NN, Tm_NN_batch
+
+
+def mismatched(primer):
+    """Return the complement of the primer with one random mismatch."""
+    template = list(complement(primer))
+    i = random.randrange(1, len(primer) - 1)
+    template[i] = random.choice([base for base in "ACGT"
+                                 if base != template[i]])
+    return "".join(template)
+
+
+def main():
+    """Run the benchmark."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    primers = ["".join(random.choice("ACGT")
+                       for i in range(random.randint(18, 30)))
+               for j in range(number)]
+    templates = [mismatched(primer) for primer in primers]
+    print("%i primers" % number)
+
+    for name, c_seqs in (("Perfect match", None),
+                         ("One mismatch", templates)):
+        start = time.time()
+        expected = [Tm_NN(primer, c_seq=c_seq) for primer, c_seq
+                    in zip(primers, c_seqs or [None] * number)]
+        baseline = time.time() - start
+        print("%s with Tm_NN: %0.2fs" % (name, baseline))
+        start = time.time()
+        values = Tm_NN_batch(primers, c_seqs=c_seqs)
+        taken = time.time() - start
+        assert values.tolist() == expected
+        print("%s with Tm_NN_batch: %0.2fs, speed up %0.1fx"
+              % (name, taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
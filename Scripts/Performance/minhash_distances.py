@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark the all against all Mash distances of Bio.SeqUtils.MinHash.
+
+Usage::
+
+    python minhash_distances.py [number [size]]
+
+Random sketches (default 200 sketches of 1000 hashes, sharing some of
+their hashes) are compared all against all, first pair by pair using
+Python sets, and then using the NumPy based mash_distances function. The
+time taken and speed up are printed.
+"""
+
+from __future__ import print_function
+
+import math
+import random
+import sys
+import time
+
+from Bio.SeqUtils.MinHash import Sketch, mash_distances, numpy
+
+
+def set_distances(sketches):
+    """Return the all against all Mash distances using Python sets."""
+    size = sketches[0].size
+    k = sketches[0].k
+    hashes = [set(sketch.hashes.tolist()) for sketch in sketches]
+    n = len(sketches)
+    distances = numpy.zeros((n, n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            union = sorted(hashes[i] | hashes[j])[:size]
+            shared = sum(1 for h in union if h in hashes[i] and h in hashes[j])
+            if shared:
+                jaccard = float(shared) / len(union)
+                d = -math.log(2 * jaccard / (1 + jaccard)) / k
+            else:
+                d = 1.0
+            distances[i, j] = distances[j, i] = d
+    return distances
+
+
+def random_sketches(number, size):
+    """Return random sketches, each sharing some hashes with a common pool."""
+    random.seed(0)
+    pool = [random.getrandbits(64) for i in range(4 * size)]
+    sketches = []
+    for i in range(number):
+        hashes = set(random.sample(pool, random.randint(0, 2 * size)))
+        while len(hashes) < 4 * size:
+            hashes.add(random.getrandbits(64))
+        sketch = Sketch(k=21, size=size, name="sketch%i" % i)
+        sketch.hashes = numpy.array(sorted(hashes)[:size], dtype=numpy.uint64)
+        sketches.append(sketch)
+    return sketches
+
+
+def main():
+    """Run the benchmark."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    sketches = random_sketches(number, size)
+    print("%i sketches of %i hashes" % (number, size))
+
+    start = time.time()
+    expected = set_distances(sketches)
+    baseline = time.time() - start
+    print("sets: %i distances in %0.2fs"
+          % (number * (number - 1) // 2, baseline))
+
+    start = time.time()
+    distances = mash_distances(sketches)
+    taken = time.time() - start
+    assert numpy.allclose(distances, expected)
+    print("mash_distances: %0.2fs, speed up %0.1fx"
+          % (taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
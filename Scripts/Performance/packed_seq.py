@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Compare the memory use and speed of Bio.Seq.PackedSeq and Bio.Seq.Seq.
+
+Usage::
+
+    python packed_seq.py [length]
+
+A random genome like sequence (default 20 million bases) with some runs of
+N and soft-masked regions is held as a Seq and as a PackedSeq. The memory
+used by each is printed, along with the time taken to count a base, find a
+motif, take the reverse complement, and translate.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio.Alphabet import generic_dna
+from Bio.Seq import PackedSeq, Seq
+
+
+def make_genome(length):
+    """Return a random sequence with runs of N and lower case regions."""
+    random.seed(0)
+    block = "".join(random.choice("ACGT") for _ in range(100000))
+    pieces = []
+    while sum(len(p) for p in pieces) < length:
+        pieces.append(block[:random.randint(10000, 100000)])
+        pieces.append(random.choice(["N" * 5000, block[:2000].lower()]))
+    return "".join(pieces)[:length]
+
+
+def main():
+    """Run the benchmark."""
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 20000000
+    genome = make_genome(length)
+
+    start = time.time()
+    packed = PackedSeq(genome, generic_dna)
+    print("Packed %i bases in %0.2fs" % (length, time.time() - start))
+    size = sys.getsizeof(packed._packed) + sum(
+        sys.getsizeof(run) for run in packed._blocks + packed._mask)
+    print("Memory per base: Seq %0.2f bytes, PackedSeq %0.2f bytes"
+          % (sys.getsizeof(genome) / float(length), size / float(length)))
+
+    seq = Seq(genome, generic_dna)
+    for name, call in [("count", lambda s: s.count("G")),
+                       ("find", lambda s: s.find("GAATTCGAATTC")),
+                       ("reverse_complement", lambda s: s.reverse_complement()),
+                       ("translate", lambda s: s[:3000000].translate())]:
+        timings = []
+        for s in (seq, packed):
+            start = time.time()
+            call(s)
+            timings.append(time.time() - start)
+        print("%s: Seq %0.2fs, PackedSeq %0.2fs" % ((name,) + tuple(timings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark banded alignment and X-drop termination with PairwiseAligner.
+
+Usage::
+
+    python pairwise_banded.py [length [substitutions [band_width]]]
+
+A random target of the given length (default 10000) is aligned to a copy
+with a number of random substitutions (default 300), using the full score
+matrix and then a band of the given width (default 50) around the main
+diagonal, for each algorithm and mode. For local alignments, X-drop
+termination is also used on a query that only matches the first tenth of
+the target. The time taken to calculate the score and to find the first
+alignment, and the speed up, are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio.Align import PairwiseAligner
+
+
+def timed(aligner, target, query):
+    """Return the score, and the time taken by score and align."""
+    start = time.time()
+    score = aligner.score(target, query)
+    middle = time.time()
+    alignments = aligner.align(target, query)
+    alignments[0]
+    end = time.time()
+    assert alignments.score == score
+    return score, middle - start, end - middle
+
+
+def report(name, aligner, target, query, baseline):
+    """Time the aligner and print the results."""
+    score, score_time, align_time = timed(aligner, target, query)
+    if baseline is None:
+        print("  %s: score %0.1f in %0.3fs, align in %0.3fs"
+              % (name, score, score_time, align_time))
+    else:
+        print("  %s: score %0.1f in %0.3fs (%0.0fx), align in %0.3fs (%0.0fx)"
+              % (name, score, score_time, baseline[1] / score_time,
+                 align_time, baseline[2] / align_time))
+    return score, score_time, align_time
+
+
+def main():
+    """Run the benchmark."""
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    substitutions = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    band_width = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    random.seed(0)
+    target = "".join(random.choice("ACGT") for i in range(length))
+    query = list(target)
+    for i in range(substitutions):
+        query[random.randrange(length)] = random.choice("ACGT")
+    query = "".join(query)
+    prefix = query[:length // 10] + \
+        "".join(random.choice("ACGT") for i in range(length - length // 10))
+    print("%i bases, %i substitutions" % (length, substitutions))
+
+    for mode in ("global", "local"):
+        for affine in (False, True):
+            aligner = PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            if affine:
+                aligner.open_gap_score = -3
+                aligner.extend_gap_score = -1
+            else:
+                aligner.gap_score = -2
+            print(aligner.algorithm)
+            baseline = report("full matrix", aligner, target, query, None)
+            aligner.band_width = band_width
+            result = report("band width %i" % band_width,
+                            aligner, target, query, baseline)
+            assert result[0] == baseline[0]
+            if mode == "local":
+                aligner.band_width = None
+                baseline = report("full matrix, matching prefix",
+                                  aligner, target, prefix, None)
+                aligner.xdrop = 20
+                report("X-drop 20, matching prefix",
+                       aligner, target, prefix, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark scoring one read against many targets with PairwiseAligner.
+
+Usage::
+
+    python pairwise_score_many.py [number [length [threads]]]
+
+A random read of the given length (default 150) is scored against a number
+(default 2000) of random targets of the same length, using global alignment
+with affine gap scores (the Gotoh algorithm). The scores are calculated by
+calling the score method in a loop, and then with the score_many method
+without and with threads (default the number of CPUs). The time taken and
+speed up are printed.
+"""
+
+from __future__ import print_function
+
+import multiprocessing
+import random
+import sys
+import time
+
+from Bio.Align import PairwiseAligner
+
+
+def main():
+    """Run the benchmark."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else \
+        multiprocessing.cpu_count()
+    random.seed(0)
+    read = "".join(random.choice("ACGT") for i in range(length))
+    targets = ["".join(random.choice("ACGT") for i in range(length))
+               for j in range(number)]
+    aligner = PairwiseAligner()
+    aligner.mismatch = -1
+    aligner.open_gap_score = -2
+    aligner.extend_gap_score = -1
+    print("%i targets of %i bases, %s"
+          % (number, length, aligner.algorithm))
+
+    start = time.time()
+    scores = [aligner.score(target, read) for target in targets]
+    baseline = time.time() - start
+    print("score in a loop: %0.2fs" % baseline)
+    for n in (0, threads):
+        start = time.time()
+        values = aligner.score_many(targets, read, threads=n)
+        taken = time.time() - start
+        assert values.tolist() == scores
+        print("score_many with %i threads: %0.2fs, speed up %0.1fx"
+              % (n, taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.SeqIO.parse_parallel against Bio.SeqIO.parse.
+
+Usage::
+
+    python seqio_parse_parallel.py [filename format]
+
+Without any arguments, a temporary FASTQ file of random reads is created.
+The file is parsed once with Bio.SeqIO.parse, and then with parse_parallel
+using 1, 2, 4, ... worker processes (up to the number of CPUs), calculating
+the GC content of each read in the workers. The speed up relative to the
+single process parser is printed for each core count.
+"""
+
+from __future__ import print_function
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from Bio import SeqIO
+
+
+def gc_count(record):
+    """Return the record identifier and its G+C count."""
+    seq = str(record.seq)
+    return record.id, seq.count("G") + seq.count("C")
+
+
+def make_fastq(filename, reads=200000, length=150):
+    """Write a FASTQ file of random reads."""
+    random.seed(0)
+    quals = "".join(chr(33 + q) for q in range(41))
+    with open(filename, "w") as handle:
+        for i in range(reads):
+            seq = "".join(random.choice("ACGT") for _ in range(length))
+            qual = "".join(random.choice(quals) for _ in range(length))
+            handle.write("@read%i\n%s\n+\n%s\n" % (i, seq, qual))
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        filename, fmt = sys.argv[1:]
+        temp = None
+    else:
+        temp = tempfile.NamedTemporaryFile(suffix=".fastq", delete=False)
+        temp.close()
+        filename, fmt = temp.name, "fastq"
+        print("Creating %s ..." % filename)
+        make_fastq(filename)
+    print("File size %0.1f MB" % (os.path.getsize(filename) / 1048576.0))
+
+    start = time.time()
+    expected = [gc_count(r) for r in SeqIO.parse(filename, fmt)]
+    baseline = time.time() - start
+    print("SeqIO.parse: %i records in %0.2fs" % (len(expected), baseline))
+
+    cores = 1
+    while True:
+        start = time.time()
+        results = list(SeqIO.parse_parallel(filename, fmt, processes=cores,
+                                            map_function=gc_count))
+        taken = time.time() - start
+        assert results == expected
+        print("SeqIO.parse_parallel, %2i processes: %0.2fs, speed up %0.2fx"
+              % (cores, taken, baseline / taken))
+        if cores >= multiprocessing.cpu_count():
+            break
+        cores = min(2 * cores, multiprocessing.cpu_count())
+
+    if temp is not None:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
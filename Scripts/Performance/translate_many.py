@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.Seq.translate_many against translating one at a time.
+
+Usage::
+
+    python translate_many.py [count [codons]]
+
+Random coding sequences (default 20000 of 333 codons) are translated one by
+one with Bio.Seq.translate, then together with Bio.Seq.translate_many,
+and the six frame translation of their concatenation is timed using
+Bio.Seq.translate_six_frames.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio.Seq import translate, translate_many, translate_six_frames
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    codons = int(sys.argv[2]) if len(sys.argv) > 2 else 333
+    random.seed(0)
+    sequences = ["".join(random.choice("ACGT") for _ in range(3 * codons))
+                 for _ in range(count)]
+
+    start = time.time()
+    expected = [translate(s) for s in sequences]
+    baseline = time.time() - start
+    print("translate: %i sequences in %0.2fs" % (count, baseline))
+
+    start = time.time()
+    proteins = translate_many(sequences)
+    taken = time.time() - start
+    assert proteins == expected
+    print("translate_many: %0.2fs, speed up %0.2fx"
+          % (taken, baseline / taken))
+
+    genome = "".join(sequences)
+    start = time.time()
+    translate_six_frames(genome)
+    print("translate_six_frames: %i bp in %0.2fs"
+          % (len(genome), time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark fetching random regions from a UCSC 2bit file.
+
+Usage::
+
+    python twobit_regions.py [filename.2bit [region_length]]
+
+Without any arguments, a temporary 2bit file with two random 25 million
+base sequences (with runs of N and many soft-masked blocks) is created.
+The file is indexed with Bio.SeqIO.index, and random regions (default 1000
+bases) are fetched from each sequence, printing the mean time per region.
+"""
+
+from __future__ import print_function
+
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+
+from Bio import SeqIO
+from Bio.Seq import _pack_dna
+
+
+def make_sequence(length):
+    """Return a random sequence with runs of N and lower case blocks."""
+    block = "".join(random.choice("ACGT") for _ in range(100000))
+    pieces = []
+    total = 0
+    while total < length:
+        piece = block[random.randint(0, 50000):random.randint(50000, 100000)]
+        if random.random() < 0.01:
+            piece = "N" * len(piece)
+        elif random.random() < 0.5:
+            piece = piece[:300].lower()
+        pieces.append(piece)
+        total += len(piece)
+    return "".join(pieces)[:length]
+
+
+def write_twobit(filename, sequences):
+    """Write (name, sequence) pairs as a version 0 little endian 2bit file."""
+    records = []
+    for name, seq in sequences:
+        packed, (starts, ends, letters), mask = _pack_dna(seq)
+        n_blocks = [(s, e) for s, e, c in zip(starts, ends, letters)
+                    if c == "N"]
+        data = struct.pack("<2I", len(seq), len(n_blocks))
+        for blocks in (n_blocks, list(zip(*mask))):
+            if blocks is not n_blocks:
+                data += struct.pack("<I", len(blocks))
+            data += struct.pack("<%iI" % len(blocks), *[s for s, e in blocks])
+            data += struct.pack("<%iI" % len(blocks),
+                                *[e - s for s, e in blocks])
+        records.append(data + struct.pack("<I", 0) + packed)
+    offset = 16 + sum(5 + len(name) for name, seq in sequences)
+    with open(filename, "wb") as handle:
+        handle.write(struct.pack("<4I", 0x1A412743, 0, len(sequences), 0))
+        for (name, seq), data in zip(sequences, records):
+            handle.write(struct.pack("<B", len(name)) + name.encode("ascii") +
+                         struct.pack("<I", offset))
+            offset += len(data)
+        for data in records:
+            handle.write(data)
+
+
+def main():
+    """Run the benchmark."""
+    region = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    if len(sys.argv) > 1:
+        filename = sys.argv[1]
+        temp = None
+    else:
+        temp = tempfile.NamedTemporaryFile(suffix=".2bit", delete=False)
+        temp.close()
+        filename = temp.name
+        print("Creating %s ..." % filename)
+        random.seed(0)
+        write_twobit(filename, [("chrA", make_sequence(25000000)),
+                                ("chrB", make_sequence(25000000))])
+    print("File size %0.1f MB" % (os.path.getsize(filename) / 1048576.0))
+
+    start = time.time()
+    index = SeqIO.index(filename, "twobit")
+    print("Indexed %i sequences in %0.4fs" % (len(index), time.time() - start))
+    random.seed(1)
+    for name in index:
+        start = time.time()
+        record = index[name]
+        length = len(record)
+        fetches = 1000
+        for i in range(fetches):
+            begin = random.randint(0, max(0, length - region))
+            str(record.seq[begin:begin + region])
+        taken = time.time() - start
+        print("%s: %i bases, %0.1f microseconds per %i base region"
+              % (name, length, 1e6 * taken / fetches, region))
+    index.close()
+
+    if temp is not None:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Benchmark Bio.SeqUtils.WindowStats against the pure Python functions.
+
+Usage::
+
+    python window_stats.py [filename format [window]]
+
+Without any arguments, a random sequence of two million bases is used.
+The GC skew in sliding windows (default 1000 bases, with a step of a
+hundredth of that) is calculated with str.count on each window, as done by
+Bio.SeqUtils.GC_skew, and the local composition complexity of every window
+(a step of one) with Bio.SeqUtils.lcc.lcc_mult. Both are then calculated
+with Bio.SeqUtils.WindowStats. The time taken and speed up are printed.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from Bio import SeqIO
+from Bio.SeqUtils.lcc import lcc_mult
+from Bio.SeqUtils.WindowStats import gc_skew, lcc
+
+
+def count_skew(sequence, window, step):
+    """Return the GC skew of each window using str.count."""
+    values = []
+    for i in range(0, len(sequence), step):
+        s = sequence[i:i + window]
+        g = s.count("G")
+        c = s.count("C")
+        values.append((g - c) / float(g + c) if g + c else 0.0)
+    return values
+
+
+def main():
+    """Run the benchmark."""
+    window = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    if len(sys.argv) > 2:
+        sequence = "".join(str(r.seq).upper()
+                           for r in SeqIO.parse(sys.argv[1], sys.argv[2]))
+    else:
+        random.seed(0)
+        sequence = "".join(random.choice("ACGT") for i in range(2000000))
+    step = max(1, window // 100)
+    print("%i bases, window %i" % (len(sequence), window))
+
+    start = time.time()
+    count_skew(sequence, window, step)
+    baseline = time.time() - start
+    print("GC skew (step %i) with str.count: %0.2fs" % (step, baseline))
+    start = time.time()
+    gc_skew(sequence, window, step)
+    taken = time.time() - start
+    print("GC skew with WindowStats: %0.2fs, speed up %0.1fx"
+          % (taken, baseline / taken))
+
+    start = time.time()
+    lcc_mult(sequence, window)
+    baseline = time.time() - start
+    print("LCC (step 1) with lcc_mult: %0.2fs" % baseline)
+    start = time.time()
+    lcc(sequence, window, 1)
+    taken = time.time() - start
+    print("LCC with WindowStats: %0.2fs, speed up %0.1fx"
+          % (taken, baseline / taken))
+
+
+if __name__ == "__main__":
+    main()
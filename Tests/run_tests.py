@@ -290,6 +290,7 @@ DOCTEST_MODULES = [
     "Bio.SeqIO.SffIO",
     "Bio.SeqIO.SwissIO",
     "Bio.SeqIO.TabIO",
+    "Bio.SeqIO.TwoBitIO",
     "Bio.SeqIO.UniprotIO",
     "Bio.SeqRecord",
     "Bio.Sequencing.Ace",
@@ -300,6 +301,7 @@ DOCTEST_MODULES = [
     "Bio.Sequencing",
     "Bio.Sequencing.Phd",
     "Bio.SeqUtils",
+    "Bio.SeqUtils.AhoCorasick",
     "Bio.SeqUtils.CheckSum",
     "Bio.SeqUtils.CodonUsageIndices",
     "Bio.SeqUtils.CodonUsage",
@@ -361,6 +363,10 @@ if numpy:
         "Bio.PDB.Vector",
         "Bio.phenotype.pm_fitting",
         "Bio.SeqIO.PdbIO",
+        "Bio.SeqUtils.FMIndex",
+        "Bio.SeqUtils.KmerCount",
+        "Bio.SeqUtils.MinHash",
+        "Bio.SeqUtils.WindowStats",
         "Bio.Statistics.lowess",
         "Bio.SVDSuperimposer",
     ])
@@ -0,0 +1,109 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqUtils.AhoCorasick module."""
+
+import pickle
+import random
+import unittest
+
+from Bio import motifs
+from Bio.Seq import Seq, reverse_complement
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.AhoCorasick import Automaton
+
+
+def slow_search(patterns, sequence, both=False):
+    """Return the (position, index) tuples of all matches using str.find."""
+    hits = []
+    for index, pattern in enumerate(patterns):
+        targets = [(pattern, 0)]
+        if both:
+            targets.append((reverse_complement(pattern), 1))
+        for target, strand in targets:
+            start = sequence.find(target)
+            while start != -1:
+                hits.append((start, strand, index))
+                start = sequence.find(target, start + 1)
+    # Forward strand matches come first for the same start position
+    return [(start - strand * len(sequence), index)
+            for start, strand, index in sorted(hits)]
+
+
+class TestAutomaton(unittest.TestCase):
+
+    def test_example(self):
+        patterns = ["he", "she", "his", "hers"]
+        automaton = Automaton(patterns)
+        self.assertEqual(len(automaton), 4)
+        self.assertEqual(automaton.search("ushers"),
+                         [(1, 1), (2, 0), (2, 3)])
+        self.assertEqual(automaton.search("USHERS"), [])
+        self.assertEqual(automaton.search(""), [])
+
+    def test_random(self):
+        random.seed(0)
+        for trial in range(50):
+            patterns = ["".join(random.choice("ACGT")
+                                for i in range(random.randint(1, 6)))
+                        for j in range(random.randint(1, 30))]
+            sequence = "".join(random.choice("ACGTN")
+                               for i in range(random.randint(0, 300)))
+            automaton = Automaton(patterns)
+            self.assertEqual(automaton.search(sequence),
+                             slow_search(patterns, sequence))
+            self.assertEqual(automaton.search(sequence, both=True),
+                             slow_search(patterns, sequence, both=True))
+
+    def test_duplicates(self):
+        automaton = Automaton(["ACG", "CG", "ACG"])
+        self.assertEqual(automaton.search("TACGT"),
+                         [(1, 0), (1, 2), (2, 1)])
+
+    def test_sequences(self):
+        automaton = Automaton([Seq("GAATTC"), "AATT"])
+        expected = [(2, 0), (3, 1)]
+        self.assertEqual(automaton.search("CCGAATTCGG"), expected)
+        self.assertEqual(automaton.search(Seq("CCGAATTCGG")), expected)
+        self.assertEqual(automaton.search(SeqRecord(Seq("CCGAATTCGG"))),
+                         expected)
+        # A palindrome matches on both strands
+        self.assertEqual(automaton.search("CCGAATTCGG", both=True),
+                         [(2, 0), (-8, 0), (3, 1), (-7, 1)])
+
+    def test_pickle(self):
+        automaton = Automaton(["GATC", "GGATCC"])
+        automaton.search("GATC", both=True)
+        new = pickle.loads(pickle.dumps(automaton))
+        self.assertEqual(new.patterns, automaton.patterns)
+        self.assertEqual(new.search("AGGATCC", both=True),
+                         automaton.search("AGGATCC", both=True))
+
+    def test_errors(self):
+        self.assertRaises(ValueError, Automaton, ["ACGT", ""])
+        self.assertEqual(Automaton([]).search("ACGT"), [])
+
+
+class TestInstances(unittest.TestCase):
+
+    def test_search(self):
+        motif = motifs.create([Seq("TACAA"), Seq("TACGC"), Seq("TACAC"),
+                               Seq("TACAA")])
+        sequence = Seq("TTGTACAACTACGCTACACTACAAGATACGCATACACTACCTA")
+        hits = list(motif.instances.search(sequence))
+        expected = []
+        for position in range(len(sequence) - 4):
+            for instance in motif.instances:
+                if str(instance) == str(sequence[position:position + 5]):
+                    expected.append((position, instance))
+                    break
+        self.assertEqual([(pos, str(instance)) for pos, instance in hits],
+                         [(pos, str(instance)) for pos, instance in expected])
+        self.assertIs(hits[0][1], motif.instances[0])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
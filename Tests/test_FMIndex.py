@@ -0,0 +1,128 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqUtils.FMIndex module."""
+
+import os
+import random
+import re
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.FMIndex.")
+
+from Bio import SeqIO
+from Bio.Data.IUPACData import ambiguous_dna_values
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.FMIndex import FMIndex, load_index, save_index
+from Bio.SeqUtils.FMIndex import _suffix_array
+
+
+def slow_locate(records, pattern):
+    """Return the (name, start) tuples of the pattern matches using regex."""
+    regex = "".join("[%s]" % ambiguous_dna_values[letter]
+                    for letter in pattern.upper().replace("U", "T"))
+    regex = re.compile("(?=%s)" % regex)
+    return [(record.id, match.start()) for record in records
+            for match in regex.finditer(str(record.seq).upper()
+                                        .replace("U", "T"))]
+
+
+class TestFMIndex(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        # Repeats make long common prefixes for the suffix array to sort
+        repeat = "ACGTTGCA" * 10
+        self.records = [
+            SeqRecord(Seq("".join(random.choice("ACGTACGTACGTNacgtu")
+                                  for i in range(random.randint(0, 300)))
+                          + repeat), id="seq%i" % j)
+            for j in range(20)]
+
+    def check_patterns(self, index):
+        for pattern in ["A", "acg", "ACGTTGCAACGT", "TTT", "GATTACA", "NNN",
+                        "ACGTRYN", "U", "CAACGTTGCAACGTTGCAACG"]:
+            expected = slow_locate(self.records, pattern)
+            self.assertEqual(index.locate(pattern), expected, pattern)
+            self.assertEqual(index.count(pattern), len(expected), pattern)
+        for i in range(50):
+            record = random.choice(self.records)
+            start = random.randint(0, len(record) - 1)
+            pattern = str(record.seq[start:start + random.randint(1, 20)])
+            if "N" in pattern:
+                continue
+            expected = slow_locate(self.records, pattern)
+            self.assertIn((record.id, start), expected)
+            self.assertEqual(index.locate(pattern), expected, pattern)
+            self.assertEqual(index.count(Seq(pattern)), len(expected))
+
+    def test_suffix_array(self):
+        for text in ["banana", "aaaaaaaaaa", "abababab", "", "a",
+                     "".join(random.choice("ab") for i in range(500))]:
+            codes = numpy.frombuffer(text.encode("ascii") + b"\0",
+                                     dtype=numpy.uint8)
+            expected = sorted(range(len(codes)),
+                              key=lambda i: codes[i:].tolist())
+            self.assertEqual(_suffix_array(codes).tolist(), expected)
+            # As used for texts too long for a combined sort key
+            self.assertEqual(_suffix_array(codes, max_key=0).tolist(),
+                             expected)
+
+    def test_search(self):
+        index = FMIndex(self.records)
+        self.assertEqual(index.names, [r.id for r in self.records])
+        self.assertEqual(index.lengths, [len(r) for r in self.records])
+        self.check_patterns(index)
+
+    def test_file(self):
+        records = list(SeqIO.parse("Fasta/f002", "fasta"))
+        index = FMIndex(SeqIO.parse("Fasta/f002", "fasta"))
+        for pattern in ["AAAGG", "GGATC", "TTNNAA", "ACGTACGT"]:
+            self.assertEqual(index.locate(pattern),
+                             slow_locate(records, pattern))
+
+    def test_save_load(self):
+        index = FMIndex(self.records)
+        handle, filename = tempfile.mkstemp(suffix=".fmi")
+        os.close(handle)
+        try:
+            save_index(index, filename)
+            loaded = load_index(filename)
+            self.assertIsInstance(loaded._bwt, numpy.memmap)
+            self.assertEqual(loaded.names, index.names)
+            self.assertEqual(loaded.lengths, index.lengths)
+            self.check_patterns(loaded)
+            del loaded
+            with open(filename, "rb") as handle:
+                data = handle.read()
+            with open(filename, "wb") as handle:
+                handle.write(data[:-1])
+            self.assertRaises(ValueError, load_index, filename)
+            with open(filename, "wb") as handle:
+                handle.write(b"X" + data)
+            self.assertRaises(ValueError, load_index, filename)
+        finally:
+            os.remove(filename)
+
+    def test_empty(self):
+        index = FMIndex([])
+        self.assertEqual(index.names, [])
+        self.assertEqual(index.count("ACGT"), 0)
+        self.assertEqual(index.locate("N"), [])
+        index = FMIndex(self.records)
+        self.assertRaises(ValueError, index.count, "")
+        self.assertRaises(ValueError, index.count, "AC-GT")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
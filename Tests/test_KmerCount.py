@@ -0,0 +1,168 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqUtils.KmerCount module."""
+
+import random
+import unittest
+from collections import Counter
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.KmerCount.")
+
+from Bio import SeqIO
+from Bio.Seq import Seq, reverse_complement
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils import KmerCount
+from Bio.SeqUtils.KmerCount import (KmerCounter, count_kmers, decode_kmer,
+                                    encode_kmer, hash_codes, kmer_codes,
+                                    minimizers)
+
+
+def slow_code(kmer):
+    """Return the integer code of a k-mer string."""
+    code = 0
+    for letter in kmer:
+        code = 4 * code + "ACGT".index(letter)
+    return code
+
+
+def slow_kmers(sequence, k, canonical=False):
+    """Return the k-mer codes (None for invalid k-mers) in Python."""
+    sequence = sequence.upper().replace("U", "T")
+    codes = []
+    for i in range(len(sequence) - k + 1):
+        kmer = sequence[i:i + k]
+        if set(kmer).difference("ACGT"):
+            codes.append(None)
+        elif canonical:
+            codes.append(min(slow_code(kmer),
+                             slow_code(reverse_complement(kmer))))
+        else:
+            codes.append(slow_code(kmer))
+    return codes
+
+
+class TestKmerCodes(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.sequences = ["".join(random.choice("ACGTACGTACGTNacgu")
+                                  for i in range(random.randint(0, 80)))
+                          for j in range(100)]
+
+    def test_codes(self):
+        for sequence in self.sequences:
+            for k in (1, 2, 5, 16, 31):
+                for canonical in (False, True):
+                    expected = [code for code in
+                                slow_kmers(sequence, k, canonical)
+                                if code is not None]
+                    codes = kmer_codes(sequence, k, canonical)
+                    self.assertEqual(codes.dtype, numpy.uint64)
+                    self.assertEqual(codes.tolist(), expected)
+
+    def test_encode_decode(self):
+        for k in (1, 7, 31):
+            kmer = "".join(random.choice("ACGT") for i in range(k))
+            self.assertEqual(encode_kmer(kmer), slow_code(kmer))
+            self.assertEqual(decode_kmer(encode_kmer(kmer), k), kmer)
+        self.assertEqual(encode_kmer(Seq("acgu")), encode_kmer("ACGT"))
+        self.assertRaises(ValueError, encode_kmer, "ACNT")
+        self.assertRaises(ValueError, kmer_codes, "ACGT", 0)
+        self.assertRaises(ValueError, kmer_codes, "ACGT", 32)
+
+    def test_hash(self):
+        codes = numpy.arange(4 ** 6, dtype=numpy.uint64)
+        hashes = hash_codes(codes, 12)
+        # Using 2k bits, the hash is a permutation of the codes
+        self.assertEqual(sorted(hashes.tolist()), codes.tolist())
+        self.assertNotEqual(hashes.tolist(), codes.tolist())
+
+    def test_minimizers(self):
+        for sequence in self.sequences:
+            for k, w in [(1, 1), (3, 4), (5, 7), (15, 2), (31, 16)]:
+                codes = slow_kmers(sequence, k, canonical=True)
+                hashes = [1 << (2 * k) if code is None else
+                          int(hash_codes([code], 2 * k)[0])
+                          for code in codes]
+                expected = []
+                for i in range(len(codes) - w + 1):
+                    best = min(range(i, i + w),
+                               key=lambda j: (hashes[j], j))
+                    if codes[best] is not None and \
+                            (not expected or expected[-1] != best):
+                        expected.append(best)
+                positions, found = minimizers(sequence, k, w, True)
+                self.assertEqual(positions.tolist(), expected)
+                self.assertEqual(found.tolist(),
+                                 [codes[i] for i in expected])
+
+
+class TestKmerCounter(unittest.TestCase):
+
+    def test_counts(self):
+        records = list(SeqIO.parse("Fasta/f002", "fasta"))
+        for canonical in (False, True):
+            expected = Counter()
+            for record in records:
+                expected.update(code for code in
+                                slow_kmers(str(record.seq), 4, canonical)
+                                if code is not None)
+            counter = count_kmers(records, 4, canonical)
+            self.assertEqual(counter.codes.tolist(), sorted(expected))
+            self.assertEqual(counter.counts.tolist(),
+                             [expected[code] for code in sorted(expected)])
+            self.assertEqual(len(counter), len(expected))
+            self.assertEqual(counter.most_common(1)[0][1],
+                             max(expected.values()))
+            self.assertEqual(sum(count for kmer, count in counter.items()),
+                             sum(expected.values()))
+            for code in list(expected)[:10]:
+                kmer = decode_kmer(code, 4)
+                self.assertEqual(counter[kmer], expected[code])
+                if canonical:
+                    self.assertEqual(counter[reverse_complement(kmer)],
+                                     expected[code])
+        self.assertEqual(counter["CCCC"],
+                         expected.get(slow_code("CCCC"), 0))
+        self.assertRaises(ValueError, counter.__getitem__, "ACG")
+        self.assertRaises(ValueError, counter.__getitem__, "ACGN")
+
+    def test_streaming(self):
+        # Force frequent merging of the counts
+        merge_size = KmerCount._MERGE_SIZE
+        KmerCount._MERGE_SIZE = 10
+        try:
+            random.seed(1)
+            counter = KmerCounter(3)
+            expected = Counter()
+            for i in range(50):
+                sequence = "".join(random.choice("ACGT") for j in range(30))
+                counter.add(SeqRecord(Seq(sequence)))
+                expected.update(slow_kmers(sequence, 3))
+            self.assertEqual(counter.codes.tolist(), sorted(expected))
+            self.assertEqual(counter.counts.tolist(),
+                             [expected[code] for code in sorted(expected)])
+        finally:
+            KmerCount._MERGE_SIZE = merge_size
+
+    def test_spectrum(self):
+        counter = KmerCounter(1)
+        counter.update("AAAACCCGGT")
+        multiplicity, frequency = counter.spectrum()
+        self.assertEqual(multiplicity.tolist(), [1, 2, 3, 4])
+        self.assertEqual(frequency.tolist(), [1, 1, 1, 1])
+        self.assertEqual(len(KmerCounter(5)), 0)
+        self.assertEqual(KmerCounter(5).most_common(), [])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,143 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Tm_NN_batch function in Bio.SeqUtils.MeltingTemp."""
+
+import random
+import unittest
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Tm_NN_batch.")
+
+from Bio import BiopythonWarning
+from Bio.Seq import Seq, complement
+from Bio.SeqUtils import MeltingTemp as mt
+
+
+def random_seq(length, letters="ACGT"):
+    return "".join(random.choice(letters) for i in range(length))
+
+
+class TestTmNNBatch(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.primers = [random_seq(random.randint(6, 40)) for i in range(300)]
+
+    def test_tables(self):
+        tables = [{}, {"nn_table": mt.DNA_NN1}, {"nn_table": mt.DNA_NN2},
+                  {"nn_table": mt.DNA_NN4}, {"nn_table": mt.RNA_NN1},
+                  {"nn_table": mt.RNA_NN2}, {"nn_table": mt.RNA_NN3},
+                  {"nn_table": mt.R_DNA_NN1}, {"selfcomp": True},
+                  {"dnac2": 0, "Tris": 10, "Mg": 1.5, "dNTPs": 0.6}]
+        for options in tables:
+            for saltcorr in range(8):
+                values = mt.Tm_NN_batch(self.primers, saltcorr=saltcorr,
+                                        **options)
+                self.assertIsInstance(values, numpy.ndarray)
+                # The values should be exactly the same
+                self.assertEqual(values.tolist(),
+                                 [mt.Tm_NN(primer, saltcorr=saltcorr,
+                                           **options)
+                                  for primer in self.primers])
+
+    def test_mismatches(self):
+        primers = self.primers
+        templates = []
+        shifts = []
+        for i, primer in enumerate(primers):
+            # A single internal mismatch, with up to two dangling bases on
+            # either side of the template (shift is the 5' overhang)
+            template = list(complement(primer))
+            position = len(template) // 2
+            template[position] = "ACGT"[("ACGT".index(template[position]) +
+                                         1 + i % 3) % 4]
+            template = "A" * (i % 3) + "".join(template) + \
+                "T" * ((i // 3) % 3)
+            templates.append(template)
+            shifts.append(i % 3)
+        values = mt.Tm_NN_batch(primers, c_seqs=templates, shifts=shifts,
+                                saltcorr=7)
+        self.assertEqual(values.tolist(),
+                         [mt.Tm_NN(primer, c_seq=template, shift=shift,
+                                   saltcorr=7) for primer, template, shift
+                          in zip(primers, templates, shifts)])
+        # A mixture of perfect matches and mismatches
+        templates[::2] = [None] * len(templates[::2])
+        shifts[::2] = [0] * len(shifts[::2])
+        values = mt.Tm_NN_batch(primers, c_seqs=templates, shifts=shifts)
+        self.assertEqual(values.tolist(),
+                         [mt.Tm_NN(primer, c_seq=template, shift=shift)
+                          for primer, template, shift
+                          in zip(primers, templates, shifts)])
+
+    def test_dangling_ends(self):
+        primers = ["CGTTCCAAAGATGTGGGCATGAGCTTAC",
+                   "CGUUCCAAAGAUGUGGGCAUGAGCUUAC"]
+        templates = ["TGCAAGGcTTCTACACCCGTACTCGAATGC",
+                     "UGCAAGGcUUCUACACCCGUACUCGAAUGC"]
+        values = mt.Tm_NN_batch(primers, c_seqs=templates, shifts=1,
+                                nn_table=mt.RNA_NN3, de_table=mt.RNA_DE1)
+        self.assertEqual(values.tolist(),
+                         [mt.Tm_NN(primer, c_seq=template, shift=1,
+                                   nn_table=mt.RNA_NN3, de_table=mt.RNA_DE1)
+                          for primer, template in zip(primers, templates)])
+
+    def test_strict(self):
+        primers = ["CGTTCCAAAGATGTGGGCATGAGCTTAC"] * 2
+        templates = [None, "TtCAAGGcTTCTACACCCGTACTCGAATGC"]
+        self.assertRaises(ValueError, mt.Tm_NN_batch, primers,
+                          c_seqs=templates, shifts=[0, 1])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonWarning)
+            values = mt.Tm_NN_batch(primers, c_seqs=templates, shifts=[0, 1],
+                                    strict=False)
+            self.assertEqual(values.tolist(),
+                             [mt.Tm_NN(primers[0]),
+                              mt.Tm_NN(primers[1], c_seq=templates[1],
+                                       shift=1, strict=False)])
+
+    def test_check(self):
+        primers = ["CGTTCCA1AGATGTGGGCATGAGCTTAC",
+                   Seq("cgttccaaag atgtgggcat gagcttac"),
+                   "CGUUCCAAAGAUGUGGGCAUGAGCUUAC"]
+        values = mt.Tm_NN_batch(primers)
+        self.assertEqual(values.tolist(),
+                         [mt.Tm_NN(primer) for primer in primers])
+        table = mt.make_table(oldtable=mt.DNA_NN3,
+                              values={"A1/T1": (-6.608, -17.235),
+                                      "1A/1T": (-6.893, -15.923)})
+        values = mt.Tm_NN_batch(primers[:1], check=False, nn_table=table)
+        self.assertEqual(values.tolist(),
+                         [mt.Tm_NN(primers[0], check=False, nn_table=table)])
+
+    def test_errors(self):
+        self.assertEqual(mt.Tm_NN_batch([]).tolist(), [])
+        self.assertRaises(ValueError, mt.Tm_NN_batch, ["ACGTACGT", "NNNN"])
+        self.assertRaises(ValueError, mt.Tm_NN_batch, ["ACGTACGU"])
+        self.assertRaises(ValueError, mt.Tm_NN_batch, ["ACGTACGT"],
+                          c_seqs=["TGCATGCA", "TGCATGCA"])
+        self.assertRaises(ValueError, mt.Tm_NN_batch, ["ACGTACGT"],
+                          shifts=[0, 1])
+
+    def test_batches(self):
+        batch_size = mt._BATCH_SIZE
+        mt._BATCH_SIZE = 7
+        try:
+            values = mt.Tm_NN_batch(self.primers, saltcorr=6)
+        finally:
+            mt._BATCH_SIZE = batch_size
+        self.assertEqual(values.tolist(),
+                         mt.Tm_NN_batch(self.primers, saltcorr=6).tolist())
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
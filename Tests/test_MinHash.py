@@ -0,0 +1,155 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqUtils.MinHash module."""
+
+import math
+import random
+import unittest
+
+from io import BytesIO
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.MinHash.")
+
+from Bio import SeqIO
+from Bio.Phylo.TreeConstruction import DistanceTreeConstructor
+from Bio.SeqUtils import MinHash
+from Bio.SeqUtils.KmerCount import hash_codes, kmer_codes
+from Bio.SeqUtils.MinHash import (Sketch, distance_matrix, load_sketches,
+                                  mash_distances, save_sketches, sketch_file)
+
+
+def slow_sketch(sequences, k, size):
+    """Return the bottom-k hashes of some sequences in Python."""
+    hashes = set()
+    for sequence in sequences:
+        hashes.update(hash_codes(kmer_codes(sequence, k, True)).tolist())
+    return sorted(hashes)[:size]
+
+
+def slow_distance(a, b, k, size):
+    """Return the Mash distance between two lists of hashes in Python."""
+    union = sorted(set(a).union(b))[:size]
+    shared = set(a).intersection(b).intersection(union)
+    if not shared:
+        return 1.0
+    j = float(len(shared)) / len(union)
+    return -math.log(2 * j / (1 + j)) / k
+
+
+def mutate(sequence, rate):
+    """Return the sequence with random substitutions."""
+    return "".join(random.choice("ACGT".replace(letter, ""))
+                   if random.random() < rate else letter
+                   for letter in sequence)
+
+
+class TestSketch(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        genome = "".join(random.choice("ACGT") for i in range(5000))
+        self.genomes = [genome] + [mutate(genome, rate)
+                                   for rate in (0.001, 0.01, 0.05, 0.2)]
+        self.genomes.append(genome[:1000])
+        self.genomes.append("ACGTN")
+
+    def test_sketch(self):
+        for k, size in [(5, 20), (15, 100), (21, 1000)]:
+            for genome in self.genomes:
+                sketch = Sketch(genome, k, size)
+                self.assertEqual(sketch.hashes.tolist(),
+                                 slow_sketch([genome], k, size))
+            # Adding the sequences in pieces trims the sketch as it goes
+            genome = self.genomes[0]
+            pieces = [genome[i:i + 100] for i in range(0, 5000, 90)]
+            sketch = Sketch(pieces, k, size)
+            self.assertEqual(sketch.hashes.tolist(),
+                             slow_sketch(pieces, k, size))
+            self.assertEqual(len(sketch), size)
+
+    def test_distances(self):
+        for k, size in [(5, 20), (15, 100), (21, 1000)]:
+            sketches = [Sketch(genome, k, size) for genome in self.genomes]
+            distances = mash_distances(sketches)
+            for i, a in enumerate(sketches):
+                for j, b in enumerate(sketches):
+                    expected = 0.0 if i == j else slow_distance(
+                        a.hashes.tolist(), b.hashes.tolist(), k, size)
+                    self.assertAlmostEqual(distances[i, j], expected)
+                    if i != j:
+                        self.assertAlmostEqual(a.distance(b), expected)
+        # More mutations give larger distances
+        self.assertEqual(sorted(distances[0, :5]), distances[0, :5].tolist())
+
+    def test_chunks(self):
+        sketches = [Sketch(genome, 11, 50) for genome in self.genomes]
+        expected = mash_distances(sketches)
+        chunk_size = MinHash._CHUNK_SIZE
+        MinHash._CHUNK_SIZE = 150
+        try:
+            self.assertEqual(mash_distances(sketches).tolist(),
+                             expected.tolist())
+        finally:
+            MinHash._CHUNK_SIZE = chunk_size
+
+    def test_incompatible(self):
+        a = Sketch(self.genomes[0], 15, 100)
+        self.assertRaises(ValueError, a.distance, Sketch("ACGT", 11, 100))
+        self.assertRaises(ValueError, a.distance, Sketch("ACGT", 15, 50))
+        self.assertRaises(ValueError, Sketch, "ACGT", 32)
+        self.assertRaises(ValueError, Sketch, "ACGT", 15, 0)
+        self.assertEqual(mash_distances([]).shape, (0, 0))
+
+    def test_save_load(self):
+        sketches = [Sketch(genome, 15, 100, name="genome%i" % i)
+                    for i, genome in enumerate(self.genomes)]
+        sketches.append(Sketch(k=15, size=100))
+        handle = BytesIO()
+        save_sketches(sketches, handle)
+        handle.seek(0)
+        loaded = load_sketches(handle)
+        self.assertEqual(len(loaded), len(sketches))
+        for sketch, new in zip(sketches, loaded):
+            self.assertEqual(new.name, sketch.name)
+            self.assertEqual(new.k, sketch.k)
+            self.assertEqual(new.size, sketch.size)
+            self.assertEqual(new.hashes.dtype, numpy.uint64)
+            self.assertEqual(new.hashes.tolist(), sketch.hashes.tolist())
+        data = handle.getvalue()
+        self.assertRaises(ValueError, load_sketches, BytesIO(data[:-1]))
+        self.assertRaises(ValueError, load_sketches, BytesIO(b"X" + data))
+
+
+class TestDistanceMatrix(unittest.TestCase):
+
+    def test_tree(self):
+        record = SeqIO.read("GFF/NC_001802.fna", "fasta")
+        sketches = [sketch_file("GFF/NC_001802.fna", k=15, size=200),
+                    Sketch(record[:6000], 15, 200, "start"),
+                    Sketch(record[3000:], 15, 200, "end"),
+                    Sketch(record[:3000], 15, 200, "first")]
+        self.assertEqual(sketches[0].name, "GFF/NC_001802.fna")
+        dm = distance_matrix(sketches)
+        distances = mash_distances(sketches)
+        self.assertEqual(dm.names,
+                         ["GFF/NC_001802.fna", "start", "end", "first"])
+        for i in range(4):
+            for j in range(4):
+                self.assertAlmostEqual(dm[i, j], distances[i, j])
+        constructor = DistanceTreeConstructor()
+        for tree in (constructor.nj(dm), constructor.upgma(dm)):
+            self.assertEqual(sorted(leaf.name for leaf in tree.get_terminals()),
+                             sorted(dm.names))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
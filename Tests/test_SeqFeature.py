@@ -5,6 +5,9 @@
 
 """Tests Bio.SeqFeature.
 """
+import copy
+import io
+import pickle
 import unittest
 from os import path
 from Bio import Seq, SeqIO
@@ -12,6 +15,7 @@ from Bio.Alphabet import generic_dna
 from Bio.Data.CodonTable import TranslationError
 from Bio.SeqFeature import FeatureLocation, AfterPosition, BeforePosition
 from Bio.SeqFeature import CompoundLocation, UnknownPosition, SeqFeature
+from Bio.SeqFeature import ExactPosition, WithinPosition
 
 
 class TestReference(unittest.TestCase):
@@ -149,3 +153,97 @@ class TestSeqFeature(unittest.TestCase):
         f.qualifiers['transl_table'] = [11]
         with self.assertRaises(TranslationError):
             f.translate(seq)
+
+
+class TestCompactStorage(unittest.TestCase):
+    """Tests for the __slots__ based storage of features and locations"""
+
+    def test_no_instance_dict(self):
+        """Test locations and exact positions have no instance dictionary"""
+        loc = FeatureLocation(5, 10, strand=-1)
+        self.assertFalse(hasattr(loc, "__dict__"))
+        self.assertFalse(hasattr(loc + loc, "__dict__"))
+        for position in (ExactPosition(5), BeforePosition(5),
+                         AfterPosition(5), UnknownPosition()):
+            self.assertFalse(hasattr(position, "__dict__"))
+        with self.assertRaises(AttributeError):
+            loc.colour = "red"
+
+    def test_exact_positions(self):
+        """Test exact positions are given as ExactPosition objects"""
+        for start, end in [(5, 10), (ExactPosition(5), ExactPosition(10))]:
+            loc = FeatureLocation(start, end)
+            self.assertIs(type(loc.start), ExactPosition)
+            self.assertIs(type(loc.end), ExactPosition)
+            self.assertEqual(repr(loc),
+                             "FeatureLocation(ExactPosition(5), "
+                             "ExactPosition(10))")
+            self.assertEqual(str(loc), "[5:10]")
+        loc = FeatureLocation(BeforePosition(5), WithinPosition(10, 8, 10))
+        self.assertIs(type(loc.start), BeforePosition)
+        self.assertIs(type(loc.end), WithinPosition)
+        self.assertEqual(str(loc._shift(2)), "[<7:(10.12)]")
+        self.assertEqual(str(loc._flip(20)), "[(10.12):>15]")
+        self.assertEqual(str(FeatureLocation(5, 10, 1)._flip(20)),
+                         "[10:15](-)")
+
+    def test_feature_attributes(self):
+        """Test other attributes can still be added to a SeqFeature"""
+        feature = SeqFeature(FeatureLocation(5, 10), type="CDS")
+        feature.colour = "red"
+        self.assertEqual(feature.colour, "red")
+        feature.strand = -1
+        self.assertEqual(feature.location.strand, -1)
+
+    def test_copy_and_pickle(self):
+        """Test copying and pickling features with compact storage"""
+        location = FeatureLocation(5, 10, 1) + FeatureLocation(20, 30, 1)
+        feature = SeqFeature(location, type="CDS", id="test",
+                             qualifiers={"gene": ["abc"]})
+        for other in (copy.copy(feature), copy.deepcopy(feature),
+                      pickle.loads(pickle.dumps(feature,
+                                                pickle.HIGHEST_PROTOCOL))):
+            self.assertEqual(repr(other), repr(feature))
+            self.assertEqual(other.location, feature.location)
+            self.assertEqual(other.qualifiers, feature.qualifiers)
+
+    def test_pickle_protocols(self):
+        """Test pickling features with old pickle protocols"""
+        location = CompoundLocation([FeatureLocation(5, 10, 1),
+                                     FeatureLocation(BeforePosition(20),
+                                                     AfterPosition(30), 1,
+                                                     ref="X")])
+        feature = SeqFeature(location, type="CDS", id="test",
+                             qualifiers={"gene": ["abc"]})
+        feature.colour = "red"
+        for protocol in range(3):
+            for obj in (feature, location, location.parts[1]):
+                other = pickle.loads(pickle.dumps(obj, protocol))
+                self.assertIs(type(other), type(obj))
+                self.assertEqual(repr(other), repr(obj))
+            other = pickle.loads(pickle.dumps(feature, protocol))
+            self.assertEqual(other.qualifiers, feature.qualifiers)
+            self.assertEqual(other.colour, "red")
+
+    def test_interned_qualifiers(self):
+        """Test short qualifier values from GenBank files are shared"""
+        testfile = path.join("GenBank", "NC_005816.gb")
+        record = SeqIO.read(testfile, "genbank")
+        gene, cds = record.features[2:4]
+        self.assertEqual(gene.type, "gene")
+        self.assertEqual(cds.type, "CDS")
+        self.assertIs(gene.qualifiers["locus_tag"][0],
+                      cds.qualifiers["locus_tag"][0])
+        self.assertIs(list(gene.qualifiers)[0], list(cds.qualifiers)[0])
+
+    def test_unicode_handle(self):
+        """Test parsing GenBank files from a text mode handle"""
+        testfile = path.join("GenBank", "NC_005816.gb")
+        expected = SeqIO.read(testfile, "genbank")
+        # On Python 2 this gives unicode strings, which are not interned
+        with io.open(testfile, encoding="utf-8") as handle:
+            record = SeqIO.read(handle, "genbank")
+        self.assertEqual(len(record.features), len(expected.features))
+        for feature, old in zip(record.features, expected.features):
+            self.assertEqual(feature.type, old.type)
+            self.assertEqual(feature.qualifiers, old.qualifiers)
@@ -6,11 +6,16 @@
 
 from __future__ import print_function
 
+import os
+import random
+import shutil
+import tempfile
 import unittest
 from Bio._py3k import StringIO
 
 from Bio import SeqIO
-from Bio.SeqIO.FastaIO import FastaIterator
+from Bio import bgzf
+from Bio.SeqIO.FastaIO import FastaIterator, FastaIndex
 from Bio.Alphabet import generic_nucleotide, generic_dna
 from Bio.SeqIO.FastaIO import SimpleFastaParser, FastaTwoLineParser
 
@@ -211,6 +216,103 @@ class TestSimpleFastaParsers(unittest.TestCase):
                 list(FastaTwoLineParser(handle))
 
 
+class TestFastaIndex(unittest.TestCase):
+    """Tests for the samtools faidx style FastaIndex."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.fasta = os.path.join(self.temp_dir, "example.fasta")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_fasta(self, newline="\n"):
+        """Write a FASTA file with a mix of line lengths, return the records."""
+        random.seed(0)
+        records = []
+        with open(self.fasta, "wb") as handle:
+            for i, (length, wrap) in enumerate([(0, 60), (1, 60), (60, 60),
+                                                (61, 60), (1000, 70),
+                                                (999, 7), (120, 60)]):
+                seq = "".join(random.choice("ACGT") for _ in range(length))
+                records.append(("seq%i" % i, seq))
+                lines = [">seq%i description here" % i]
+                lines.extend(seq[j:j + wrap] for j in range(0, length, wrap))
+                handle.write((newline.join(lines) + newline).encode("ascii"))
+        return records
+
+    def check_regions(self, fasta, records):
+        self.assertEqual(fasta.keys(), [name for name, seq in records])
+        self.assertEqual(len(fasta), len(records))
+        for name, seq in records:
+            self.assertIn(name, fasta)
+            self.assertEqual(fasta.length(name), len(seq))
+            self.assertEqual(str(fasta.fetch(name)), seq)
+            for start in range(0, len(seq) + 2, 13):
+                for end in (start, start + 1, start + 59, start + 61,
+                            start + 500):
+                    self.assertEqual(str(fasta.fetch(name, start, end)),
+                                     seq[start:end])
+        self.assertRaises(KeyError, fasta.fetch, "missing")
+
+    def test_fai_file(self):
+        """Check the .fai file matches samtools faidx."""
+        self.write_fasta()
+        with FastaIndex(self.fasta) as fasta:
+            self.assertEqual(fasta.length("seq4"), 1000)
+        with open(self.fasta + ".fai") as handle:
+            lines = handle.readlines()
+        self.assertEqual(lines[:5], ["seq0\t0\t23\t0\t0\n",
+                                     "seq1\t1\t46\t1\t2\n",
+                                     "seq2\t60\t71\t60\t61\n",
+                                     "seq3\t61\t155\t60\t61\n",
+                                     "seq4\t1000\t241\t70\t71\n"])
+
+    def test_plain(self):
+        records = self.write_fasta()
+        with FastaIndex(self.fasta) as fasta:
+            self.check_regions(fasta, records)
+        # Again, but now loading the .fai file
+        self.assertTrue(os.path.isfile(self.fasta + ".fai"))
+        with FastaIndex(self.fasta) as fasta:
+            self.check_regions(fasta, records)
+
+    def test_windows_newlines(self):
+        records = self.write_fasta("\r\n")
+        with FastaIndex(self.fasta, fai_filename=False) as fasta:
+            self.check_regions(fasta, records)
+        self.assertFalse(os.path.isfile(self.fasta + ".fai"))
+
+    def test_bgzf(self):
+        records = self.write_fasta()
+        with open(self.fasta, "rb") as handle:
+            data = handle.read()
+        compressed = self.fasta + ".gz"
+        with bgzf.BgzfWriter(compressed, "wb") as handle:
+            # Use lots of small blocks to test the .gzi offsets
+            for i in range(0, len(data), 100):
+                handle.write(data[i:i + 100])
+                handle.flush()
+        with FastaIndex(compressed) as fasta:
+            self.check_regions(fasta, records)
+        self.assertTrue(os.path.isfile(compressed + ".fai"))
+        self.assertTrue(os.path.isfile(compressed + ".gzi"))
+        with FastaIndex(compressed) as fasta:
+            self.check_regions(fasta, records)
+
+    def test_bad_line_lengths(self):
+        with open(self.fasta, "w") as handle:
+            handle.write(">alpha\nACGT\nAC\nACGT\n")
+        self.assertRaises(ValueError, FastaIndex, self.fasta)
+        with open(self.fasta, "w") as handle:
+            handle.write(">alpha\nACGT\nACGTA\n")
+        self.assertRaises(ValueError, FastaIndex, self.fasta)
+        self.assertFalse(os.path.isfile(self.fasta + ".fai"))
+
+    def test_duplicates(self):
+        self.assertRaises(ValueError, FastaIndex, "Fasta/dups.fasta", False)
+
+
 single_nucleic_files = ['Fasta/lupine.nu', 'Fasta/elderberry.nu',
                         'Fasta/phlox.nu', 'Fasta/centaurea.nu',
                         'Fasta/wisteria.nu', 'Fasta/sweetpea.nu',
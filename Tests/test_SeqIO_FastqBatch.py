@@ -0,0 +1,101 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for the columnar FASTQ batch reader in Bio.SeqIO.QualityIO."""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use FastqBatchIterator.")
+
+from Bio._py3k import StringIO
+from Bio._py3k import _as_bytes
+
+from Bio import SeqIO
+from Bio.SeqIO.QualityIO import FastqBatchIterator, FastqGeneralIterator
+
+
+class TestFastqBatch(unittest.TestCase):
+
+    def check_batches(self, filename, fmt, variant, batch_size):
+        if fmt == "fastq-solexa":
+            key = "solexa_quality"
+        else:
+            key = "phred_quality"
+        records = list(SeqIO.parse(filename, fmt))
+        with open(filename) as handle:
+            batches = list(FastqBatchIterator(handle, batch_size, variant))
+        self.assertEqual(sum(len(b) for b in batches), len(records))
+        for batch in batches[:-1]:
+            self.assertEqual(len(batch), batch_size)
+        index = 0
+        for batch in batches:
+            self.assertEqual(batch.qualities.dtype, numpy.uint8)
+            self.assertEqual(len(batch.seq), len(batch.qualities))
+            self.assertEqual(batch.offsets[-1], len(batch.seq))
+            for title, seq, quals in batch:
+                record = records[index]
+                self.assertEqual(title.split(None, 1)[0], record.id)
+                self.assertEqual(seq, _as_bytes(str(record.seq)))
+                expected = record.letter_annotations[key]
+                if fmt == "fastq-solexa":
+                    expected = [int(round(SeqIO.QualityIO.phred_quality_from_solexa(q)))
+                                for q in expected]
+                self.assertEqual(list(quals), expected)
+                index += 1
+
+    def test_sanger(self):
+        self.check_batches("Quality/example.fastq", "fastq", "sanger", 2)
+
+    def test_tricky(self):
+        self.check_batches("Quality/tricky.fastq", "fastq", "fastq", 3)
+
+    def test_sanger_full_range(self):
+        self.check_batches("Quality/sanger_full_range_original_sanger.fastq", "fastq",
+                           "fastq-sanger", 1)
+
+    def test_solexa(self):
+        self.check_batches("Quality/solexa_faked.fastq", "fastq-solexa",
+                           "solexa", 10)
+        self.check_batches("Quality/solexa_example.fastq", "fastq-solexa",
+                           "solexa", 2)
+        self.check_batches("Quality/solexa_full_range_original_solexa.fastq",
+                           "fastq-solexa", "fastq-solexa", 1)
+
+    def test_illumina(self):
+        self.check_batches("Quality/illumina_faked.fastq", "fastq-illumina",
+                           "illumina", 5)
+
+    def test_lengths(self):
+        with open("Quality/tricky.fastq") as handle:
+            batch = next(FastqBatchIterator(handle))
+        with open("Quality/tricky.fastq") as handle:
+            lengths = [len(s) for t, s, q in FastqGeneralIterator(handle)]
+        self.assertEqual(list(batch.lengths()), lengths)
+        self.assertEqual(batch[-1][1], _as_bytes("TGGGAGGTTTTATGTGGAAAGCAGCAATGTACAAGA"))
+
+    def test_empty(self):
+        self.assertEqual(list(FastqBatchIterator(StringIO(""))), [])
+
+    def test_invalid(self):
+        handle = StringIO("@read\nACGT\n+\nII I\n")
+        self.assertRaises(ValueError, list, FastqBatchIterator(handle))
+        handle = StringIO("@read\nACGT\n+\n;;;;\n")
+        self.assertRaises(ValueError, list,
+                          FastqBatchIterator(handle, variant="illumina"))
+        handle = StringIO("@read\nACGT\n+\nIIII\n")
+        self.assertRaises(ValueError, list,
+                          FastqBatchIterator(handle, variant="bogus"))
+        self.assertRaises(ValueError, list,
+                          FastqBatchIterator(handle, batch_size=0))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -8,7 +8,8 @@ from Bio._py3k import StringIO
 
 from Bio import SeqIO
 from Bio.Alphabet import generic_dna
-from Bio.Seq import Seq
+from Bio.GenBank.Scanner import Projection
+from Bio.Seq import Seq, UnknownSeq
 from Bio.SeqFeature import SeqFeature, FeatureLocation
 from Bio.SeqRecord import SeqRecord
 
@@ -97,6 +98,104 @@ class TestEmblRewrite(unittest.TestCase):
         self.check_rewrite("EMBL/AE017046.embl")
 
 
+class TestProjection(unittest.TestCase):
+
+    def check_projection(self, filename, fmt, header):
+        qualifiers = ["locus_tag", "product", "note"]
+        projection = Projection(header=header, features=["CDS"],
+                                qualifiers=qualifiers, sequence=False)
+        full = list(SeqIO.parse(filename, fmt))
+        records = list(SeqIO.parse(filename, fmt, projection=projection))
+        self.assertEqual(len(full), len(records))
+        for old, new in zip(full, records):
+            self.assertEqual(old.id, new.id)
+            self.assertEqual(old.name, new.name)
+            self.assertEqual(old.description, new.description)
+            self.assertEqual(len(old), len(new))
+            self.assertIsInstance(new.seq, UnknownSeq)
+            self.assertEqual(old.annotations.get("organism"),
+                             new.annotations.get("organism"))
+            self.assertNotIn("references", new.annotations)
+            self.assertNotIn("keywords", new.annotations)
+            cds = [f for f in old.features if f.type == "CDS"]
+            self.assertEqual(len(cds), len(new.features))
+            for f1, f2 in zip(cds, new.features):
+                self.assertEqual(f1.location, f2.location)
+                self.assertEqual(
+                    dict((k, v) for k, v in f1.qualifiers.items()
+                         if k in qualifiers),
+                    dict(f2.qualifiers))
+
+    def test_genbank(self):
+        """Check parsing GenBank files with a projection."""
+        self.check_projection("GenBank/cor6_6.gb", "gb",
+                              ["DEFINITION", "SOURCE"])
+        self.check_projection("GenBank/NC_005816.gb", "genbank",
+                              ["DEFINITION", "SOURCE"])
+
+    def test_embl(self):
+        """Check parsing EMBL files with a projection."""
+        self.check_projection("EMBL/TRBG361.embl", "embl", ["DE", "OS"])
+        self.check_projection("EMBL/AE017046.embl", "embl", ["DE", "OS"])
+
+    def test_everything(self):
+        """Check a projection of everything matches a normal parse."""
+        projection = {"header": None, "features": None, "sequence": True}
+        for old, new in zip(SeqIO.parse("GenBank/cor6_6.gb", "gb"),
+                            SeqIO.parse("GenBank/cor6_6.gb", "gb",
+                                        projection=projection)):
+            self.assertTrue(compare_record(old, new))
+
+    def test_references(self):
+        """Check keeping the references with a projection."""
+        for filename, fmt, field in [("GenBank/cor6_6.gb", "gb", "REFERENCE"),
+                                     ("EMBL/TRBG361.embl", "embl", "RN")]:
+            projection = Projection(header=[field], features=[])
+            for old, new in zip(SeqIO.parse(filename, fmt),
+                                SeqIO.parse(filename, fmt,
+                                            projection=projection)):
+                self.assertEqual(str(old.seq), str(new.seq))
+                self.assertEqual(new.features, [])
+                self.assertEqual(new.description, "")
+                self.assertEqual(
+                    [(r.title, r.authors, r.journal)
+                     for r in old.annotations["references"]],
+                    [(r.title, r.authors, r.journal)
+                     for r in new.annotations["references"]])
+
+    def test_skipped_qualifiers(self):
+        """Check skipping multi-line qualifiers with a projection."""
+        record = SeqIO.read("GenBank/NC_005816.gb", "gb")
+        projection = Projection(header=[], features=["CDS"],
+                                qualifiers=["protein_id"])
+        new = next(SeqIO.parse("GenBank/NC_005816.gb", "gb",
+                               projection=projection))
+        self.assertEqual(str(record.seq), str(new.seq))
+        self.assertEqual(
+            [f.qualifiers["protein_id"] for f in record.features
+             if f.type == "CDS"],
+            [f.qualifiers["protein_id"] for f in new.features])
+
+    def test_unterminated_qualifier(self):
+        """Check an unterminated skipped qualifier raises ValueError."""
+        with open("GenBank/NC_005816.gb") as handle:
+            text = handle.read()
+        start = text.index("/translation=")
+        end = text.index('"', start + len('/translation="'))
+        text = text[:end] + text[end + 1:]
+        projection = Projection(header=[], features=["CDS"],
+                                qualifiers=["locus_tag"])
+        for kwargs in ({}, {"projection": projection}):
+            with self.assertRaises(ValueError):
+                list(SeqIO.parse(StringIO(text), "gb", **kwargs))
+
+    def test_unsupported_format(self):
+        """Check a projection is rejected for other formats."""
+        with self.assertRaises(ValueError):
+            list(SeqIO.parse("Fasta/f002", "fasta",
+                             projection=Projection(sequence=False)))
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -10,6 +10,12 @@ from __future__ import print_function
 import os
 import unittest
 import warnings
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from Bio._py3k import range
 from Bio._py3k import StringIO
@@ -726,6 +732,72 @@ class MappingTests(unittest.TestCase):
                          expected_phred)
 
 
+class TestCompactQualities(unittest.TestCase):
+    """Test quality scores held as arrays of bytes."""
+
+    files = [("Quality/example.fastq", "fastq", "phred_quality", "B"),
+             ("Quality/sanger_full_range_original_sanger.fastq", "fastq",
+              "phred_quality", "B"),
+             ("Quality/solexa_full_range_original_solexa.fastq",
+              "fastq-solexa", "solexa_quality", "b"),
+             ("Quality/illumina_full_range_original_illumina.fastq",
+              "fastq-illumina", "phred_quality", "B")]
+    iterators = {"fastq": QualityIO.FastqPhredIterator,
+                 "fastq-solexa": QualityIO.FastqSolexaIterator,
+                 "fastq-illumina": QualityIO.FastqIlluminaIterator}
+    formats = ["fastq", "fastq-solexa", "fastq-illumina", "qual"]
+
+    def compact_records(self, filename, fmt):
+        with open(filename) as handle:
+            return list(self.iterators[fmt](handle, compact=True))
+
+    def test_parse(self):
+        """Check compact qualities match the lists of integers."""
+        for filename, fmt, key, typecode in self.files:
+            records = list(SeqIO.parse(filename, fmt))
+            compact = self.compact_records(filename, fmt)
+            self.assertEqual(len(records), len(compact))
+            for old, new in zip(records, compact):
+                self.assertEqual(old.id, new.id)
+                self.assertEqual(str(old.seq), str(new.seq))
+                qualities = new.letter_annotations[key]
+                self.assertIsInstance(qualities, array)
+                self.assertEqual(qualities.typecode, typecode)
+                self.assertEqual(qualities.tolist(),
+                                 old.letter_annotations[key])
+
+    def test_write(self):
+        """Check compact qualities are written out as before."""
+        for filename, fmt, key, typecode in self.files:
+            records = list(SeqIO.parse(filename, fmt))
+            compact = self.compact_records(filename, fmt)
+            for old, new in zip(records, compact):
+                with warnings.catch_warnings():
+                    # High scores are truncated in some formats
+                    warnings.simplefilter("ignore", BiopythonWarning)
+                    for out_fmt in self.formats:
+                        self.assertEqual(old.format(out_fmt),
+                                         new.format(out_fmt))
+                        self.assertEqual(old[5:].format(out_fmt),
+                                         new[5:].format(out_fmt))
+                    if numpy is None:
+                        continue
+                    qualities = new.letter_annotations[key]
+                    new.letter_annotations[key] = numpy.frombuffer(
+                        qualities, "u1" if typecode == "B" else "i1")
+                    for out_fmt in self.formats:
+                        self.assertEqual(old.format(out_fmt),
+                                         new.format(out_fmt))
+
+    def test_errors(self):
+        """Check invalid quality strings are rejected."""
+        for fmt, quality in [("fastq", " "), ("fastq", "\x7f"),
+                             ("fastq-solexa", ":"), ("fastq-illumina", "?")]:
+            handle = StringIO("@read\nA\n+\n%s\n" % quality)
+            self.assertRaises(ValueError, list,
+                              self.iterators[fmt](handle, compact=True))
+
+
 class TestSFF(unittest.TestCase):
     """Test SFF specific details."""
 
@@ -0,0 +1,99 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqIO.TwoBitIO module."""
+
+import random
+import unittest
+
+from io import BytesIO
+
+from Bio import SeqIO
+from Bio.Alphabet import generic_dna, generic_protein
+from Bio.Seq import PackedSeq, Seq
+
+
+class TestTwoBitReader(unittest.TestCase):
+
+    def setUp(self):
+        self.expected = list(SeqIO.parse("TwoBit/sequence.fa", "fasta"))
+
+    def check_records(self, records):
+        self.assertEqual([r.id for r in records],
+                         [r.id for r in self.expected])
+        for record, expected in zip(records, self.expected):
+            self.assertIsInstance(record.seq, PackedSeq)
+            self.assertEqual(record.seq.alphabet, generic_dna)
+            self.assertEqual(len(record), len(expected))
+            self.assertEqual(str(record.seq), str(expected.seq))
+
+    def test_littleendian(self):
+        records = list(SeqIO.parse("TwoBit/sequence.littleendian.2bit",
+                                   "twobit"))
+        self.check_records(records)
+
+    def test_bigendian(self):
+        with open("TwoBit/sequence.bigendian.2bit", "rb") as handle:
+            records = list(SeqIO.parse(handle, "twobit"))
+        # The file is memory mapped, so closing it does not matter
+        self.check_records(records)
+
+    def test_bytesio(self):
+        with open("TwoBit/sequence.littleendian.2bit", "rb") as handle:
+            data = handle.read()
+        records = list(SeqIO.parse(BytesIO(data), "twobit"))
+        self.check_records(records)
+
+    def test_regions(self):
+        random.seed(0)
+        records = SeqIO.parse("TwoBit/sequence.bigendian.2bit", "twobit")
+        for record, expected in zip(records, self.expected):
+            text = str(expected.seq)
+            for i in range(50):
+                start = random.randint(-10, len(text))
+                end = random.randint(start, len(text) + 10)
+                region = record.seq[start:end]
+                self.assertEqual(str(region), text[start:end])
+                self.assertEqual(str(region.reverse_complement()),
+                                 str(Seq(text[start:end],
+                                         generic_dna).reverse_complement()))
+                self.assertEqual(region.count("N"), text[start:end].count("N"))
+            self.assertEqual(record.seq.find("NNNNN"), text.find("NNNNN"))
+            self.assertEqual(record.seq.rfind("ga"), text.rfind("ga"))
+            self.assertEqual(record.seq[-1], text[-1])
+
+    def test_index(self):
+        index = SeqIO.index("TwoBit/sequence.littleendian.2bit", "twobit")
+        self.assertEqual(len(index), 3)
+        for expected in self.expected:
+            record = index[expected.id]
+            self.assertEqual(str(record.seq[5:75]), str(expected.seq)[5:75])
+        copied = Seq(str(record.seq))
+        index.close()
+        # The memory mapping is closed with the index
+        self.assertRaises(ValueError, str, record.seq)
+        self.assertEqual(str(copied), str(expected.seq))
+
+    def test_alphabet(self):
+        records = SeqIO.parse("TwoBit/sequence.littleendian.2bit", "twobit",
+                              generic_protein)
+        self.assertRaises(ValueError, next, records)
+
+    def test_bad_files(self):
+        with open("TwoBit/sequence.littleendian.2bit", "rb") as handle:
+            data = handle.read()
+        records = SeqIO.parse(BytesIO(b"NOT2" + data[4:]), "twobit")
+        self.assertRaises(ValueError, next, records)
+        records = SeqIO.parse(BytesIO(data[:-10]), "twobit")
+        self.assertEqual(next(records).id, "seq11111")
+        self.assertEqual(next(records).id, "seq222")
+        self.assertRaises(ValueError, next, records)
+        records = SeqIO.parse(BytesIO(b""), "twobit")
+        self.assertRaises(ValueError, next, records)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
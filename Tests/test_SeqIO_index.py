@@ -12,6 +12,14 @@ except ImportError:
     # where we don't expect this to be installed.
     sqlite3 = None
 
+try:
+    import numpy
+except ImportError:
+    # The memory mapped index requires NumPy
+    numpy = None
+
+import copy
+import pickle
 import sys
 import os
 import unittest
@@ -30,9 +38,11 @@ except NameError:
     # Python 2 does not have this,
     FileNotFoundError = IOError
 
+from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio import SeqIO
 from Bio.SeqIO._index import _FormatToRandomAccess
+from Bio.SeqIO._index import _FormatToLazyRandomAccess
 from Bio.Alphabet import generic_protein, generic_nucleotide, generic_dna
 
 from seq_tests_common import compare_record
@@ -495,6 +505,58 @@ class IndexDictTests(unittest.TestCase):
         self.assertRaises(NotImplementedError, rec_dict.copy)
         self.assertRaises(NotImplementedError, rec_dict.fromkeys, [])
 
+    def mmap_check(self, filename, format, alphabet, comp):
+        """Check memory mapped indexing gives the same records and raw data."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', BiopythonParserWarning)
+            rec_dict = SeqIO.index(filename, format, alphabet)
+            mmap_dict = SeqIO.index(filename, format, alphabet, mmap=True)
+        keys = list(rec_dict)
+        self.assertEqual(keys, list(mmap_dict))
+        self.check_dict_methods(mmap_dict, keys, keys)
+        with open(filename, "rb") as handle:
+            raw_file = handle.read()
+        for key in keys:
+            compare_record(rec_dict[key], mmap_dict[key])
+            try:
+                raw = rec_dict.get_raw(key)
+            except NotImplementedError:
+                continue
+            view = mmap_dict.get_raw(key)
+            self.assertEqual(raw, bytes(view))
+            self.assertIn(bytes(view), raw_file)
+            if sys.version_info[0] >= 3:
+                self.assertTrue(isinstance(view, memoryview))
+                view.release()
+        rec_dict.close()
+        mmap_dict.close()
+
+    def lazy_check(self, filename, format, alphabet, comp):
+        """Check lazy loading gives the same records and sequence slices."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', BiopythonParserWarning)
+            rec_dict = SeqIO.index(filename, format, alphabet)
+            lazy_dict = SeqIO.index(filename, format, alphabet, lazy=True)
+            self.assertEqual(list(rec_dict), list(lazy_dict))
+            for key in rec_dict:
+                old = rec_dict[key]
+                new = lazy_dict[key]
+                length = len(old.seq)
+                self.assertEqual(length, len(new.seq))
+                for start in range(-5, length + 5, 1 + length // 20):
+                    for end in (start + 1, start + 70, start + 200, None):
+                        self.assertEqual(str(old.seq[start:end]),
+                                         str(new.seq[start:end]))
+                    self.assertEqual(str(old.seq[start::-7]),
+                                     str(new.seq[start::-7]))
+                    if -length <= start < length:
+                        self.assertEqual(old.seq[start], new.seq[start])
+                self.assertEqual(repr(old.seq),
+                                 repr(new.seq).replace("LazySeq", "Seq", 1))
+                compare_record(old, new)
+        rec_dict.close()
+        lazy_dict.close()
+
     def get_raw_check(self, filename, format, alphabet, comp):
         # Also checking the key_function here
         if comp:
@@ -610,6 +672,93 @@ class IndexDictTests(unittest.TestCase):
         handle.close()
 
 
+class LazySeqTests(unittest.TestCase):
+    """Tests for lazy loading of the sequences in SeqIO.index."""
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".fasta")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_region_only(self):
+        """Check slicing reads only the lines needed."""
+        with open(self.filename, "w") as handle:
+            handle.write(">big\n" + "ACGTACGTAC\n" * 100 + "GG\n>small\nTT\n")
+        records = SeqIO.index(self.filename, "fasta", lazy=True)
+        seq = records["big"].seq
+        self.assertEqual(1002, len(seq))
+        self.assertEqual("ACGTACGTACACG", str(seq[10:23]))
+        self.assertEqual("ACGG", str(seq[-4:]))
+        self.assertEqual("ACGG", str(seq[20:][-4:]))
+        self.assertTrue(seq._loaded is None)
+        self.assertEqual("CCGT", str(seq.reverse_complement()[:4]))
+        self.assertEqual("TT", str(records["small"].seq))
+        records.close()
+
+    def test_layout_indexed(self):
+        """Check fetching a record does not read through its sequence."""
+        with open(self.filename, "w") as handle:
+            handle.write(">big\n" + "ACGTACGTAC\n" * 100 + "GG\n>small\nTT\n")
+        records = SeqIO.index(self.filename, "fasta", lazy=True)
+
+        def scan_sequence(seq_offset):
+            raise AssertionError("Sequence layout should be known already")
+
+        records._proxy._scan_sequence = scan_sequence
+        self.assertEqual("ACGTACGTACACG", str(records["big"].seq[10:23]))
+        self.assertEqual("TT", str(records["small"].seq))
+        records.close()
+
+    def test_operators(self):
+        """Check adding, multiplying and copying a LazySeq gives a Seq."""
+        with open(self.filename, "w") as handle:
+            handle.write(">big\n" + "ACGTACGTAC\n" * 100 + "GG\n")
+        records = SeqIO.index(self.filename, "fasta", lazy=True)
+        seq = records["big"].seq
+        data = str(seq)
+        for new, expected in [(seq + "ACGT", data + "ACGT"),
+                              ("AC" + seq, "AC" + data),
+                              (seq + Seq("TT"), data + "TT"),
+                              (Seq("TT") + seq, "TT" + data),
+                              (seq * 2, data * 2),
+                              (2 * seq, data * 2),
+                              (seq[10:20] + seq[30:40],
+                               data[10:20] + data[30:40]),
+                              (seq[:5] + seq[-5:], data[:5] + data[-5:]),
+                              (copy.deepcopy(seq), data),
+                              (pickle.loads(pickle.dumps(seq)), data)]:
+            self.assertEqual("Seq", new.__class__.__name__)
+            self.assertEqual(expected, str(new))
+        seq = records["big"].seq
+        seq *= 3
+        self.assertEqual("Seq", seq.__class__.__name__)
+        self.assertEqual(data * 3, str(seq))
+        record = copy.deepcopy(records["big"])
+        records.close()
+        # The copy does not need the file
+        self.assertEqual(data, str(record.seq))
+
+    def test_irregular(self):
+        """Check sequences with irregular line lengths are loaded as normal."""
+        with open(self.filename, "w") as handle:
+            handle.write(">alpha\nACGT\nAC\nACGT\n>beta\nAC\nACGT\n"
+                         ">gamma\n>delta\nACGT\n\n\nAC\n")
+        records = SeqIO.index(self.filename, "fasta", lazy=True)
+        for record in SeqIO.parse(self.filename, "fasta"):
+            new = records[record.id]
+            self.assertEqual(str(record.seq), str(new.seq))
+            self.assertEqual("Seq", new.seq.__class__.__name__)
+        records.close()
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, SeqIO.index,
+                          "Quality/example.fastq", "fastq", lazy=True)
+        self.assertRaises(ValueError, SeqIO.index,
+                          "GenBank/NC_000932.gb.bgz", "gb", lazy=True)
+
+
 class IndexOrderingSingleFile(unittest.TestCase):
     f = "GenBank/NC_000932.faa"
     ids = [r.id for r in SeqIO.parse(f, "fasta")]
@@ -642,6 +791,98 @@ if sqlite3:
             d = SeqIO.index_db(":memory:", files, "fasta")
             self.assertEqual(ids, list(d))
 
+    class IndexDbBuildTests(unittest.TestCase):
+        """Check building index_db in parallel and adding files."""
+
+        files = ["GenBank/NC_000932.faa", "GenBank/NC_005816.faa",
+                 "Fasta/f002", "Fasta/fa01"]
+
+        def setUp(self):
+            fd, self.index_file = tempfile.mkstemp(suffix=".idx")
+            os.close(fd)
+            os.remove(self.index_file)
+            self.ids = []
+            for f in self.files:
+                self.ids.extend(r.id for r in SeqIO.parse(f, "fasta"))
+
+        def tearDown(self):
+            if os.path.isfile(self.index_file):
+                os.remove(self.index_file)
+
+        def test_parallel(self):
+            """Check index_db with worker processes matches the serial build."""
+            d = SeqIO.index_db(self.index_file, self.files, "fasta",
+                               processes=2)
+            self.assertEqual(self.ids, list(d))
+            self.assertEqual(len(self.ids), len(d))
+            for f in self.files:
+                for record in SeqIO.parse(f, "fasta"):
+                    self.assertEqual(str(record.seq), str(d[record.id].seq))
+            d.close()
+            d._con.close()  # hack for PyPy
+            d = SeqIO.index_db(self.index_file, self.files)
+            self.assertEqual(self.ids, list(d))
+            d.close()
+            d._con.close()  # hack for PyPy
+
+        def test_add_files(self):
+            """Check files can be added to an existing index."""
+            d = SeqIO.index_db(self.index_file, self.files[:1], "fasta")
+            d.add_files(self.files[1])
+            d.close()
+            d._con.close()  # hack for PyPy
+            d = SeqIO.index_db(self.index_file, self.files[:2], processes=2)
+            d.add_files(self.files[2:])
+            self.assertEqual(self.ids, list(d))
+            self.assertEqual(len(self.ids), len(d))
+            self.assertEqual(str(next(SeqIO.parse("Fasta/fa01", "fasta")).seq),
+                             str(d["AK1H_ECOLI/1-378"].seq))
+            d.close()
+            d._con.close()  # hack for PyPy
+            d = SeqIO.index_db(self.index_file, self.files)
+            self.assertEqual(self.ids, list(d))
+            d.close()
+            d._con.close()  # hack for PyPy
+
+        def test_open_handles(self):
+            """Check the handles of every file scanned are kept for use."""
+            d = SeqIO.index_db(self.index_file, self.files[:2], "fasta")
+            self.assertEqual([0, 1], sorted(d._proxies))
+            d.add_files(self.files[2:])
+            self.assertEqual([0, 1, 2, 3], sorted(d._proxies))
+            proxies = list(d._proxies.values())
+            d.close()
+            for proxy in proxies:
+                self.assertTrue(proxy._handle.closed)
+            d._con.close()  # hack for PyPy
+
+        def test_add_duplicates(self):
+            """Check adding a file with existing keys leaves the index alone."""
+            d = SeqIO.index_db(self.index_file, self.files[:2], "fasta")
+            self.assertRaises(ValueError, d.add_files,
+                              ["Fasta/f002", "GenBank/NC_005816.faa"])
+            self.assertEqual(self.ids[:95], list(d))
+            self.assertEqual(95, len(d))
+            d.close()
+            d._con.close()  # hack for PyPy
+            d = SeqIO.index_db(self.index_file, self.files[:2], "fasta")
+            self.assertEqual(95, len(d))
+            d.close()
+            d._con.close()  # hack for PyPy
+
+        def test_add_after_duplicates(self):
+            """Check files can be added after adding duplicates failed."""
+            d = SeqIO.index_db(self.index_file, self.files[:2], "fasta")
+            self.assertRaises(ValueError, d.add_files,
+                              ["Fasta/f002", "GenBank/NC_005816.faa"])
+            self.assertEqual([0, 1], sorted(d._proxies))
+            d.add_files(["Fasta/fa01"])
+            self.assertEqual(self.ids[:95] + self.ids[-2:], list(d))
+            self.assertEqual(str(next(SeqIO.parse("Fasta/fa01", "fasta")).seq),
+                             str(d["AK1H_ECOLI/1-378"].seq))
+            d.close()
+            d._con.close()  # hack for PyPy
+
 
 tests = [
     ("Ace/contig1.ace", "ace", generic_dna),
@@ -737,6 +978,26 @@ for filename1, format, alphabet in tests:
                 funct(filename2, format, alphabet, comp))
         del funct
 
+        if numpy is not None and not comp:
+            def funct(fn, fmt, alpha, c):
+                f = lambda x: x.mmap_check(fn, fmt, alpha, c)
+                f.__doc__ = "Index %s file %s memory mapped" % (fmt, fn)
+                return f
+            setattr(IndexDictTests, "test_%s_%s_mmap"
+                    % (format, filename2.replace("/", "_").replace(".", "_")),
+                    funct(filename2, format, alphabet, comp))
+            del funct
+
+        if format in _FormatToLazyRandomAccess and not comp:
+            def funct(fn, fmt, alpha, c):
+                f = lambda x: x.lazy_check(fn, fmt, alpha, c)
+                f.__doc__ = "Index %s file %s with lazy loading" % (fmt, fn)
+                return f
+            setattr(IndexDictTests, "test_%s_%s_lazy"
+                    % (format, filename2.replace("/", "_").replace(".", "_")),
+                    funct(filename2, format, alphabet, comp))
+            del funct
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -0,0 +1,86 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for Bio.SeqIO.parse_parallel and the file splitting code."""
+
+import unittest
+
+from Bio import SeqIO
+from Bio.SeqIO._parallel import _chunk_offsets
+
+
+def get_length(record):
+    """Top level map function (so it can be pickled)."""
+    return record.id, len(record)
+
+
+class TestParseParallel(unittest.TestCase):
+
+    files = [("Fasta/f002", "fasta"),
+             ("Fasta/fa01", "fasta"),
+             ("Quality/example.fastq", "fastq"),
+             ("Quality/tricky.fastq", "fastq"),
+             ("Quality/solexa_faked.fastq", "fastq-solexa"),
+             ("Quality/example.qual", "qual"),
+             ("GenBank/cor6_6.gb", "genbank"),
+             ("EMBL/epo_prt_selection.embl", "embl"),
+             ("SwissProt/multi_ex.txt", "swiss"),
+             ]
+
+    def check(self, filename, fmt, **kwargs):
+        expected = [(r.id, r.description, str(r.seq), r.letter_annotations)
+                    for r in SeqIO.parse(filename, fmt)]
+        records = [(r.id, r.description, str(r.seq), r.letter_annotations)
+                   for r in SeqIO.parse_parallel(filename, fmt, **kwargs)]
+        if kwargs.get("ordered", True):
+            self.assertEqual(expected, records)
+        else:
+            self.assertEqual(sorted(expected), sorted(records))
+
+    def test_chunk_sizes(self):
+        for filename, fmt in self.files:
+            for chunk_size in (1, 100, 1000, 2 ** 24):
+                self.check(filename, fmt, processes=2, chunk_size=chunk_size)
+
+    def test_unordered(self):
+        for filename, fmt in self.files:
+            self.check(filename, fmt, processes=3, chunk_size=200,
+                       ordered=False)
+
+    def test_map_function(self):
+        filename = "GenBank/cor6_6.gb"
+        expected = [get_length(r) for r in SeqIO.parse(filename, "gb")]
+        results = list(SeqIO.parse_parallel(filename, "gb", processes=2,
+                                            map_function=get_length,
+                                            chunk_size=500))
+        self.assertEqual(expected, results)
+
+    def test_chunks(self):
+        with open("Quality/example.fastq", "rb") as handle:
+            data = handle.read()
+        chunks = _chunk_offsets("Quality/example.fastq", "fastq", 1)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[-1][1], len(data))
+        for start, end in chunks:
+            self.assertEqual(data[start:start + 1], b"@")
+        for (s1, e1), (s2, e2) in zip(chunks, chunks[1:]):
+            self.assertEqual(e1, s2)
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, SeqIO.parse_parallel,
+                          "Clustalw/opuntia.aln", "clustal")
+        self.assertRaises(ValueError, SeqIO.parse_parallel,
+                          "Fasta/f002", "FASTA")
+        self.assertRaises(ValueError, SeqIO.parse_parallel,
+                          "Fasta/f002", "fasta", chunk_size=0)
+        with open("Fasta/f002") as handle:
+            self.assertRaises(TypeError, SeqIO.parse_parallel,
+                              handle, "fasta")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -8,7 +8,15 @@
 Initially this takes matched tests of GenBank and FASTA files from the NCBI
 and confirms they are consistent using our different parsers.
 """
+import random
 import unittest
+import warnings
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from Bio import SeqIO
 from Bio.Alphabet import generic_dna, generic_protein
@@ -471,6 +479,169 @@ class TestTranslation(unittest.TestCase):
         self.assertEqual(t.letter_annotations, {"aa": ["Met", "Val"]})
 
 
+class TestArrayLetterAnnotations(unittest.TestCase):
+    """Per-letter-annotations held in arrays rather than lists."""
+
+    def setUp(self):
+        self.record = SeqRecord(Seq("ACGTACGTAC", generic_dna), id="Test")
+        self.qualities = [40, 30, 20, 10, 0, 5, 15, 25, 35, 45]
+
+    def check(self, record, qualities):
+        self.assertEqual(list(record[2:7].letter_annotations["q"]),
+                         qualities[2:7])
+        self.assertEqual(list(record[::-2].letter_annotations["q"]),
+                         qualities[::-2])
+        self.assertEqual(
+            list(record.reverse_complement(letter_annotations=True)
+                 .letter_annotations["q"]), qualities[::-1])
+        self.assertEqual(list((record[5:] + record[:5])
+                              .letter_annotations["q"]),
+                         qualities[5:] + qualities[:5])
+
+    def test_array(self):
+        """Check array.array annotations are kept as arrays."""
+        self.record.letter_annotations["q"] = array("B", self.qualities)
+        self.check(self.record, self.qualities)
+        for other in (self.record[3:], self.record[:4] + self.record[4:]):
+            self.assertIsInstance(other.letter_annotations["q"], array)
+            self.assertEqual(other.letter_annotations["q"].typecode, "B")
+        # Adding a record with a list of the annotation
+        other = SeqRecord(Seq("GG", generic_dna), letter_annotations={
+            "q": [1, 2]})
+        for answer in (self.record + other, other + self.record):
+            self.assertIsInstance(answer.letter_annotations["q"], array)
+        self.assertEqual(list((self.record + other).letter_annotations["q"]),
+                         self.qualities + [1, 2])
+        self.assertEqual(list((other + self.record).letter_annotations["q"]),
+                         [1, 2] + self.qualities)
+
+    def test_numpy(self):
+        """Check NumPy annotations are sliced as views and concatenated."""
+        if numpy is None:
+            return
+        qualities = numpy.array(self.qualities, numpy.uint8)
+        self.record.letter_annotations["q"] = qualities
+        self.check(self.record, self.qualities)
+        sub_record = self.record[2:8]
+        self.assertIs(sub_record.letter_annotations["q"].base, qualities)
+        added = self.record + self.record
+        self.assertIsInstance(added.letter_annotations["q"], numpy.ndarray)
+        self.assertEqual(added.letter_annotations["q"].tolist(),
+                         self.qualities * 2)
+
+
+class TestFeatureIndex(unittest.TestCase):
+    """Check the feature queries against looking at every feature."""
+
+    def setUp(self):
+        random.seed(0)
+        self.record = SeqRecord(Seq("ACGT" * 250), id="TestID")
+        for i in range(300):
+            start = random.randint(0, 1000)
+            end = min(1000, start + random.choice([0, 1, 5, 50, 300]))
+            self.record.features.append(
+                SeqFeature(FeatureLocation(start, end), type="misc_feature"))
+
+    def check(self, record):
+        for trial in range(100):
+            start = random.randint(-10, 1010)
+            end = start + random.choice([0, 1, 10, 100])
+            self.assertEqual(
+                record.overlapping_features(start, end),
+                [f for f in record.features
+                 if f.location.start < end and start < f.location.end])
+            self.assertEqual(
+                record.contained_features(start, end),
+                [f for f in record.features
+                 if start <= f.location.start and f.location.end <= end])
+            distances = [max(0, start - f.location.end, f.location.start - end)
+                         for f in record.features]
+            self.assertEqual(
+                record.nearest_features(start, end),
+                [f for f, d in zip(record.features, distances)
+                 if d == min(distances)])
+
+    def test_queries(self):
+        self.check(self.record)
+
+    def test_nested(self):
+        record = SeqRecord(Seq("ACGT" * 25), id="TestID")
+        for start, end in [(10, 90), (20, 30), (20, 30), (25, 28), (40, 80),
+                           (50, 50), (60, 95), (0, 100)]:
+            record.features.append(SeqFeature(FeatureLocation(start, end)))
+        self.check(record)
+        self.assertEqual(len(record.overlapping_features(26, 27)), 5)
+        self.assertEqual(len(record.overlapping_features(50, 51)), 3)
+        self.assertEqual(len(record.contained_features(50, 50)), 1)
+        self.assertEqual(record.nearest_features(50), [record.features[0]] +
+                         record.features[4:6] + [record.features[7]])
+        self.assertEqual(record.nearest_features(97, 98), [record.features[7]])
+        del record.features[7]
+        self.assertEqual(record.nearest_features(97, 98), [record.features[6]])
+
+    def test_changes(self):
+        record = self.record
+        self.check(record)
+        # Appended features are added to the index
+        for i in range(100):
+            record.features.append(
+                SeqFeature(FeatureLocation(i * 10, i * 10 + 3)))
+            self.assertEqual(record.overlapping_features(i * 10, i * 10 + 1)[-1],
+                             record.features[-1])
+        self.check(record)
+        # Any other change to the list should rebuild the index
+        del record.features[::2]
+        self.check(record)
+        record.features.reverse()
+        self.check(record)
+        record.features[-1] = SeqFeature(FeatureLocation(0, 1000))
+        self.check(record)
+        record.features.pop()
+        record.features.append(SeqFeature(FeatureLocation(500, 501)))
+        self.check(record)
+        # Other changes in place need the list to be set again
+        record.features.sort(key=lambda f: f.location.end)
+        record.features = list(record.features)
+        self.check(record)
+        record.features = record.features[:50]
+        self.check(record)
+        record.features = []
+        self.assertEqual(record.overlapping_features(0, 1000), [])
+        self.assertEqual(record.nearest_features(500), [])
+
+    def test_slicing(self):
+        record = self.record
+        record.features.append(SeqFeature(FeatureLocation(10, 20), ref="X"))
+        record.features.append(SeqFeature(None))
+        for start, end in [(0, 1000), (100, 200), (550, 551), (10, 10)]:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                sub = record[start:end]
+                self.assertEqual(len(w), 1)
+            expected = [f for f in record.features[:-2]
+                        if start <= f.location.start and f.location.end <= end]
+            self.assertEqual([(f.location.start, f.location.end)
+                              for f in sub.features],
+                             [(f.location.start - start, f.location.end - start)
+                              for f in expected])
+
+    def test_slicing_after_changes(self):
+        record = SeqRecord(Seq("ACGT" * 25), id="TestID")
+        for start in range(0, 50, 10):
+            record.features.append(
+                SeqFeature(FeatureLocation(start, start + 5), id=str(start)))
+        # Build the feature index
+        self.assertEqual(len(record[0:50].features), 5)
+        # Slicing should notice changes to a feature location in place
+        record.features[2].location = FeatureLocation(80, 90)
+        self.assertEqual([f.id for f in record[75:95].features], ["20"])
+        # and features replaced in the middle of the list
+        record.features[3] = SeqFeature(FeatureLocation(60, 65), id="60")
+        self.assertEqual([f.id for f in record[55:70].features], ["60"])
+        self.assertEqual([f.id for f in record[0:50].features],
+                         ["0", "10", "40"])
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -0,0 +1,105 @@
+# Copyright 2019 by Biopython contributors.  All rights reserved.
+#
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqUtils.WindowStats module."""
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.WindowStats.")
+
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils import GC, GC_skew
+from Bio.SeqUtils.lcc import lcc_simp
+from Bio.SeqUtils import WindowStats
+from Bio.SeqUtils.WindowStats import (at_skew, gc_content, gc_skew,
+                                      genome_tracks, lcc, window_counts,
+                                      window_positions)
+
+
+class TestWindowStats(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.sequence = "".join(random.choice("ACGTACGTacgtNS")
+                                for i in range(1003))
+
+    def windows(self, window, step):
+        sequence = self.sequence
+        return [sequence[i:i + window] for i in range(0, len(sequence), step)]
+
+    def test_positions(self):
+        starts, ends = window_positions(10, 4)
+        self.assertEqual(starts.tolist(), [0, 4, 8])
+        self.assertEqual(ends.tolist(), [4, 8, 10])
+        starts, ends = window_positions(10, 4, 3)
+        self.assertEqual(starts.tolist(), [0, 3, 6, 9])
+        self.assertEqual(ends.tolist(), [4, 7, 10, 10])
+        starts, ends = window_positions(0, 4)
+        self.assertEqual(starts.tolist(), [])
+        self.assertRaises(ValueError, window_positions, 10, 0)
+        self.assertRaises(ValueError, window_positions, 10, 5, 0)
+
+    def test_counts(self):
+        for window, step in [(1, 1), (10, None), (100, 7), (50, 200),
+                             (2000, 1)]:
+            windows = self.windows(window, step or window)
+            counts = window_counts(self.sequence, ["A", "gc", "N"],
+                                   window, step)
+            expected = [[w.upper().count("A"),
+                         w.upper().count("G") + w.upper().count("C"),
+                         w.count("N")] for w in windows]
+            self.assertEqual(counts.tolist(), expected)
+
+    def test_chunks(self):
+        expected = window_counts(self.sequence, "ACGT", 30, 11)
+        chunk_size = WindowStats._CHUNK_SIZE
+        WindowStats._CHUNK_SIZE = 50
+        try:
+            for sequence in (self.sequence, Seq(self.sequence),
+                             SeqRecord(Seq(self.sequence))):
+                counts = window_counts(sequence, "ACGT", 30, 11)
+                self.assertEqual(counts.tolist(), expected.tolist())
+        finally:
+            WindowStats._CHUNK_SIZE = chunk_size
+
+    def test_statistics(self):
+        windows = self.windows(100, 100)
+        self.assertEqual(gc_skew(self.sequence, 100).tolist(),
+                         GC_skew(self.sequence.upper(), 100))
+        for value, w in zip(gc_content(self.sequence, 100), windows):
+            self.assertAlmostEqual(value, GC(w))
+        for value, w in zip(lcc(self.sequence, 100), windows):
+            w = w.upper()
+            self.assertAlmostEqual(value, lcc_simp(w))
+        for value, w in zip(at_skew(self.sequence, 100), windows):
+            a = w.upper().count("A")
+            t = w.upper().count("T")
+            self.assertAlmostEqual(value, float(a - t) / (a + t))
+        self.assertEqual(at_skew("GGCC", 2).tolist(), [0.0, 0.0])
+        self.assertEqual(lcc("NNNN", 2).tolist(), [0.0, 0.0])
+
+    def test_tracks(self):
+        records = list(SeqIO.parse("TwoBit/sequence.fa", "fasta"))
+        tracks = genome_tracks(SeqIO.parse("TwoBit/sequence.bigendian.2bit",
+                                           "twobit"), gc_skew, 50, 25)
+        for record, (name, starts, ends, values) in zip(records, tracks):
+            self.assertEqual(name, record.id)
+            self.assertEqual(starts.tolist(), list(range(0, len(record), 25)))
+            self.assertEqual(values.tolist(),
+                             gc_skew(str(record.seq), 50, 25).tolist())
+            self.assertIsInstance(values, numpy.ndarray)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -440,6 +440,172 @@ class BgzfTests(unittest.TestCase):
         self.assertEqual(data[-5:], b'\x01\x02\x03\x04\n')
         h.close()
 
+    def check_threaded(self, filename):
+        """Check threaded read ahead gives the same data and offsets."""
+        for mode in ["r", "rb"]:
+            h1 = bgzf.BgzfReader(filename, mode)
+            h2 = bgzf.BgzfReader(filename, mode, max_cache=8,
+                                 threads=2, read_ahead=3)
+            offsets = []
+            while True:
+                offset = h1.tell()
+                self.assertEqual(offset, h2.tell())
+                line = h1.readline()
+                self.assertEqual(line, h2.readline())
+                offsets.append(offset)
+                if not line:
+                    break
+            shuffle(offsets)
+            for offset in offsets[:100]:
+                h1.seek(offset)
+                h2.seek(offset)
+                self.assertEqual(h1.read(70000), h2.read(70000))
+                self.assertEqual(h1.tell(), h2.tell())
+            h1.close()
+            h2.close()
+
+    def test_threaded_bam_ex1(self):
+        self.check_threaded("SamBam/ex1.bam")
+
+    def test_threaded_example_cor6(self):
+        self.check_threaded("GenBank/cor6_6.gb.bgz")
+
+    def test_threaded_many_blocks(self):
+        with bgzf.open(self.temp_file, "wb") as h:
+            for i in range(500):
+                h.write(_as_bytes("Line %i\n" % i))
+                h.flush()
+        self.check_threaded(self.temp_file)
+
+    def test_threaded_bad_args(self):
+        self.assertRaises(ValueError, bgzf.BgzfReader, "SamBam/ex1.bam",
+                          threads=-1)
+        self.assertRaises(ValueError, bgzf.BgzfReader, "SamBam/ex1.bam",
+                          threads=2, read_ahead=20, max_cache=10)
+
+    def test_threaded_write(self):
+        """Check threaded compression gives identical output and offsets"""
+        with open("Quality/example.fastq", "rb") as h:
+            chunk = h.read()
+        chunks = [chunk[:i] for i in (0, 1, 17, len(chunk))] * 300
+        chunks.append(b"X" * 200000)
+        serial_file = self.temp_file + ".serial"
+        try:
+            offsets = {}
+            for filename, threads in [(serial_file, 0), (self.temp_file, 3)]:
+                offsets[threads] = []
+                with bgzf.BgzfWriter(filename, "wb", threads=threads) as h:
+                    for i, data in enumerate(chunks):
+                        h.write(data)
+                        if i % 50 == 0:
+                            offsets[threads].append(h.tell())
+                        if i % 70 == 0:
+                            h.flush()
+            self.assertEqual(offsets[0], offsets[3])
+            with open(serial_file, "rb") as h:
+                expected = h.read()
+            with open(self.temp_file, "rb") as h:
+                self.assertEqual(expected, h.read())
+        finally:
+            if os.path.isfile(serial_file):
+                os.remove(serial_file)
+
+    def test_threaded_seqio_write(self):
+        """Check SeqIO.write into a threaded BGZF writer"""
+        from Bio import SeqIO
+        records = list(SeqIO.parse("GenBank/cor6_6.gb", "gb")) * 50
+        with bgzf.open(self.temp_file, "w", threads=2) as h:
+            SeqIO.write(records, h, "fasta")
+        with bgzf.open(self.temp_file, "r", threads=2) as h:
+            new = list(SeqIO.parse(h, "fasta"))
+        self.assertEqual([str(r.seq) for r in records],
+                         [str(r.seq) for r in new])
+
+    def test_lru_cache(self):
+        h = open("SamBam/ex1.bam", "rb")
+        blocks = list(bgzf.BgzfBlocks(h))
+        h.close()
+        h = bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache=3)
+        for start in [0, blocks[1][0], blocks[2][0], 0, blocks[3][0]]:
+            h.seek(bgzf.make_virtual_offset(start, 0))
+        # Block zero was used recently, so should still be cached
+        self.assertEqual(list(h._buffers),
+                         [blocks[2][0], 0, blocks[3][0]])
+        h.close()
+
+    def test_gzi_write(self):
+        """Check the .gzi index recorded when writing matches the blocks"""
+        gzi_file = self.temp_file + ".gzi"
+        try:
+            with open("Quality/example.fastq", "rb") as h:
+                chunk = h.read()
+            for threads in (0, 2):
+                with bgzf.BgzfWriter(self.temp_file, "wb", threads=threads,
+                                     gzi=gzi_file) as h:
+                    for i in range(1000):
+                        h.write(chunk[:i % 400])
+                        if i % 300 == 0:
+                            h.flush()
+                index = bgzf.read_gzi(gzi_file)
+                self.assertEqual(index,
+                                 bgzf.make_gzi(self.temp_file, False))
+                with open(self.temp_file, "rb") as h:
+                    blocks = [(raw_start + raw_len, data_start + data_len)
+                              for (raw_start, raw_len, data_start, data_len)
+                              in bgzf.BgzfBlocks(h) if data_len]
+                self.assertEqual(index, [(0, 0)] + blocks)
+        finally:
+            if os.path.isfile(gzi_file):
+                os.remove(gzi_file)
+
+    def test_gzi_format(self):
+        """Check the .gzi file layout, little endian unsigned 64 bit integers"""
+        index = [(0, 0), (15073, 65536), (2 ** 40, 2 ** 50)]
+        bgzf.write_gzi(self.temp_file, index)
+        with open(self.temp_file, "rb") as h:
+            data = h.read()
+        self.assertEqual(data,
+                         b"\x02\x00\x00\x00\x00\x00\x00\x00"
+                         b"\xe1\x3a\x00\x00\x00\x00\x00\x00"
+                         b"\x00\x00\x01\x00\x00\x00\x00\x00"
+                         b"\x00\x00\x00\x00\x00\x01\x00\x00"
+                         b"\x00\x00\x00\x00\x00\x00\x04\x00")
+        self.assertEqual(bgzf.read_gzi(self.temp_file), index)
+        with open(self.temp_file, "wb") as h:
+            h.write(data[:-1])
+        self.assertRaises(ValueError, bgzf.read_gzi, self.temp_file)
+
+    def check_seek_uncompressed(self, filename, gzi=None):
+        """Check seek_uncompressed against the gzip decompressed data."""
+        with gzip.open(filename, "rb") as h:
+            expected = h.read()
+        offsets = list(range(0, len(expected) + 1, 997))
+        offsets.extend([65535, 65536, 65537, len(expected)])
+        shuffle(offsets)
+        h = bgzf.BgzfReader(filename, "rb", gzi=gzi)
+        for offset in offsets:
+            virtual_offset = h.seek_uncompressed(offset)
+            self.assertEqual(virtual_offset, h.tell())
+            self.assertEqual(h.read(100), expected[offset:offset + 100])
+        self.assertRaises(ValueError, h.seek_uncompressed, -1)
+        self.assertRaises(ValueError, h.seek_uncompressed, len(expected) + 1)
+        h.close()
+
+    def test_seek_uncompressed_bam_ex1(self):
+        self.check_seek_uncompressed("SamBam/ex1.bam")
+
+    def test_seek_uncompressed_gb(self):
+        self.check_seek_uncompressed("GenBank/NC_000932.gb.bgz")
+
+    def test_seek_uncompressed_gzi(self):
+        gzi_file = self.temp_file + ".gzi"
+        try:
+            bgzf.make_gzi("SamBam/ex1_refresh.bam", gzi_file)
+            self.check_seek_uncompressed("SamBam/ex1_refresh.bam", gzi_file)
+        finally:
+            if os.path.isfile(gzi_file):
+                os.remove(gzi_file)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -5,9 +5,16 @@
 # as part of this package.
 
 
+import random
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from Bio import Align
+from Bio.Seq import BytesSeq, Seq
 
 
 class TestAlignerProperties(unittest.TestCase):
@@ -1515,6 +1522,269 @@ TTGGAA
             alignments = list(alignments)
 
 
+class TestBytesSequences(unittest.TestCase):
+
+    def test_bytes_like(self):
+        aligner = Align.PairwiseAligner()
+        aligner.gap_score = -0.5
+        expected = aligner.score("GAACT", "GAT")
+        for seq1 in (b"GAACT", bytearray(b"GAACT"), memoryview(b"GAACT"),
+                     BytesSeq(b"xxGAACTxx")[2:-2]):
+            self.assertAlmostEqual(aligner.score(seq1, "GAT"), expected)
+        alignments = aligner.align(BytesSeq(b"GAACT"), BytesSeq(b"GAT"))
+        self.assertEqual([str(a) for a in alignments],
+                         [str(a) for a in aligner.align("GAACT", "GAT")])
+
+
+class TestManySequences(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.targets = ["".join(random.choice("ACGT")
+                                for j in range(random.randint(1, 60)))
+                        for i in range(40)]
+        self.query = "GATTACAGATTACA"
+
+    def aligners(self):
+        """Yield aligners using each of the algorithms and modes."""
+        for mode in ("global", "local"):
+            aligner = Align.PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            aligner.gap_score = -2
+            yield aligner
+            aligner = Align.PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            aligner.open_gap_score = -3
+            aligner.extend_gap_score = -1
+            yield aligner
+            aligner = Align.PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            aligner.gap_score = lambda i, n: -2 - n * n
+            yield aligner
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_score_many(self):
+        for aligner in self.aligners():
+            scores = [aligner.score(target, self.query)
+                      for target in self.targets]
+            for threads in (0, 3):
+                values = aligner.score_many(self.targets, self.query,
+                                            threads=threads)
+                self.assertIsInstance(values, numpy.ndarray)
+                self.assertEqual(values.tolist(), scores)
+            scores = [aligner.score(self.query, target)
+                      for target in self.targets]
+            values = aligner.score_many(self.query, self.targets, threads=2)
+            self.assertEqual(values.tolist(), scores)
+            queries = self.targets[::-1]
+            scores = [aligner.score(target, query)
+                      for target, query in zip(self.targets, queries)]
+            values = aligner.score_many(tuple(self.targets), queries,
+                                        threads=4)
+            self.assertEqual(values.tolist(), scores)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_score_many_sequence_types(self):
+        aligner = Align.PairwiseAligner()
+        targets = ["ACGT", BytesSeq(b"ACCGT"), b"AGT", bytearray(b"ACT"),
+                   Seq("ACGGT")]
+        values = aligner.score_many(targets, "ACGT")
+        self.assertEqual(values.tolist(),
+                         [aligner.score(target, "ACGT")
+                          for target in targets])
+        self.assertEqual(aligner.score_many([], "ACGT").tolist(), [])
+        self.assertEqual(aligner.score_many("ACGT", "AGT").tolist(), [3.0])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_score_many_errors(self):
+        aligner = Align.PairwiseAligner()
+        self.assertRaises(ValueError, aligner.score_many,
+                          ["ACGT", "AC"], ["A", "C", "G"])
+        self.assertRaises(ValueError, aligner.score_many,
+                          ["ACGT"], "ACGT", threads=-1)
+        aligner.mismatch = -1
+        aligner.gap_score = lambda i, n: 1 / 0
+        self.assertRaises(ZeroDivisionError, aligner.score_many,
+                          ["ACGT", "AGT"], "ACT")
+        scores = numpy.zeros(3, dtype=numpy.int32)
+        self.assertRaises(ValueError, Align._aligners.PairwiseAligner.score_many,
+                          aligner, ["A", "C", "G"], ["A"], scores)
+        scores = numpy.zeros(2)
+        self.assertRaises(ValueError, Align._aligners.PairwiseAligner.score_many,
+                          aligner, ["A", "C", "G"], ["A"], scores)
+
+    def test_align_many(self):
+        for aligner in self.aligners():
+            for threads in (0, 3):
+                results = aligner.align_many(self.targets, self.query,
+                                             threads=threads)
+                self.assertEqual(len(results), len(self.targets))
+                for target, alignments in zip(self.targets, results):
+                    expected = aligner.align(target, self.query)
+                    self.assertEqual(alignments.score, expected.score)
+                    self.assertEqual(len(alignments), len(expected))
+                    self.assertEqual(str(alignments[0]), str(expected[0]))
+
+
+class TestBandedAlignment(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.pairs = []
+        for i in range(40):
+            target = "".join(random.choice("ACGT")
+                             for j in range(random.randint(1, 30)))
+            query = list(target)
+            for k in range(random.randint(0, 3)):
+                n = random.randrange(len(query) + 1)
+                action = random.randint(0, 2)
+                if action == 0 and n < len(query):
+                    query[n] = random.choice("ACGT")
+                elif action == 1 and n < len(query):
+                    del query[n]
+                else:
+                    query.insert(n, random.choice("ACGT"))
+            self.pairs.append((target, "".join(query) or "A"))
+
+    def aligners(self):
+        """Yield aligners using the algorithms that allow a band."""
+        for mode in ("global", "local"):
+            aligner = Align.PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            aligner.gap_score = -2
+            yield aligner
+            aligner = Align.PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            aligner.gap_score = -1
+            aligner.query_end_gap_score = 0
+            yield aligner
+            aligner = Align.PairwiseAligner()
+            aligner.mode = mode
+            aligner.mismatch = -1
+            aligner.open_gap_score = -3
+            aligner.extend_gap_score = -1
+            aligner.target_end_gap_score = -0.5
+            yield aligner
+
+    def check_same(self, aligner, target, query, band_width, xdrop=None):
+        score = aligner.score(target, query)
+        alignments = sorted(str(a) for a in aligner.align(target, query))
+        aligner.band_width = band_width
+        aligner.xdrop = xdrop
+        try:
+            self.assertEqual(aligner.score(target, query), score)
+            banded = aligner.align(target, query)
+            self.assertEqual(banded.score, score)
+            self.assertEqual(sorted(str(a) for a in banded), alignments)
+        finally:
+            aligner.band_width = None
+            aligner.xdrop = None
+
+    def test_full_band(self):
+        for aligner in self.aligners():
+            for target, query in self.pairs:
+                self.check_same(aligner, target, query,
+                                len(target) + len(query))
+
+    def test_narrow_band(self):
+        target = "GAACTGCATTACGGATCCAGTAGCATGACTGA"
+        query = "GACTGCATTACGGTATCCAGTAGCATGACTGA"
+        for aligner in self.aligners():
+            self.check_same(aligner, target, query, 2)
+
+    def test_band_limits(self):
+        target = "TTACGGATCCAGTAGCA"
+        query = "ACGGATCGAGTAGCATG"
+        for aligner in self.aligners():
+            aligner.band_width = 1
+            aligner.band_offset = -2
+            if aligner.mode == "global":
+                # the end of the alignment is on diagonal 0
+                self.assertRaises(ValueError, aligner.score, target, query)
+                self.assertRaises(ValueError, aligner.align, target, query)
+                continue
+            score = aligner.score(target, query)
+            alignments = aligner.align(target, query)
+            self.assertEqual(alignments.score, score)
+            aligner.band_width = None
+            self.assertLessEqual(score, aligner.score(target, query))
+            for alignment in alignments:
+                for (i1, j1), (i2, j2) in zip(alignment.path,
+                                              alignment.path[1:]):
+                    self.assertTrue(-3 <= j1 - i1 <= -1)
+                    self.assertTrue(-3 <= j2 - i2 <= -1)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_score_many(self):
+        targets = [target for target, query in self.pairs]
+        queries = [query for target, query in self.pairs]
+        for aligner in self.aligners():
+            aligner.band_width = 3
+            scores = [aligner.score(target, query)
+                      for target, query in self.pairs]
+            values = aligner.score_many(targets, queries, threads=2)
+            self.assertEqual(values.tolist(), scores)
+        aligner.mode = "global"
+        aligner.band_width = 0
+        self.assertRaises(ValueError, aligner.score_many,
+                          ["ACGT", "ACG"], "ACGT")
+
+    def test_xdrop(self):
+        target = "ACGTACGTAC" + "A" * 30 + "GATTACAGATTACAGATTACA"
+        query = "ACGTACGTAC" + "C" * 30 + "GATTACAGATTACAGATTACA"
+        for aligner in self.aligners():
+            if aligner.mode == "global":
+                aligner.xdrop = 5
+                self.assertRaises(ValueError, aligner.score, target, query)
+                continue
+            for seqA, seqB in self.pairs:
+                self.check_same(aligner, seqA, seqB, None, xdrop=100)
+            self.assertEqual(aligner.score(target, query), 21.0)
+            aligner.xdrop = 50
+            self.assertEqual(aligner.score(target, query), 21.0)
+            aligner.xdrop = 5
+            self.assertEqual(aligner.score(target, query), 10.0)
+            alignments = aligner.align(target, query)
+            self.assertEqual(alignments.score, 10.0)
+            self.assertEqual(len(alignments), 1)
+            self.assertEqual(alignments[0].path, ((0, 0), (10, 10)))
+
+    def test_attributes(self):
+        aligner = Align.PairwiseAligner()
+        self.assertIsNone(aligner.band_width)
+        self.assertEqual(aligner.band_offset, 0)
+        self.assertIsNone(aligner.xdrop)
+        aligner.band_width = 5
+        aligner.band_offset = -3
+        aligner.xdrop = 10
+        self.assertEqual(aligner.band_width, 5)
+        self.assertEqual(aligner.band_offset, -3)
+        self.assertEqual(aligner.xdrop, 10.0)
+        self.assertIn("band width: 5", str(aligner))
+        self.assertIn("X-drop: 10.000000", str(aligner))
+        with self.assertRaises(ValueError):
+            aligner.band_width = -1
+        with self.assertRaises(ValueError):
+            aligner.xdrop = -1
+        aligner.band_width = None
+        aligner.xdrop = None
+        self.assertIsNone(aligner.band_width)
+        self.assertIsNone(aligner.xdrop)
+        self.assertNotIn("band width", str(aligner))
+
+    def test_waterman_smith_beyer(self):
+        aligner = Align.PairwiseAligner()
+        aligner.gap_score = lambda i, n: -2 - n * n
+        aligner.band_width = 2
+        self.assertRaises(ValueError, aligner.score, "ACGT", "ACT")
+        self.assertRaises(ValueError, aligner.align, "ACGT", "ACT")
+
+
 if __name__ == '__main__':
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -1515,6 +1515,268 @@ class TestStopCodons(unittest.TestCase):
         self.assertEqual(Seq.translate("tan"), "X")
         self.assertEqual(Seq.translate("nnn"), "X")
 
+    def test_translation_of_long_sequences(self):
+        """Check long sequences (using NumPy if available) match short ones."""
+        codons = ["ATG", "GCA", "tgg", "TAA", "TAN", "NNN", "---"]
+        sequence = "".join(codons[i % 6] for i in range(0, 3000, 7))
+        expected = "".join(Seq.translate(sequence[i:i + 3])
+                           for i in range(0, len(sequence), 3))
+        self.assertEqual(Seq.translate(sequence), expected)
+        self.assertEqual(Seq.translate(sequence, stop_symbol="@"),
+                         expected.replace("*", "@"))
+        self.assertEqual(Seq.translate(sequence, to_stop=True),
+                         expected.split("*")[0])
+        gapped = sequence + "---" + sequence
+        self.assertEqual(Seq.translate(gapped, gap="-"),
+                         expected + "-" + expected)
+        with self.assertRaises(TranslationError):
+            Seq.translate(gapped)
+        with self.assertRaises(TranslationError):
+            Seq.translate(sequence + "A-A" + sequence, gap="-")
+        # An invalid codon after the first stop is ignored with to_stop:
+        self.assertEqual(Seq.translate(sequence + "A-A", to_stop=True),
+                         expected.split("*")[0])
+        cds = "ATG" + "GCA" * 200 + "TAG"
+        self.assertEqual(Seq.translate(cds, cds=True), "M" + "A" * 200)
+        with self.assertRaises(TranslationError):
+            Seq.translate(cds + cds, cds=True)
+
+    def test_translation_of_long_sequences_with_other_letters(self):
+        """Check letters not in the codon table alphabet in long sequences."""
+        codons = ["ATG", "AXG", "ggx", "CTX", "ACG", "TAA"]
+        sequence = "".join(codons[i % 6] for i in range(0, 3000, 7))
+        expected = "".join(Seq.translate(sequence[i:i + 3])
+                           for i in range(0, len(sequence), 3))
+        self.assertEqual(Seq.translate("AXG"), "X")
+        self.assertEqual(Seq.translate(sequence), expected)
+        self.assertEqual(Seq.translate("ACG" * 100 + "AXG"), "T" * 100 + "X")
+        self.assertEqual(Seq.translate(sequence + "---" + sequence, gap="-"),
+                         expected + "-" + expected)
+        self.assertEqual(Seq.translate(sequence, to_stop=True),
+                         expected.split("*")[0])
+        with self.assertRaises(TranslationError):
+            Seq.translate(sequence + "TXA")
+
+    def test_translate_many(self):
+        sequences = ["ATGGCACGGAAGTGA", Seq.Seq("GTGGCCATTTAG"),
+                     Seq.MutableSeq("ATGNNNTAR"), "", "ATG" * 100 + "TAA"]
+        for kwargs in [{}, {"to_stop": True}, {"table": 2},
+                       {"stop_symbol": "@"}, {"table": 11, "cds": True}]:
+            self.assertEqual(Seq.translate_many(sequences[:3], **kwargs),
+                             [Seq.translate(str(s), **kwargs)
+                              for s in sequences[:3]])
+        self.assertEqual(Seq.translate_many(sequences),
+                         ["MARK*", "VAI*", "MX*", "", "M" * 100 + "*"])
+        with self.assertRaises(TranslationError):
+            Seq.translate_many(["ATG", "ATGTA?"])
+
+    def test_translate_six_frames(self):
+        sequence = "GTGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAGA"
+        reverse = Seq.reverse_complement(sequence)
+        expected = []
+        for strand in (sequence, reverse):
+            for i in range(3):
+                frame = strand[i:]
+                expected.append(Seq.translate(frame[:len(frame) // 3 * 3],
+                                              table=2))
+        self.assertEqual(Seq.translate_six_frames(sequence, table=2),
+                         expected)
+        self.assertEqual(Seq.translate_six_frames(Seq.Seq(sequence), 2),
+                         expected)
+        self.assertEqual(Seq.translate_six_frames("AC"), [""] * 6)
+
+
+class TestBytesSeq(unittest.TestCase):
+
+    def test_views(self):
+        data = bytearray(b"ACGTNacgtU" * 10)
+        seq = Seq.BytesSeq(data, Alphabet.generic_nucleotide)
+        text = data.decode()
+        self.assertEqual(len(seq), 100)
+        self.assertEqual(str(seq), text)
+        self.assertEqual(bytes(seq), bytes(data))
+        self.assertEqual(seq[4], "N")
+        self.assertEqual(seq[-1], "U")
+        for index in [slice(3, 17), slice(-5, None), slice(None, None, -1),
+                      slice(1, 50, 3), slice(50, 1, -7), slice(8, 2)]:
+            self.assertIsInstance(seq[index], Seq.BytesSeq)
+            self.assertEqual(str(seq[index]), text[index])
+            self.assertEqual(seq[index].alphabet, seq.alphabet)
+        # Slices without a step share the memory
+        sub = seq[10:20]
+        data[10] = ord("G")
+        self.assertEqual(str(sub), "GCGTNacgtU")
+
+    def test_complements(self):
+        for text, alphabet in [("CCCCCgatA-GD", Alphabet.generic_dna),
+                               ("CCCCCgauA-GD", Alphabet.generic_rna),
+                               ("CCCCCGATAGNR", IUPAC.ambiguous_dna),
+                               ("ACGTNRY", Alphabet.generic_alphabet),
+                               ("ACGUNRY", Alphabet.generic_alphabet)]:
+            seq = Seq.BytesSeq(text.encode("ascii"), alphabet)
+            expected = Seq.Seq(text, alphabet)
+            for method in ("complement", "reverse_complement",
+                           "upper", "lower"):
+                new = getattr(seq, method)()
+                old = getattr(expected, method)()
+                self.assertIsInstance(new, Seq.BytesSeq)
+                self.assertEqual(str(new), str(old))
+                self.assertEqual(new.alphabet, old.alphabet)
+        with self.assertRaises(ValueError):
+            Seq.BytesSeq(b"ACGTU").complement()
+        with self.assertRaises(ValueError):
+            Seq.BytesSeq(b"MKL", IUPAC.protein).reverse_complement()
+
+    def test_interoperability(self):
+        import pickle
+        from Bio import SeqIO
+        from Bio.SeqRecord import SeqRecord
+        from Bio._py3k import StringIO
+        seq = Seq.BytesSeq(b"ATGGCCATTGTAATGGGCCGCTGA" * 5,
+                           Alphabet.generic_dna)
+        self.assertEqual(str(seq.translate()), "MAIVMGR*" * 5)
+        self.assertEqual(seq.find("CATT"), 5)
+        self.assertEqual(seq + "AA", str(seq) + "AA")
+        self.assertIsInstance(seq + "AA", Seq.BytesSeq)
+        self.assertEqual(seq, Seq.Seq(str(seq)))
+        self.assertEqual(pickle.loads(pickle.dumps(seq)), seq)
+        self.assertEqual(repr(seq[:10]), "BytesSeq('ATGGCCATTG', DNAAlphabet())")
+        self.assertEqual(repr(seq), "BytesSeq('%s...TGA', DNAAlphabet())"
+                         % str(seq)[:54])
+        record = SeqRecord(seq, id="test", description="")
+        self.assertEqual(str(record[10:20].seq), str(seq)[10:20])
+        handle = StringIO()
+        SeqIO.write([record], handle, "fasta")
+        handle.seek(0)
+        self.assertEqual(str(SeqIO.read(handle, "fasta").seq), str(seq))
+
+    @unittest.skipIf(sys.version_info[0] < 3,
+                     "Python 2 mmap objects do not support memoryview")
+    def test_mmap(self):
+        import mmap
+        import tempfile
+        with tempfile.TemporaryFile() as handle:
+            handle.write(b"ACGT" * 4096)
+            handle.flush()
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            seq = Seq.BytesSeq(data)
+            self.assertEqual(len(seq), 4 * 4096)
+            self.assertEqual(str(seq[4094:4100]), "GTACGT")
+            self.assertEqual(str(seq[:8].reverse_complement()), "ACGTACGT")
+            del seq
+            data.close()
+
+    def test_bad_data(self):
+        with self.assertRaises(TypeError):
+            Seq.BytesSeq(Seq.Seq("ACGT"))
+        with self.assertRaises(TypeError):
+            Seq.BytesSeq(123)
+        if sys.version_info[0] < 3:
+            # Only the old buffer interface, which memoryview can't use
+            with self.assertRaises(TypeError):
+                Seq.BytesSeq(array.array("c", b"ACGT"))
+        else:
+            with self.assertRaises(ValueError):
+                Seq.BytesSeq(array.array("i", [1, 2, 3]))
+
+
+class TestPackedSeq(unittest.TestCase):
+
+    text = "CCCCCGATAGNNNNacgtRnnGAT-ATGGCCATTGTAATGGGCCGCTGAagag" * 3
+
+    def test_slicing(self):
+        seq = Seq.PackedSeq(self.text)
+        self.assertEqual(len(seq), len(self.text))
+        self.assertEqual(str(seq), self.text)
+        self.assertEqual(seq[10], "N")
+        self.assertEqual(seq[-1], "g")
+        with self.assertRaises(IndexError):
+            seq[len(self.text)]
+        for index in [slice(3, 17), slice(-5, None), slice(None, None, -1),
+                      slice(1, 50, 3), slice(50, 1, -7), slice(8, 2)]:
+            self.assertIsInstance(seq[index], Seq.PackedSeq)
+            self.assertEqual(str(seq[index]), self.text[index])
+            self.assertEqual(seq[index].alphabet, seq.alphabet)
+        # Slices of slices share the packed data
+        sub = seq[7:90][5:60]
+        self.assertIs(sub._packed, seq._packed)
+        self.assertEqual(str(sub), self.text[12:67])
+
+    def test_memory(self):
+        text = "ACGT" * 25000 + "N" * 1000 + "acgt" * 25000
+        seq = Seq.PackedSeq(text)
+        self.assertEqual(str(seq), text)
+        self.assertLessEqual(sys.getsizeof(seq._packed), len(text) // 4 + 100)
+
+    def test_complements(self):
+        for start, end in [(0, None), (3, 50), (1, 2), (5, 5), (6, 99)]:
+            text = self.text[start:end]
+            seq = Seq.PackedSeq(self.text)[start:end]
+            expected = Seq.Seq(text, Alphabet.generic_dna)
+            for method in ("complement", "reverse_complement",
+                           "upper", "lower"):
+                new = getattr(seq, method)()
+                old = getattr(expected, method)()
+                self.assertIsInstance(new, Seq.PackedSeq)
+                self.assertEqual(str(new), str(old))
+                self.assertEqual(str(new[2:-3]), str(old)[2:-3])
+                self.assertEqual(new.alphabet, old.alphabet)
+        with self.assertRaises(ValueError):
+            Seq.PackedSeq("ACGU", Alphabet.generic_rna)
+        with self.assertRaises(ValueError):
+            Seq.PackedSeq("MKL", IUPAC.protein)
+
+    def test_searching(self):
+        seq = Seq.PackedSeq(self.text)
+        for sub in ["A", "n", "GAT", "NNNNa", "CC", "AGAG", "X",
+                    Seq.Seq("GCC", Alphabet.generic_dna)]:
+            for start, end in [(0, sys.maxsize), (5, -5), (60, 70)]:
+                self.assertEqual(seq.count(sub, start, end),
+                                 self.text.count(str(sub), start, end))
+                self.assertEqual(seq.find(sub, start, end),
+                                 self.text.find(str(sub), start, end))
+                self.assertEqual(seq.rfind(sub, start, end),
+                                 self.text.rfind(str(sub), start, end))
+        self.assertIn("NNac", seq)
+        self.assertNotIn("NNNNN", seq)
+        with self.assertRaises(TypeError):
+            seq.find(Seq.Seq("AUG", Alphabet.generic_rna))
+
+    def test_chunks(self):
+        # Use a tiny chunk size to check matches spanning two chunks
+        chunk = Seq._PACKED_CHUNK
+        Seq._PACKED_CHUNK = 12
+        try:
+            seq = Seq.PackedSeq(self.text)
+            for sub in ["A", "GAT", "NNNNa", "AGAG", "CCCCCGATAGNNNN"]:
+                self.assertEqual(seq.count(sub), self.text.count(sub))
+                self.assertEqual(seq.find(sub, 11), self.text.find(sub, 11))
+                self.assertEqual(seq.rfind(sub, 0, -11),
+                                 self.text.rfind(sub, 0, -11))
+            coding = Seq.PackedSeq("ATGGCCATTGTAATGGGCCGCTGA" * 5)
+            expected = Seq.Seq(str(coding))
+            for to_stop in (False, True):
+                self.assertEqual(repr(coding.translate(to_stop=to_stop)),
+                                 repr(expected.translate(to_stop=to_stop)))
+            self.assertEqual(str(coding[-24:].translate(cds=True)),
+                             "MAIVMGR")
+        finally:
+            Seq._PACKED_CHUNK = chunk
+
+    def test_interoperability(self):
+        import pickle
+        seq = Seq.PackedSeq(self.text)
+        self.assertEqual(seq, Seq.Seq(self.text))
+        self.assertEqual(seq + "AA", self.text + "AA")
+        self.assertEqual(pickle.loads(pickle.dumps(seq)), seq)
+        self.assertEqual(repr(seq[:10]), "PackedSeq('CCCCCGATAG', DNAAlphabet())")
+        self.assertEqual(repr(seq), "PackedSeq('%s...gag', DNAAlphabet())"
+                         % self.text[:54])
+        self.assertEqual(str(Seq.PackedSeq("")), "")
+        self.assertEqual(str(Seq.PackedSeq(b"ACGTN")), "ACGTN")
+        with self.assertRaises(TypeError):
+            Seq.PackedSeq(Seq.Seq("ACGT"))
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)